@@ -0,0 +1,50 @@
+"""Shared helpers for the libvbrief benchmark scripts.
+
+Run benchmarks from the repository root, e.g. ``python benchmarks/bench_tron.py``.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+EXAMPLES_DIR = REPO_ROOT / "examples"
+
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+def load_example(name: str) -> dict[str, Any]:
+    """Load ``examples/<name>.vbrief.json`` as a dict."""
+    return json.loads((EXAMPLES_DIR / f"{name}.vbrief.json").read_text(encoding="utf-8"))
+
+
+def best_time(func: Callable[[], Any], *, repeat: int = 5, number: int | None = None) -> float:
+    """Return the best per-call wall time in seconds."""
+    timer = timeit.Timer(func)
+    if number is None:
+        number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def print_table(headers: Sequence[str], rows: Sequence[Sequence[Any]]) -> None:
+    """Print a plain fixed-width results table."""
+    cells = [[str(h) for h in headers]] + [[_fmt(c) for c in row] for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    for index, row in enumerate(cells):
+        print("  ".join(cell.rjust(width) if i else cell.ljust(width) for i, (cell, width) in enumerate(zip(row, widths))))
+        if index == 0:
+            print("  ".join("-" * width for width in widths))
+    print()
+
+
+def _fmt(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:,.2f}"
+    if isinstance(value, int):
+        return f"{value:,}"
+    return str(value)
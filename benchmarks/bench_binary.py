@@ -0,0 +1,52 @@
+"""Compare the binary codec against json_codec on size and speed."""
+
+from __future__ import annotations
+
+import zlib
+
+from _common import best_time, load_example, print_table
+from bench_stream import build_document
+
+from libvbrief.serialization.binary_codec import dumps_binary, parse_binary
+from libvbrief.serialization.json_codec import dumps_json_bytes, parse_json_bytes
+
+EXAMPLES = ["construction-project-gantt", "software-development-gantt", "prd"]
+
+
+def main() -> None:
+    documents = [(name, load_example(name)) for name in EXAMPLES]
+    documents.append(("synthetic 2k items", build_document(2_000)))
+
+    size_rows = []
+    speed_rows = []
+    for name, document in documents:
+        json_bytes = dumps_json_bytes(document, canonical=False, preserve_format=True)
+        binary = dumps_binary(document, canonical=False, preserve_format=True)
+        assert parse_binary(binary) == document
+
+        size_rows.append(
+            [
+                name,
+                len(json_bytes),
+                len(binary),
+                f"{len(binary) / len(json_bytes) * 100:.1f}%",
+                len(zlib.compress(json_bytes)),
+                len(zlib.compress(binary)),
+            ]
+        )
+        speed_rows.append(
+            [
+                name,
+                best_time(lambda: dumps_json_bytes(document, canonical=False, preserve_format=True)) * 1e6,
+                best_time(lambda: dumps_binary(document, canonical=False, preserve_format=True)) * 1e6,
+                best_time(lambda: parse_json_bytes(json_bytes)) * 1e6,
+                best_time(lambda: parse_binary(binary)) * 1e6,
+            ]
+        )
+
+    print_table(["document", "json bytes", "binary bytes", "ratio", "json+zlib", "binary+zlib"], size_rows)
+    print_table(["document", "encode json us", "encode binary us", "decode json us", "decode binary us"], speed_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Full versus bounded validation of valid and badly broken plans, and strict loading."""
+
+from __future__ import annotations
+
+import json
+import sys
+
+from _common import best_time, print_table
+from bench_stream import build_document
+
+from libvbrief import ValidationError, loads, validate
+
+
+def broken_document(count: int) -> dict:
+    document = build_document(count)
+    for item in document["plan"]["items"]:
+        item["status"] = "bogus"
+        del item["subItems"][0]["title"]
+    return document
+
+
+def strict_load(text: str) -> None:
+    try:
+        loads(text, strict=True)
+    except ValidationError:
+        pass
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rows = []
+    for label, document in (("valid", build_document(count)), ("broken", broken_document(count))):
+        full = validate(document)
+        for mode, options in (
+            ("all issues", {}),
+            ("max_errors=100", {"max_errors": 100}),
+            ("fail_fast", {"fail_fast": True, "include_warnings": False}),
+        ):
+            seconds = best_time(lambda: validate(document, **options), repeat=3)
+            rows.append([label, mode, len(validate(document, **options).errors), seconds])
+        text = json.dumps(document)
+        rows.append([label, "loads(strict=True)", len(full.errors), best_time(lambda: strict_load(text), repeat=3)])
+    print(f"{count:,} items with one subItem each; every item of the broken plan has two errors")
+    print_table(["plan", "validation", "errors", "s"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Batch validation throughput of ``vbrief validate`` versus one process per file."""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from _common import REPO_ROOT, print_table
+from bench_stream import build_document
+
+from libvbrief.cli import main as vbrief
+
+
+def run_cli(args: list[str]) -> float:
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        vbrief(["validate", *args])
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    jobs = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        text = json.dumps(build_document(50), indent=2)
+        for index in range(count):
+            (root / f"plan-{index:05}.vbrief.json").write_text(text, encoding="utf-8")
+        megabytes = count * len(text) / 1e6
+
+        rows = []
+        for label, args in (
+            ("vbrief validate -j 1", ["-j", "1", directory]),
+            (f"vbrief validate -j {jobs}", ["-j", str(jobs), directory]),
+            (f"vbrief validate -j {jobs} --conformance --schema", ["-j", str(jobs), "--conformance", "--schema", directory]),
+        ):
+            seconds = run_cli(args)
+            rows.append([label, count / seconds, megabytes / seconds])
+
+        # What `task validate` amounted to: a validator process per file.
+        sample = sorted(root.iterdir())[:20]
+        started = time.perf_counter()
+        for path in sample:
+            subprocess.run(
+                [sys.executable, str(REPO_ROOT / "validation" / "vbrief_validator.py"), str(path)],
+                stdout=subprocess.DEVNULL,
+                check=False,
+            )
+        seconds = (time.perf_counter() - started) / len(sample) * count
+        rows.append(["vbrief_validator.py per file", count / seconds, megabytes / seconds])
+
+    print(f"{count:,} files of 50 items each ({megabytes:,.1f} MB), {jobs} CPUs")
+    print_table(["command", "files/s", "MB/s"], rows)
+
+
+if __name__ == "__main__":
+    main()
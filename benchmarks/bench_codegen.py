@@ -0,0 +1,109 @@
+"""Generated from_dict/to_dict fast paths versus generic field-list loops.
+
+Every example document is loaded and dumped with its plan items repeated
+1000 times. The generic versions reproduce the previous implementation: 28
+``.get()`` keyword arguments, list-membership extras and an
+``optional_pairs`` dict per item.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from typing import Any, Mapping
+
+from _common import EXAMPLES_DIR, best_time, print_table
+
+from libvbrief import VBriefDocument, models
+from libvbrief.compat import PLAN_FIELD_ORDER, PLAN_ITEM_FIELD_ORDER
+
+
+def generic_load(loading_cls: type, fields: list[str], children: str):
+    def load(data: Mapping[str, Any]) -> Any:
+        kwargs = {name: data.get(name) for name in fields if name != children}
+        kwargs["title"] = data.get("title", "")
+        kwargs["status"] = data.get("status", "")
+        extras = {k: v for k, v in data.items() if k not in fields}
+        return loading_cls(**kwargs, extras=extras or None, _field_order=data.keys())
+
+    return load
+
+
+def generic_known_values(fields: list[str], required: tuple[str, ...], children: str):
+    def known_values(node: Any, child_dicts: list[Any]) -> dict[str, Any]:
+        values = {name: getattr(node, name) for name in required if name != children}
+        if children in required:
+            values[children] = child_dicts
+        optional_pairs = {}
+        for name in fields:
+            if name in required:
+                continue
+            if name == children:
+                optional_pairs[name] = child_dicts or None
+            else:
+                optional_pairs[name] = getattr(node, name)
+        for key, value in optional_pairs.items():
+            if value is not None:
+                values[key] = value
+        return values
+
+    return known_values
+
+
+GENERIC = {
+    "_load_plan_item": generic_load(models._LoadingPlanItem, PLAN_ITEM_FIELD_ORDER, "subItems"),
+    "_load_plan": generic_load(models._LoadingPlan, PLAN_FIELD_ORDER, "items"),
+    "_known_item_values": generic_known_values(PLAN_ITEM_FIELD_ORDER, ("title", "status"), "subItems"),
+    "_known_plan_values": generic_known_values(PLAN_FIELD_ORDER, ("title", "status", "items"), "items"),
+}
+
+
+def scaled_examples(factor: int) -> list[dict[str, Any]]:
+    documents = []
+    for path in sorted(EXAMPLES_DIR.glob("*.vbrief.json")):
+        document = json.loads(path.read_text(encoding="utf-8"))
+        document["plan"]["items"] = document["plan"].get("items", []) * factor
+        documents.append(document)
+    return documents
+
+
+def measure(documents: list[dict[str, Any]]) -> tuple[float, float]:
+    def load() -> list[VBriefDocument]:
+        return [VBriefDocument.from_dict(document) for document in documents]
+
+    def dump() -> None:
+        # Fresh models each time so no cached dicts are reused.
+        for model in load():
+            model.to_dict(preserve_order=True)
+
+    load_time = best_time(load, repeat=3, number=1)
+    return load_time, best_time(dump, repeat=3, number=1) - load_time
+
+
+def main() -> None:
+    factor = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    documents = scaled_examples(factor)
+    count = sum(len(document["plan"]["items"]) for document in documents)
+
+    generated = measure(documents)
+    saved = {name: getattr(models, name) for name in GENERIC}
+    for name, function in GENERIC.items():
+        setattr(models, name, function)
+    try:
+        generic = measure(documents)
+    finally:
+        for name, function in saved.items():
+            setattr(models, name, function)
+
+    print(f"{len(documents)} examples x {factor}: {count:,} top-level items")
+    print_table(
+        ["step", "generic ms", "generated ms", "speedup"],
+        [
+            ["from_dict", generic[0] * 1e3, generated[0] * 1e3, generic[0] / generated[0]],
+            ["to_dict", generic[1] * 1e3, generated[1] * 1e3, generic[1] / generated[1]],
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
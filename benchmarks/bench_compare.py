@@ -0,0 +1,58 @@
+"""Structural diff of two 100k-item plans with 1% churn versus a line diff of their JSON."""
+
+from __future__ import annotations
+
+import copy
+import difflib
+import json
+import random
+import sys
+
+from _common import best_time, print_table
+from bench_stream import build_document
+
+from libvbrief import diff
+
+
+def churn(data: dict, fraction: float, seed: int = 1) -> dict:
+    """Return a copy of ``data`` with ``fraction`` of its items edited, moved, removed or added."""
+    rng = random.Random(seed)
+    data = copy.deepcopy(data)
+    items = data["plan"]["items"]
+    for step in range(int(len(items) * fraction)):
+        kind = step % 4
+        position = rng.randrange(len(items))
+        if kind == 0:
+            items[position]["status"] = "completed"
+        elif kind == 1:
+            items.insert(rng.randrange(len(items)), items.pop(position))
+        elif kind == 2:
+            del items[position]
+        else:
+            items.insert(position, {"id": f"new-{step}", "title": "New", "status": "draft"})
+    return data
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    old = build_document(count)
+    new = churn(old, 0.01)
+    result = diff(old, new)
+    old_lines = json.dumps(old, indent=2).splitlines()
+    new_lines = json.dumps(new, indent=2).splitlines()
+
+    def line_diff() -> None:
+        for _ in difflib.unified_diff(old_lines, new_lines, lineterm=""):
+            pass
+
+    rows = [
+        ["difflib on pretty-printed JSON", best_time(line_diff, repeat=1)],
+        ["diff", best_time(lambda: diff(old, new), repeat=3)],
+        ["diff + to_patch", best_time(lambda: diff(old, new).to_patch(), repeat=3)],
+    ]
+    print(f"{count:,} items with one subItem each, {len(result):,} changes")
+    print_table(["workload", "s"], rows)
+
+
+if __name__ == "__main__":
+    main()
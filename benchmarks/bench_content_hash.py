@@ -0,0 +1,69 @@
+"""Merkle content hashes: first hash, rehash after one edit, and a hash-guided compare."""
+
+from __future__ import annotations
+
+import hashlib
+import sys
+import time
+
+from _common import best_time, print_table
+from bench_stream import build_document
+
+from libvbrief import VBriefDocument
+from libvbrief.serialization import dumps_jcs
+
+
+def changed_items(old, new) -> list:
+    # Descend only where the hashes differ.
+    found, pending = [], [(old.items, new.items)]
+    while pending:
+        left, right = pending.pop()
+        for a, b in zip(left, right):
+            if a.content_hash() != b.content_hash():
+                found.append(b)
+                pending.append((a.subItems, b.subItems))
+    return found
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    document = build_document(count)
+    model = VBriefDocument.from_dict(document)
+    other = VBriefDocument.from_dict(document)
+    statuses = ["running", "completed"]
+    state = {"flip": 0}
+
+    def flip() -> None:
+        state["flip"] += 1
+        model.plan.items[(state["flip"] * 7919) % count].subItems[0].status = statuses[state["flip"] % 2]
+
+    def cold() -> float:
+        fresh = VBriefDocument.from_dict(document)
+        start = time.perf_counter()
+        fresh.content_hash()
+        return time.perf_counter() - start
+
+    def flip_and_hash() -> None:
+        flip()
+        model.content_hash()
+
+    model.content_hash()
+    other.content_hash()
+    flip()
+    compare_start = time.perf_counter()
+    changed = changed_items(other.plan, model.plan)
+    compare = time.perf_counter() - compare_start
+    assert len(changed) == 2
+
+    rows = [
+        ["content_hash, nothing cached", cold() * 1e3],
+        ["sha256(dumps_jcs(to_dict()))", best_time(lambda: hashlib.sha256(dumps_jcs(model.to_dict())), repeat=3) * 1e3],
+        ["flip + content_hash", best_time(flip_and_hash, repeat=5) * 1e3],
+        ["find the changed item by hashes", compare * 1e3],
+    ]
+    print(f"{count:,} items with one subItem each")
+    print_table(["operation", "ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
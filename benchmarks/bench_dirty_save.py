@@ -0,0 +1,59 @@
+"""One status flip, then save: cached to_dict versus rebuilding the whole tree."""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from _common import best_time, print_table
+from bench_stream import build_document
+
+from libvbrief import VBriefDocument
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    document = build_document(count)
+    model = VBriefDocument.from_dict(document)
+    statuses = ["running", "completed"]
+    state = {"flip": 0}
+
+    def flip() -> None:
+        state["flip"] += 1
+        model.plan.items[(state["flip"] * 7919) % count].status = statuses[state["flip"] % 2]
+
+    def cold_to_dict() -> float:
+        # A freshly loaded model has no cached dicts, like every save did before.
+        best = float("inf")
+        for _ in range(3):
+            fresh = VBriefDocument.from_dict(document)
+            start = time.perf_counter()
+            fresh.to_dict()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    def flip_and_to_dict() -> None:
+        flip()
+        model.to_dict()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "plan.vbrief.json"
+
+        def flip_and_save() -> None:
+            flip()
+            model.to_file(path)
+
+        rows = [
+            ["to_dict, nothing cached", cold_to_dict() * 1e3],
+            ["flip + to_dict", best_time(flip_and_to_dict, repeat=5) * 1e3],
+            ["flip + to_file", best_time(flip_and_save, repeat=5, number=3) * 1e3],
+        ]
+
+    print(f"{count:,} items with one subItem each")
+    print_table(["workload", "ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Peak memory and time of the streaming, atomic dump_file on a large plan."""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+from pathlib import Path
+
+from _common import print_table
+from bench_stream import build_document, measure
+
+from libvbrief import dump_file
+from libvbrief.serialization import dumps_json_bytes
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    document = build_document(count)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "big.vbrief.json"
+
+        def whole_string() -> None:
+            path.write_bytes(dumps_json_bytes(document))
+
+        def streamed() -> None:
+            dump_file(document, path)
+
+        rows = []
+        for label, func in [("dumps_json_bytes + write_bytes", whole_string), ("dump_file (streamed, atomic)", streamed)]:
+            elapsed, peak = measure(func)
+            rows.append([label, count, elapsed * 1e3, peak / 1e6])
+
+    print_table(["writer", "items", "time ms", "peak MB"], rows)
+
+
+if __name__ == "__main__":
+    main()
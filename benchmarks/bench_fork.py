@@ -0,0 +1,45 @@
+"""Forking a large plan and editing a few items, versus rebuilding a full copy."""
+
+from __future__ import annotations
+
+import sys
+
+from _common import print_table
+from bench_stream import build_document, measure
+
+from libvbrief import VBriefDocument
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    forks = 20
+    model = VBriefDocument.from_dict(build_document(count))
+    model.to_dict()
+
+    def edit(document: VBriefDocument, seed: int) -> None:
+        for step in range(5):
+            document.plan.items[(seed * 7919 + step * 104_729) % count].subItems[0].status = "completed"
+
+    def forked() -> list:
+        documents = [model.fork() for _ in range(forks)]
+        for seed, document in enumerate(documents):
+            edit(document, seed)
+        return documents
+
+    def rebuilt() -> list:
+        # copy.deepcopy of the model is slower still, by an order of magnitude.
+        documents = [VBriefDocument.from_dict(model.to_dict()) for _ in range(forks)]
+        for seed, document in enumerate(documents):
+            edit(document, seed)
+        return documents
+
+    rows = []
+    for label, func in [("fork", forked), ("from_dict(to_dict())", rebuilt)]:
+        seconds, peak = measure(func)
+        rows.append([label, seconds * 1e3, seconds / forks * 1e3, peak / 2**20])
+    print(f"{forks} copies of a {count:,}-item plan, 5 status edits each")
+    print_table(["method", "total ms", "ms per copy", "peak MiB"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Item lookup by id: linear walk versus the document index."""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from _common import best_time, print_table
+from bench_stream import build_document
+
+from libvbrief import PlanItem, VBriefDocument
+from libvbrief.traversal import walk_items
+
+
+def linear_find(model: VBriefDocument, item_id: str) -> PlanItem | None:
+    # What callers did before: walk items and subItems until the id matches.
+    children = lambda item: item._subItems  # noqa: E731
+    for _, item, _ in walk_items(model.plan.items, path=None, children=children):
+        if item.id == item_id:
+            return item
+    return None
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    model = VBriefDocument.from_dict(build_document(count))
+    ids = [item.id for item in model.plan.items]
+    probes = [ids[(i * 7919) % count] for i in range(200)]
+
+    start = time.perf_counter()
+    index = model.index
+    build_ms = (time.perf_counter() - start) * 1e3
+
+    def scan() -> None:
+        for item_id in probes[:5]:
+            linear_find(model, item_id)
+
+    def lookup() -> None:
+        for item_id in probes:
+            index.by_id(item_id)
+
+    state = {"step": 0}
+
+    def append_and_pop() -> None:
+        state["step"] += 1
+        items = model.plan.items
+        items.append(PlanItem(title="new", status="pending", id=f"new-{state['step']}"))
+        items.pop()
+
+    def rename() -> None:
+        state["step"] += 1
+        model.plan.items[state["step"] % count].uid = f"uid-{state['step']}"
+
+    print(f"{count:,} items with one subItem each; index built in {build_ms:,.1f} ms")
+    print_table(
+        ["operation", "us per call"],
+        [
+            ["linear find by id", best_time(scan) / 5 * 1e6],
+            ["index.by_id", best_time(lookup) / len(probes) * 1e6],
+            ["append + pop, indexed", best_time(append_and_pop) * 1e6],
+            ["uid change, indexed", best_time(rename) * 1e6],
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
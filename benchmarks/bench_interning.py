@@ -0,0 +1,36 @@
+"""Memory held by a corpus of parsed example plans, with and without interning."""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from _common import EXAMPLES_DIR, print_table
+from bench_models_memory import allocated
+
+from libvbrief.serialization import clear_intern_table, parse_json_bytes
+
+
+def main() -> None:
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    sources = [path.read_bytes() for path in sorted(EXAMPLES_DIR.glob("*.vbrief.json"))]
+    corpus = sources * copies
+
+    rows = []
+    for label, intern in [("parse_json_bytes", False), ("parse_json_bytes(intern=True)", True)]:
+        clear_intern_table()
+        start = time.perf_counter()
+        for data in corpus:
+            parse_json_bytes(data, intern=intern)
+        seconds = time.perf_counter() - start
+        clear_intern_table()
+        # Measured from an empty table, so the shared strings count against interning.
+        held, documents = allocated(lambda: [parse_json_bytes(data, intern=intern) for data in corpus])
+        assert len(documents) == len(corpus)
+        rows.append([label, seconds * 1e3, held / 2**20, held / len(corpus)])
+    print(f"{len(corpus):,} documents: {copies} copies of {len(sources)} example plans")
+    print_table(["parser", "parse ms", "held MiB", "bytes/document"], rows)
+
+
+if __name__ == "__main__":
+    main()
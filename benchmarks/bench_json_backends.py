@@ -0,0 +1,50 @@
+"""Compare parse/emit throughput of each importable JSON backend."""
+
+from __future__ import annotations
+
+from _common import EXAMPLES_DIR, best_time, print_table
+
+from libvbrief.serialization import (
+    available_json_backends,
+    dumps_json_bytes,
+    parse_json,
+    parse_json_bytes,
+    set_json_backend,
+)
+
+EXAMPLES = ["construction-project-gantt", "prd"]
+
+
+def main() -> None:
+    rows = []
+    for name in EXAMPLES:
+        data = (EXAMPLES_DIR / f"{name}.vbrief.json").read_bytes()
+        text = data.decode("utf-8")
+        baseline = None
+        for backend in available_json_backends():
+            set_json_backend(backend)
+            document = parse_json_bytes(data)
+            rendered = dumps_json_bytes(document)
+            baseline = baseline or rendered
+            assert rendered == baseline, f"{backend} output differs"
+
+            rows.append(
+                [
+                    name,
+                    backend,
+                    best_time(lambda: parse_json(text)) * 1e6,
+                    best_time(lambda: parse_json_bytes(data)) * 1e6,
+                    best_time(lambda: dumps_json_bytes(document)) * 1e6,
+                    best_time(lambda: dumps_json_bytes(document, canonical=False, preserve_format=True)) * 1e6,
+                ]
+            )
+    set_json_backend(None)
+
+    print_table(
+        ["example", "backend", "parse str us", "parse bytes us", "dump canonical us", "dump preserve us"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
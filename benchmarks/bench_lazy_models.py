@@ -0,0 +1,45 @@
+"""Cold-load time of eager versus lazy VBriefDocument.from_dict on a large plan."""
+
+from __future__ import annotations
+
+import sys
+
+from _common import best_time, print_table
+from bench_stream import build_document
+
+from libvbrief import VBriefDocument
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    document = build_document(count)
+
+    def title_only(lazy: bool) -> None:
+        VBriefDocument.from_dict(document, lazy=lazy).plan.title
+
+    def first_ten(lazy: bool) -> None:
+        items = VBriefDocument.from_dict(document, lazy=lazy).plan.items
+        for index in range(10):
+            items[index].subItems[0].status
+
+    def edit_one_and_dump(lazy: bool) -> None:
+        model = VBriefDocument.from_dict(document, lazy=lazy)
+        model.plan.items[0].status = "completed"
+        model.to_dict()
+
+    rows = []
+    for label, func in [
+        ("plan title only", title_only),
+        ("first 10 items", first_ten),
+        ("edit one item + to_dict", edit_one_and_dump),
+    ]:
+        eager = best_time(lambda: func(False), repeat=3, number=1)
+        lazy = best_time(lambda: func(True), repeat=3, number=1)
+        rows.append([label, eager * 1e3, lazy * 1e3, eager / lazy])
+
+    print(f"{count:,} items with one subItem each")
+    print_table(["workload", "eager ms", "lazy ms", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""Three-way merge of two concurrent edits to a large plan, by plan size."""
+
+from __future__ import annotations
+
+import sys
+
+from _common import best_time, print_table
+from bench_compare import churn
+from bench_stream import build_document
+
+from libvbrief import merge
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 50_000, 100_000]
+    rows = []
+    for count in sizes:
+        base = build_document(count)
+        ours, theirs = churn(base, 0.01, seed=1), churn(base, 0.01, seed=2)
+        result = merge(base, ours, theirs)
+        seconds = best_time(lambda: merge(base, ours, theirs), repeat=3)
+        rows.append([f"{count:,}", len(result.conflicts), seconds, seconds / (2 * count) * 1e6])
+    print("Each side edits, moves, removes or adds 1% of the items")
+    print_table(["items", "conflicts", "s", "us per item"], rows)
+
+
+if __name__ == "__main__":
+    main()
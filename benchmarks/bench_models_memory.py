@@ -0,0 +1,95 @@
+"""Bytes per PlanItem for the slots models versus the previous dataclass layout."""
+
+from __future__ import annotations
+
+import json
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Mapping
+
+from _common import print_table
+from bench_stream import build_document
+
+from libvbrief import VBriefDocument
+from libvbrief.compat import PLAN_ITEM_FIELD_ORDER
+
+
+@dataclass
+class DataclassPlanItem:
+    """The PlanItem layout before the switch to __slots__, for comparison."""
+
+    title: Any = ""
+    status: Any = ""
+    id: Any = None
+    uid: Any = None
+    narrative: Any = None
+    subItems: list[Any] = field(default_factory=list)
+    planRef: Any = None
+    tags: Any = None
+    metadata: Any = None
+    created: Any = None
+    updated: Any = None
+    completed: Any = None
+    priority: Any = None
+    dueDate: Any = None
+    startDate: Any = None
+    endDate: Any = None
+    percentComplete: Any = None
+    participants: Any = None
+    location: Any = None
+    uris: Any = None
+    recurrence: Any = None
+    reminders: Any = None
+    classification: Any = None
+    relatedComments: Any = None
+    timezone: Any = None
+    sequence: Any = None
+    lastModifiedBy: Any = None
+    lockedBy: Any = None
+    extras: dict[str, Any] = field(default_factory=dict)
+    _field_order: list[str] = field(default_factory=list, repr=False)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> DataclassPlanItem:
+        item = cls(
+            **{key: data.get(key) for key in PLAN_ITEM_FIELD_ORDER if key != "subItems" and key in data},
+            extras={k: v for k, v in data.items() if k not in PLAN_ITEM_FIELD_ORDER},
+            _field_order=list(data.keys()),
+        )
+        item.subItems = [cls.from_dict(x) for x in data.get("subItems") or []]
+        return item
+
+
+def allocated(build) -> tuple[int, Any]:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    document = build_document(count)
+    items = document["plan"]["items"]
+    total_items = count * 2  # every generated item has one leaf subItem
+
+    source_bytes = len(json.dumps(items, separators=(",", ":")).encode("utf-8"))
+    old_bytes, old = allocated(lambda: [DataclassPlanItem.from_dict(x) for x in items])
+    new_bytes, new = allocated(lambda: VBriefDocument.from_dict(document).plan.items)
+    assert len(old) == len(new) == count
+
+    print_table(
+        ["representation", "items", "total MB", "bytes/item"],
+        [
+            ["compact JSON source", total_items, source_bytes / 1e6, source_bytes / total_items],
+            ["dataclass models (before)", total_items, old_bytes / 1e6, old_bytes / total_items],
+            ["__slots__ models (after)", total_items, new_bytes / 1e6, new_bytes / total_items],
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
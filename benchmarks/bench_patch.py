@@ -0,0 +1,56 @@
+"""Small agent edits: apply_patch on the models versus edit-the-dict-and-revalidate."""
+
+from __future__ import annotations
+
+import sys
+
+from _common import best_time, print_table
+from bench_stream import build_document
+
+from libvbrief import VBriefDocument
+from libvbrief.validation import validate_document
+
+STATUSES = ["running", "completed", "blocked"]
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    data = build_document(count)
+    model = VBriefDocument.from_dict(build_document(count))
+    state = {"step": 0}
+
+    def next_edit() -> tuple[int, str, dict]:
+        state["step"] += 1
+        step = state["step"]
+        return (step * 7919) % count, STATUSES[step % 3], {"title": f"Follow-up {step}", "status": "pending"}
+
+    def edit_dicts() -> None:
+        # The previous workflow: edit the dicts, reload, validate everything.
+        position, status, follow_up = next_edit()
+        item = data["plan"]["items"][position]
+        item["status"] = status
+        item["subItems"].append(follow_up)
+        del item["subItems"][0]
+        VBriefDocument.from_dict(data)
+        validate_document(data)
+
+    def patch() -> None:
+        position, status, follow_up = next_edit()
+        model.apply_patch(
+            [
+                {"op": "replace", "path": f"/plan/items/{position}/status", "value": status},
+                {"op": "add", "path": f"/plan/items/{position}/subItems/-", "value": follow_up},
+                {"op": "remove", "path": f"/plan/items/{position}/subItems/0"},
+            ]
+        )
+
+    rows = [
+        ["edit dicts, reload, validate", best_time(edit_dicts, repeat=3) * 1e3],
+        ["apply_patch (3 operations)", best_time(patch) * 1e3],
+    ]
+    print(f"{count:,} items with one subItem each")
+    print_table(["workload", "ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Query latency: PlanQuery indexes versus a full scan over PlanItem fields."""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+from typing import Any
+
+from _common import best_time, print_table
+
+from libvbrief import VBriefDocument
+from libvbrief.query import F, All, PlanQuery
+from libvbrief.traversal import walk_items
+
+TAGS = ["backend", "frontend", "ops", "docs", "infra", "design", "qa", "data"]
+STATUSES = ["pending", "running", "blocked", "completed", "draft"]
+
+
+def build_document(count: int, seed: int = 1) -> dict[str, Any]:
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        item: dict[str, Any] = {
+            "id": f"task-{i}",
+            "title": f"Task {i}",
+            "status": rng.choice(STATUSES),
+            "priority": rng.choice(["low", "medium", "high", "critical"]),
+            "tags": rng.sample(TAGS, 2),
+            "dueDate": f"2026-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}T12:00:00Z",
+            "participants": [{"id": f"user-{rng.randrange(200)}", "role": "assignee"}],
+        }
+        if i % 10 == 0:
+            item["metadata"] = {"sprint": i // 1000}
+        items.append(item)
+    return {"vBRIEFInfo": {"version": "0.5"}, "plan": {"title": "Big", "status": "running", "items": items}}
+
+
+QUERIES = [
+    (
+        "blocked & high & backend & due this week",
+        (F.status == "blocked", F.priority == "high", F.tags.contains("backend"), F.dueDate.between("2026-10-12", "2026-10-18T23:59:59Z")),
+        {},
+    ),
+    ("assigned to user-7", (F.participants.contains("user-7"),), {}),
+    ("critical, soonest 20", (F.priority == "critical",), {"order_by": "dueDate", "limit": 20}),
+    ("soonest 20 overall", (), {"order_by": "dueDate", "limit": 20}),
+    ("has metadata sprint", (F.metadata.contains("sprint"), F.status == "running"), {}),
+]
+
+
+def scan(model: VBriefDocument, conditions: tuple, order_by: str | None = None, limit: int | None = None) -> list:
+    # The pre-index way: test every item, then sort what matched.
+    condition = All(conditions)
+    children = lambda item: item._subItems  # noqa: E731
+    matches = [item for _, item, _ in walk_items(model.plan.items, path=None, children=children) if condition.matches(item)]
+    if order_by is not None:
+        matches.sort(key=lambda item: getattr(item, order_by) or "")
+    return matches if limit is None else matches[:limit]
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    model = VBriefDocument.from_dict(build_document(count))
+
+    start = time.perf_counter()
+    query = PlanQuery(model)
+    build_ms = (time.perf_counter() - start) * 1e3
+
+    rows = []
+    for label, conditions, options in QUERIES:
+        assert len(query.select(*conditions, **options)) == len(scan(model, conditions, **options))
+        scan_us = best_time(lambda: scan(model, conditions, **options), repeat=3) * 1e6
+        indexed_us = best_time(lambda: query.select(*conditions, **options)) * 1e6
+        rows.append([label, scan_us, indexed_us, scan_us / indexed_us])
+
+    flips = {"step": 0}
+
+    def flip_status() -> None:
+        flips["step"] += 1
+        model.plan.items[(flips["step"] * 7919) % count].status = STATUSES[flips["step"] % len(STATUSES)]
+
+    print(f"{count:,} items; indexes built in {build_ms:,.1f} ms")
+    print_table(["query", "scan us", "indexed us", "speedup"], rows)
+    print_table(["maintenance", "us per call"], [["status assignment, indexed", best_time(flip_status) * 1e6]])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Conformance validation with edges: one rule-engine pass versus separate walks."""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+
+from _common import REPO_ROOT, best_time, print_table
+from bench_stream import build_document
+
+from libvbrief.validation import CONFORMANCE_RULES, validate_document
+
+
+def load_dag_validator():
+    spec = importlib.util.spec_from_file_location("dag_validator", REPO_ROOT / "validation" / "dag_validator.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    document = build_document(count)
+    document["plan"]["edges"] = [
+        {"from": f"task-{i}", "to": f"task-{i + 1}", "type": "blocks"} for i in range(count - 1)
+    ]
+    dag_validator = load_dag_validator()
+
+    def separate_walks() -> None:
+        # What the conformance script did: core validation plus a DAG pass.
+        validate_document(document)
+        dag_validator.validate_plan_dag(document["plan"])
+
+    rows = [
+        ["core rules (validate_document)", best_time(lambda: validate_document(document), repeat=3)],
+        ["core rules + dag_validator", best_time(separate_walks, repeat=3)],
+        ["CONFORMANCE_RULES, one pass", best_time(lambda: validate_document(document, rules=CONFORMANCE_RULES), repeat=3)],
+    ]
+    print(f"{count:,} items with one subItem each and a chain of {count - 1:,} edges")
+    print_table(["validation", "s"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Core JSON Schema validation: compiled closures versus jsonschema, on the examples."""
+
+from __future__ import annotations
+
+import sys
+
+from _common import EXAMPLES_DIR, best_time, load_example, print_table
+from bench_stream import build_document
+
+from libvbrief.schema import core_schema, load_core_schema
+
+try:
+    import jsonschema
+except ImportError:  # optional; only the compiled validator is timed
+    jsonschema = None
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    schema = load_core_schema()
+    names = [path.name.removesuffix(".vbrief.json") for path in sorted(EXAMPLES_DIR.glob("*.vbrief.json"))]
+    documents = [(name, load_example(name)) for name in names]
+    documents.append((f"generated, {count:,} items", build_document(count)))
+    compiled = core_schema()
+    validator = jsonschema.Draft202012Validator(schema) if jsonschema else None
+
+    rows = []
+    for name, document in documents:
+        issues = len(compiled.validate(document).errors)
+        row = [name, issues, best_time(lambda: compiled.validate(document), repeat=3) * 1e3]
+        if validator is not None:
+            assert issues == sum(1 for _ in validator.iter_errors(document))
+            row.append(best_time(lambda: list(validator.iter_errors(document)), repeat=3) * 1e3)
+            row.append(row[-1] / row[2])
+        rows.append(row)
+
+    headers = ["document", "issues", "compiled ms"]
+    if validator is None:
+        print("jsonschema is not installed; timing the compiled validator only")
+    else:
+        headers += ["jsonschema ms", "speedup"]
+    print_table(headers, rows)
+
+
+if __name__ == "__main__":
+    main()
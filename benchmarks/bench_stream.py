@@ -0,0 +1,68 @@
+"""Peak memory and time of iter_items versus load_file on a large plan."""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from _common import print_table
+
+from libvbrief import dump_file, load_file
+from libvbrief.stream import iter_items
+
+
+def build_document(count: int) -> dict:
+    items = [
+        {
+            "id": f"task-{i}",
+            "title": f"Task {i}",
+            "status": "pending" if i % 3 else "running",
+            "tags": ["backend", "memory"],
+            "subItems": [{"id": f"task-{i}.check", "title": "Check", "status": "draft"}],
+        }
+        for i in range(count)
+    ]
+    return {"vBRIEFInfo": {"version": "0.5"}, "plan": {"title": "Big", "status": "running", "items": items}}
+
+
+def measure(func) -> tuple[float, int]:
+    # tracemalloc slows Python-level code far more than C code, so time and
+    # memory are measured in separate runs.
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "big.vbrief.json"
+        dump_file(build_document(count), path)
+        size = path.stat().st_size
+
+        def full_load() -> None:
+            for item in load_file(path)["plan"]["items"]:
+                item.get("status")
+
+        def streamed() -> None:
+            for streamed_item in iter_items(path, depth=None):
+                streamed_item.item.get("status")
+
+        rows = []
+        for label, func in [("load_file", full_load), ("iter_items(depth=None)", streamed)]:
+            elapsed, peak = measure(func)
+            rows.append([label, count, size / 1e6, elapsed * 1e3, peak / 1e6])
+
+    print_table(["reader", "items", "file MB", "time ms", "peak MB"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Strict loading: one validating traversal that also builds the models."""
+
+from __future__ import annotations
+
+import json
+import sys
+
+from _common import best_time, print_table
+from bench_stream import build_document
+
+from libvbrief import VBriefDocument, loads
+from libvbrief.serialization import parse_json
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    text = json.dumps(build_document(count))
+
+    def separate_passes() -> None:
+        # What strict model loading did: build, then validate the model's dict.
+        VBriefDocument.from_json(text).validate(fail_fast=True)
+
+    rows = [
+        ["parse_json", best_time(lambda: parse_json(text), repeat=3)],
+        ["loads(strict=True)", best_time(lambda: loads(text, strict=True), repeat=3)],
+        ["from_json", best_time(lambda: VBriefDocument.from_json(text), repeat=3)],
+        ["from_json + validate()", best_time(separate_passes, repeat=3)],
+        ["from_json(strict=True)", best_time(lambda: VBriefDocument.from_json(text, strict=True), repeat=3)],
+    ]
+    print(f"{count:,} items with one subItem each")
+    print_table(["load", "s"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""PlanTable analytics versus the equivalent loops over PlanItem objects."""
+
+from __future__ import annotations
+
+import sys
+import time
+from collections import Counter
+
+from _common import best_time, print_table
+from bench_query import build_document
+
+from libvbrief import VBriefDocument
+from libvbrief.query import date_key
+from libvbrief.table import PlanTable, available_table_backends
+from libvbrief.traversal import walk_items
+
+WINDOW = (date_key("2026-06-01"), date_key("2026-06-30T23:59:59Z"))
+
+
+def loop_items(model: VBriefDocument) -> list:
+    return [item for _, item, _ in walk_items(model.plan.items, path=None, children=lambda item: item._subItems)]
+
+
+def loop_status_counts(model: VBriefDocument) -> Counter:
+    return Counter(item.status for item in loop_items(model))
+
+
+def loop_window(model: VBriefDocument) -> list:
+    low, high = WINDOW
+    matches = []
+    for item in loop_items(model):
+        if item.priority == "high" and item.dueDate is not None and low <= date_key(item.dueDate) <= high:
+            matches.append(item)
+    return matches
+
+
+def loop_mean_percent(model: VBriefDocument) -> dict:
+    totals: dict = {}
+    for item in loop_items(model):
+        if item.percentComplete is not None:
+            entry = totals.setdefault(item.status, [0.0, 0])
+            entry[0] += item.percentComplete
+            entry[1] += 1
+    return {status: total / count for status, (total, count) in totals.items()}
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    data = build_document(count)
+    for index, item in enumerate(data["plan"]["items"]):
+        item["percentComplete"] = index % 101
+    model = VBriefDocument.from_dict(data)
+
+    rows = []
+    tables = {}
+    for backend in available_table_backends():
+        start = time.perf_counter()
+        tables[backend] = PlanTable(model, backend=backend)
+        rows.append([f"build ({backend})", (time.perf_counter() - start) * 1e3])
+    print(f"{count:,} items")
+    print_table(["table", "ms"], rows)
+
+    rows = []
+    cases = [
+        ("status counts", loop_status_counts, lambda table: table.count_by("status")),
+        ("high priority due in June", loop_window, lambda table: table.items_at(table.where(priority="high", dueDate=("2026-06-01", "2026-06-30T23:59:59Z")))),
+        ("mean percent by status", loop_mean_percent, lambda table: table.aggregate_by("status", "percentComplete")),
+    ]
+    for label, loop, vectorized in cases:
+        loop_us = best_time(lambda: loop(model), repeat=3) * 1e6
+        row = [label, loop_us]
+        for backend, table in tables.items():
+            table_us = best_time(lambda: vectorized(table), repeat=5) * 1e6
+            row += [table_us, loop_us / table_us]
+        rows.append(row)
+    headers = ["analysis", "loop us"]
+    for backend in tables:
+        headers += [f"{backend} us", "speedup"]
+    print_table(headers, rows)
+
+
+if __name__ == "__main__":
+    main()
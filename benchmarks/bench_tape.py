@@ -0,0 +1,49 @@
+"""Random access through the structural index versus a full load_file."""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from _common import print_table
+from bench_stream import build_document
+
+from libvbrief import dump_file, load_file
+from libvbrief.tape import load_lazy
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1e3
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    target = count * 4 // 5
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "big.vbrief.json"
+        dump_file(build_document(count), path)
+
+        rows = [
+            ["load_file + items[i]", timed(lambda: load_file(path)["plan"]["items"][target])],
+            ["load_lazy (build index)", timed(lambda: load_lazy(path).close())],
+        ]
+
+        def reopen() -> None:
+            with load_lazy(path) as doc:
+                doc.items[target]
+                doc.get(f"task-{target}")
+
+        rows.append(["load_lazy (cached) + items[i] + get(id)", timed(reopen)])
+        with load_lazy(path) as doc:
+            rows.append(["items[i] on open document", timed(lambda: doc.items[target])])
+            rows.append(["get(id) on open document", timed(lambda: doc.get(f"task-{target}"))])
+
+    print_table(["operation", "time ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Deeply nested items: explicit-stack walk versus the old recursive walk."""
+
+from __future__ import annotations
+
+import sys
+from typing import Any, Iterator
+
+from _common import best_time, print_table
+
+from libvbrief import VBriefDocument, validate
+from libvbrief.traversal import walk_items
+
+
+def build_chain(depth: int) -> list[dict[str, Any]]:
+    node: dict[str, Any] = {"title": f"level {depth - 1}", "status": "pending"}
+    for level in range(depth - 2, -1, -1):
+        node = {"title": f"level {level}", "status": "pending", "subItems": [node]}
+    return [node]
+
+
+def recursive_walk(items: list[Any], path: str = "plan.items") -> Iterator[tuple[str, Any]]:
+    # The shape of the walks this replaced: one generator frame per level.
+    for index, item in enumerate(items):
+        item_path = f"{path}[{index}]"
+        yield item_path, item
+        nested = item.get("subItems") if isinstance(item, dict) else None
+        if isinstance(nested, list):
+            yield from recursive_walk(nested, f"{item_path}.subItems")
+
+
+def touch_leaf(model: VBriefDocument) -> None:
+    leaf = model.plan.items[0]
+    while leaf.subItems:
+        leaf = leaf.subItems[0]
+    leaf.status = "completed" if leaf.status == "pending" else "pending"
+    model.to_dict()
+
+
+def main() -> None:
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 900
+    deep = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    items = build_chain(depth)
+
+    def walk_recursive() -> None:
+        for _ in recursive_walk(items):
+            pass
+
+    def walk_iterative() -> None:
+        # Paths are rendered only when something reports them.
+        for _ in walk_items(items):
+            pass
+
+    def walk_iterative_no_paths() -> None:
+        for _ in walk_items(items, path=None):
+            pass
+
+    print(f"{depth:,}-level chain (within the default recursion limit)")
+    print_table(
+        ["walk", "ms"],
+        [
+            ["recursive, string paths", best_time(walk_recursive) * 1e3],
+            ["walk_items, lazy paths", best_time(walk_iterative) * 1e3],
+            ["walk_items, no paths", best_time(walk_iterative_no_paths) * 1e3],
+        ],
+    )
+
+    document = {"vBRIEFInfo": {"version": "0.5"}, "plan": {"title": "P", "status": "running", "items": build_chain(deep)}}
+    model = VBriefDocument.from_dict(document)
+    print(f"{deep:,}-level chain (the recursive code raised RecursionError)")
+    print_table(
+        ["workload", "ms"],
+        [
+            ["validate", best_time(lambda: validate(document), repeat=3, number=1) * 1e3],
+            ["from_dict", best_time(lambda: VBriefDocument.from_dict(document), repeat=3, number=1) * 1e3],
+            ["from_dict + to_dict", best_time(lambda: VBriefDocument.from_dict(document).to_dict(), repeat=3, number=1) * 1e3],
+            ["leaf change + to_dict", best_time(lambda: touch_leaf(model), repeat=3, number=1) * 1e3],
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Compare the TRON codec against json_codec on real example plans."""
+
+from __future__ import annotations
+
+from _common import best_time, load_example, print_table
+
+from libvbrief.serialization.json_codec import dumps_json, parse_json
+from libvbrief.serialization.tron_codec import dumps_tron, parse_tron
+
+EXAMPLES = ["construction-project-gantt", "prd"]
+
+
+def main() -> None:
+    rows = []
+    for name in EXAMPLES:
+        document = load_example(name)
+        json_text = dumps_json(document, canonical=False, preserve_format=True)
+        tron_text = dumps_tron(document, canonical=False, preserve_format=True)
+        assert parse_tron(tron_text) == document
+
+        parse_json_us = best_time(lambda: parse_json(json_text)) * 1e6
+        parse_tron_us = best_time(lambda: parse_tron(tron_text)) * 1e6
+        dump_json_us = best_time(lambda: dumps_json(document, canonical=False, preserve_format=True)) * 1e6
+        dump_tron_us = best_time(lambda: dumps_tron(document, canonical=False, preserve_format=True)) * 1e6
+
+        rows.append(
+            [
+                name,
+                len(json_text),
+                len(tron_text),
+                f"{(1 - len(tron_text) / len(json_text)) * 100:.1f}%",
+                parse_json_us,
+                parse_tron_us,
+                dump_json_us,
+                dump_tron_us,
+            ]
+        )
+
+    print_table(
+        [
+            "example",
+            "json chars",
+            "tron chars",
+            "saved",
+            "parse json us",
+            "parse tron us",
+            "dump json us",
+            "dump tron us",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 """libvbrief public API."""
 
-from libvbrief.errors import LibVBriefError, ValidationError
-from libvbrief.io import dump_file, dumps, load_file, loads, validate
+from libvbrief.compare import diff
+from libvbrief.errors import LibVBriefError, PatchError, ValidationError
+from libvbrief.io import dump_file, dumps, dumps_bytes, load_file, loads, loads_bytes, validate
+from libvbrief.merge import MergeConflict, MergeResult, merge
 from libvbrief.issues import Issue, ValidationReport
 from libvbrief.models import Plan, PlanItem, VBriefDocument
 
@@ -11,12 +13,19 @@ __all__ = [
     "__version__",
     "dump_file",
     "dumps",
+    "dumps_bytes",
     "load_file",
     "loads",
+    "loads_bytes",
     "validate",
+    "diff",
+    "merge",
+    "MergeConflict",
+    "MergeResult",
     "Issue",
     "ValidationReport",
     "LibVBriefError",
+    "PatchError",
     "ValidationError",
     "VBriefDocument",
     "Plan",
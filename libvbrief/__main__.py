@@ -0,0 +1,5 @@
+"""Run the ``vbrief`` command line as ``python -m libvbrief``."""
+
+from libvbrief.cli import main
+
+raise SystemExit(main())
@@ -0,0 +1,281 @@
+"""The ``vbrief`` command line: batch validation of plan files.
+
+``vbrief validate`` expands files, directories and glob patterns lazily,
+validates the files in a process pool (each worker compiles the rules and
+schema once and takes files a chunk at a time) and writes each file's
+report as soon as it completes, so memory stays flat however many files are
+checked. Reports go to stdout as JSON lines, SARIF or text; the throughput
+summary goes to stderr.
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Iterator, Sequence, TextIO
+
+from libvbrief import __version__
+from libvbrief.compat import ISSUE_UNREADABLE_DOCUMENT, ISSUE_VALIDATION_FAILED
+from libvbrief.schema import compile_schema, core_schema
+from libvbrief.serialization.json_codec import _loads
+from libvbrief.validation import CONFORMANCE_RULES, CORE_RULES, RuleEngine, SchemaRule
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+# (file, size in bytes, errors, warnings); issues are (code, path, message)
+# tuples, which are cheap to send back from the workers.
+FileResult = tuple[str, int, list[tuple[str, str, str]], list[tuple[str, str, str]]]
+
+# Set in every worker process by _init_worker.
+_engine: RuleEngine | None = None
+_max_errors: int | None = None
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the ``vbrief`` command and return its exit code.
+
+    ``validate`` exits with 0 when every file is valid, 1 when any file has
+    errors and 2 when no file matched.
+    """
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help(sys.stderr)
+        return 2
+    return _validate(args, sys.stdout, sys.stderr)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="vbrief", description="vBRIEF command line tools.")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    commands = parser.add_subparsers(dest="command")
+
+    validate = commands.add_parser(
+        "validate",
+        help="validate plan files in parallel",
+        description="Validate vBRIEF files, directories and glob patterns in parallel.",
+    )
+    validate.add_argument("paths", nargs="+", help="files, directories or glob patterns (quote globs)")
+    validate.add_argument(
+        "--pattern",
+        default="*.vbrief.json",
+        help="file name pattern searched for below directories (default: %(default)s)",
+    )
+    validate.add_argument(
+        "--format",
+        choices=("jsonl", "sarif", "text"),
+        default="jsonl",
+        help="report format written to stdout (default: %(default)s)",
+    )
+    validate.add_argument("--conformance", action="store_true", help="also check edges and spec recommendations")
+    validate.add_argument("--schema", action="store_true", help="also check the core JSON Schema")
+    validate.add_argument("--schema-file", metavar="PATH", help="also check the JSON Schema at PATH, e.g. an extension")
+    validate.add_argument("--max-errors", type=_positive, default=None, help="stop checking a file after N errors")
+    validate.add_argument(
+        "--jobs",
+        "-j",
+        type=_positive,
+        default=os.cpu_count() or 1,
+        help="worker processes; 1 validates in this process (default: %(default)s)",
+    )
+    validate.add_argument(
+        "--chunk-size",
+        type=_positive,
+        default=16,
+        help="files handed to a worker at a time (default: %(default)s)",
+    )
+    return parser
+
+
+def _positive(text: str) -> int:
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return value
+
+
+def _validate(args: argparse.Namespace, out: TextIO, err: TextIO) -> int:
+    schema: Any = args.schema
+    if args.schema_file:
+        # Compiled here first so a bad schema fails once, not in every worker.
+        try:
+            schema = json.loads(Path(args.schema_file).read_text(encoding="utf-8"))
+            compile_schema(schema)
+        except (OSError, ValueError) as exc:
+            print(f"vbrief: cannot use schema {args.schema_file}: {exc}", file=err)
+            return 2
+    settings = (args.conformance, schema, args.max_errors)
+
+    writer = _WRITERS[args.format](out)
+    files = invalid = size = 0
+    started = time.perf_counter()
+    writer.start()
+    for result in _results(_iter_files(args.paths, args.pattern), settings, args.jobs, args.chunk_size):
+        writer.write(result)
+        files += 1
+        size += result[1]
+        invalid += bool(result[2])
+    writer.finish()
+    out.flush()
+    elapsed = max(time.perf_counter() - started, 1e-9)
+
+    if not files:
+        print("vbrief: no files matched", file=err)
+        return 2
+    megabytes = size / 1e6
+    print(
+        f"{files:,} files ({invalid:,} invalid), {megabytes:,.1f} MB in {elapsed:.2f}s: "
+        f"{files / elapsed:,.0f} files/s, {megabytes / elapsed:,.1f} MB/s",
+        file=err,
+    )
+    return 1 if invalid else 0
+
+
+def _iter_files(patterns: Sequence[str], name_pattern: str) -> Iterator[str]:
+    """Yield the files named by each argument, without listing them all first."""
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            for found in path.rglob(name_pattern):
+                if found.is_file():
+                    yield str(found)
+        elif path.is_file():
+            yield pattern
+        else:
+            for found in glob.iglob(pattern, recursive=True):
+                if os.path.isfile(found):
+                    yield found
+
+
+def _results(files: Iterator[str], settings: tuple[Any, ...], jobs: int, chunk_size: int) -> Iterator[FileResult]:
+    if jobs == 1:
+        _init_worker(*settings)
+        yield from map(_check_file, files)
+        return
+    with multiprocessing.Pool(jobs, initializer=_init_worker, initargs=settings) as pool:
+        yield from pool.imap_unordered(_check_file, files, chunksize=chunk_size)
+
+
+def _init_worker(conformance: bool, schema: Any, max_errors: int | None) -> None:
+    global _engine, _max_errors
+    rules = CONFORMANCE_RULES if conformance else CORE_RULES
+    if schema is not False:
+        rules += (SchemaRule(core_schema() if schema is True else compile_schema(schema)),)
+    _engine = RuleEngine(rules)
+    _max_errors = max_errors
+
+
+def _check_file(file: str) -> FileResult:
+    try:
+        data = Path(file).read_bytes()
+    except OSError as exc:
+        return file, 0, [(ISSUE_UNREADABLE_DOCUMENT, "$", exc.strerror or str(exc))], []
+    try:
+        # Not parse_json_bytes: a document that is not an object is reported
+        # by the engine like any other validation error.
+        document = _loads(data)
+    except ValueError as exc:
+        return file, len(data), [(ISSUE_UNREADABLE_DOCUMENT, "$", str(exc))], []
+    try:
+        report = _engine.validate(document, max_errors=_max_errors)
+    except Exception as exc:
+        # A rule that trips over one document must not stop the whole run.
+        return file, len(data), [(ISSUE_VALIDATION_FAILED, "$", f"{type(exc).__name__}: {exc}")], []
+    return (
+        file,
+        len(data),
+        [(issue.code, issue.path, issue.message) for issue in report.errors],
+        [(issue.code, issue.path, issue.message) for issue in report.warnings],
+    )
+
+
+class _JsonLinesWriter:
+    """One JSON object per file and line."""
+
+    def __init__(self, out: TextIO) -> None:
+        self.out = out
+
+    def start(self) -> None:
+        pass
+
+    def write(self, result: FileResult) -> None:
+        file, size, errors, warnings = result
+        record = {
+            "file": file,
+            "valid": not errors,
+            "bytes": size,
+            "errors": [_issue(issue) for issue in errors],
+            "warnings": [_issue(issue) for issue in warnings],
+        }
+        self.out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def finish(self) -> None:
+        pass
+
+
+class _SarifWriter:
+    """A SARIF 2.1.0 log whose ``results`` array is written as files complete."""
+
+    def __init__(self, out: TextIO) -> None:
+        self.out = out
+        self.separator = ""
+
+    def start(self) -> None:
+        driver = {"name": "vbrief", "version": __version__, "informationUri": "https://github.com/visionik/vBRIEF"}
+        header = json.dumps({"$schema": SARIF_SCHEMA, "version": "2.1.0", "runs": [{"tool": {"driver": driver}, "results": []}]})
+        # Everything up to the open results array; finish() closes it.
+        self.out.write(header[: header.rindex("[]") + 1] + "\n")
+
+    def write(self, result: FileResult) -> None:
+        file, _, errors, warnings = result
+        for level, issues in (("error", errors), ("warning", warnings)):
+            for code, path, message in issues:
+                entry = {
+                    "ruleId": code,
+                    "level": level,
+                    "message": {"text": message},
+                    "locations": [
+                        {
+                            "physicalLocation": {"artifactLocation": {"uri": Path(file).as_posix()}},
+                            "logicalLocations": [{"fullyQualifiedName": path}],
+                        }
+                    ],
+                }
+                self.out.write(self.separator + json.dumps(entry, ensure_ascii=False))
+                self.separator = ",\n"
+
+    def finish(self) -> None:
+        self.out.write("\n]}]}\n")
+
+
+class _TextWriter:
+    """One line per issue, in the style of a linter; valid files print nothing."""
+
+    def __init__(self, out: TextIO) -> None:
+        self.out = out
+
+    def start(self) -> None:
+        pass
+
+    def write(self, result: FileResult) -> None:
+        file, _, errors, warnings = result
+        for level, issues in (("error", errors), ("warning", warnings)):
+            for code, path, message in issues:
+                self.out.write(f"{file}: {path}: {level}: {message} [{code}]\n")
+
+    def finish(self) -> None:
+        pass
+
+
+_WRITERS = {"jsonl": _JsonLinesWriter, "sarif": _SarifWriter, "text": _TextWriter}
+
+
+def _issue(issue: tuple[str, str, str]) -> dict[str, str]:
+    code, path, message = issue
+    return {"code": code, "path": path, "message": message}
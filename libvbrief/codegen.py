@@ -0,0 +1,124 @@
+"""Specialized model loaders and serializers generated from field lists.
+
+The field lists in :mod:`libvbrief.compat.policy` mirror the properties of
+the core schema shipped as ``libvbrief/schemas/vbrief-core.schema.json``
+(``tests/test_schema_fields.py`` keeps them in sync). The generators read
+those lists rather than the schema: patching, queries and the binary codec
+share them, and importing the models should not parse JSON. Compiling
+straight-line code from them at import time, the way :mod:`dataclasses`
+builds ``__init__``, replaces the per-item loops, ``.get()`` calls and
+temporary dicts of a generic implementation with one attribute load or
+store per field.
+"""
+
+from __future__ import annotations
+
+import keyword
+from typing import Any, Callable, Iterable, Mapping
+
+
+def compile_loader(
+    name: str,
+    cls: type,
+    fields: Iterable[str],
+    *,
+    defaults: Mapping[str, Any],
+    children: str,
+    intern_layout: Callable[[Iterable[str]], tuple[str, ...]],
+    final_cls: type,
+    tracking: Iterable[str] = (),
+) -> Callable[[Mapping[str, Any]], Any]:
+    """Return ``loader(data)`` building an instance of ``final_cls`` from a mapping.
+
+    Each field is read with ``data.get`` (``defaults`` gives fallbacks other
+    than None), keys outside ``fields`` go to ``_extras`` and the key order
+    to ``_field_order``. The ``children`` list and the ``tracking`` slots
+    are left None for the caller.
+    The instance is filled in as ``cls``, which must accept plain attribute
+    stores, and then switched to ``final_cls``.
+    """
+    fields = _checked(fields)
+    lines = [
+        f"def {name}(data):",
+        "    node = _new(_cls)",
+        "    get = data.get",
+    ]
+    lines += [f"    node.{slot} = None" for slot in _checked(tracking)]
+    for field in fields:
+        if field == children:
+            lines.append(f"    node._{field} = None")
+        elif field in defaults:
+            lines.append(f"    node.{field} = get({field!r}, {defaults[field]!r})")
+        else:
+            lines.append(f"    node.{field} = get({field!r})")
+    lines += [
+        "    keys = data.keys()",
+        "    if keys <= _known:",
+        "        node._extras = None",
+        "    else:",
+        "        node._extras = {key: value for key, value in data.items() if key not in _known}",
+        "    node._field_order = _intern_layout(keys)",
+        "    node.__class__ = _final_cls",
+        "    return node",
+    ]
+    namespace = {
+        "_new": object.__new__,
+        "_cls": cls,
+        "_final_cls": final_cls,
+        "_known": frozenset(fields),
+        "_intern_layout": intern_layout,
+    }
+    return _compile(name, lines, namespace)
+
+
+def compile_known_values(
+    name: str,
+    fields: Iterable[str],
+    *,
+    required: Iterable[str],
+    children: str,
+) -> Callable[[Any, list[Any]], dict[str, Any]]:
+    """Return ``known_values(node, child_dicts)`` for a model's known fields.
+
+    ``required`` fields are always emitted, first and in the given order;
+    the others follow in ``fields`` order and are skipped when None. The
+    ``children`` member is the already serialized ``child_dicts`` and,
+    unless required, is skipped when empty.
+    """
+    fields = _checked(fields)
+    required = _checked(required)
+    lines = [f"def {name}(node, child_dicts):"]
+    entries = [f"{field!r}: child_dicts" if field == children else f"{field!r}: node.{field}" for field in required]
+    lines.append(f"    values = {{{', '.join(entries)}}}")
+    for field in fields:
+        if field in required:
+            continue
+        if field == children:
+            lines += [
+                "    if child_dicts:",
+                f"        values[{field!r}] = child_dicts",
+            ]
+        else:
+            lines += [
+                f"    value = node.{field}",
+                "    if value is not None:",
+                f"        values[{field!r}] = value",
+            ]
+    lines.append("    return values")
+    return _compile(name, lines, {})
+
+
+def _checked(fields: Iterable[str]) -> tuple[str, ...]:
+    fields = tuple(fields)
+    for field in fields:
+        if not field.isidentifier() or keyword.iskeyword(field):
+            raise ValueError(f"Field name {field!r} is not a valid identifier")
+    return fields
+
+
+def _compile(name: str, lines: list[str], namespace: dict[str, Any]) -> Callable[..., Any]:
+    source = "\n".join(lines) + "\n"
+    exec(compile(source, f"<generated {name}>", "exec"), namespace)
+    function = namespace[name]
+    function.__source__ = source
+    return function
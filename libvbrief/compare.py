@@ -0,0 +1,593 @@
+"""Structural diff between two vBRIEF documents.
+
+:func:`diff` matches the items of two documents by ``uid``, then ``id``,
+then hierarchical path (parent ids joined with ``.`` as the DAG tools build
+it, with ``#<position>`` standing in for a missing id), using hash maps
+throughout: comparing two plans takes time linear in their size, plus an
+O(k log k) longest-increasing-subsequence pass over each reordered list of
+k siblings. An item that lands under another parent, or out of order among
+its matched siblings, is a move rather than a removal and an addition.
+Edges are matched by ``(from, to, type)``; their order is not reported.
+
+The result lists :class:`Change` records and converts to a JSON Patch that
+turns the old document into the new one (see :mod:`libvbrief.patch`) or to
+``changeLog`` entries.
+"""
+
+from __future__ import annotations
+
+import copy
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from operator import attrgetter
+from typing import Any, Callable, Iterable, Iterator, Mapping
+
+from libvbrief.models import _is_mapping, _same_json
+from libvbrief.traversal import ItemPath
+from libvbrief.validation import _to_dict
+
+_ABSENT = object()
+_KEYS = (attrgetter("uid"), attrgetter("id"), attrgetter("path"))
+
+
+@dataclass(frozen=True)
+class Change:
+    """One difference between two documents.
+
+    ``kind`` is ``added``, ``removed``, ``moved`` or ``changed``. ``path``
+    locates the item or edge (``plan.items[2].subItems[0]``,
+    ``plan.edges[3]``), the plan (``plan``) or the document (``$``) in the
+    new document, or in the old one for removals; ``old_path`` is where a
+    moved item was. For ``changed`` records ``field`` names the member.
+    ``old`` and ``new`` hold the values before and after (None for none).
+    """
+
+    kind: str
+    path: str
+    field: str | None = None
+    old: Any = None
+    new: Any = None
+    old_path: str | None = None
+
+
+class DocumentDiff:
+    """What :func:`diff` found, as change records, a JSON Patch or changeLog entries."""
+
+    def __init__(self, differ: _Differ) -> None:
+        self._differ = differ
+        self.changes: list[Change] = differ.changes()
+        self._patch: list[dict[str, Any]] | None = None
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+    def __bool__(self) -> bool:
+        return bool(self.changes)
+
+    def __iter__(self) -> Iterator[Change]:
+        return iter(self.changes)
+
+    def to_patch(self) -> list[dict[str, Any]]:
+        """Return RFC 6902 operations turning the old document into the new one.
+
+        Matched items keep their identity: moves are ``move`` operations
+        and changed items only get operations on the changed members.
+        """
+        if self._patch is None:
+            self._patch = self._differ.patch()
+        return copy.deepcopy(self._patch)
+
+    def to_change_log(self, agent: Mapping[str, Any], *, sequence: int, timestamp: str | None = None) -> list[dict[str, Any]]:
+        """Return a vBRIEF Change record per change, all for revision ``sequence``.
+
+        Additions become ``create``, removals ``delete``, and moves and
+        member changes ``update`` operations; ``timestamp`` defaults to now.
+        """
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        records = []
+        for change in self.changes:
+            record: dict[str, Any] = {"sequence": sequence, "timestamp": timestamp, "agent": dict(agent)}
+            if change.kind == "added":
+                record.update(operation="create", path=change.path, newValue=copy.deepcopy(change.new))
+            elif change.kind == "removed":
+                record.update(operation="delete", path=change.path, oldValue=copy.deepcopy(change.old))
+            elif change.kind == "moved":
+                record.update(operation="update", path=change.path, description=f"Moved from {change.old_path}")
+            else:
+                record.update(operation="update", path=f"{change.path}.{change.field}" if change.field else change.path)
+                if change.old is not None:
+                    record["oldValue"] = copy.deepcopy(change.old)
+                if change.new is not None:
+                    record["newValue"] = copy.deepcopy(change.new)
+            records.append(record)
+        return records
+
+
+def diff(old: Any, new: Any) -> DocumentDiff:
+    """Compare two documents (dicts or :class:`VBriefDocument` objects) structurally."""
+    return DocumentDiff(_Differ(_tree(old), _tree(new)))
+
+
+def _tree(document: Any) -> _Tree:
+    data = _to_dict(document)
+    if not _is_mapping(data):
+        raise ValueError("Documents to compare must be objects/dictionaries")
+    return _Tree(data)
+
+
+class _Node:
+    """An item or edge on one side, linked to its counterpart on the other."""
+
+    __slots__ = ("data", "parent", "position", "children", "uid", "id", "path", "match", "stable", "fresh", "own", "container", "slot", "target")
+
+    def __init__(self, data: Any, parent: _Node | None, position: int, uid: str | None, id: Any, path: Any) -> None:
+        self.data = data
+        self.parent = parent
+        self.position = position
+        self.children: list[_Node] | tuple[()] = ()
+        # Matching keys, used in this order; a root's path is its list key
+        # and a non-item's path also holds its value.
+        self.uid = uid
+        self.id = id
+        self.path = path
+        self.match: _Node | None = None
+        # Kept in place: same parent, and in order among its matched siblings.
+        self.stable = False
+        # New side: unmatched along with its whole subtree, so added in one go.
+        self.fresh = False
+        # While building a patch: the list this node owns, the list it is
+        # in now (with its slot there) and its slot in the list it moves to.
+        self.own: _Container | None = None
+        self.container: _Container | None = None
+        self.slot = 0
+        self.target = 0
+
+
+class _Tree:
+    """One side's plan, flattened to nodes in document order."""
+
+    def __init__(self, data: Mapping[str, Any]) -> None:
+        self.data = data
+        plan = data.get("plan")
+        self.plan: Mapping[str, Any] = plan if _is_mapping(plan) else {}
+        self.root = _Node(self.plan, None, 0, None, None, "items")
+        self.items = self._flatten()
+        edges = self.plan.get("edges", _ABSENT)
+        # Edges are compared one by one only when both sides list them.
+        self.edges_listed = edges is _ABSENT or isinstance(edges, list)
+        self.edges_root = _Node(self.plan, None, 0, None, None, "edges")
+        self.edges = self.edges_root.children = [
+            _Node(edge, self.edges_root, position, None, _edge_key(edge), None) for position, edge in enumerate(edges if isinstance(edges, list) else ())
+        ]
+
+    def _flatten(self) -> list[_Node]:
+        # Allocation-light: a large plan makes one node per item and little else.
+        nodes: list[_Node] = []
+        items = self.plan.get("items")
+        self.root.children = []
+        stack = [(self.root, enumerate(items if isinstance(items, list) else ()), "")]
+        while stack:
+            parent, entries, prefix = stack[-1]
+            children = parent.children
+            for position, entry in entries:
+                if not _is_mapping(entry):
+                    # Not an item: an opaque leaf, kept only where an equal
+                    # value sits at the same path and otherwise replaced whole.
+                    path = f"{prefix}.#{position}" if prefix else f"#{position}"
+                    node = _Node(entry, parent, position, None, None, (path, repr(entry)))
+                    children.append(node)
+                    nodes.append(node)
+                    continue
+                uid, item_id, sub_items = _key(entry.get("uid")), _key(entry.get("id")), entry.get("subItems")
+                name = item_id or f"#{position}"
+                path = f"{prefix}.{name}" if prefix else name
+                node = _Node(entry, parent, position, uid, item_id, path)
+                children.append(node)
+                nodes.append(node)
+                if isinstance(sub_items, list) and sub_items:
+                    node.children = []
+                    stack.append((node, enumerate(sub_items), path))
+                    break
+            else:
+                stack.pop()
+        return nodes
+
+
+class _Differ:
+    """Matches the two trees; derives change records and a patch from the matching."""
+
+    def __init__(self, old: _Tree, new: _Tree) -> None:
+        self.old = old
+        self.new = new
+        self.edges = old.edges_listed and new.edges_listed
+        for old_root, new_root in ((old.root, new.root), (old.edges_root, new.edges_root)):
+            old_root.match, new_root.match = new_root, old_root
+            old_root.stable = new_root.stable = True
+        for key in _KEYS:
+            _match(old.items, new.items, key)
+        if self.edges:
+            _match(old.edges, new.edges, _KEYS[1])
+        for parent in (new.root, new.edges_root, *new.items):
+            _mark_stable(parent)
+        for node in reversed(new.items):
+            node.fresh = node.match is None and all(child.fresh for child in node.children)
+        for node in new.edges:
+            node.fresh = node.match is None
+
+    def _plan_skip(self) -> tuple[str, ...]:
+        return ("items", "edges") if self.edges else ("items",)
+
+    def changes(self) -> list[Change]:
+        old, new = self.old, self.new
+        changes: list[Change] = []
+        _member_changes(changes, "$", old.data, new.data, ("plan",))
+        _member_changes(changes, "plan", old.plan, new.plan, self._plan_skip())
+        changes += _removals(old.items)
+        for node in new.items:
+            if node.match is None:
+                if node.parent.match is not None:
+                    changes.append(Change("added", _where(node), new=node.data))
+                continue
+            if not node.stable:
+                changes.append(Change("moved", _where(node), old_path=_where(node.match)))
+            _node_changes(changes, node, "subItems")
+        if self.edges:
+            changes += _removals(old.edges)
+            for node in new.edges:
+                if node.match is None:
+                    changes.append(Change("added", _where(node), new=node.data))
+                else:
+                    _node_changes(changes, node, None)
+        return changes
+
+    def patch(self) -> list[dict[str, Any]]:
+        """Structure first (additions and moves top-down, then removals), then members."""
+        old, new = self.old, self.new
+        operations: list[dict[str, Any]] = []
+        containers = [_Container.pair(new.root, "items")]
+        containers += [_Container.pair(node, "subItems") for node in new.items if _owns_list(node)]
+        if self.edges:
+            containers.append(_Container.pair(new.edges_root, "edges"))
+        for node in old.items:
+            if node.match is None and node.children:
+                # Removed, but children may still move out of it first.
+                _Container(node, "subItems", node.children, (), _ABSENT, None)
+        for container in containers:
+            container.place(operations)
+        for node in reversed(old.items + old.edges):
+            if node.match is None and node.parent.match is not None:
+                operations.append({"op": "remove", "path": _pointer(node)})
+                node.container.remove(node.slot)
+        _member_operations(operations, "", old.data, new.data, ("plan",))
+        _member_operations(operations, "/plan", old.plan, new.plan, self._plan_skip())
+        for node in new.items + new.edges:
+            counterpart = node.match
+            if counterpart is None:
+                continue
+            if _is_mapping(counterpart.data) and _is_mapping(node.data):
+                skip = ("subItems",) if node.parent is not new.edges_root else ()
+                _member_operations(operations, node, counterpart.data, node.data, skip)
+            elif not _same_json(counterpart.data, node.data):
+                operations.append({"op": "replace", "path": _new_pointer(node), "value": node.data})
+        for container in containers:
+            container.settle(operations)
+        return operations
+
+
+class _Container:
+    """A list (``items``, ``subItems`` or ``edges``) while the patch is built.
+
+    Slots lay out every element the list will hold along the way: stable
+    elements in order, each followed by the elements inserted after it and
+    then by those that will leave. A Fenwick tree over the filled slots
+    gives live positions. Lists without changes skip all that and keep
+    their positions.
+    """
+
+    __slots__ = ("owner", "key", "old", "new", "existing", "listed", "new_owner", "_tree")
+
+    def __init__(self, owner: _Node, key: str, old: list[_Node], new: Iterable[_Node], existing: Any, new_owner: _Node | None) -> None:
+        self.owner = owner
+        self.key = key
+        self.old = old
+        self.new = list(new)
+        self.existing = existing
+        self.listed = isinstance(existing, list)
+        self.new_owner = new_owner
+        self._tree: list[int] | None = None
+        owner.own = self
+        if all(node.stable for node in old) and all(node.stable for node in self.new):
+            for node in old:
+                node.container, node.slot = self, node.position
+        else:
+            self._layout()
+
+    @classmethod
+    def pair(cls, node: _Node, key: str) -> _Container:
+        """The list ``key`` of new-side ``node`` and of its counterpart, if any."""
+        counterpart = node.match
+        if counterpart is None:
+            return cls(node, key, [], node.children, _ABSENT, node)
+        existing = counterpart.data.get(key, _ABSENT) if _is_mapping(counterpart.data) else _ABSENT
+        return cls(counterpart, key, counterpart.children, node.children, existing, node)
+
+    def _layout(self) -> None:
+        inserted: dict[int, list[_Node]] = {}
+        anchor = 0
+        for node in self.new:
+            if node.stable:
+                anchor = id(node.match)
+            else:
+                inserted.setdefault(anchor, []).append(node.match or node)
+        filled = [0] * len(inserted.get(0, ()))
+        for slot, node in enumerate(inserted.get(0, ())):
+            node.target = slot
+        for node in self.old:
+            node.container, node.slot = self, len(filled)
+            filled.append(1)
+            if node.stable:
+                for other in inserted.get(id(node), ()):
+                    other.target = len(filled)
+                    filled.append(0)
+        tree = [0, *filled]
+        for index in range(1, len(tree)):
+            parent = index + (index & -index)
+            if parent < len(tree):
+                tree[parent] += tree[index]
+        self._tree = tree
+
+    def position(self, slot: int) -> int:
+        tree = self._tree
+        if tree is None:
+            return slot
+        total = 0
+        while slot > 0:
+            total += tree[slot]
+            slot -= slot & -slot
+        return total
+
+    def size(self) -> int:
+        return self.position(len(self._tree) - 1)
+
+    def remove(self, slot: int) -> None:
+        self._update(slot, -1)
+
+    def _fill(self, node: _Node) -> None:
+        node.container, node.slot = self, node.target
+        self._update(node.target, 1)
+
+    def _update(self, slot: int, delta: int) -> None:
+        tree = self._tree
+        index = slot + 1
+        while index < len(tree):
+            tree[index] += delta
+            index += index & -index
+
+    def pointer(self) -> str:
+        return f"{_pointer(self.owner)}/{self.key}"
+
+    def place(self, operations: list[dict[str, Any]]) -> None:
+        """Add or move in, in order, the elements new to this list."""
+        if self._tree is None or not self.new:
+            return
+        if not self.old and all(node.fresh for node in self.new):
+            operations.append({"op": "add", "path": self.pointer(), "value": [node.data for node in self.new]})
+            for node in self.new:
+                self._fill(node)
+            self.listed = True
+            return
+        if not self.listed:
+            operations.append({"op": "add", "path": self.pointer(), "value": []})
+            self.listed = True
+        for node in self.new:
+            if node.stable:
+                continue
+            if node.match is None:
+                self._fill(node)
+                value = node.data
+                if not node.fresh:
+                    # Its children follow one by one when its own list is placed.
+                    value = {**value, "subItems": []}
+                    node.own.listed = True
+                operations.append({"op": "add", "path": _pointer(node), "value": value})
+            else:
+                element = node.match
+                source, origin = _pointer(element), element.container
+                origin.remove(element.slot)
+                self._fill(element)
+                target = _pointer(element)
+                if target.startswith(source + "/"):
+                    # The next sibling becomes an ancestor of the target once
+                    # the element is out, but RFC 6902 still reads that as a
+                    # move into itself: go via the end of the list.
+                    operations.append({"op": "move", "from": source, "path": f"{origin.pointer()}/-"})
+                    source = f"{origin.pointer()}/{origin.size()}"
+                operations.append({"op": "move", "from": source, "path": target})
+
+    def settle(self, operations: list[dict[str, Any]]) -> None:
+        """Make the list member itself match the new side: a list, absent or another value."""
+        data = self.new_owner.data
+        wanted = data.get(self.key, _ABSENT) if _is_mapping(data) else _ABSENT
+        path = f"{_new_pointer(self.new_owner)}/{self.key}"
+        if isinstance(wanted, list):
+            if not self.listed:
+                operations.append({"op": "add", "path": path, "value": []})
+        elif wanted is _ABSENT:
+            if self.listed or self.existing is not _ABSENT:
+                operations.append({"op": "remove", "path": path})
+        elif self.existing is _ABSENT or self.listed:
+            operations.append({"op": "add", "path": path, "value": wanted})
+        elif wanted != self.existing:
+            operations.append({"op": "replace", "path": path, "value": wanted})
+
+
+def _owns_list(node: _Node) -> bool:
+    """Whether a new-side item's subItems are tracked while the patch is built.
+
+    Items added whole need nothing, and neither do lists that stay lists
+    (or stay absent) with every element kept in place.
+    """
+    if node.fresh:
+        return False
+    counterpart = node.match
+    if counterpart is None or not all(child.stable for child in node.children) or not all(child.stable for child in counterpart.children):
+        return True
+    before = counterpart.data.get("subItems", _ABSENT) if _is_mapping(counterpart.data) else _ABSENT
+    after = node.data.get("subItems", _ABSENT) if _is_mapping(node.data) else _ABSENT
+    if isinstance(before, list) and isinstance(after, list):
+        return False
+    return before is not _ABSENT or after is not _ABSENT
+
+
+def _match(old: list[_Node], new: list[_Node], get: Callable[[_Node], Any]) -> None:
+    """Pair still unmatched nodes whose key is unique on both sides."""
+    counts = Counter(get(node) for node in old if node.match is None)
+    candidates: dict[Any, _Node | None] = {}
+    for node in new:
+        key = get(node)
+        if key is not None and node.match is None:
+            candidates[key] = None if key in candidates else node
+    for node in old:
+        key = get(node)
+        if key is None or node.match is not None or counts[key] != 1:
+            continue
+        other = candidates.get(key)
+        if other is not None:
+            node.match, other.match = other, node
+
+
+def _mark_stable(parent: _Node) -> None:
+    """Mark the children of ``parent`` that stay where they are."""
+    counterpart = parent.match
+    if counterpart is None:
+        return
+    staying = [child for child in parent.children if child.match is not None and child.match.parent is counterpart]
+    positions = [child.match.position for child in staying]
+    if all(a < b for a, b in zip(positions, positions[1:])):
+        for child in staying:
+            child.stable = child.match.stable = True
+        return
+    for index in _increasing(positions):
+        staying[index].stable = staying[index].match.stable = True
+
+
+def _increasing(values: list[int]) -> list[int]:
+    """Indexes of a longest strictly increasing subsequence of ``values``."""
+    tails: list[int] = []
+    tail_indexes: list[int] = []
+    previous = [-1] * len(values)
+    for index, value in enumerate(values):
+        at = bisect_left(tails, value)
+        if at == len(tails):
+            tails.append(value)
+            tail_indexes.append(index)
+        else:
+            tails[at] = value
+            tail_indexes[at] = index
+        previous[index] = tail_indexes[at - 1] if at else -1
+    result = []
+    index = tail_indexes[-1] if tail_indexes else -1
+    while index >= 0:
+        result.append(index)
+        index = previous[index]
+    result.reverse()
+    return result
+
+
+def _where(node: _Node) -> str:
+    positions = []
+    while node.parent is not None:
+        positions.append(node.position)
+        node = node.parent
+    if node.path == "edges":
+        return f"plan.edges[{positions[0]}]"
+    where: Any = "plan.items"
+    for position in reversed(positions):
+        where = ItemPath(where, position)
+    return str(where)
+
+
+def _removals(nodes: list[_Node]) -> list[Change]:
+    # Only the top of a removed subtree is reported.
+    return [Change("removed", _where(node), old=node.data) for node in nodes if node.match is None and node.parent.match is not None]
+
+
+def _node_changes(changes: list[Change], node: _Node, children: str | None) -> None:
+    old, new = node.match.data, node.data
+    if _is_mapping(old) and _is_mapping(new):
+        _member_changes(changes, node, old, new, (children,))
+    elif not _same_json(old, new):
+        changes.append(Change("changed", _where(node), old=old, new=new))
+
+
+def _member_changes(changes: list[Change], where: _Node | str, old: Mapping[str, Any], new: Mapping[str, Any], skip: tuple[Any, ...]) -> None:
+    members = _changed_members(old, new, skip)
+    if members:
+        path = where if isinstance(where, str) else _where(where)
+        changes += [Change("changed", path, key, None if before is _ABSENT else before, None if after is _ABSENT else after) for key, before, after in members]
+
+
+def _member_operations(operations: list[dict[str, Any]], where: _Node | str, old: Mapping[str, Any], new: Mapping[str, Any], skip: tuple[Any, ...]) -> None:
+    members = _changed_members(old, new, skip)
+    if not members:
+        return
+    pointer = where if isinstance(where, str) else _new_pointer(where)
+    for key, before, after in members:
+        path = f"{pointer}/{_escape(key)}"
+        if after is _ABSENT:
+            operations.append({"op": "remove", "path": path})
+        else:
+            operations.append({"op": "add" if before is _ABSENT else "replace", "path": path, "value": after})
+
+
+def _changed_members(old: Mapping[str, Any], new: Mapping[str, Any], skip: tuple[Any, ...]) -> list[tuple[str, Any, Any]]:
+    """``(key, old value, new value)`` per differing member, with _ABSENT for a missing one."""
+    members = [(key, value, new.get(key, _ABSENT)) for key, value in old.items() if key not in skip and not _same_json(new.get(key, _ABSENT), value)]
+    members += [(key, _ABSENT, value) for key, value in new.items() if key not in old and key not in skip]
+    return members
+
+
+def _pointer(node: _Node) -> str:
+    """Where ``node`` is now, while a patch is being built."""
+    tokens = []
+    while node.parent is not None:
+        container = node.container
+        if container is None:
+            # In a list nobody tracks, which keeps its old positions.
+            tokens.append(f"/{_list_key(node.parent)}/{node.position}")
+            node = node.parent
+        else:
+            tokens.append(f"/{container.key}/{container.position(node.slot)}")
+            node = container.owner
+    return "/plan" + "".join(reversed(tokens))
+
+
+def _new_pointer(node: _Node) -> str:
+    """Where ``node`` is in the new document."""
+    tokens = []
+    while node.parent is not None:
+        tokens.append(f"/{_list_key(node.parent)}/{node.position}")
+        node = node.parent
+    return "/plan" + "".join(reversed(tokens))
+
+
+def _list_key(parent: _Node) -> str:
+    return "subItems" if parent.parent is not None else parent.path
+
+
+def _escape(key: str) -> str:
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+def _key(value: Any) -> str | None:
+    return value if isinstance(value, str) and value else None
+
+
+def _edge_key(edge: Any) -> tuple[Any, ...] | None:
+    if not _is_mapping(edge):
+        return None
+    key = (edge.get("from"), edge.get("to"), edge.get("type"))
+    return key if all(isinstance(part, str) for part in key) else None
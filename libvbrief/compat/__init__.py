@@ -1,8 +1,12 @@
 """Compatibility helpers and policy constants."""
 
 from libvbrief.compat.policy import (
+    CORE_EDGE_TYPES,
+    DOCUMENT_FIELD_ORDER,
     HIERARCHICAL_ID_PATTERN,
+    ISSUE_EDGE_CYCLE,
     ISSUE_INVALID_DOCUMENT_TYPE,
+    ISSUE_INVALID_EDGE,
     ISSUE_INVALID_ID_FORMAT,
     ISSUE_INVALID_ITEM_STATUS,
     ISSUE_INVALID_ITEM_TYPE,
@@ -15,12 +19,28 @@ from libvbrief.compat.policy import (
     ISSUE_MISSING_ITEM_FIELD,
     ISSUE_MISSING_PLAN_FIELD,
     ISSUE_MISSING_ROOT_FIELD,
+    ISSUE_NARRATIVE_KEY_CASE,
+    ISSUE_REMOVED_CONTAINER,
+    ISSUE_SCHEMA_VIOLATION,
+    ISSUE_UNKNOWN_EDGE_REFERENCE,
+    ISSUE_UNREADABLE_DOCUMENT,
+    ISSUE_VALIDATION_FAILED,
+    PLAN_FIELD_ORDER,
+    PLAN_ITEM_FIELD_ORDER,
+    PLAN_ITEM_REQUIRED_FIELDS,
     PLAN_REF_PATTERN,
+    PLAN_REQUIRED_FIELDS,
     VALID_STATUSES,
 )
 
 __all__ = [
     "VALID_STATUSES",
+    "CORE_EDGE_TYPES",
+    "DOCUMENT_FIELD_ORDER",
+    "PLAN_FIELD_ORDER",
+    "PLAN_ITEM_FIELD_ORDER",
+    "PLAN_REQUIRED_FIELDS",
+    "PLAN_ITEM_REQUIRED_FIELDS",
     "HIERARCHICAL_ID_PATTERN",
     "PLAN_REF_PATTERN",
     "ISSUE_INVALID_DOCUMENT_TYPE",
@@ -36,4 +56,12 @@ __all__ = [
     "ISSUE_INVALID_ID_FORMAT",
     "ISSUE_INVALID_PLANREF",
     "ISSUE_INVALID_SUBITEMS_TYPE",
+    "ISSUE_REMOVED_CONTAINER",
+    "ISSUE_NARRATIVE_KEY_CASE",
+    "ISSUE_INVALID_EDGE",
+    "ISSUE_UNKNOWN_EDGE_REFERENCE",
+    "ISSUE_EDGE_CYCLE",
+    "ISSUE_SCHEMA_VIOLATION",
+    "ISSUE_UNREADABLE_DOCUMENT",
+    "ISSUE_VALIDATION_FAILED",
 ]
@@ -16,6 +16,70 @@ VALID_STATUSES: Final[set[str]] = {
     "cancelled",
 }
 
+CORE_EDGE_TYPES: Final[tuple[str, ...]] = ("blocks", "informs", "invalidates", "suggests")
+
+# Known members in the spec's canonical order; anything else is an extra.
+PLAN_ITEM_FIELD_ORDER: Final[list[str]] = [
+    "id",
+    "uid",
+    "title",
+    "status",
+    "narrative",
+    "subItems",
+    "planRef",
+    "tags",
+    "metadata",
+    "created",
+    "updated",
+    "completed",
+    "priority",
+    "dueDate",
+    "startDate",
+    "endDate",
+    "percentComplete",
+    "participants",
+    "location",
+    "uris",
+    "recurrence",
+    "reminders",
+    "classification",
+    "relatedComments",
+    "timezone",
+    "sequence",
+    "lastModifiedBy",
+    "lockedBy",
+]
+
+PLAN_FIELD_ORDER: Final[list[str]] = [
+    "id",
+    "uid",
+    "title",
+    "status",
+    "items",
+    "narratives",
+    "edges",
+    "tags",
+    "metadata",
+    "created",
+    "updated",
+    "author",
+    "reviewers",
+    "uris",
+    "references",
+    "timezone",
+    "agent",
+    "lastModifiedBy",
+    "changeLog",
+    "sequence",
+    "fork",
+]
+
+DOCUMENT_FIELD_ORDER: Final[list[str]] = ["vBRIEFInfo", "plan"]
+
+# Members the schema requires; the models always emit them.
+PLAN_ITEM_REQUIRED_FIELDS: Final[tuple[str, ...]] = ("title", "status")
+PLAN_REQUIRED_FIELDS: Final[tuple[str, ...]] = ("title", "status", "items")
+
 HIERARCHICAL_ID_PATTERN: Final[re.Pattern[str]] = re.compile(
     r"^[a-zA-Z0-9_-]+(\.[a-zA-Z0-9_-]+)*$"
 )
@@ -37,3 +101,11 @@ ISSUE_INVALID_ITEM_STATUS: Final[str] = "invalid_item_status"
 ISSUE_INVALID_ID_FORMAT: Final[str] = "invalid_id_format"
 ISSUE_INVALID_PLANREF: Final[str] = "invalid_planref"
 ISSUE_INVALID_SUBITEMS_TYPE: Final[str] = "invalid_subitems_type"
+ISSUE_REMOVED_CONTAINER: Final[str] = "removed_container"
+ISSUE_NARRATIVE_KEY_CASE: Final[str] = "narrative_key_case"
+ISSUE_INVALID_EDGE: Final[str] = "invalid_edge"
+ISSUE_UNKNOWN_EDGE_REFERENCE: Final[str] = "unknown_edge_reference"
+ISSUE_EDGE_CYCLE: Final[str] = "edge_cycle"
+ISSUE_SCHEMA_VIOLATION: Final[str] = "schema_violation"
+ISSUE_UNREADABLE_DOCUMENT: Final[str] = "unreadable_document"
+ISSUE_VALIDATION_FAILED: Final[str] = "validation_failed"
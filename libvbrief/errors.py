@@ -15,6 +15,13 @@ class ValidationError(LibVBriefError):
     def __init__(self, report: ValidationReport) -> None:
         self.report = report
         summary = "; ".join(f"{i.path}: {i.message}" for i in report.errors[:3])
-        if len(report.errors) > 3:
+        if report.truncated:
+            count = len(report.errors)
+            summary = f"{summary}; ... (stopped after {count} error{'s' if count != 1 else ''})"
+        elif len(report.errors) > 3:
             summary = f"{summary}; ... ({len(report.errors)} total errors)"
         super().__init__(summary or "validation failed")
+
+
+class PatchError(LibVBriefError):
+    """Raised when a JSON Patch cannot be applied; the document is left unchanged."""
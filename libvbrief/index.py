@@ -0,0 +1,342 @@
+"""Constant-time item lookup for a plan: by id, uid and hierarchical path.
+
+:class:`ItemIndex` is built in one pass over a plan and then kept up to
+date by the models themselves: item list mutations and attribute
+assignments report to the index of the plan they belong to, which re-keys
+only what changed. Obtain it through
+:attr:`libvbrief.models.VBriefDocument.index`.
+"""
+
+from __future__ import annotations
+
+import weakref
+from typing import Any, Iterable, Protocol
+
+from libvbrief.models import LazyItemList, Plan, PlanItem, _ItemList, _SlotsModel
+from libvbrief.traversal import walk_items
+
+_TRACKED_LISTS = (_ItemList, LazyItemList)
+
+
+class IndexObserver(Protocol):
+    """Receives the item changes an :class:`ItemIndex` sees (see ``subscribe``)."""
+
+    def item_added(self, item: PlanItem) -> None: ...
+
+    def item_removed(self, item: PlanItem) -> None: ...
+
+    def item_changed(self, item: PlanItem, name: str) -> None: ...
+
+    def reset(self) -> None: ...
+
+
+class IndexEntry:
+    """Where an indexed item sits in its plan.
+
+    ``parent`` is the owning :class:`PlanItem` or the :class:`Plan`,
+    ``position`` the item's offset in the parent's list, and ``path`` the
+    hierarchical id (parent ids joined with ``.``, as the DAG tools build
+    it), or None when the item or one of its ancestors has no id.
+    """
+
+    __slots__ = ("item", "parent", "position", "path", "_id", "_uid")
+
+    def __init__(self, item: PlanItem, parent: _SlotsModel, position: int, path: str | None) -> None:
+        self.item = item
+        self.parent = parent
+        self.position = position
+        self.path = path
+        self._id = _key(item.id)
+        self._uid = _key(item.uid)
+
+    def __repr__(self) -> str:
+        return f"IndexEntry(id={self._id!r}, path={self.path!r}, position={self.position})"
+
+
+class ItemIndex:
+    """Lookup tables for the items of one plan, maintained incrementally.
+
+    Building the index materializes lazily loaded items. Mutations of
+    item lists the models do not track (a plain list passed to a
+    constructor or assigned to ``subItems``/``items``) cannot be followed,
+    so while the plan contains one, every lookup rebuilds the index first.
+    When several items share an id, uid or path, lookups return the first
+    one indexed and the next takes its place when it is removed.
+
+    Secondary indexes (see :mod:`libvbrief.query`) ``subscribe`` to hear
+    about items entering and leaving the plan and about field assignments.
+    """
+
+    def __init__(self, plan: Plan) -> None:
+        self.plan = plan
+        self._entries: dict[int, IndexEntry] = {}
+        self._ids = _KeyMap()
+        self._uids = _KeyMap()
+        self._paths = _KeyMap()
+        self._exact = True
+        self._observers: weakref.WeakSet[IndexObserver] = weakref.WeakSet()
+        self._build()
+        object.__setattr__(plan, "_index", self)
+
+    def by_id(self, item_id: str) -> PlanItem | None:
+        """Return the item whose ``id`` is ``item_id``."""
+        return self._lookup(self._ids, item_id)
+
+    def by_uid(self, uid: str) -> PlanItem | None:
+        """Return the item whose ``uid`` is ``uid``."""
+        return self._lookup(self._uids, uid)
+
+    def by_path(self, path: str) -> PlanItem | None:
+        """Return the item at hierarchical id ``path``, e.g. ``"setup.auth"``."""
+        return self._lookup(self._paths, path)
+
+    def resolve(self, reference: str) -> PlanItem | None:
+        """Resolve an edge endpoint or internal ``#id`` planRef to an item.
+
+        The id is tried first, then the hierarchical path. References to
+        other documents (``file://``, ``https://``) resolve to None.
+        """
+        if not isinstance(reference, str):
+            return None
+        if reference.startswith("#"):
+            reference = reference[1:]
+        elif "://" in reference:
+            return None
+        item = self.by_id(reference)
+        return item if item is not None else self.by_path(reference)
+
+    def subscribe(self, observer: IndexObserver) -> None:
+        """Report item changes to ``observer`` for as long as it is alive.
+
+        ``reset`` is called whenever the index is rebuilt from scratch; the
+        observer should then re-read ``items()``.
+        """
+        self._observers.add(observer)
+
+    def items(self) -> list[PlanItem]:
+        """Return every indexed item."""
+        self._sync()
+        return [entry.item for entry in self._entries.values()]
+
+    def entry(self, item: PlanItem) -> IndexEntry:
+        """Return the parent, position and path of ``item``; KeyError if not in the plan."""
+        self._sync()
+        entry = self._entries.get(id(item))
+        if entry is None or entry.item is not item:
+            raise KeyError(item)
+        return entry
+
+    def __contains__(self, item: object) -> bool:
+        self._sync()
+        entry = self._entries.get(id(item))
+        return entry is not None and entry.item is item
+
+    def __len__(self) -> int:
+        self._sync()
+        return len(self._entries)
+
+    def _lookup(self, keys: _KeyMap, key: Any) -> PlanItem | None:
+        self._sync()
+        entry = keys.get(key)
+        return None if entry is None else entry.item
+
+    def _sync(self) -> None:
+        if not self._exact:
+            self._build()
+
+    def _build(self) -> None:
+        self._entries.clear()
+        self._ids.clear()
+        self._uids.clear()
+        self._paths.clear()
+        self._exact = True
+        self._add_items(self._children(self.plan) or (), self.plan, 0, notify=False)
+        for observer in list(self._observers):
+            observer.reset()
+
+    # Notifications from the models.
+
+    def _children_changed(self, owner: _SlotsModel, start: int, stop: int | None, removed: Iterable[Any]) -> None:
+        """Renumber ``owner``'s items in ``[start, stop)``, index new ones, drop ``removed``."""
+        if not self._owns(owner):
+            return
+        children = self._children(owner)
+        if children is None:
+            children = ()
+        parent_path = self._path_of(owner)
+        entries = self._entries
+        for position in range(start, len(children) if stop is None else stop):
+            child = children[position]
+            if not isinstance(child, PlanItem):
+                continue
+            entry = entries.get(id(child))
+            if entry is None:
+                self._add_items((child,), owner, position, notify=True)
+            elif entry.parent is owner:
+                entry.position = position
+            else:
+                # Moved here from elsewhere in the plan.
+                entry.parent = owner
+                entry.position = position
+                self._repath(entry, parent_path)
+        for item in removed:
+            entry = entries.get(id(item))
+            if entry is None or entry.parent is not owner:
+                continue
+            position = entry.position
+            if position < len(children) and children[position] is item:
+                continue
+            self._drop_subtree(entry)
+
+    def _item_changed(self, node: _SlotsModel, name: str, old_children: Any) -> None:
+        """Follow an assignment to attribute ``name`` of ``node``."""
+        if not self._owns(node):
+            return
+        if name == "subItems" or name == "items":
+            if getattr(node, node._CHILDREN) is not old_children:
+                self._children_changed(node, 0, None, old_children or ())
+        elif node is not self.plan:
+            entry = self._entries[id(node)]
+            if name == "id":
+                self._rekey(entry)
+                self._repath(entry, self._path_of(entry.parent))
+            elif name == "uid":
+                self._rekey(entry)
+            for observer in list(self._observers):
+                observer.item_changed(node, name)
+
+    # Bookkeeping.
+
+    def _owns(self, node: _SlotsModel) -> bool:
+        if node is self.plan:
+            return True
+        entry = self._entries.get(id(node))
+        return entry is not None and entry.item is node
+
+    def _children(self, node: Any) -> Any:
+        if not isinstance(node, _SlotsModel):
+            return None
+        children = getattr(node, node._CHILDREN)
+        if children is not None and not isinstance(children, _TRACKED_LISTS):
+            self._exact = False
+        return children
+
+    def _path_of(self, node: _SlotsModel) -> str | None:
+        if node is self.plan:
+            return ""
+        return self._entries[id(node)].path
+
+    def _add_items(self, items: Iterable[Any], parent: _SlotsModel, offset: int, *, notify: bool) -> None:
+        """Index ``items``, found at ``offset`` in ``parent``'s list, and their subtrees."""
+        observers = list(self._observers) if notify else ()
+        entries = self._entries
+        parent_path = self._path_of(parent)
+        for item_path, item, owner in walk_items(items, path="", parent=parent, children=self._children):
+            if not isinstance(item, PlanItem):
+                continue
+            if owner is parent:
+                entry = IndexEntry(item, owner, offset + item_path.index, _child_path(parent_path, item.id))
+            else:
+                entry = IndexEntry(item, owner, item_path.index, _child_path(entries[id(owner)].path, item.id))
+            entries[id(item)] = entry
+            self._ids.add(entry._id, entry)
+            self._uids.add(entry._uid, entry)
+            self._paths.add(entry.path, entry)
+            for observer in observers:
+                observer.item_added(item)
+
+    def _drop_subtree(self, entry: IndexEntry) -> None:
+        self._discard(entry)
+        entries = self._entries
+        for _, child, owner in walk_items(self._children(entry.item) or (), path=None, parent=entry.item, children=self._children):
+            found = entries.get(id(child))
+            if found is not None and found.item is child and found.parent is owner:
+                self._discard(found)
+
+    def _discard(self, entry: IndexEntry) -> None:
+        del self._entries[id(entry.item)]
+        self._ids.discard(entry._id, entry)
+        self._uids.discard(entry._uid, entry)
+        self._paths.discard(entry.path, entry)
+        for observer in list(self._observers):
+            observer.item_removed(entry.item)
+
+    def _rekey(self, entry: IndexEntry) -> None:
+        item_id = _key(entry.item.id)
+        if item_id != entry._id:
+            self._ids.discard(entry._id, entry)
+            entry._id = item_id
+            self._ids.add(item_id, entry)
+        uid = _key(entry.item.uid)
+        if uid != entry._uid:
+            self._uids.discard(entry._uid, entry)
+            entry._uid = uid
+            self._uids.add(uid, entry)
+
+    def _repath(self, entry: IndexEntry, parent_path: str | None) -> None:
+        # Descendant paths only change when this one does.
+        path = _child_path(parent_path, entry.item.id)
+        if path == entry.path:
+            return
+        self._set_path(entry, path)
+        entries = self._entries
+        for _, child, owner in walk_items(self._children(entry.item) or (), path=None, parent=entry.item, children=self._children):
+            found = entries.get(id(child))
+            if found is not None and found.item is child:
+                self._set_path(found, _child_path(entries[id(owner)].path, child.id))
+
+    def _set_path(self, entry: IndexEntry, path: str | None) -> None:
+        self._paths.discard(entry.path, entry)
+        entry.path = path
+        self._paths.add(path, entry)
+
+
+class _KeyMap:
+    """Key to entry, with entries that share a key queued behind the first."""
+
+    __slots__ = ("_first", "_shadowed")
+
+    def __init__(self) -> None:
+        self._first: dict[str, IndexEntry] = {}
+        self._shadowed: dict[str, list[IndexEntry]] = {}
+
+    def get(self, key: Any) -> IndexEntry | None:
+        try:
+            return self._first.get(key)
+        except TypeError:
+            return None
+
+    def add(self, key: str | None, entry: IndexEntry) -> None:
+        if key is None:
+            return
+        if self._first.setdefault(key, entry) is not entry:
+            self._shadowed.setdefault(key, []).append(entry)
+
+    def discard(self, key: str | None, entry: IndexEntry) -> None:
+        if key is None:
+            return
+        queue = self._shadowed.get(key)
+        if self._first.get(key) is entry:
+            if queue:
+                self._first[key] = queue.pop(0)
+            else:
+                del self._first[key]
+        elif queue and entry in queue:
+            queue.remove(entry)
+        if queue == []:
+            del self._shadowed[key]
+
+    def clear(self) -> None:
+        self._first.clear()
+        self._shadowed.clear()
+
+
+def _key(value: Any) -> str | None:
+    return value if isinstance(value, str) and value else None
+
+
+def _child_path(parent_path: str | None, item_id: Any) -> str | None:
+    # Items without an id break the chain for their whole subtree.
+    if parent_path is None or not isinstance(item_id, str) or not item_id:
+        return None
+    return f"{parent_path}.{item_id}" if parent_path else item_id
@@ -3,25 +3,78 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Mapping
+from typing import Any, Callable, Mapping
 
 from libvbrief.errors import ValidationError
 from libvbrief.issues import ValidationReport
-from libvbrief.serialization.json_codec import dump_json_file, dumps_json, load_json_file, parse_json
+from libvbrief.schema import CompiledSchema
+from libvbrief.serialization.binary_codec import dump_binary_file, dumps_binary, load_binary_file, parse_binary
+from libvbrief.serialization.interning import intern_strings
+from libvbrief.serialization.json_codec import (
+    dump_json_file,
+    dumps_json,
+    dumps_json_bytes,
+    load_json_file,
+    parse_json,
+    parse_json_bytes,
+)
+from libvbrief.serialization.tron_codec import dump_tron_file, dumps_tron, load_tron_file, parse_tron
 from libvbrief.validation import validate_document
 
+_PARSERS: dict[str, Callable[[str], dict[str, Any]]] = {"json": parse_json, "tron": parse_tron}
+_BYTES_PARSERS: dict[str, Callable[[bytes], dict[str, Any]]] = {"json": parse_json_bytes, "binary": parse_binary}
+_LOADERS: dict[str, Callable[[str | Path], dict[str, Any]]] = {
+    "json": load_json_file,
+    "tron": load_tron_file,
+    "binary": load_binary_file,
+}
+_EMITTERS: dict[str, Callable[..., str]] = {"json": dumps_json, "tron": dumps_tron}
+_BYTES_EMITTERS: dict[str, Callable[..., bytes]] = {"json": dumps_json_bytes, "binary": dumps_binary}
+_WRITERS: dict[str, Callable[..., None]] = {"json": dump_json_file, "tron": dump_tron_file, "binary": dump_binary_file}
+_SUFFIX_FORMATS = {".tron": "tron", ".vbb": "binary"}
+
+
+def loads(text: str, *, strict: bool = False, format: str = "json", intern: bool = False) -> dict[str, Any]:
+    """Load a vBRIEF JSON or TRON document from a string.
+
+    ``strict`` raises ValidationError at the first validation error.
+    ``intern`` shares keys and short string values between loaded documents,
+    which saves memory when many plans are held at once.
+    """
+    document = _codec(_PARSERS, format)(text)
+    if intern:
+        intern_strings(document)
+    if strict:
+        _raise_on_invalid(document)
+    return document
 
-def loads(text: str, *, strict: bool = False) -> dict[str, Any]:
-    """Load a vBRIEF JSON document from a string."""
-    document = parse_json(text)
+
+def loads_bytes(data: bytes, *, strict: bool = False, format: str = "json", intern: bool = False) -> dict[str, Any]:
+    """Load a vBRIEF document from UTF-8 JSON bytes (no intermediate str) or binary."""
+    document = _codec(_BYTES_PARSERS, format)(data)
+    if intern:
+        intern_strings(document)
     if strict:
         _raise_on_invalid(document)
     return document
 
 
-def load_file(path: str | Path, *, strict: bool = False) -> dict[str, Any]:
-    """Load a vBRIEF JSON document from a UTF-8 file."""
-    document = load_json_file(path)
+def load_file(
+    path: str | Path,
+    *,
+    strict: bool = False,
+    format: str | None = None,
+    intern: bool = False,
+) -> dict[str, Any]:
+    """Load a vBRIEF document from a UTF-8 file.
+
+    When ``format`` is omitted it is inferred from the file suffix
+    (``.tron`` selects TRON, ``.vbb`` binary, anything else JSON).
+    ``intern`` works as in :func:`loads`.
+    """
+    document = _codec(_LOADERS, _file_format(path, format))(path)
+    if intern:
+        intern_strings(document)
     if strict:
         _raise_on_invalid(document)
     return document
@@ -32,10 +85,25 @@ def dumps(
     *,
     canonical: bool = True,
     preserve_format: bool = False,
+    format: str = "json",
 ) -> str:
-    """Serialize a document or model object to JSON text."""
+    """Serialize a document or model object to JSON or TRON text."""
+    emit = _codec(_EMITTERS, format)
+    payload = _coerce_to_dict(document, preserve_order=preserve_format)
+    return emit(payload, canonical=canonical, preserve_format=preserve_format)
+
+
+def dumps_bytes(
+    document: Mapping[str, Any] | Any,
+    *,
+    canonical: bool = True,
+    preserve_format: bool = False,
+    format: str = "json",
+) -> bytes:
+    """Serialize a document or model object to UTF-8 JSON bytes or binary."""
+    emit = _codec(_BYTES_EMITTERS, format)
     payload = _coerce_to_dict(document, preserve_order=preserve_format)
-    return dumps_json(payload, canonical=canonical, preserve_format=preserve_format)
+    return emit(payload, canonical=canonical, preserve_format=preserve_format)
 
 
 def dump_file(
@@ -44,21 +112,49 @@ def dump_file(
     *,
     canonical: bool = True,
     preserve_format: bool = False,
+    format: str | None = None,
 ) -> None:
-    """Serialize a document or model object to JSON file."""
+    """Serialize a document or model object to a JSON, TRON or binary file."""
+    write = _codec(_WRITERS, _file_format(path, format))
     payload = _coerce_to_dict(document, preserve_order=preserve_format)
-    dump_json_file(path, payload, canonical=canonical, preserve_format=preserve_format)
+    write(path, payload, canonical=canonical, preserve_format=preserve_format)
 
 
-def validate(document: Mapping[str, Any] | Any) -> ValidationReport:
-    """Validate a dict document or model object."""
-    return validate_document(document)
+def validate(
+    document: Mapping[str, Any] | Any,
+    *,
+    schema: bool | Mapping[str, Any] | CompiledSchema = False,
+    max_errors: int | None = None,
+    fail_fast: bool = False,
+    include_warnings: bool = True,
+) -> ValidationReport:
+    """Validate a dict document or model object.
+
+    ``schema=True`` also checks the document against the vBRIEF core JSON
+    Schema, reporting ``schema_violation`` issues; an extension schema
+    mapping is compiled once and checked instead. ``max_errors`` stops
+    validating once that many errors were found (the report is then
+    ``truncated``), ``fail_fast`` stops at the first one and
+    ``include_warnings=False`` skips warnings.
+    """
+    return validate_document(
+        document,
+        schema=schema,
+        max_errors=max_errors,
+        fail_fast=fail_fast,
+        include_warnings=include_warnings,
+    )
 
 
 def _coerce_to_dict(document: Mapping[str, Any] | Any, *, preserve_order: bool) -> dict[str, Any]:
     if isinstance(document, Mapping):
         return dict(document)
 
+    # Models hand out their cached dicts: serializing only reads them.
+    shared = getattr(document, "_shared_dict", None)
+    if callable(shared):
+        return shared(preserve_order)
+
     to_dict = getattr(document, "to_dict", None)
     if callable(to_dict):
         try:
@@ -69,7 +165,22 @@ def _coerce_to_dict(document: Mapping[str, Any] | Any, *, preserve_order: bool)
     raise TypeError("document must be a mapping or provide to_dict()")
 
 
+def _codec(table: Mapping[str, Any], format: str) -> Any:
+    try:
+        return table[format]
+    except KeyError:
+        raise ValueError(f"Unsupported format {format!r}; expected one of {sorted(table)}") from None
+
+
+def _file_format(path: str | Path, format: str | None) -> str:
+    if format is not None:
+        return format
+    return _SUFFIX_FORMATS.get(Path(path).suffix, "json")
+
+
 def _raise_on_invalid(document: Mapping[str, Any]) -> None:
-    report = validate_document(document)
+    # Strict loading only needs to know whether the document is valid; call
+    # validate() for the full list of issues.
+    report = validate_document(document, fail_fast=True, include_warnings=False)
     if not report.is_valid:
         raise ValidationError(report)
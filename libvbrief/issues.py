@@ -22,6 +22,8 @@ class ValidationReport:
 
     errors: List[Issue] = field(default_factory=list)
     warnings: List[Issue] = field(default_factory=list)
+    # Set when validation stopped at its error budget, so more issues may exist.
+    truncated: bool = False
 
     @property
     def is_valid(self) -> bool:
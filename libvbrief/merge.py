@@ -0,0 +1,445 @@
+"""Three-way merge of concurrently edited vBRIEF documents.
+
+:func:`merge` lines the items of a common ancestor and two edited copies up
+by ``uid``, then ``id``, then hierarchical path (as :mod:`libvbrief.compare`
+does); items both sides added without a key are one item when they have the
+same members under the same parent. It then merges them member by member: a
+change made on one side is taken, the same change made on both is taken
+once, and different changes to the same member conflict. Values compare as
+JSON does, so ``true`` and ``1`` are different changes. An item's conflicts
+go to the side whose item ``sequence`` is higher (ours on a tie); the plan's
+and the document's members and the edges go by the plan ``sequence``. Items
+keep their place unless a side moved them, and siblings keep the order of
+whichever side reordered them. Everything is hash lookups, so a merge takes
+time linear in the size of the three documents.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Mapping
+
+from libvbrief.compare import _ABSENT, _KEYS, _changed_members, _match, _Node, _Tree, _tree, _where
+from libvbrief.models import VBriefDocument, _is_mapping, _same_json
+from libvbrief.serialization.jcs import dumps_jcs
+from libvbrief.traversal import ItemPath
+
+# Bookkeeping members follow the winning side without being reported.
+_BOOKKEEPING = frozenset(("sequence", "lastModifiedBy", "updated"))
+
+_BASE, _OURS, _THEIRS = 0, 1, 2
+_SIDES = {_OURS: "ours", _THEIRS: "theirs"}
+
+
+@dataclass(frozen=True)
+class MergeConflict:
+    """Something both sides changed in different ways, and how it was resolved.
+
+    ``kind`` is ``member`` (``field`` names it), ``removed`` (one side
+    removed an item, or edge, the other still changed; it is kept) or
+    ``moved`` (the sides put an item under different parents; ``ours`` and
+    ``theirs`` are its path in each). ``path`` locates the item or edge in
+    the merged document, ``plan`` or ``$``. ``resolution`` is the side kept.
+    """
+
+    kind: str
+    path: str
+    field: str | None
+    ours: Any
+    theirs: Any
+    resolution: str
+
+
+@dataclass
+class MergeResult:
+    """Merged document plus the conflicts met on the way."""
+
+    document: VBriefDocument
+    conflicts: list[MergeConflict] = field(default_factory=list)
+
+    @property
+    def clean(self) -> bool:
+        """True when the two sides never disagreed."""
+        return not self.conflicts
+
+
+def merge(base: Any, ours: Any, theirs: Any) -> MergeResult:
+    """Merge ``ours`` and ``theirs``, two edits of ``base`` (dicts or :class:`VBriefDocument` objects)."""
+    return _Merger(_tree(base), _tree(ours), _tree(theirs)).result()
+
+
+class _Entry:
+    """One item across the three documents."""
+
+    __slots__ = ("nodes", "parent", "kept", "where")
+
+    def __init__(self, base: _Node | None, ours: _Node | None, theirs: _Node | None) -> None:
+        self.nodes = (base, ours, theirs)
+        self.parent: _Entry | None = None
+        self.kept = False
+        self.where: Any = None
+
+
+class _Merger:
+    def __init__(self, base: _Tree, ours: _Tree, theirs: _Tree) -> None:
+        self.trees = (base, ours, theirs)
+        self.root = _Entry(base.root, ours.root, theirs.root)
+        self.entries: list[_Entry] = []
+        self._by_node: dict[int, _Entry] = {}
+        # Pending conflicts: (kind, entry or path, field, ours, theirs, resolution).
+        self._conflicts: list[tuple[Any, ...]] = []
+        for node in self.root.nodes:
+            self._by_node[id(node)] = self.root
+        self._line_up()
+
+    def _add(self, entry: _Entry) -> None:
+        self.entries.append(entry)
+        for node in entry.nodes:
+            if node is not None:
+                self._by_node[id(node)] = entry
+
+    def _line_up(self) -> None:
+        base, ours, theirs = self.trees
+        _line_up(base, ours)
+        pairs = [(node, node.match) for node in base.items]
+        for node in base.items:
+            node.match = None
+        _line_up(base, theirs)
+        # Theirs' item for each of ours' that has one.
+        counterparts: dict[int, _Node | None] = {id(ours.root): theirs.root}
+        for node, counterpart in pairs:
+            self._add(_Entry(node, counterpart, node.match))
+            if counterpart is not None:
+                counterparts[id(counterpart)] = node.match
+        added_ours = [node for node in ours.items if node.match is None]
+        added_theirs = [node for node in theirs.items if node.match is None]
+        # Both sides adding the same uid or id is one item.
+        for key in _KEYS[:2]:
+            _match(added_ours, added_theirs, key)
+        _match_added(added_ours, added_theirs, counterparts)
+        for node in added_ours:
+            self._add(_Entry(None, node, node.match))
+        for node in added_theirs:
+            if node.match is None:
+                self._add(_Entry(None, None, node))
+
+    def result(self) -> MergeResult:
+        for entry in self.entries:
+            self._keep(entry)
+        for entry in self.entries:
+            entry.parent = self._parent(entry)
+        self._break_cycles()
+        for entry in self.entries:
+            if entry.kept:
+                self._keep_ancestors(entry)
+        plan_winner = self._winner(*(tree.plan for tree in self.trees[1:]))
+        base, ours, theirs = (tree.data for tree in self.trees)
+        document = self._members("$", base, ours, theirs, ("plan",), plan_winner)
+        plan = self._plan(plan_winner)
+        document["plan"] = plan
+        conflicts = [self._conflict(*pending) for pending in self._conflicts]
+        # The merged dicts are fresh, so items are only built when used.
+        return MergeResult(VBriefDocument.from_dict(document, lazy=True), conflicts)
+
+    # Which items survive, and where they go.
+
+    def _keep(self, entry: _Entry) -> None:
+        base, ours, theirs = entry.nodes
+        if ours is not None and theirs is not None or base is None:
+            entry.kept = True
+            return
+        if ours is None and theirs is None:
+            return
+        side = _OURS if ours is not None else _THEIRS
+        survivor = entry.nodes[side]
+        if self._changed(base, survivor) or self._side_parent(entry, side) is not self._side_parent(entry, _BASE):
+            entry.kept = True
+            self._conflicts.append(("removed", entry, None, _data(ours), _data(theirs), _SIDES[side]))
+
+    def _changed(self, base: _Node, other: _Node) -> bool:
+        if _is_mapping(base.data) and _is_mapping(other.data):
+            return bool(_changed_members(base.data, other.data, ("subItems",)))
+        return not _same_json(base.data, other.data)
+
+    def _side_parent(self, entry: _Entry, side: int) -> _Entry | None:
+        node = entry.nodes[side]
+        return None if node is None else self._by_node[id(node.parent)]
+
+    def _parent(self, entry: _Entry) -> _Entry:
+        base, ours, theirs = (self._side_parent(entry, side) for side in (_BASE, _OURS, _THEIRS))
+        if theirs is None or ours is theirs:
+            return ours
+        if ours is None or ours is base:
+            return theirs
+        if theirs is base:
+            return ours
+        side = self._winner(entry.nodes[_OURS].data, entry.nodes[_THEIRS].data)
+        self._conflicts.append(("moved", entry, None, _where(entry.nodes[_OURS]), _where(entry.nodes[_THEIRS]), _SIDES[side]))
+        return ours if side == _OURS else theirs
+
+    def _break_cycles(self) -> None:
+        # Moves from both sides can close a loop (each put one item under
+        # the other); items on such a path go back to one side's parent,
+        # whose own chain reaches the root, and failing that to the root.
+        reaches = {id(self.root)}
+        reset: set[int] = set()
+        for entry in self.entries:
+            if entry.parent is None:
+                # Removed on both sides; never anyone's parent.
+                continue
+            path: list[_Entry] = []
+            seen: set[int] = set()
+            current = entry
+            while id(current) not in reaches:
+                if id(current) in seen:
+                    for looped in path:
+                        previous = looped.parent
+                        if id(looped) in reset:
+                            looped.parent = self.root
+                        else:
+                            reset.add(id(looped))
+                            side = _OURS if looped.nodes[_OURS] is not None else _THEIRS
+                            looped.parent = self._side_parent(looped, side)
+                        if looped.parent is not previous:
+                            ours, theirs = (node and _where(node) for node in looped.nodes[1:])
+                            self._conflicts.append(("moved", looped, None, ours, theirs, "ours" if looped.nodes[_OURS] else "theirs"))
+                    path, seen, current = [], set(), entry
+                    continue
+                seen.add(id(current))
+                path.append(current)
+                current = current.parent
+            reaches.update(id(looped) for looped in path)
+
+    def _keep_ancestors(self, entry: _Entry) -> None:
+        parent = entry.parent
+        while parent is not self.root and not parent.kept:
+            parent.kept = True
+            side = _OURS if parent.nodes[_OURS] is not None else _THEIRS
+            self._conflicts.append(("removed", parent, None, _data(parent.nodes[_OURS]), _data(parent.nodes[_THEIRS]), _SIDES[side]))
+            parent = parent.parent
+
+    # Building the merged document.
+
+    def _plan(self, winner: int) -> dict[str, Any]:
+        base, ours, theirs = self.trees
+        listed = all(tree.edges_listed for tree in self.trees)
+        change_log = _merge_change_log(*(tree.plan.get("changeLog", _ABSENT) for tree in self.trees))
+        skip = ("items", "edges") if listed else ("items",)
+        if change_log is not None:
+            skip += ("changeLog",)
+        plan = self._members("plan", base.plan, ours.plan, theirs.plan, skip, winner)
+        plan["items"] = self._items()
+        if listed and ("edges" in ours.plan or "edges" in theirs.plan):
+            plan["edges"] = self._edges(winner)
+        if change_log is not None and change_log is not _ABSENT:
+            plan["changeLog"] = change_log
+        return plan
+
+    def _items(self) -> list[Any]:
+        children: dict[int, list[_Entry]] = {}
+        for entry in self.entries:
+            if entry.kept:
+                children.setdefault(id(entry.parent), []).append(entry)
+        items: list[Any] = []
+        stack = [(self.root, items, "plan.items")]
+        while stack:
+            parent, output, where = stack.pop()
+            for position, entry in enumerate(self._order(parent, children.get(id(parent), ()))):
+                entry.where = ItemPath(where, position)
+                data = self._item(entry)
+                output.append(data)
+                if id(entry) in children and _is_mapping(data):
+                    data["subItems"] = []
+                    stack.append((entry, data["subItems"], entry.where))
+        return items
+
+    def _order(self, parent: _Entry, members: Any) -> list[_Entry]:
+        """Children of ``parent`` in the order of the side that reordered them."""
+        if not members:
+            return []
+        sides = []
+        for side in (_BASE, _OURS, _THEIRS):
+            node = parent.nodes[side]
+            listed = [] if node is None else [self._by_node[id(child)] for child in node.children]
+            sides.append([entry for entry in listed if entry.kept and entry.parent is parent] if side else listed)
+        rank = {id(entry): position for position, entry in enumerate(sides[_BASE])}
+        primary, secondary = sides[_OURS], sides[_THEIRS]
+        if _reordered(secondary, rank) and not _reordered(primary, rank):
+            primary, secondary = secondary, primary
+        placed = {id(entry) for entry in primary}
+        after: dict[int, list[_Entry]] = {}
+        anchor = 0
+        for entry in secondary:
+            if id(entry) in placed:
+                anchor = id(entry)
+            else:
+                after.setdefault(anchor, []).append(entry)
+                placed.add(id(entry))
+        order = list(after.get(0, ()))
+        for entry in primary:
+            order.append(entry)
+            order += after.get(id(entry), ())
+        # Items sent here when a loop of moves was broken.
+        order += [entry for entry in members if id(entry) not in placed]
+        return order
+
+    def _item(self, entry: _Entry) -> Any:
+        base, ours, theirs = (_data(node) for node in entry.nodes)
+        if ours is None or theirs is None:
+            value = ours if theirs is None else theirs
+            return {key: member for key, member in value.items() if key != "subItems"} if _is_mapping(value) else value
+        winner = self._winner(ours, theirs)
+        if _is_mapping(ours) and _is_mapping(theirs):
+            return self._members(entry, base if _is_mapping(base) else {}, ours, theirs, ("subItems",), winner)
+        return self._value(entry, None, _ABSENT if base is None else base, ours, theirs, winner)
+
+    def _members(self, where: Any, base: Mapping[str, Any], ours: Mapping[str, Any], theirs: Mapping[str, Any], skip: tuple[str, ...], winner: int) -> dict[str, Any]:
+        merged = {}
+        for key in [*ours, *(key for key in theirs if key not in ours)]:
+            if key in skip:
+                continue
+            value = self._value(where, key, base.get(key, _ABSENT), ours.get(key, _ABSENT), theirs.get(key, _ABSENT), winner)
+            if value is not _ABSENT:
+                merged[key] = value
+        return merged
+
+    def _value(self, where: Any, key: str | None, base: Any, ours: Any, theirs: Any, winner: int) -> Any:
+        if _same_json(ours, theirs) or _same_json(theirs, base):
+            return ours
+        if _same_json(ours, base):
+            return theirs
+        if key not in _BOOKKEEPING:
+            self._conflicts.append(("member", where, key, _present(ours), _present(theirs), _SIDES[winner]))
+        return ours if winner == _OURS else theirs
+
+    def _edges(self, winner: int) -> list[Any]:
+        """Edges keyed by (from, to, type); ours' edges without a unique key are kept as they are."""
+        base, ours, theirs = (_unique_edges(tree) for tree in self.trees)
+        merged: list[Any] = []
+        for node in self.trees[_OURS].edges:
+            if node.id in ours:
+                self._edge(merged, node.id, base, ours, theirs, winner)
+            else:
+                merged.append(node.data)
+        for node in self.trees[_THEIRS].edges:
+            if node.id in theirs and node.id not in ours:
+                self._edge(merged, node.id, base, ours, theirs, winner)
+        return merged
+
+    def _edge(self, merged: list[Any], key: Any, base: dict[Any, Any], ours: dict[Any, Any], theirs: dict[Any, Any], winner: int) -> None:
+        before, mine, other = base.get(key, _ABSENT), ours.get(key, _ABSENT), theirs.get(key, _ABSENT)
+        where = f"plan.edges[{len(merged)}]"
+        if mine is not _ABSENT and other is not _ABSENT:
+            merged.append(self._members(where, {} if before is _ABSENT else before, mine, other, (), winner))
+            return
+        survivor, side = (mine, _OURS) if other is _ABSENT else (other, _THEIRS)
+        if before is _ABSENT:
+            merged.append(survivor)
+        elif not _same_json(survivor, before):
+            self._conflicts.append(("removed", where, None, _present(mine), _present(other), _SIDES[side]))
+            merged.append(survivor)
+
+    def _winner(self, ours: Any, theirs: Any) -> int:
+        return _THEIRS if _sequence(theirs) > _sequence(ours) else _OURS
+
+    def _conflict(self, kind: str, where: Any, key: str | None, ours: Any, theirs: Any, resolution: str) -> MergeConflict:
+        if isinstance(where, _Entry):
+            where = where.where
+        return MergeConflict(kind, str(where), key, ours, theirs, resolution)
+
+
+def _line_up(base: _Tree, side: _Tree) -> None:
+    for key in _KEYS:
+        _match(base.items, side.items, key)
+    # Items no key tells apart pair up in order under matched parents.
+    base.root.match = side.root
+    for parent in (base.root, *base.items):
+        counterpart = parent.match
+        if counterpart is not None:
+            left = [child for child in parent.children if child.match is None]
+            right = [child for child in counterpart.children if child.match is None]
+            for node, other in zip(left, right):
+                node.match, other.match = other, node
+    base.root.match = None
+
+
+def _match_added(ours: list[_Node], theirs: list[_Node], counterparts: dict[int, _Node | None]) -> None:
+    """Pair unkeyed items both sides added with the same members under the same parent.
+
+    ``counterparts`` maps ours' items that have one to theirs'. Items are
+    visited parent first, so a pair made here lets their children pair up
+    too; equal items under one parent pair in order.
+    """
+    candidates: dict[tuple[int, bytes], list[_Node]] = {}
+    for node in theirs:
+        key = None if node.match is not None else _content_key(node)
+        if key is not None:
+            candidates.setdefault((id(node.parent), key), []).append(node)
+    for waiting in candidates.values():
+        waiting.reverse()
+    for node in ours:
+        parent = counterparts.get(id(node.parent))
+        if node.match is None and parent is not None:
+            waiting = candidates.get((id(parent), _content_key(node)))
+            if waiting:
+                other = waiting.pop()
+                node.match, other.match = other, node
+        if node.match is not None:
+            counterparts[id(node)] = node.match
+
+
+def _content_key(node: _Node) -> bytes | None:
+    # The item without its subItems, in canonical form.
+    data = node.data
+    if _is_mapping(data):
+        data = {key: value for key, value in data.items() if key != "subItems"}
+    try:
+        return dumps_jcs(data)
+    except (TypeError, ValueError):
+        return None
+
+
+def _reordered(entries: list[_Entry], rank: dict[int, int]) -> bool:
+    """Whether ``entries`` list items that were already siblings in another order than before."""
+    last = -1
+    for entry in entries:
+        position = rank.get(id(entry))
+        if position is not None:
+            if position < last:
+                return True
+            last = position
+    return False
+
+
+def _merge_change_log(base: Any, ours: Any, theirs: Any) -> Any:
+    """Base entries, then ours' new ones, then theirs'; None when the logs do not extend the base."""
+    if ours is _ABSENT and theirs is _ABSENT:
+        return _ABSENT
+    logs = [[] if log is _ABSENT else log for log in (base, ours, theirs)]
+    if not all(isinstance(log, list) for log in logs):
+        return None
+    start, ours, theirs = logs
+    if ours[: len(start)] != start or theirs[: len(start)] != start:
+        return None
+    return [*start, *ours[len(start) :], *theirs[len(start) :]]
+
+
+def _unique_edges(tree: _Tree) -> dict[Any, Any]:
+    edges: dict[Any, Any] = {}
+    for node in tree.edges:
+        if node.id is not None:
+            edges[node.id] = _ABSENT if node.id in edges else node.data
+    return {key: data for key, data in edges.items() if data is not _ABSENT}
+
+
+def _data(node: _Node | None) -> Any:
+    return None if node is None else node.data
+
+
+def _present(value: Any) -> Any:
+    return None if value is _ABSENT else value
+
+
+def _sequence(data: Any) -> int:
+    sequence = data.get("sequence") if _is_mapping(data) else None
+    return sequence if type(sequence) is int and sequence >= 0 else -1
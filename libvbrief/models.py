@@ -1,237 +1,787 @@
-"""Dataclass object model for vBRIEF v0.5 documents."""
+"""Object model for vBRIEF v0.5 documents."""
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import hashlib
+import inspect
+import operator
+from collections.abc import MutableSequence
+from dataclasses import dataclass, field, make_dataclass
+from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
-from typing import Any, Iterable, Mapping
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Mapping
+from uuid import uuid4
 
+from libvbrief.codegen import compile_known_values, compile_loader
+from libvbrief.compat.policy import (
+    DOCUMENT_FIELD_ORDER,
+    PLAN_FIELD_ORDER,
+    PLAN_ITEM_FIELD_ORDER,
+    PLAN_ITEM_REQUIRED_FIELDS,
+    PLAN_REQUIRED_FIELDS,
+)
 from libvbrief.errors import ValidationError
 from libvbrief.issues import ValidationReport
+from libvbrief.schema import CompiledSchema
+from libvbrief.serialization.jcs import dumps_jcs
 from libvbrief.serialization.json_codec import dump_json_file, dumps_json, load_json_file, parse_json
+from libvbrief.traversal import ItemPath
+from libvbrief.validation import CORE_RULES, Rule, RuleEngine, validate_document
 
-_PLAN_ITEM_FIELD_ORDER = [
-    "id",
-    "uid",
-    "title",
-    "status",
-    "narrative",
-    "subItems",
-    "planRef",
-    "tags",
-    "metadata",
-    "created",
-    "updated",
-    "completed",
-    "priority",
-    "dueDate",
-    "startDate",
-    "endDate",
-    "percentComplete",
-    "participants",
-    "location",
-    "uris",
-    "recurrence",
-    "reminders",
-    "classification",
-    "relatedComments",
-    "timezone",
-    "sequence",
-    "lastModifiedBy",
-    "lockedBy",
-]
-
-_PLAN_FIELD_ORDER = [
-    "id",
-    "uid",
-    "title",
-    "status",
-    "items",
-    "narratives",
-    "edges",
-    "tags",
-    "metadata",
-    "created",
-    "updated",
-    "author",
-    "reviewers",
-    "uris",
-    "references",
-    "timezone",
-    "agent",
-    "lastModifiedBy",
-    "changeLog",
-    "sequence",
-    "fork",
-]
-
-_DOCUMENT_FIELD_ORDER = ["vBRIEFInfo", "plan"]
+if TYPE_CHECKING:
+    from libvbrief.index import ItemIndex
 
+_NO_EXTRAS: dict[str, Any] = {}
+_UNBUILT = object()
+_NO_FIELD_ORDER: tuple[str, ...] = ()
+_CHILD_FIELDS = frozenset({"subItems", "items"})
 
-@dataclass
-class PlanItem:
+# Writes that must not count as a change (tracking state, loading).
+_set = object.__setattr__
+
+# Key layouts are shared between every item (or plan) that has the same keys
+# in the same order; the cap keeps pathological inputs from growing it forever.
+_LAYOUTS: dict[tuple[str, ...], tuple[str, ...]] = {}
+_MAX_LAYOUTS = 4096
+
+
+def _intern_layout(keys: Iterable[str]) -> tuple[str, ...]:
+    layout = tuple(keys)
+    shared = _LAYOUTS.get(layout)
+    if shared is not None:
+        return shared
+    if len(_LAYOUTS) < _MAX_LAYOUTS:
+        _LAYOUTS[layout] = layout
+    return layout
+
+
+class _SlotsModel:
+    """Equality and repr in the style of a dataclass, for ``__slots__`` models.
+
+    ``subItems``/``items`` and ``extras`` are stored as None until first
+    accessed or assigned, so leaf items carry no empty list or dict.
+
+    Models also track changes: ``to_dict`` results and content hashes are
+    cached per node and any attribute assignment, item list mutation or
+    ``extras`` access drops the cache of the node and of every ancestor
+    (``_parent``), so re-serializing after a small edit only rebuilds the
+    changed path. Edits inside a plain list assigned by the caller are not
+    seen, so a node with such a list below it is never cached. Content
+    hashes also miss in-place edits of field values such as ``tags``
+    lists: assign a new value instead.
+    """
+
+    __slots__ = ()
+    _FIELDS: tuple[str, ...] = ()
+    _CHILDREN = ""
+    # Bookkeeping slots: reset on load, left out of copies and pickles.
+    _TRACKING: tuple[str, ...] = ("_parent", "_cached")
+    # Only a Plan can carry the document index (libvbrief.index); it is told
+    # about every assignment in its tree.
+    _index = None
+    __hash__ = None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        children = getattr(self, self._CHILDREN, None) if name in _CHILD_FIELDS else None
+        _set(self, name, value)
+        index = self._changed()._index
+        if index is not None:
+            index._item_changed(self, name, children)
+
+    def _changed(self) -> _SlotsModel:
+        """Drop cached dicts up to the root of the tree and return the root."""
+        node = self
+        while True:
+            _set(node, "_cached", None)
+            parent = node._parent
+            if parent is None:
+                return node
+            node = parent
+
+    def _shared_dict(self, preserve_order: bool = False) -> dict[str, Any]:
+        """``to_dict`` output shared with the cache; callers must not modify it."""
+        cached = self._cached
+        if cached is not None:
+            result = cached[1 if preserve_order else 0]
+            if result is not None:
+                return result
+        return _build_dicts(self, preserve_order)
+
+    def _tracks_children(self) -> bool:
+        # Only a child list owned by this node reports its mutations here.
+        children = getattr(self, self._CHILDREN)
+        if children is None:
+            return True
+        return (type(children) is _ItemList or type(children) is LazyItemList) and children._owner is self
+
+    def _finish_dict(self, known: dict[str, Any], preserve_order: bool, tracked: bool) -> dict[str, Any]:
+        result = _merge_values(
+            known=known,
+            extras=self._extras or _NO_EXTRAS,
+            field_order=self._field_order,
+            preserve_order=preserve_order,
+        )
+        if tracked:
+            if self._cached is None:
+                _set(self, "_cached", [None, None, None])
+            self._cached[1 if preserve_order else 0] = result
+        return result
+
+    def content_hash(self) -> str:
+        """Return the hex SHA-256 Merkle hash of this node and its subtree.
+
+        A node hashes the RFC 8785 (JCS) form of its ``to_dict`` members
+        other than the child list, a NUL byte and its children's digests in
+        order, so equal content always gives equal hashes regardless of key
+        order or how the model was loaded. Hashes are cached like
+        ``to_dict``: after an edit only the changed path is rehashed, and
+        two trees can be compared by descending only where hashes differ.
+        Like the query indexes, hashes do not see in-place edits of a
+        field's value (``item.tags.append(...)``); assign a new value instead.
+        """
+        return _digest(self).hex()
+
+    def _values(self) -> tuple[Any, ...]:
+        return tuple(self._field_values()) + (self._field_order,)
+
+    def _field_values(self) -> list[Any]:
+        # Reads ``_extras`` directly: the ``extras`` property counts as a change.
+        return [(self._extras or {}) if name == "extras" else getattr(self, name) for name in self._FIELDS]
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={value!r}" for name, value in zip(self._FIELDS, self._field_values()))
+        return f"{type(self).__name__}({values})"
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Copies and pickles leave the parent (and its whole tree) behind.
+        return {
+            name: getattr(self, name)
+            for cls in type(self).__mro__
+            for name in getattr(cls, "__slots__", ())
+            if name not in self._TRACKING and hasattr(self, name)
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for name in self._TRACKING:
+            _set(self, name, None)
+        for name, value in state.items():
+            _set(self, name, value)
+
+
+def _dataclass_fields(cls: type[_SlotsModel]) -> type[_SlotsModel]:
+    """Give a ``__slots__`` model the field table of the dataclass it replaced.
+
+    The fields mirror the ``__init__`` parameters and their defaults, so
+    ``dataclasses.fields``, ``asdict`` and ``replace`` keep working.
+    """
+    parameters = list(inspect.signature(cls.__init__).parameters.values())[1:]
+    spec = make_dataclass(
+        cls.__name__,
+        [(p.name, Any, field(default=p.default, repr=not p.name.startswith("_"))) for p in parameters],
+        repr=False,
+        eq=False,
+    )
+    cls.__dataclass_fields__ = spec.__dataclass_fields__
+    cls.__dataclass_params__ = spec.__dataclass_params__
+    return cls
+
+
+@_dataclass_fields
+class PlanItem(_SlotsModel):
     """Plan item model with unknown-field preservation."""
 
-    title: Any = ""
-    status: Any = ""
-    id: Any = None
-    uid: Any = None
-    narrative: Any = None
-    subItems: list[PlanItem] = field(default_factory=list)
-    planRef: Any = None
-    tags: Any = None
-    metadata: Any = None
-    created: Any = None
-    updated: Any = None
-    completed: Any = None
-    priority: Any = None
-    dueDate: Any = None
-    startDate: Any = None
-    endDate: Any = None
-    percentComplete: Any = None
-    participants: Any = None
-    location: Any = None
-    uris: Any = None
-    recurrence: Any = None
-    reminders: Any = None
-    classification: Any = None
-    relatedComments: Any = None
-    timezone: Any = None
-    sequence: Any = None
-    lastModifiedBy: Any = None
-    lockedBy: Any = None
-    extras: dict[str, Any] = field(default_factory=dict)
-    _field_order: list[str] = field(default_factory=list, repr=False)
+    __slots__ = (
+        "title",
+        "status",
+        "id",
+        "uid",
+        "narrative",
+        "_subItems",
+        "planRef",
+        "tags",
+        "metadata",
+        "created",
+        "updated",
+        "completed",
+        "priority",
+        "dueDate",
+        "startDate",
+        "endDate",
+        "percentComplete",
+        "participants",
+        "location",
+        "uris",
+        "recurrence",
+        "reminders",
+        "classification",
+        "relatedComments",
+        "timezone",
+        "sequence",
+        "lastModifiedBy",
+        "lockedBy",
+        "_extras",
+        "_field_order",
+        "_parent",
+        "_cached",
+    )
+    _FIELDS = (
+        "title",
+        "status",
+        "id",
+        "uid",
+        "narrative",
+        "subItems",
+        "planRef",
+        "tags",
+        "metadata",
+        "created",
+        "updated",
+        "completed",
+        "priority",
+        "dueDate",
+        "startDate",
+        "endDate",
+        "percentComplete",
+        "participants",
+        "location",
+        "uris",
+        "recurrence",
+        "reminders",
+        "classification",
+        "relatedComments",
+        "timezone",
+        "sequence",
+        "lastModifiedBy",
+        "lockedBy",
+        "extras",
+    )
+    _CHILDREN = "_subItems"
+
+    def __init__(
+        self,
+        title: Any = "",
+        status: Any = "",
+        id: Any = None,
+        uid: Any = None,
+        narrative: Any = None,
+        subItems: list[PlanItem] | None = None,
+        planRef: Any = None,
+        tags: Any = None,
+        metadata: Any = None,
+        created: Any = None,
+        updated: Any = None,
+        completed: Any = None,
+        priority: Any = None,
+        dueDate: Any = None,
+        startDate: Any = None,
+        endDate: Any = None,
+        percentComplete: Any = None,
+        participants: Any = None,
+        location: Any = None,
+        uris: Any = None,
+        recurrence: Any = None,
+        reminders: Any = None,
+        classification: Any = None,
+        relatedComments: Any = None,
+        timezone: Any = None,
+        sequence: Any = None,
+        lastModifiedBy: Any = None,
+        lockedBy: Any = None,
+        extras: dict[str, Any] | None = None,
+        _field_order: Iterable[str] = _NO_FIELD_ORDER,
+    ) -> None:
+        _set(self, "_parent", None)
+        _set(self, "_cached", None)
+        self.title = title
+        self.status = status
+        self.id = id
+        self.uid = uid
+        self.narrative = narrative
+        self._subItems = subItems
+        self.planRef = planRef
+        self.tags = tags
+        self.metadata = metadata
+        self.created = created
+        self.updated = updated
+        self.completed = completed
+        self.priority = priority
+        self.dueDate = dueDate
+        self.startDate = startDate
+        self.endDate = endDate
+        self.percentComplete = percentComplete
+        self.participants = participants
+        self.location = location
+        self.uris = uris
+        self.recurrence = recurrence
+        self.reminders = reminders
+        self.classification = classification
+        self.relatedComments = relatedComments
+        self.timezone = timezone
+        self.sequence = sequence
+        self.lastModifiedBy = lastModifiedBy
+        self.lockedBy = lockedBy
+        self._extras = extras
+        self._field_order = _intern_layout(_field_order)
+
+    @property
+    def subItems(self) -> list[PlanItem]:
+        if self._subItems is None:
+            _set(self, "_subItems", _ItemList(owner=self))
+        return self._subItems
+
+    @subItems.setter
+    def subItems(self, value: list[PlanItem]) -> None:
+        _set(self, "_subItems", value)
+
+    @property
+    def extras(self) -> dict[str, Any]:
+        # Reading counts as a change: the dict may be edited in place.
+        if self._extras is None:
+            _set(self, "_extras", {})
+        self._changed()
+        return self._extras
+
+    @extras.setter
+    def extras(self, value: dict[str, Any]) -> None:
+        _set(self, "_extras", value)
 
     @classmethod
-    def from_dict(cls, data: Mapping[str, Any]) -> PlanItem:
-        """Create a PlanItem from a mapping."""
+    def from_dict(cls, data: Mapping[str, Any], *, lazy: bool = False) -> PlanItem:
+        """Create a PlanItem from a mapping.
+
+        With ``lazy`` the subItems become a proxy that builds each child on
+        first access (see :class:`LazyItemList`).
+        """
         if not isinstance(data, Mapping):
             data = {}
 
-        extras = {k: v for k, v in data.items() if k not in _PLAN_ITEM_FIELD_ORDER}
-        item = cls(
-            id=data.get("id"),
-            uid=data.get("uid"),
-            title=data.get("title", ""),
-            status=data.get("status", ""),
-            narrative=data.get("narrative"),
-            planRef=data.get("planRef"),
-            tags=data.get("tags"),
-            metadata=data.get("metadata"),
-            created=data.get("created"),
-            updated=data.get("updated"),
-            completed=data.get("completed"),
-            priority=data.get("priority"),
-            dueDate=data.get("dueDate"),
-            startDate=data.get("startDate"),
-            endDate=data.get("endDate"),
-            percentComplete=data.get("percentComplete"),
-            participants=data.get("participants"),
-            location=data.get("location"),
-            uris=data.get("uris"),
-            recurrence=data.get("recurrence"),
-            reminders=data.get("reminders"),
-            classification=data.get("classification"),
-            relatedComments=data.get("relatedComments"),
-            timezone=data.get("timezone"),
-            sequence=data.get("sequence"),
-            lastModifiedBy=data.get("lastModifiedBy"),
-            lockedBy=data.get("lockedBy"),
-            extras=extras,
-            _field_order=list(data.keys()),
-        )
-
+        load = _load_plan_item if cls is PlanItem else partial(_load_subclass, cls)
+        item = load(data)
         sub_items = data.get("subItems")
-        if isinstance(sub_items, list):
-            item.subItems = [cls.from_dict(x) for x in sub_items if isinstance(x, Mapping)]
+        if isinstance(sub_items, list) and sub_items:
+            _attach_items(item, sub_items, load, lazy=lazy)
         return item
 
     def to_dict(self, *, preserve_order: bool = False) -> dict[str, Any]:
-        """Convert item to dict while preserving unknown fields."""
-        known = _known_item_values(self, preserve_order=preserve_order)
-        return _merge_values(
-            known=known,
-            extras=self.extras,
-            field_order=self._field_order,
-            preserve_order=preserve_order,
-        )
+        """Convert item to dict while preserving unknown fields.
 
+        Built from dicts cached until the item or a subItem changes; the
+        returned dicts are copies the caller may modify.
+        """
+        return _copy_dicts(self._shared_dict(preserve_order), "subItems")
 
-@dataclass
-class Plan:
+    def _build_dict(self, preserve_order: bool, child_dicts: list[Any], tracked: bool) -> dict[str, Any]:
+        return self._finish_dict(_known_item_values(self, child_dicts), preserve_order, tracked)
+
+
+@_dataclass_fields
+class Plan(_SlotsModel):
     """Plan model with nested items and unknown-field preservation."""
 
-    title: Any = ""
-    status: Any = ""
-    items: list[PlanItem] = field(default_factory=list)
-    id: Any = None
-    uid: Any = None
-    narratives: Any = None
-    edges: Any = None
-    tags: Any = None
-    metadata: Any = None
-    created: Any = None
-    updated: Any = None
-    author: Any = None
-    reviewers: Any = None
-    uris: Any = None
-    references: Any = None
-    timezone: Any = None
-    agent: Any = None
-    lastModifiedBy: Any = None
-    changeLog: Any = None
-    sequence: Any = None
-    fork: Any = None
-    extras: dict[str, Any] = field(default_factory=dict)
-    _field_order: list[str] = field(default_factory=list, repr=False)
+    __slots__ = (
+        "title",
+        "status",
+        "_items",
+        "id",
+        "uid",
+        "narratives",
+        "edges",
+        "tags",
+        "metadata",
+        "created",
+        "updated",
+        "author",
+        "reviewers",
+        "uris",
+        "references",
+        "timezone",
+        "agent",
+        "lastModifiedBy",
+        "changeLog",
+        "sequence",
+        "fork",
+        "_extras",
+        "_field_order",
+        "_parent",
+        "_cached",
+        "_index",
+    )
+    _FIELDS = (
+        "title",
+        "status",
+        "items",
+        "id",
+        "uid",
+        "narratives",
+        "edges",
+        "tags",
+        "metadata",
+        "created",
+        "updated",
+        "author",
+        "reviewers",
+        "uris",
+        "references",
+        "timezone",
+        "agent",
+        "lastModifiedBy",
+        "changeLog",
+        "sequence",
+        "fork",
+        "extras",
+    )
+    _CHILDREN = "_items"
+    _TRACKING = ("_parent", "_cached", "_index")
+
+    def __init__(
+        self,
+        title: Any = "",
+        status: Any = "",
+        items: list[PlanItem] | None = None,
+        id: Any = None,
+        uid: Any = None,
+        narratives: Any = None,
+        edges: Any = None,
+        tags: Any = None,
+        metadata: Any = None,
+        created: Any = None,
+        updated: Any = None,
+        author: Any = None,
+        reviewers: Any = None,
+        uris: Any = None,
+        references: Any = None,
+        timezone: Any = None,
+        agent: Any = None,
+        lastModifiedBy: Any = None,
+        changeLog: Any = None,
+        sequence: Any = None,
+        fork: Any = None,
+        extras: dict[str, Any] | None = None,
+        _field_order: Iterable[str] = _NO_FIELD_ORDER,
+    ) -> None:
+        _set(self, "_parent", None)
+        _set(self, "_cached", None)
+        _set(self, "_index", None)
+        self.title = title
+        self.status = status
+        self._items = items
+        self.id = id
+        self.uid = uid
+        self.narratives = narratives
+        self.edges = edges
+        self.tags = tags
+        self.metadata = metadata
+        self.created = created
+        self.updated = updated
+        self.author = author
+        self.reviewers = reviewers
+        self.uris = uris
+        self.references = references
+        self.timezone = timezone
+        self.agent = agent
+        self.lastModifiedBy = lastModifiedBy
+        self.changeLog = changeLog
+        self.sequence = sequence
+        self.fork = fork
+        self._extras = extras
+        self._field_order = _intern_layout(_field_order)
+
+    @property
+    def items(self) -> list[PlanItem]:
+        if self._items is None:
+            _set(self, "_items", _ItemList(owner=self))
+        return self._items
+
+    @items.setter
+    def items(self, value: list[PlanItem]) -> None:
+        _set(self, "_items", value)
+
+    @property
+    def extras(self) -> dict[str, Any]:
+        # Reading counts as a change: the dict may be edited in place.
+        if self._extras is None:
+            _set(self, "_extras", {})
+        self._changed()
+        return self._extras
+
+    @extras.setter
+    def extras(self, value: dict[str, Any]) -> None:
+        _set(self, "_extras", value)
 
     @classmethod
-    def from_dict(cls, data: Mapping[str, Any]) -> Plan:
-        """Create a Plan from a mapping."""
+    def from_dict(cls, data: Mapping[str, Any], *, lazy: bool = False) -> Plan:
+        """Create a Plan from a mapping; ``lazy`` defers building its items."""
         if not isinstance(data, Mapping):
             data = {}
 
-        extras = {k: v for k, v in data.items() if k not in _PLAN_FIELD_ORDER}
-        plan = cls(
-            id=data.get("id"),
-            uid=data.get("uid"),
-            title=data.get("title", ""),
-            status=data.get("status", ""),
-            narratives=data.get("narratives"),
-            edges=data.get("edges"),
-            tags=data.get("tags"),
-            metadata=data.get("metadata"),
-            created=data.get("created"),
-            updated=data.get("updated"),
-            author=data.get("author"),
-            reviewers=data.get("reviewers"),
-            uris=data.get("uris"),
-            references=data.get("references"),
-            timezone=data.get("timezone"),
-            agent=data.get("agent"),
-            lastModifiedBy=data.get("lastModifiedBy"),
-            changeLog=data.get("changeLog"),
-            sequence=data.get("sequence"),
-            fork=data.get("fork"),
-            extras=extras,
-            _field_order=list(data.keys()),
-        )
-
+        plan = _load_plan(data) if cls is Plan else _load_subclass(cls, data)
         items = data.get("items")
         if isinstance(items, list):
-            plan.items = [PlanItem.from_dict(x) for x in items if isinstance(x, Mapping)]
+            _attach_items(plan, items, _load_plan_item, lazy=lazy)
         return plan
 
     def to_dict(self, *, preserve_order: bool = False) -> dict[str, Any]:
-        """Convert plan to dict while preserving unknown fields."""
-        known = _known_plan_values(self, preserve_order=preserve_order)
-        return _merge_values(
-            known=known,
-            extras=self.extras,
-            field_order=self._field_order,
-            preserve_order=preserve_order,
-        )
+        """Convert plan to dict while preserving unknown fields.
+
+        Cached like :meth:`PlanItem.to_dict`; the result is a copy.
+        """
+        return _copy_dicts(self._shared_dict(preserve_order), "items")
+
+    def _build_dict(self, preserve_order: bool, child_dicts: list[Any], tracked: bool) -> dict[str, Any]:
+        return self._finish_dict(_known_plan_values(self, child_dicts), preserve_order, tracked)
+
+
+class _LoadingPlanItem(PlanItem):
+    """PlanItem without change tracking, used while ``from_dict`` fills it in."""
+
+    __slots__ = ()
+    __setattr__ = object.__setattr__
+
+
+class _LoadingPlan(Plan):
+    """Plan without change tracking, used while ``from_dict`` fills it in."""
+
+    __slots__ = ()
+    __setattr__ = object.__setattr__
+
+
+class _ItemList(list):
+    """List of child items that reports its mutations to the owning model.
+
+    A list without an owner (as built by ``dataclasses.asdict``) behaves
+    like a plain list.
+    """
+
+    __slots__ = ("_owner",)
+
+    def __init__(self, values: Iterable[Any] = (), owner: _SlotsModel | None = None) -> None:
+        list.__init__(self, values)
+        self._owner = owner
+        self._adopt(self)
+
+    def _adopt(self, values: Iterable[Any]) -> None:
+        if self._owner is None:
+            return
+        for value in values:
+            if isinstance(value, _SlotsModel):
+                _set(value, "_parent", self._owner)
+
+    def _mutated(self, start: int, removed: Iterable[Any] = (), added: Iterable[Any] = (), *, stop: int | None = None) -> None:
+        # Positions before ``start`` (and from ``stop`` on, if given) kept their item.
+        if self._owner is None:
+            return
+        self._adopt(added)
+        index = self._owner._changed()._index
+        if index is not None:
+            index._children_changed(self._owner, start, stop, removed)
+
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        # Copies are plain lists, detached from the owner.
+        return (list, (list(self),))
+
+    def append(self, value: Any) -> None:
+        list.append(self, value)
+        self._mutated(len(self) - 1, added=(value,))
+
+    def extend(self, values: Iterable[Any]) -> None:
+        values = list(values)
+        start = len(self)
+        list.extend(self, values)
+        self._mutated(start, added=values)
+
+    def __iadd__(self, values: Iterable[Any]) -> _ItemList:
+        self.extend(values)
+        return self
+
+    def insert(self, index: Any, value: Any) -> None:
+        start = _first_touched(index, len(self))
+        list.insert(self, index, value)
+        self._mutated(start, added=(value,))
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        start = _first_touched(index, len(self))
+        removed = list.__getitem__(self, index)
+        if isinstance(index, slice):
+            value = list(value)
+            list.__setitem__(self, index, value)
+            self._mutated(start, removed, value)
+        else:
+            list.__setitem__(self, index, value)
+            self._mutated(start, (removed,), (value,), stop=start + 1)
+
+    def __delitem__(self, index: Any) -> None:
+        start = _first_touched(index, len(self))
+        removed = list.__getitem__(self, index)
+        list.__delitem__(self, index)
+        self._mutated(start, removed if isinstance(index, slice) else (removed,))
+
+    def __imul__(self, count: Any) -> _ItemList:
+        start = len(self)
+        list.__imul__(self, count)
+        self._mutated(start)
+        return self
+
+    def pop(self, index: Any = -1) -> Any:
+        start = _first_touched(index, len(self))
+        value = list.pop(self, index)
+        self._mutated(start, (value,))
+        return value
+
+    def remove(self, value: Any) -> None:
+        start = list.index(self, value)
+        removed = list.pop(self, start)
+        self._mutated(start, (removed,))
+
+    def clear(self) -> None:
+        removed = list(self)
+        list.clear(self)
+        self._mutated(0, removed)
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        list.sort(self, *args, **kwargs)
+        self._mutated(0)
+
+    def reverse(self) -> None:
+        list.reverse(self)
+        self._mutated(0)
+
+
+def _first_touched(index: Any, length: int) -> int:
+    # Lowest position a list operation at ``index`` can change.
+    if isinstance(index, slice):
+        start, stop, step = index.indices(length)
+        return start if step > 0 else max(min(start, stop + 1), 0)
+    index = operator.index(index)
+    return min(max(index + length if index < 0 else index, 0), length)
+
+
+class LazyItemList(MutableSequence):
+    """List of plan items that builds each PlanItem on first access.
+
+    Wraps the raw ``items``/``subItems`` list. Built items are cached, and
+    entries that were never accessed are serialized as they are. Like eager loading, entries that are not mappings are
+    dropped. The wrapped list itself is never modified. Mutations are
+    reported to ``owner`` like those of a regular item list.
+    """
+
+    __slots__ = ("_raw", "_source", "_cache", "_owner", "_digests")
+
+    def __init__(self, raw: list[Any], owner: _SlotsModel | None = None) -> None:
+        self._raw = raw
+        self._source: list[Any] | None = None
+        self._cache: list[Any] = []
+        self._owner = owner
+        self._digests: dict[int, tuple[Any, bytes]] | None = None
+
+    def _entries(self) -> list[Any]:
+        if self._source is None:
+            raw = self._raw
+            if all(type(entry) is dict for entry in raw):
+                self._source = raw
+            else:
+                self._source = [entry for entry in raw if isinstance(entry, Mapping)]
+            self._cache = [_UNBUILT] * len(self._source)
+        return self._source
+
+    def _own_entries(self) -> list[Any]:
+        # Copy-on-write so mutations never reach the caller's raw list.
+        source = self._entries()
+        if source is self._raw:
+            source = self._source = list(source)
+        return source
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def __getitem__(self, index: Any) -> Any:
+        source = self._entries()
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(source)))]
+        item = self._cache[index]
+        if item is _UNBUILT:
+            item = self._cache[index] = PlanItem.from_dict(source[index], lazy=True)
+            _set(item, "_parent", self._owner)
+        return item
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        source = self._own_entries()
+        start = _first_touched(index, len(source))
+        removed = self._cache[index]
+        if isinstance(index, slice):
+            value = list(value)
+            source[index] = [None] * len(value)
+            self._cache[index] = value
+            self._mutated(start, removed, value)
+        else:
+            source[index] = None
+            self._cache[index] = value
+            self._mutated(start, (removed,), (value,), stop=start + 1)
+
+    def __delitem__(self, index: Any) -> None:
+        source = self._own_entries()
+        start = _first_touched(index, len(source))
+        removed = self._cache[index]
+        del source[index]
+        del self._cache[index]
+        self._mutated(start, removed if isinstance(index, slice) else (removed,))
+
+    def insert(self, index: int, value: PlanItem) -> None:
+        source = self._own_entries()
+        start = _first_touched(index, len(source))
+        source.insert(index, None)
+        self._cache.insert(index, value)
+        self._mutated(start, added=(value,))
+
+    def _mutated(self, start: int, removed: Iterable[Any] = (), added: Iterable[Any] = (), *, stop: int | None = None) -> None:
+        owner = self._owner
+        if owner is None:
+            return
+        for value in added:
+            if isinstance(value, _SlotsModel):
+                _set(value, "_parent", owner)
+        index = owner._changed()._index
+        if index is not None:
+            index._children_changed(owner, start, stop, removed)
+
+    def _raw_digest(self, raw: Mapping[str, Any]) -> bytes:
+        # Digests of unbuilt entries, by identity; the entry is kept with its
+        # digest so a recycled id can never match.
+        digests = self._digests
+        if digests is None:
+            digests = self._digests = {}
+        known = digests.get(id(raw))
+        if known is not None and known[0] is raw:
+            return known[1]
+        digest = _raw_digest(raw)
+        digests[id(raw)] = (raw, digest)
+        return digest
+
+    def __iter__(self) -> Iterator[PlanItem]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, LazyItemList)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    @property
+    def built_count(self) -> int:
+        """Number of entries turned into PlanItem objects so far."""
+        if self._source is None:
+            return 0
+        return sum(item is not _UNBUILT for item in self._cache)
 
 
 @dataclass
@@ -244,51 +794,68 @@ class VBriefDocument:
     _field_order: list[str] = field(default_factory=list, repr=False)
 
     @classmethod
-    def from_dict(cls, data: Mapping[str, Any], *, strict: bool = False) -> VBriefDocument:
-        """Create document from dict and optionally validate in strict mode."""
+    def from_dict(cls, data: Mapping[str, Any], *, strict: bool = False, lazy: bool = False) -> VBriefDocument:
+        """Create document from dict and optionally validate in strict mode.
+
+        With ``lazy`` plan items are only turned into :class:`PlanItem` objects
+        when accessed; untouched items are serialized straight from the
+        original mappings.
+
+        ``strict`` validates ``data`` itself against the core rules and raises
+        ValidationError at the first error, like ``libvbrief.loads``; the
+        items are built in the same traversal that validates them.
+        """
         if not isinstance(data, Mapping):
             data = {}
 
-        extras = {k: v for k, v in data.items() if k not in _DOCUMENT_FIELD_ORDER}
+        extras = {k: v for k, v in data.items() if k not in DOCUMENT_FIELD_ORDER}
 
         vbrief_info = data.get("vBRIEFInfo")
         if not isinstance(vbrief_info, dict):
             vbrief_info = {}
 
-        plan_raw = data.get("plan")
-        plan = Plan.from_dict(plan_raw if isinstance(plan_raw, Mapping) else {})
+        if strict:
+            plan = _load_valid_plan(data, lazy=lazy)
+        else:
+            plan_raw = data.get("plan")
+            plan = Plan.from_dict(plan_raw if isinstance(plan_raw, Mapping) else {}, lazy=lazy)
 
-        doc = cls(
+        return cls(
             vbrief_info=vbrief_info,
             plan=plan,
             extras=extras,
             _field_order=list(data.keys()),
         )
 
-        if strict:
-            report = doc.validate()
-            _raise_if_invalid(report)
-
-        return doc
-
     @classmethod
-    def from_json(cls, text: str, *, strict: bool = False) -> VBriefDocument:
-        """Create document from JSON string."""
-        data = parse_json(text)
-        return cls.from_dict(data, strict=strict)
+    def from_json(cls, text: str, *, strict: bool = False, lazy: bool = False, intern: bool = False) -> VBriefDocument:
+        """Create document from JSON string; ``intern`` shares strings between documents."""
+        data = parse_json(text, intern=intern)
+        return cls.from_dict(data, strict=strict, lazy=lazy)
 
     @classmethod
-    def from_file(cls, path: str | Path, *, strict: bool = False) -> VBriefDocument:
-        """Create document from JSON file."""
-        data = load_json_file(path)
-        return cls.from_dict(data, strict=strict)
+    def from_file(
+        cls,
+        path: str | Path,
+        *,
+        strict: bool = False,
+        lazy: bool = False,
+        intern: bool = False,
+    ) -> VBriefDocument:
+        """Create document from JSON file; ``intern`` works as in :meth:`from_json`."""
+        data = load_json_file(path, intern=intern)
+        return cls.from_dict(data, strict=strict, lazy=lazy)
 
     def to_dict(self, *, preserve_order: bool = False) -> dict[str, Any]:
         """Convert model to dict while preserving extras."""
-        known = {
-            "vBRIEFInfo": self.vbrief_info,
-            "plan": self.plan.to_dict(preserve_order=preserve_order),
-        }
+        return self._document_dict(self.plan.to_dict(preserve_order=preserve_order), preserve_order)
+
+    def _shared_dict(self, preserve_order: bool = False) -> dict[str, Any]:
+        # Like to_dict, over the plan's cached dicts; for read-only callers.
+        return self._document_dict(self.plan._shared_dict(preserve_order), preserve_order)
+
+    def _document_dict(self, plan: dict[str, Any], preserve_order: bool) -> dict[str, Any]:
+        known = {"vBRIEFInfo": self.vbrief_info, "plan": plan}
         return _merge_values(
             known=known,
             extras=self.extras,
@@ -298,7 +865,7 @@ class VBriefDocument:
 
     def to_json(self, *, canonical: bool = True, preserve_format: bool = False) -> str:
         """Serialize model to JSON text."""
-        payload = self.to_dict(preserve_order=preserve_format)
+        payload = self._shared_dict(preserve_format)
         return dumps_json(payload, canonical=canonical, preserve_format=preserve_format)
 
     def to_file(
@@ -309,87 +876,321 @@ class VBriefDocument:
         preserve_format: bool = False,
     ) -> None:
         """Serialize model to JSON file."""
-        payload = self.to_dict(preserve_order=preserve_format)
+        payload = self._shared_dict(preserve_format)
         dump_json_file(path, payload, canonical=canonical, preserve_format=preserve_format)
 
-    def validate(self) -> ValidationReport:
-        """Validate this document and return structured issues."""
-        from libvbrief.validation import validate_document
-
-        return validate_document(self)
-
-
-def _known_item_values(item: PlanItem, *, preserve_order: bool) -> dict[str, Any]:
-    values: dict[str, Any] = {
-        "title": item.title,
-        "status": item.status,
-    }
-    optional_pairs = {
-        "id": item.id,
-        "uid": item.uid,
-        "narrative": item.narrative,
-        "subItems": [sub.to_dict(preserve_order=preserve_order) for sub in item.subItems]
-        if item.subItems
-        else None,
-        "planRef": item.planRef,
-        "tags": item.tags,
-        "metadata": item.metadata,
-        "created": item.created,
-        "updated": item.updated,
-        "completed": item.completed,
-        "priority": item.priority,
-        "dueDate": item.dueDate,
-        "startDate": item.startDate,
-        "endDate": item.endDate,
-        "percentComplete": item.percentComplete,
-        "participants": item.participants,
-        "location": item.location,
-        "uris": item.uris,
-        "recurrence": item.recurrence,
-        "reminders": item.reminders,
-        "classification": item.classification,
-        "relatedComments": item.relatedComments,
-        "timezone": item.timezone,
-        "sequence": item.sequence,
-        "lastModifiedBy": item.lastModifiedBy,
-        "lockedBy": item.lockedBy,
-    }
-    for key, value in optional_pairs.items():
-        if value is not None:
-            values[key] = value
-    return values
-
-
-def _known_plan_values(plan: Plan, *, preserve_order: bool) -> dict[str, Any]:
-    values: dict[str, Any] = {
-        "title": plan.title,
-        "status": plan.status,
-        "items": [item.to_dict(preserve_order=preserve_order) for item in plan.items],
-    }
-    optional_pairs = {
-        "id": plan.id,
-        "uid": plan.uid,
-        "narratives": plan.narratives,
-        "edges": plan.edges,
-        "tags": plan.tags,
-        "metadata": plan.metadata,
-        "created": plan.created,
-        "updated": plan.updated,
-        "author": plan.author,
-        "reviewers": plan.reviewers,
-        "uris": plan.uris,
-        "references": plan.references,
-        "timezone": plan.timezone,
-        "agent": plan.agent,
-        "lastModifiedBy": plan.lastModifiedBy,
-        "changeLog": plan.changeLog,
-        "sequence": plan.sequence,
-        "fork": plan.fork,
-    }
-    for key, value in optional_pairs.items():
-        if value is not None:
-            values[key] = value
-    return values
+    def validate(
+        self,
+        *,
+        schema: bool | Mapping[str, Any] | CompiledSchema = False,
+        max_errors: int | None = None,
+        fail_fast: bool = False,
+        include_warnings: bool = True,
+    ) -> ValidationReport:
+        """Validate this document and return structured issues.
+
+        The keywords work as in :func:`libvbrief.validate`.
+        """
+        return validate_document(
+            self,
+            schema=schema,
+            max_errors=max_errors,
+            fail_fast=fail_fast,
+            include_warnings=include_warnings,
+        )
+
+    def apply_patch(
+        self,
+        operations: Iterable[Mapping[str, Any]],
+        *,
+        strict: bool = False,
+        agent: Mapping[str, Any] | None = None,
+        reason: str | None = None,
+    ) -> ValidationReport:
+        """Apply RFC 6902 JSON Patch ``operations`` in place and revalidate what they touched.
+
+        See :func:`libvbrief.patch.apply_patch`.
+        """
+        from libvbrief.patch import apply_patch
+
+        return apply_patch(self, operations, strict=strict, agent=agent, reason=reason)
+
+    def fork(self, *, reason: str | None = None) -> VBriefDocument:
+        """Return a derived document that shares this one's unchanged items.
+
+        The fork is loaded lazily (see :class:`LazyItemList`) over the cached
+        ``to_dict`` output of this plan, so forking costs nothing once that
+        is cached, an edit builds only the items on its path, and untouched
+        subtrees stay shared between all forks. Edits on either side do not
+        show on the other. Like the cached dicts, field values such as
+        ``tags`` lists are shared too: assign new values instead of editing
+        them in place.
+
+        The fork gets a new ``uid`` and ``fork`` metadata pointing at this
+        plan, which is given a ``uid`` first if it has none.
+        """
+        plan = self.plan
+        if plan.uid is None:
+            plan.uid = str(uuid4())
+        sequence = plan.sequence if type(plan.sequence) is int else 0
+        data = self._shared_dict()
+        metadata = {
+            "parentUid": plan.uid,
+            "parentSequence": sequence,
+            "forkedAt": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "mergeStatus": "unmerged",
+        }
+        if reason is not None:
+            metadata["forkReason"] = reason
+        forked = {**data, "vBRIEFInfo": dict(self.vbrief_info), "plan": {**data["plan"], "uid": str(uuid4()), "fork": metadata}}
+        return VBriefDocument.from_dict(forked, lazy=True)
+
+    def content_hash(self) -> str:
+        """Return the hex SHA-256 Merkle root of the document.
+
+        Covers ``vBRIEFInfo`` and document extras plus the plan's
+        :meth:`Plan.content_hash`; suitable as a cache key or HTTP ETag.
+        """
+        data = self._shared_dict()
+        own = {key: value for key, value in data.items() if key != "plan"}
+        return hashlib.sha256(dumps_jcs(own) + b"\0" + _digest(self.plan)).hexdigest()
+
+    @property
+    def index(self) -> ItemIndex:
+        """Lookup of the plan's items by id, uid and hierarchical path.
+
+        Built on first access and then kept current as the plan's items are
+        edited through the models (see :class:`libvbrief.index.ItemIndex`).
+        """
+        index = self.plan._index
+        if index is None:
+            from libvbrief.index import ItemIndex
+
+            index = ItemIndex(self.plan)
+        return index
+
+
+def _build_dicts(root: _SlotsModel, preserve_order: bool) -> dict[str, Any]:
+    """Serialize ``root`` bottom-up with an explicit stack, reusing cached dicts.
+
+    Each frame collects its children's dicts; a child without a cached dict
+    gets a frame of its own, and a finished frame hands its dict to the
+    frame below. Nesting depth is therefore not limited by recursion. A
+    frame is cached only if every change below it is reported to it.
+    """
+    mode = 1 if preserve_order else 0
+    stack = [[root, _child_entries(root), [], root._tracks_children()]]
+    while True:
+        frame = stack[-1]
+        node, entries, dicts, _ = frame
+        for raw, child in entries:
+            if child is _UNBUILT:
+                dicts.append(raw)
+                continue
+            if getattr(child, "_parent", None) is not node:
+                # Edits to this child would not reach ``node``.
+                frame[3] = False
+            cached = getattr(child, "_cached", None)
+            if cached is not None and cached[mode] is not None:
+                dicts.append(cached[mode])
+            elif isinstance(child, _SlotsModel):
+                stack.append([child, _child_entries(child), [], child._tracks_children()])
+                break
+            else:
+                dicts.append(child.to_dict(preserve_order=preserve_order))
+        else:
+            stack.pop()
+            tracked = frame[3]
+            result = node._build_dict(preserve_order, dicts, tracked)
+            if not stack:
+                return result
+            stack[-1][2].append(result)
+            # An untracked subtree leaves every ancestor untracked too.
+            stack[-1][3] = stack[-1][3] and tracked
+
+
+def _copy_dicts(data: dict[str, Any], children: str) -> dict[str, Any]:
+    """Copy the node dicts and child lists of a shared ``to_dict`` result.
+
+    Field values such as ``tags`` lists are the model's own, as they always
+    were; only the structure the cache shares between calls is copied.
+    """
+    root = dict(data)
+    stack = [(root, children)]
+    while stack:
+        node, key = stack.pop()
+        entries = node.get(key)
+        if type(entries) is list:
+            copies = node[key] = [dict(entry) if _is_mapping(entry) else entry for entry in entries]
+            stack.extend((entry, "subItems") for entry in copies if type(entry) is dict)
+    return root
+
+
+def _digest(root: _SlotsModel) -> bytes:
+    """Merkle digest of ``root``, bottom-up over the tree like :func:`_build_dicts`."""
+    cached = root._cached
+    if cached is not None and cached[2] is not None:
+        return cached[2]
+    stack = [(root, getattr(root, root._CHILDREN), _child_entries(root), [])]
+    while True:
+        node, children, entries, digests = stack[-1]
+        for raw, child in entries:
+            if child is _UNBUILT:
+                digests.append(children._raw_digest(raw))
+                continue
+            cached = getattr(child, "_cached", None)
+            if cached is not None and cached[2] is not None:
+                digests.append(cached[2])
+            elif isinstance(child, _SlotsModel):
+                stack.append((child, getattr(child, child._CHILDREN), _child_entries(child), []))
+                break
+            else:
+                digests.append(_raw_digest(child))
+        else:
+            stack.pop()
+            digest = _node_digest(node._shared_dict(), node._CHILDREN[1:], digests)
+            # to_dict only caches nodes whose changes are tracked.
+            if node._cached is not None:
+                node._cached[2] = digest
+            if not stack:
+                return digest
+            stack[-1][3].append(digest)
+
+
+def _raw_digest(raw: Mapping[str, Any]) -> bytes:
+    """Digest of a plan item mapping, equal to that of the PlanItem built from it."""
+    stack = [(raw, iter(_raw_children(raw)), [])]
+    while True:
+        data, entries, digests = stack[-1]
+        for entry in entries:
+            stack.append((entry, iter(_raw_children(entry)), []))
+            break
+        else:
+            stack.pop()
+            # A childless item built from the mapping normalizes its members.
+            digest = _node_digest(_load_plan_item(data)._shared_dict(), "subItems", digests)
+            if not stack:
+                return digest
+            stack[-1][2].append(digest)
+
+
+def _raw_children(data: Mapping[str, Any]) -> list[Any]:
+    sub_items = data.get("subItems")
+    if not isinstance(sub_items, list):
+        return []
+    return [entry for entry in sub_items if _is_mapping(entry)]
+
+
+def _node_digest(values: Mapping[str, Any], children: str, digests: list[bytes]) -> bytes:
+    own = {key: value for key, value in values.items() if key != children}
+    return hashlib.sha256(dumps_jcs(own) + b"\0" + b"".join(digests)).digest()
+
+
+def _child_entries(node: _SlotsModel) -> Iterator[tuple[Any, Any]]:
+    # (raw mapping, item) pairs; only unbuilt lazy entries use the raw side.
+    children = getattr(node, node._CHILDREN)
+    if not children:
+        return iter(())
+    if type(children) is LazyItemList:
+        return zip(children._entries(), children._cache)
+    return zip(children, children)
+
+
+_known_item_values = compile_known_values(
+    "_known_item_values",
+    PLAN_ITEM_FIELD_ORDER,
+    required=PLAN_ITEM_REQUIRED_FIELDS,
+    children="subItems",
+)
+_known_plan_values = compile_known_values(
+    "_known_plan_values",
+    PLAN_FIELD_ORDER,
+    required=PLAN_REQUIRED_FIELDS,
+    children="items",
+)
+_load_plan_item = compile_loader(
+    "_load_plan_item",
+    _LoadingPlanItem,
+    PLAN_ITEM_FIELD_ORDER,
+    defaults={"title": "", "status": ""},
+    children="subItems",
+    intern_layout=_intern_layout,
+    final_cls=PlanItem,
+    tracking=PlanItem._TRACKING,
+)
+_load_plan = compile_loader(
+    "_load_plan",
+    _LoadingPlan,
+    PLAN_FIELD_ORDER,
+    defaults={"title": "", "status": ""},
+    children="items",
+    intern_layout=_intern_layout,
+    final_cls=Plan,
+    tracking=Plan._TRACKING,
+)
+
+
+def _is_mapping(value: Any) -> bool:
+    return type(value) is dict or isinstance(value, Mapping)
+
+
+def _same_json(left: Any, right: Any) -> bool:
+    """``left == right`` for JSON values, except that booleans never equal numbers."""
+    stack = [(left, right)]
+    while stack:
+        left, right = stack.pop()
+        if left is right:
+            continue
+        # True and False are singletons, so a boolean here differs from right.
+        if type(left) is bool or type(right) is bool:
+            return False
+        if _is_mapping(left):
+            if not _is_mapping(right) or len(left) != len(right):
+                return False
+            for key, value in left.items():
+                if key not in right:
+                    return False
+                stack.append((value, right[key]))
+        elif isinstance(left, list):
+            if not isinstance(right, list) or len(left) != len(right):
+                return False
+            stack.extend(zip(left, right))
+        elif left != right:
+            return False
+    return True
+
+
+def _load_subclass(cls: type[_SlotsModel], data: Mapping[str, Any]) -> Any:
+    # Generic path for subclasses, which may define their own __init__.
+    fields = PLAN_ITEM_FIELD_ORDER if issubclass(cls, PlanItem) else PLAN_FIELD_ORDER
+    children = cls._CHILDREN[1:]
+    kwargs = {name: data[name] for name in fields if name != children and name in data}
+    kwargs["extras"] = {k: v for k, v in data.items() if k not in fields} or None
+    kwargs["_field_order"] = data.keys()
+    return cls(**kwargs)
+
+
+def _attach_items(
+    owner: _SlotsModel,
+    entries: list[Any],
+    load: Callable[[Mapping[str, Any]], PlanItem],
+    *,
+    lazy: bool,
+) -> None:
+    """Build the item lists below ``owner`` top-down with an explicit stack."""
+    if lazy:
+        _set(owner, owner._CHILDREN, LazyItemList(entries, owner=owner))
+        return
+    pending = [(owner, entries)]
+    while pending:
+        node, entries = pending.pop()
+        raws = [entry for entry in entries if _is_mapping(entry)]
+        children = [load(raw) for raw in raws]
+        _set(node, node._CHILDREN, _ItemList(children, node))
+        for child, raw in zip(children, raws):
+            sub_items = raw.get("subItems")
+            if isinstance(sub_items, list) and sub_items:
+                pending.append((child, sub_items))
 
 
 def _merge_values(
@@ -423,6 +1224,49 @@ def _merge_values(
     return merged
 
 
+class _PlanBuilder(Rule):
+    """Builds the plan like ``Plan.from_dict`` while the engine validates it.
+
+    The engine visits items parent first, so each item is appended to the
+    list of the model built for its parent; the lists are attached once the
+    traversal finished without errors.
+    """
+
+    def __init__(self) -> None:
+        self.result: Plan | None = None
+        self._lists: dict[int | None, list[PlanItem]] = {}
+        self._owners: list[tuple[_SlotsModel, list[PlanItem]]] = []
+
+    def plan(self, plan: Mapping[str, Any], report: ValidationReport) -> None:
+        self.result = _load_plan(plan)
+        if isinstance(plan.get("items"), list):
+            self._lists[None] = children = []
+            self._owners.append((self.result, children))
+
+    def item(self, item: Mapping[str, Any], parent: Mapping[str, Any] | None, path: ItemPath, report: ValidationReport) -> None:
+        model = _load_plan_item(item)
+        self._lists[None if parent is None else id(parent)].append(model)
+        sub_items = item.get("subItems")
+        if isinstance(sub_items, list) and sub_items:
+            self._lists[id(item)] = children = []
+            self._owners.append((model, children))
+
+    def finish(self, report: ValidationReport) -> None:
+        for owner, children in self._owners:
+            _set(owner, owner._CHILDREN, _ItemList(children, owner))
+
+
+def _load_valid_plan(data: Mapping[str, Any], *, lazy: bool) -> Plan:
+    # Strict loading: one traversal validates the raw document and, unless
+    # the items are lazy, builds them; a valid document has a plan mapping.
+    if lazy:
+        _raise_if_invalid(RuleEngine(CORE_RULES).validate(data, fail_fast=True, include_warnings=False))
+        return Plan.from_dict(data["plan"], lazy=True)
+    builder = _PlanBuilder()
+    _raise_if_invalid(RuleEngine(CORE_RULES + (builder,)).validate(data, fail_fast=True, include_warnings=False))
+    return builder.result
+
+
 def _raise_if_invalid(report: ValidationReport) -> None:
     if not report.is_valid:
         raise ValidationError(report)
@@ -0,0 +1,500 @@
+"""RFC 6902 JSON Patch applied directly to the document models.
+
+Operations address the document's JSON form with RFC 6901 pointers such as
+``/plan/items/3/subItems/0/status`` and are carried out as model edits
+(attribute assignments and item list operations), so cached dicts, the item
+index and query indexes follow along. Only what the patch touched is
+revalidated afterwards: applying a patch costs time in proportion to the
+patch, not to the document.
+"""
+
+from __future__ import annotations
+
+import copy
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Callable, Iterable, Mapping
+
+from libvbrief.compat.policy import (
+    PLAN_FIELD_ORDER,
+    PLAN_ITEM_FIELD_ORDER,
+    PLAN_ITEM_REQUIRED_FIELDS,
+    PLAN_REQUIRED_FIELDS,
+)
+from libvbrief.errors import PatchError, ValidationError
+from libvbrief.issues import ValidationReport
+from libvbrief.models import (
+    LazyItemList,
+    Plan,
+    PlanItem,
+    VBriefDocument,
+    _ItemList,
+    _known_item_values,
+    _known_plan_values,
+    _same_json,
+    _set,
+    _SlotsModel,
+)
+from libvbrief.traversal import ItemPath, walk_items
+from libvbrief.validation import _validate_info, _validate_item, _validate_plan_fields
+
+_MISSING = object()
+_NO_EXTRAS: dict[str, Any] = {}
+_OPERATIONS = ("add", "remove", "replace", "move", "copy", "test")
+_KNOWN = {Plan: frozenset(PLAN_FIELD_ORDER), PlanItem: frozenset(PLAN_ITEM_FIELD_ORDER)}
+_REQUIRED = {
+    VBriefDocument: frozenset({"vBRIEFInfo", "plan"}),
+    Plan: frozenset(PLAN_REQUIRED_FIELDS),
+    PlanItem: frozenset(PLAN_ITEM_REQUIRED_FIELDS),
+}
+
+
+def apply_patch(
+    document: VBriefDocument,
+    operations: Iterable[Mapping[str, Any]],
+    *,
+    strict: bool = False,
+    agent: Mapping[str, Any] | None = None,
+    reason: str | None = None,
+) -> ValidationReport:
+    """Apply JSON Patch ``operations`` to ``document`` in place.
+
+    The patch is atomic: if an operation fails, the ones before it are
+    undone and PatchError is raised. The plan fields, items and vBRIEFInfo
+    the patch touched are then revalidated with the checks of
+    :func:`libvbrief.validation.validate_document`, and the returned report
+    holds their issues; issues elsewhere in the document are not repeated.
+    Any other exception, from an operation or from the revalidation, also
+    undoes the patch before it propagates.
+    With ``strict`` a report with errors undoes the patch and raises
+    ValidationError.
+
+    A successful patch increments ``plan.sequence``. Given an ``agent`` (a
+    vBRIEF Agent object) it also appends an ``update`` entry, with
+    ``reason`` if given, to ``plan.changeLog``.
+    """
+    session = _Session(document)
+    number = 0
+    try:
+        for number, operation in enumerate(operations):
+            session.apply(operation)
+        report = session.revalidate()
+    except PatchError as error:
+        session.undo()
+        raise PatchError(f"Operation {number}: {error}") from None
+    except BaseException:
+        session.undo()
+        raise
+    if strict and not report.is_valid:
+        session.undo()
+        raise ValidationError(report)
+    _record(document.plan, agent, reason)
+    return report
+
+
+class _Session:
+    """The edits of one patch: how to undo them and which nodes they touched."""
+
+    def __init__(self, document: VBriefDocument) -> None:
+        self.document = document
+        self._undo: list[Callable[[], None]] = []
+        # id(node) -> (node, positions when touched, whole subtree?)
+        self._touched: dict[int, tuple[_SlotsModel, tuple[int, ...], bool]] = {}
+        self._info = False
+
+    def apply(self, operation: Mapping[str, Any]) -> None:
+        if not isinstance(operation, Mapping):
+            raise PatchError("operation must be an object")
+        op = operation.get("op")
+        if op not in _OPERATIONS:
+            raise PatchError(f"unknown op {op!r}; expected one of {list(_OPERATIONS)}")
+        path = _pointer(operation, "path")
+        if op in ("add", "replace", "test"):
+            if "value" not in operation:
+                raise PatchError(f"{op} requires a value")
+            value = operation["value"]
+        if op == "test":
+            if not _same_json(_json(self._get(path)), value):
+                raise PatchError(f"test failed at {_render(path)}")
+            return
+        if not path:
+            raise PatchError(f"cannot {op} the whole document")
+        if op == "add":
+            self._add(path, value)
+        elif op == "remove":
+            self._remove(path)
+        elif op == "replace":
+            self._replace(path, value)
+        else:
+            source = _pointer(operation, "from")
+            value = self._get(source)
+            if op == "copy":
+                self._add(path, copy.deepcopy(_json(value)))
+            elif source != path:
+                if path[: len(source)] == source:
+                    raise PatchError(f"cannot move {_render(source)} into itself")
+                self._remove(source)
+                self._add(path, value)
+
+    def undo(self) -> None:
+        while self._undo:
+            self._undo.pop()()
+
+    # Operations on a resolved location: a member of the document, plan or an
+    # item (and a pointer into its value), or an element of an item list.
+
+    def _get(self, path: list[str]) -> Any:
+        if not path:
+            return self.document
+        owner, positions, name, rest = self._resolve(path)
+        if name is None:
+            children, position = self._element(owner, rest[0])
+            return children[position]
+        value = self._read(owner, name)
+        if value is _MISSING:
+            raise PatchError(f"no value at {_render(path)}")
+        return _json_get(value, rest, path)
+
+    def _add(self, path: list[str], value: Any) -> None:
+        owner, positions, name, rest = self._resolve(path)
+        if name is None:
+            children, position = self._element(owner, rest[0], end=True)
+            item = _as_item(value)
+            children.insert(position, item)
+            self._undo.append(partial(children.__delitem__, position))
+            self._touch(item, positions + (position,), tree=True)
+        elif rest:
+            self._write(owner, positions, name, _edited(self._read(owner, name), rest, "add", value, path))
+        else:
+            self._write(owner, positions, name, self._converted(owner, name, value))
+
+    def _remove(self, path: list[str]) -> None:
+        owner, positions, name, rest = self._resolve(path)
+        if name is None:
+            children, position = self._element(owner, rest[0])
+            item = children[position]
+            del children[position]
+            self._undo.append(partial(children.insert, position, item))
+        elif rest:
+            self._write(owner, positions, name, _edited(self._read(owner, name), rest, "remove", None, path))
+        elif name in _required(owner):
+            raise PatchError(f"cannot remove required member {_render(path)}")
+        elif self._read(owner, name) is _MISSING:
+            # An emptied item list still reads as missing; removing it is a no-op.
+            if isinstance(owner, VBriefDocument) or name != owner._CHILDREN[1:]:
+                raise PatchError(f"no value at {_render(path)}")
+        else:
+            self._write(owner, positions, name, _MISSING)
+
+    def _replace(self, path: list[str], value: Any) -> None:
+        owner, positions, name, rest = self._resolve(path)
+        if name is None:
+            children, position = self._element(owner, rest[0])
+            old, item = children[position], _as_item(value)
+            children[position] = item
+            self._undo.append(partial(children.__setitem__, position, old))
+            self._touch(item, positions + (position,), tree=True)
+        elif rest:
+            self._write(owner, positions, name, _edited(self._read(owner, name), rest, "replace", value, path))
+        elif self._read(owner, name) is _MISSING:
+            raise PatchError(f"no value at {_render(path)}")
+        else:
+            self._write(owner, positions, name, self._converted(owner, name, value))
+
+    def _resolve(self, path: list[str]) -> tuple[Any, tuple[int, ...], Any, list[str]]:
+        """Return ``(owner, positions, name, rest)`` for ``path``.
+
+        ``owner`` is the document, the plan or an item (at ``positions``
+        below the plan) and ``name`` the member of it, with ``rest`` the
+        pointer into the member's value. For an element of the owner's item
+        list ``name`` is None and ``rest`` holds just the array index.
+        """
+        document = self.document
+        if path[0] != "plan" or len(path) == 1:
+            return document, (), path[0], path[1:]
+        node: _SlotsModel = document.plan
+        positions: tuple[int, ...] = ()
+        depth = 1
+        while True:
+            name = path[depth]
+            if name != node._CHILDREN[1:] or depth + 1 == len(path):
+                return node, positions, name, path[depth + 1 :]
+            if depth + 2 == len(path):
+                return node, positions, None, path[depth + 1 :]
+            children, position = self._element(node, path[depth + 1])
+            node = children[position]
+            positions += (position,)
+            depth += 2
+
+    def _element(self, owner: _SlotsModel, token: str, *, end: bool = False) -> tuple[Any, int]:
+        children = self._children(owner)
+        return children, _index(token, len(children), end=end)
+
+    def _children(self, owner: _SlotsModel) -> Any:
+        children = getattr(owner, owner._CHILDREN[1:])
+        if not isinstance(children, (_ItemList, LazyItemList)):
+            # A plain list the caller assigned: track it from now on.
+            children = _ItemList(children, owner)
+            _set(owner, owner._CHILDREN, children)
+        return children
+
+    def _read(self, owner: Any, name: str) -> Any:
+        if isinstance(owner, VBriefDocument):
+            if name == "vBRIEFInfo":
+                return owner.vbrief_info
+            if name == "plan":
+                return owner.plan
+            return owner.extras.get(name, _MISSING)
+        if name == owner._CHILDREN[1:]:
+            children = self._children(owner)
+            return children if children or name in _required(owner) else _MISSING
+        if name in _KNOWN[_model_type(owner)]:
+            value = getattr(owner, name)
+            return value if value is not None or name in _required(owner) else _MISSING
+        return (owner._extras or _NO_EXTRAS).get(name, _MISSING)
+
+    def _write(self, owner: Any, positions: tuple[int, ...], name: str, value: Any) -> None:
+        old = self._read(owner, name)
+        _store(owner, name, value)
+        self._undo.append(partial(_store, owner, name, old))
+        if isinstance(owner, VBriefDocument):
+            if name == "vBRIEFInfo":
+                self._info = True
+            elif name == "plan":
+                self._touch(owner.plan, (), tree=True)
+        else:
+            self._touch(owner, positions, tree=name == owner._CHILDREN[1:])
+
+    def _converted(self, owner: Any, name: str, value: Any) -> Any:
+        """Turn JSON ``value`` into what the model stores for member ``name``."""
+        if isinstance(owner, VBriefDocument):
+            if name == "plan":
+                if not isinstance(value, Mapping):
+                    raise PatchError("plan must be an object")
+                return Plan.from_dict(value)
+            return _json(value)
+        if name == owner._CHILDREN[1:]:
+            if not isinstance(value, (list, LazyItemList)):
+                raise PatchError(f"{name} must be an array")
+            return _ItemList([_as_item(entry) for entry in value], owner)
+        return _json(value)
+
+    def _touch(self, node: _SlotsModel, positions: tuple[int, ...], *, tree: bool) -> None:
+        seen = self._touched.get(id(node))
+        if seen is not None and seen[0] is node:
+            tree = tree or seen[2]
+        self._touched[id(node)] = (node, positions, tree)
+
+    def revalidate(self) -> ValidationReport:
+        """Validate what the patch touched, in document order."""
+        report = ValidationReport()
+        document = self.document
+        if self._info:
+            _validate_info({"vBRIEFInfo": document.vbrief_info}, report)
+        plan = document.plan
+        located = []
+        for node, hint, tree in self._touched.values():
+            positions = _locate(plan, node, hint)
+            if positions is not None:
+                located.append((positions, tree, node))
+        located.sort(key=lambda entry: entry[0])
+        covered: tuple[int, ...] | None = None
+        for positions, tree, node in located:
+            if covered is not None and positions[: len(covered)] == covered:
+                continue
+            if node is plan:
+                path: str | ItemPath = "plan.items"
+                _validate_plan_fields({**_known_plan_values(plan, []), **(plan._extras or _NO_EXTRAS)}, report)
+            else:
+                path = _item_path(positions)
+                _validate_item(_item_fields(node), path, report)
+            if tree:
+                covered = positions
+                children = getattr(node, node._CHILDREN) or ()
+                for item_path, item, _ in walk_items(children, path=path, children=_model_children):
+                    if isinstance(item, PlanItem):
+                        _validate_item(_item_fields(item), item_path, report)
+        return report
+
+
+def _store(owner: Any, name: str, value: Any) -> None:
+    if isinstance(owner, VBriefDocument):
+        if name == "vBRIEFInfo":
+            owner.vbrief_info = value
+        elif name == "plan":
+            owner.plan = value
+        elif value is _MISSING:
+            del owner.extras[name]
+        else:
+            owner.extras[name] = value
+    elif name == owner._CHILDREN[1:] or name in _KNOWN[_model_type(owner)]:
+        setattr(owner, name, None if value is _MISSING else value)
+    elif value is _MISSING:
+        del owner.extras[name]
+    else:
+        owner.extras[name] = value
+
+
+def _record(plan: Plan, agent: Mapping[str, Any] | None, reason: str | None) -> None:
+    sequence = plan.sequence
+    sequence = sequence + 1 if type(sequence) is int and sequence >= 0 else 1
+    plan.sequence = sequence
+    if agent is None:
+        return
+    entry = {
+        "sequence": sequence,
+        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "agent": dict(agent),
+        "operation": "update",
+    }
+    if reason is not None:
+        entry["reason"] = reason
+    # A new list: the old one may be shared with the dict the plan was loaded from.
+    change_log = plan.changeLog
+    plan.changeLog = [*change_log, entry] if isinstance(change_log, list) else [entry]
+
+
+def _model_type(owner: _SlotsModel) -> type:
+    return PlanItem if isinstance(owner, PlanItem) else Plan
+
+
+def _required(owner: Any) -> frozenset[str]:
+    return _REQUIRED[VBriefDocument if isinstance(owner, VBriefDocument) else _model_type(owner)]
+
+
+def _model_children(item: Any) -> Any:
+    return item._subItems if isinstance(item, PlanItem) else None
+
+
+def _item_fields(item: PlanItem) -> dict[str, Any]:
+    # What to_dict would give for the item's own members, without its subItems.
+    return {**_known_item_values(item, ()), **(item._extras or _NO_EXTRAS)}
+
+
+def _as_item(value: Any) -> PlanItem:
+    if isinstance(value, PlanItem):
+        return value
+    if not isinstance(value, Mapping):
+        raise PatchError("plan items must be objects")
+    return PlanItem.from_dict(value)
+
+
+def _json(value: Any) -> Any:
+    if isinstance(value, (_SlotsModel, VBriefDocument)):
+        return value.to_dict()
+    if isinstance(value, (_ItemList, LazyItemList)):
+        return [_json(entry) for entry in value]
+    return value
+
+
+def _locate(plan: Plan, node: _SlotsModel, hint: tuple[int, ...]) -> tuple[int, ...] | None:
+    """Return the positions of ``node`` below ``plan``, or None if it is not in it.
+
+    ``hint`` holds the positions the node had when the patch touched it; a
+    later operation may have moved it, in which case the siblings are
+    searched.
+    """
+    positions = []
+    level = len(hint)
+    while node is not plan:
+        owner = node._parent
+        if owner is None:
+            return None
+        children = getattr(owner, owner._CHILDREN)
+        entries = children._cache if type(children) is LazyItemList else children or ()
+        level -= 1
+        position = hint[level] if level >= 0 else -1
+        if not 0 <= position < len(entries) or entries[position] is not node:
+            position = next((index for index, entry in enumerate(entries) if entry is node), None)
+            if position is None:
+                return None
+        positions.append(position)
+        node = owner
+    positions.reverse()
+    return tuple(positions)
+
+
+def _item_path(positions: tuple[int, ...]) -> ItemPath:
+    path: str | ItemPath = "plan.items"
+    for position in positions:
+        path = ItemPath(path, position)
+    return path
+
+
+# JSON Pointer handling and edits inside plain JSON values.
+
+
+def _pointer(operation: Mapping[str, Any], key: str) -> list[str]:
+    pointer = operation.get(key)
+    if not isinstance(pointer, str):
+        raise PatchError(f"{key} must be a JSON Pointer string")
+    if not pointer:
+        return []
+    if not pointer.startswith("/"):
+        raise PatchError(f"JSON Pointer {pointer!r} must start with '/'")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _render(path: list[str]) -> str:
+    return "".join("/" + token.replace("~", "~0").replace("/", "~1") for token in path) or "''"
+
+
+def _index(token: str, length: int, *, end: bool = False) -> int:
+    """Array index ``token``; with ``end``, ``-`` and ``length`` are allowed (for add)."""
+    if end and token == "-":
+        return length
+    if not (token.isascii() and token.isdigit()) or (len(token) > 1 and token[0] == "0"):
+        raise PatchError(f"{token!r} is not an array index")
+    index = int(token)
+    if index > length or (index == length and not end):
+        raise PatchError(f"array index {index} is out of range")
+    return index
+
+
+def _json_get(value: Any, tokens: list[str], path: list[str]) -> Any:
+    for token in tokens:
+        if isinstance(value, Mapping):
+            if token not in value:
+                raise PatchError(f"no value at {_render(path)}")
+            value = value[token]
+        elif isinstance(value, list):
+            value = value[_index(token, len(value))]
+        else:
+            raise PatchError(f"no value at {_render(path)}")
+    return value
+
+
+def _edited(container: Any, tokens: list[str], op: str, value: Any, path: list[str]) -> Any:
+    """Return a copy of ``container`` with ``op`` applied at ``tokens``.
+
+    Only the containers along the way are copied, so a model's field can be
+    swapped for the edited value in one tracked assignment.
+    """
+    if container is _MISSING:
+        raise PatchError(f"no value at {_render(path)}")
+    token, rest = tokens[0], tokens[1:]
+    if isinstance(container, Mapping):
+        result = dict(container)
+        if rest or op != "add":
+            if token not in result:
+                raise PatchError(f"no value at {_render(path)}")
+        if rest:
+            result[token] = _edited(result[token], rest, op, value, path)
+        elif op == "remove":
+            del result[token]
+        else:
+            result[token] = _json(value)
+        return result
+    if isinstance(container, list):
+        result = list(container)
+        index = _index(token, len(result), end=op == "add" and not rest)
+        if rest:
+            result[index] = _edited(result[index], rest, op, value, path)
+        elif op == "add":
+            result.insert(index, _json(value))
+        elif op == "remove":
+            del result[index]
+        else:
+            result[index] = _json(value)
+        return result
+    raise PatchError(f"no value at {_render(path)}")
@@ -0,0 +1,586 @@
+"""Indexed queries over plan items.
+
+Conditions are built from :data:`F` and combined with ``&`` and ``|``::
+
+    from libvbrief.query import F, PlanQuery
+
+    query = PlanQuery(doc)
+    query.select(
+        F.status == "blocked",
+        F.priority.isin("high", "critical"),
+        F.tags.contains("backend"),
+        F.dueDate.between("2026-10-12T00:00:00Z", "2026-10-18T23:59:59Z"),
+        order_by="dueDate",
+    )
+
+:class:`PlanQuery` keeps hash indexes on the enum-like fields, sorted
+indexes on the date-time fields and inverted indexes on tags, participant
+ids and metadata keys. For each query it starts from the index that
+matches the fewest items and checks the remaining conditions on those
+alone. The indexes follow the plan through :class:`~libvbrief.index.ItemIndex`:
+item list mutations and field assignments update them incrementally.
+Like the ``to_dict`` cache, they do not see in-place edits of a field's
+value (``item.tags.append(...)``); assign a new value instead.
+"""
+
+from __future__ import annotations
+
+import bisect
+from datetime import date, datetime, timezone
+from collections.abc import Hashable, Mapping
+from functools import partial
+from typing import Any, Callable, Iterable, Iterator, NamedTuple
+
+from libvbrief.compat.policy import PLAN_ITEM_FIELD_ORDER
+from libvbrief.index import ItemIndex
+from libvbrief.models import Plan, PlanItem, VBriefDocument
+from libvbrief.traversal import walk_items
+
+HASH_INDEXED_FIELDS = ("status", "priority", "classification")
+DATE_FIELDS = ("dueDate", "startDate", "endDate", "created", "updated", "completed")
+MEMBER_INDEXED_FIELDS = ("tags", "participants", "metadata")
+
+_QUERYABLE_FIELDS = frozenset(PLAN_ITEM_FIELD_ORDER) - {"subItems"}
+_AFTER = float("inf")
+
+
+def date_key(value: Any) -> datetime | None:
+    """Normalize an ISO 8601 date-time (or date/datetime) to aware UTC; None if not one.
+
+    Values without an offset, such as ``"2026-10-12"``, are taken as UTC.
+    """
+    if isinstance(value, str):
+        if value[-1:] in ("Z", "z"):
+            # Python 3.10's fromisoformat does not accept the UTC designator.
+            value = value[:-1] + "+00:00"
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    elif isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    elif not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _members(name: str, value: Any) -> Iterable[Hashable]:
+    # What ``contains`` looks for: tags, participant ids, metadata keys.
+    if name == "metadata":
+        return value.keys() if isinstance(value, Mapping) else ()
+    if type(value) is not list:
+        return ()
+    if name == "participants":
+        value = [member.get("id") if isinstance(member, Mapping) else member for member in value]
+    return [member for member in value if type(member) is str or _hashable(member)]
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+class Condition:
+    """A test on plan items; combine with ``&`` and ``|``."""
+
+    def matches(self, item: PlanItem) -> bool:
+        raise NotImplementedError
+
+    def __and__(self, other: Condition) -> Condition:
+        return All((self, other))
+
+    def __or__(self, other: Condition) -> Condition:
+        return AnyOf((self, other))
+
+
+class Equals(Condition):
+    """Field value is one of ``values``."""
+
+    def __init__(self, name: str, values: Iterable[Any]) -> None:
+        self.name = name
+        self.values = frozenset(values)
+
+    def matches(self, item: PlanItem) -> bool:
+        try:
+            return getattr(item, self.name) in self.values
+        except TypeError:
+            return False
+
+    def __repr__(self) -> str:
+        if len(self.values) == 1:
+            return f"F.{self.name} == {next(iter(self.values))!r}"
+        return f"F.{self.name}.isin({', '.join(repr(value) for value in self.values)})"
+
+
+class Contains(Condition):
+    """List field holds ``value``; participants match by id, metadata by key."""
+
+    def __init__(self, name: str, value: Hashable) -> None:
+        self.name = name
+        self.value = value
+
+    def matches(self, item: PlanItem) -> bool:
+        return self.value in _members(self.name, getattr(item, self.name))
+
+    def __repr__(self) -> str:
+        return f"F.{self.name}.contains({self.value!r})"
+
+
+class Range(Condition):
+    """Field value lies between ``low`` and ``high`` (either may be None).
+
+    Date-time fields are compared as instants (see :func:`date_key`).
+    """
+
+    def __init__(self, name: str, low: Any = None, high: Any = None, *, include_low: bool = True, include_high: bool = True) -> None:
+        self.name = name
+        self.key = date_key if name in DATE_FIELDS else None
+        self.low = self._bound(low)
+        self.high = self._bound(high)
+        self.include_low = include_low
+        self.include_high = include_high
+
+    def _bound(self, value: Any) -> Any:
+        if value is None or self.key is None:
+            return value
+        key = self.key(value)
+        if key is None:
+            raise ValueError(f"{self.name} bound {value!r} is not an ISO 8601 date-time")
+        return key
+
+    def matches(self, item: PlanItem) -> bool:
+        value = getattr(item, self.name)
+        if self.key is not None:
+            value = self.key(value)
+        if value is None:
+            return False
+        try:
+            if self.low is not None and (value < self.low or (value == self.low and not self.include_low)):
+                return False
+            if self.high is not None and (value > self.high or (value == self.high and not self.include_high)):
+                return False
+        except TypeError:
+            return False
+        return True
+
+    def __repr__(self) -> str:
+        low = "[" if self.include_low else "("
+        high = "]" if self.include_high else ")"
+        return f"F.{self.name} in {low}{self.low}, {self.high}{high}"
+
+
+class All(Condition):
+    """Every condition holds."""
+
+    def __init__(self, conditions: Iterable[Condition]) -> None:
+        self.conditions = tuple(_flatten(conditions, All))
+
+    def matches(self, item: PlanItem) -> bool:
+        return all(condition.matches(item) for condition in self.conditions)
+
+    def __repr__(self) -> str:
+        return "(" + " & ".join(map(repr, self.conditions)) + ")"
+
+
+class AnyOf(Condition):
+    """At least one condition holds."""
+
+    def __init__(self, conditions: Iterable[Condition]) -> None:
+        self.conditions = tuple(_flatten(conditions, AnyOf))
+
+    def matches(self, item: PlanItem) -> bool:
+        return any(condition.matches(item) for condition in self.conditions)
+
+    def __repr__(self) -> str:
+        return "(" + " | ".join(map(repr, self.conditions)) + ")"
+
+
+def _flatten(conditions: Iterable[Condition], kind: type) -> Iterator[Condition]:
+    for condition in conditions:
+        if type(condition) is kind:
+            yield from condition.conditions
+        else:
+            yield condition
+
+
+class Field:
+    """Builds conditions on one PlanItem field; obtain through :data:`F`."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __eq__(self, value: Any) -> Equals:  # type: ignore[override]
+        return Equals(self.name, (value,))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def isin(self, *values: Any) -> Equals:
+        return Equals(self.name, values)
+
+    def contains(self, value: Hashable) -> Contains:
+        return Contains(self.name, value)
+
+    def between(self, low: Any, high: Any) -> Range:
+        return Range(self.name, low, high)
+
+    def __lt__(self, value: Any) -> Range:
+        return Range(self.name, high=value, include_high=False)
+
+    def __le__(self, value: Any) -> Range:
+        return Range(self.name, high=value)
+
+    def __gt__(self, value: Any) -> Range:
+        return Range(self.name, low=value, include_low=False)
+
+    def __ge__(self, value: Any) -> Range:
+        return Range(self.name, low=value)
+
+
+class _Fields:
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Field:
+        if name not in _QUERYABLE_FIELDS:
+            raise AttributeError(f"PlanItem has no queryable field {name!r}")
+        return Field(name)
+
+
+F = _Fields()
+"""Condition builder: ``F.status == "blocked"``, ``F.tags.contains("x")``."""
+
+
+class _HashIndex:
+    """Field value to the items having it."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.buckets: dict[Any, dict[int, PlanItem]] = {}
+        self.keys: dict[int, Any] = {}
+
+    def add(self, item: PlanItem) -> None:
+        key = getattr(item, self.name)
+        try:
+            bucket = self.buckets.setdefault(key, {})
+        except TypeError:
+            return
+        bucket[id(item)] = item
+        self.keys[id(item)] = key
+
+    def add_all(self, items: Iterable[PlanItem]) -> None:
+        for item in items:
+            self.add(item)
+
+    def remove(self, item: PlanItem) -> None:
+        if id(item) in self.keys:
+            key = self.keys.pop(id(item))
+            bucket = self.buckets[key]
+            del bucket[id(item)]
+            if not bucket:
+                del self.buckets[key]
+
+    def count(self, condition: Equals) -> int:
+        return sum(len(self.buckets.get(value, ())) for value in condition.values)
+
+    def lookup(self, condition: Equals) -> Iterator[PlanItem]:
+        for value in condition.values:
+            yield from self.buckets.get(value, {}).values()
+
+
+class _MemberIndex:
+    """Inverted index: tag, participant id or metadata key to the items holding it."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.postings: dict[Hashable, dict[int, PlanItem]] = {}
+        self.keys: dict[int, tuple[Hashable, ...]] = {}
+
+    def add(self, item: PlanItem) -> None:
+        members = tuple(dict.fromkeys(_members(self.name, getattr(item, self.name))))
+        if members:
+            self.keys[id(item)] = members
+            for member in members:
+                self.postings.setdefault(member, {})[id(item)] = item
+
+    def add_all(self, items: Iterable[PlanItem]) -> None:
+        for item in items:
+            self.add(item)
+
+    def remove(self, item: PlanItem) -> None:
+        for member in self.keys.pop(id(item), ()):
+            posting = self.postings[member]
+            del posting[id(item)]
+            if not posting:
+                del self.postings[member]
+
+    def count(self, condition: Contains) -> int:
+        return len(self.postings.get(condition.value, ()))
+
+    def lookup(self, condition: Contains) -> Iterator[PlanItem]:
+        yield from self.postings.get(condition.value, {}).values()
+
+
+class _SortedIndex:
+    """Items with a valid date-time in ``name``, ordered by instant."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.order: list[tuple[datetime, int]] = []
+        self.items: dict[int, PlanItem] = {}
+        self.keys: dict[int, datetime] = {}
+
+    def add(self, item: PlanItem) -> None:
+        key = date_key(getattr(item, self.name))
+        if key is None:
+            return
+        self.keys[id(item)] = key
+        self.items[id(item)] = item
+        bisect.insort(self.order, (key, id(item)))
+
+    def add_all(self, items: Iterable[PlanItem]) -> None:
+        # One sort instead of an insort per item.
+        for item in items:
+            key = date_key(getattr(item, self.name))
+            if key is not None:
+                self.keys[id(item)] = key
+                self.items[id(item)] = item
+        self.order = sorted((key, item_id) for item_id, key in self.keys.items())
+
+    def remove(self, item: PlanItem) -> None:
+        key = self.keys.pop(id(item), None)
+        if key is None:
+            return
+        del self.items[id(item)]
+        del self.order[bisect.bisect_left(self.order, (key, id(item)))]
+
+    def _bounds(self, condition: Range) -> tuple[int, int]:
+        # Among (key, id) pairs, (key,) sorts before and (key, inf) after
+        # every pair with that key.
+        order = self.order
+        start, stop = 0, len(order)
+        if condition.low is not None:
+            start = bisect.bisect_left(order, (condition.low,) if condition.include_low else (condition.low, _AFTER))
+        if condition.high is not None:
+            stop = bisect.bisect_left(order, (condition.high, _AFTER) if condition.include_high else (condition.high,))
+        return start, max(start, stop)
+
+    def count(self, condition: Range) -> int:
+        start, stop = self._bounds(condition)
+        return stop - start
+
+    def lookup(self, condition: Range) -> Iterator[PlanItem]:
+        start, stop = self._bounds(condition)
+        items = self.items
+        for _, item_id in self.order[start:stop]:
+            yield items[item_id]
+
+    def ascending(self) -> Iterator[tuple[datetime, PlanItem]]:
+        items = self.items
+        for key, item_id in self.order:
+            yield key, items[item_id]
+
+
+class PlanQuery:
+    """Secondary indexes over the items of a plan, and queries that use them.
+
+    Creating one indexes every item (building the document's
+    :class:`~libvbrief.index.ItemIndex` first, if needed); afterwards it is
+    updated as the plan changes, for as long as the ``PlanQuery`` is alive.
+    """
+
+    def __init__(self, document: VBriefDocument | Plan) -> None:
+        plan = document.plan if isinstance(document, VBriefDocument) else document
+        self.plan = plan
+        self._item_index = plan._index if plan._index is not None else ItemIndex(plan)
+        self._indexes: dict[str, Any] = {}
+        for name in HASH_INDEXED_FIELDS:
+            self._indexes[name] = _HashIndex(name)
+        for name in DATE_FIELDS:
+            self._indexes[name] = _SortedIndex(name)
+        for name in MEMBER_INDEXED_FIELDS:
+            self._indexes[name] = _MemberIndex(name)
+        self.reset()
+        self._item_index.subscribe(self)
+
+    def select(
+        self,
+        *conditions: Condition,
+        order_by: str | None = None,
+        descending: bool = False,
+        limit: int | None = None,
+    ) -> list[PlanItem]:
+        """Return the items matching every condition.
+
+        Results come in document order, or sorted by the ``order_by`` field
+        with missing values last and ties in document order.
+        """
+        condition = All(conditions)
+        if order_by is not None and order_by not in _QUERYABLE_FIELDS:
+            raise ValueError(f"Cannot order by {order_by!r}")
+        self._item_index._sync()
+        source, estimate = self._plan(condition)
+        if order_by in DATE_FIELDS and limit is not None and not descending:
+            # Walking the dates in order stops after ``limit`` matches, about
+            # limit * total / estimate items in; better than sorting them all.
+            total = len(self._item_index._entries)
+            if source is None or limit * total < estimate * estimate:
+                return self._scan_by_date(condition, order_by, limit)
+        if source is None:
+            matches = [item for item in self._document_order() if condition.matches(item)]
+        else:
+            # Index candidates already satisfy the condition they came from.
+            rest = All(part for part in condition.conditions if part is not source.covers)
+            # Document order first, so that ties in order_by keep it too.
+            matches = self._in_document_order([item for item in source.lookup() if rest.matches(item)])
+        if order_by is not None:
+            matches = _sorted(matches, order_by, descending)
+        return matches if limit is None else matches[:limit]
+
+    def count(self, *conditions: Condition) -> int:
+        """Return the number of items matching every condition."""
+        return len(self.select(*conditions))
+
+    def explain(self, *conditions: Condition) -> str:
+        """Describe where the planner starts for these conditions."""
+        self._item_index._sync()
+        source, estimate = self._plan(All(conditions))
+        total = len(self._item_index._entries)
+        if source is None:
+            return f"scan {total} items"
+        return f"{source.label} (~{estimate} of {total} items)"
+
+    # IndexObserver
+
+    def item_added(self, item: PlanItem) -> None:
+        for index in self._indexes.values():
+            index.add(item)
+
+    def item_removed(self, item: PlanItem) -> None:
+        for index in self._indexes.values():
+            index.remove(item)
+
+    def item_changed(self, item: PlanItem, name: str) -> None:
+        index = self._indexes.get(name)
+        if index is not None:
+            index.remove(item)
+            index.add(item)
+
+    def reset(self) -> None:
+        items = self._item_index.items()
+        for name, index in self._indexes.items():
+            index = self._indexes[name] = type(index)(name)
+            index.add_all(items)
+
+    # Planning.
+
+    def _plan(self, condition: Condition) -> tuple[_Source | None, int]:
+        """Pick the indexed source with the fewest candidates, or None for a full scan."""
+        total = len(self._item_index._entries)
+        source = self._source(condition)
+        if source is None or source.estimate >= total:
+            return None, total
+        return source, source.estimate
+
+    def _source(self, condition: Condition) -> _Source | None:
+        if isinstance(condition, All):
+            sources = [source for source in map(self._source, condition.conditions) if source is not None]
+            return min(sources, key=lambda source: source.estimate, default=None)
+        if isinstance(condition, AnyOf):
+            sources = [self._source(part) for part in condition.conditions]
+            if not sources or None in sources:
+                return None
+            return _Source(
+                sum(source.estimate for source in sources),
+                lambda: _unique(item for source in sources for item in source.lookup()),
+                "union of " + ", ".join(source.label for source in sources),
+                condition,
+            )
+        index = self._indexes.get(getattr(condition, "name", None))
+        if (
+            (isinstance(condition, Equals) and isinstance(index, _HashIndex))
+            or (isinstance(condition, Contains) and isinstance(index, _MemberIndex))
+            or (isinstance(condition, Range) and isinstance(index, _SortedIndex))
+        ):
+            return _Source(index.count(condition), partial(index.lookup, condition), f"index {condition!r}", condition)
+        return None
+
+    def _document_order(self) -> Iterator[PlanItem]:
+        for _, item, _ in walk_items(self.plan._items or (), path=None, children=_model_children):
+            if isinstance(item, PlanItem):
+                yield item
+
+    def _in_document_order(self, items: list[PlanItem]) -> list[PlanItem]:
+        entries = self._item_index._entries
+        plan = self.plan
+
+        def position(item: PlanItem) -> tuple[int, ...]:
+            entry = entries[id(item)]
+            if entry.parent is plan:
+                return (entry.position,)
+            positions = []
+            while entry is not None:
+                positions.append(entry.position)
+                entry = entries.get(id(entry.parent))
+            return tuple(reversed(positions))
+
+        return sorted(items, key=position)
+
+    def _scan_by_date(self, condition: Condition, order_by: str, limit: int) -> list[PlanItem]:
+        index = self._indexes[order_by]
+        dated: list[tuple[datetime, PlanItem]] = []
+        for key, item in index.ascending():
+            # Keep going through ties with the last item that makes the cut.
+            if len(dated) >= limit and key > dated[limit - 1][0]:
+                break
+            if condition.matches(item):
+                dated.append((key, item))
+        matches = _sorted(self._in_document_order([item for _, item in dated]), order_by, False)
+        if len(matches) < limit:
+            for item in self._document_order():
+                if id(item) not in index.keys and condition.matches(item):
+                    matches.append(item)
+                    if len(matches) == limit:
+                        break
+        return matches[:limit]
+
+
+class _Source(NamedTuple):
+    """Candidate items from an index, and how many there are."""
+
+    estimate: int
+    lookup: Callable[[], Iterable[PlanItem]]
+    label: str
+    covers: Condition
+
+
+def _model_children(item: Any) -> Any:
+    return item._subItems if isinstance(item, PlanItem) else None
+
+
+def _unique(items: Iterable[PlanItem]) -> Iterator[PlanItem]:
+    seen: set[int] = set()
+    for item in items:
+        if id(item) not in seen:
+            seen.add(id(item))
+            yield item
+
+
+def _sorted(items: list[PlanItem], name: str, descending: bool) -> list[PlanItem]:
+    key = date_key if name in DATE_FIELDS else None
+    present, missing = [], []
+    for item in items:
+        value = getattr(item, name)
+        if key is not None:
+            value = key(value)
+        (missing if value is None else present).append((value, item))
+    try:
+        present.sort(key=lambda pair: pair[0], reverse=descending)
+    except TypeError:
+        present.sort(key=lambda pair: (type(pair[0]).__name__, repr(pair[0])), reverse=descending)
+    return [item for _, item in present] + [item for _, item in missing]
@@ -0,0 +1,558 @@
+"""Compile JSON Schemas into validator closures, with no third-party dependency.
+
+:func:`compile_schema` turns every subschema into a closure once: keywords
+are read, patterns compiled and ``$ref`` targets resolved at compile time,
+so validating a document only runs the checks. The closures never recurse
+into the document themselves; each checks its own value and pushes the
+values below it onto a work stack, so plans nested hundreds of levels deep
+do not hit the recursion limit.
+
+The draft 2020-12 assertion keywords are supported except those that need
+evaluation state (``if``/``then``/``else``, ``contains``, ``unevaluated*``,
+``dependentSchemas``, ``$dynamicRef`` and a few more), which raise
+ValueError when compiling. ``format`` is an annotation, as is the draft
+2020-12 default.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import reprlib
+from pathlib import Path
+from typing import Any, Callable, Mapping
+from urllib.parse import unquote, urljoin
+
+from libvbrief.compat import ISSUE_SCHEMA_VIOLATION
+from libvbrief.issues import ValidationReport
+from libvbrief.serialization.jcs import dumps_jcs
+
+CORE_SCHEMA_ID = "https://vbrief.dev/schemas/vbrief-core.schema.json"
+CORE_SCHEMA_PATH = Path(__file__).resolve().parent / "schemas" / "vbrief-core.schema.json"
+
+# check(value, parent, key, report, stack) reports the violations of
+# ``value`` itself and pushes a (check, child, location, key) task for each
+# child. ``(parent, key)`` is the value's location, a linked pair rendered
+# as "plan.items[0].title" only when an issue is reported.
+Check = Callable[[Any, Any, Any, Any, list], None]
+
+_UNSUPPORTED = frozenset(
+    {
+        "if",
+        "then",
+        "else",
+        "contains",
+        "minContains",
+        "maxContains",
+        "dependentSchemas",
+        "dependentRequired",
+        "dependencies",
+        "propertyNames",
+        "unevaluatedItems",
+        "unevaluatedProperties",
+        "additionalItems",
+        "$dynamicRef",
+        "$recursiveRef",
+    }
+)
+_PENDING = object()
+
+# Compiled schemas by canonical schema text; the cap bounds memory when
+# callers compile generated schemas.
+_COMPILED: dict[bytes, CompiledSchema] = {}
+_MAX_COMPILED = 64
+_core: CompiledSchema | None = None
+_core_document: dict[str, Any] | None = None
+
+# Values are quoted in messages only this far, however big they are.
+_SHORT = reprlib.Repr()
+_SHORT.maxlevel = 1
+_SHORT.maxlist = _SHORT.maxdict = 3
+_SHORT.maxstring = _SHORT.maxother = 60
+
+
+class CompiledSchema:
+    """A JSON Schema compiled by :func:`compile_schema`."""
+
+    __slots__ = ("schema", "_check")
+
+    def __init__(self, schema: Mapping[str, Any] | bool, check: Check | None) -> None:
+        self.schema = schema
+        self._check = check
+
+    def validate(self, instance: Any, report: ValidationReport | None = None) -> ValidationReport:
+        """Add a ``schema_violation`` error per violation to ``report`` (a new one by default)."""
+        if report is None:
+            report = ValidationReport()
+        if self._check is not None:
+            _run([(self._check, instance, None, None)], report)
+        return report
+
+    def is_valid(self, instance: Any) -> bool:
+        """True when ``instance`` conforms; stops at the first violation."""
+        return self._check is None or _matches(self._check, instance)
+
+
+def compile_schema(schema: Mapping[str, Any] | bool) -> CompiledSchema:
+    """Compile a draft 2020-12 JSON Schema into validator closures.
+
+    Results are cached by schema content, so compiling the same schema again
+    costs one canonical serialization. ``$ref`` may point into the schema
+    itself or into the vBRIEF core schema by its URI, :data:`CORE_SCHEMA_ID`,
+    so extension schemas can build on ``<CORE_SCHEMA_ID>#/$defs/PlanItem``.
+    """
+    key = dumps_jcs(schema)
+    compiled = _COMPILED.get(key)
+    if compiled is None:
+        compiled = CompiledSchema(schema, _Compiler(schema).compile(schema, _base(schema, "")))
+        if len(_COMPILED) < _MAX_COMPILED:
+            _COMPILED[key] = compiled
+    return compiled
+
+
+def core_schema() -> CompiledSchema:
+    """Return the vBRIEF core schema, compiled on first use."""
+    global _core
+    if _core is None:
+        _core = compile_schema(load_core_schema())
+    return _core
+
+
+def load_core_schema() -> dict[str, Any]:
+    """Return a fresh copy of the bundled ``vbrief-core.schema.json``."""
+    return json.loads(CORE_SCHEMA_PATH.read_text(encoding="utf-8"))
+
+
+class _Compiler:
+    def __init__(self, schema: Mapping[str, Any] | bool) -> None:
+        self.documents: dict[str, Any] = {_base(schema, ""): schema}
+        self.refs: dict[tuple[str, str], list[Any]] = {}
+
+    def compile(self, schema: Any, base: str) -> Check | None:
+        """Return the check for ``schema``, or None when it accepts everything."""
+        if schema is True:
+            return None
+        if schema is False:
+            return _reject
+        if not isinstance(schema, Mapping):
+            raise ValueError(f"A JSON Schema must be an object or a boolean, not {type(schema).__name__}")
+        unsupported = _UNSUPPORTED.intersection(schema)
+        if unsupported:
+            raise ValueError(f"Unsupported JSON Schema keywords: {sorted(unsupported)}")
+        if "$id" in schema:
+            base = _base(schema, base)
+            self.documents.setdefault(base, schema)
+
+        checks: list[Check | None] = []
+        if "$ref" in schema:
+            checks.append(self._ref(schema["$ref"], base))
+        if "type" in schema:
+            checks.append(_type_check(schema["type"]))
+        if "enum" in schema:
+            checks.append(_enum_check(list(schema["enum"])))
+        if "const" in schema:
+            checks.append(_const_check(schema["const"]))
+        checks.append(_string_check(schema))
+        checks.append(_number_check(schema))
+        checks.append(self._object_check(schema, base))
+        checks.append(self._array_check(schema, base))
+        for sub in schema.get("allOf", ()):
+            checks.append(self.compile(sub, base))
+        if "anyOf" in schema:
+            checks.append(_any_of([self.compile(sub, base) for sub in schema["anyOf"]]))
+        if "oneOf" in schema:
+            checks.append(_one_of([self.compile(sub, base) for sub in schema["oneOf"]]))
+        if "not" in schema:
+            checks.append(_not(self.compile(schema["not"], base)))
+
+        active = [check for check in checks if check is not None]
+        if not active:
+            return None
+        if len(active) == 1:
+            return active[0]
+
+        def check_all(value: Any, parent: Any, key: Any, report: Any, stack: list) -> None:
+            for check in active:
+                check(value, parent, key, report, stack)
+
+        return check_all
+
+    def _ref(self, ref: str, base: str) -> Check | None:
+        target = urljoin(base, ref) if base else ref
+        uri, _, fragment = target.partition("#")
+        key = (uri, fragment)
+        cell = self.refs.get(key)
+        if cell is None:
+            node = _pointer(self._document(uri, ref), unquote(fragment), ref)
+            cell = self.refs[key] = [_PENDING]
+            cell[0] = self.compile(node, uri)
+        if cell[0] is not _PENDING:
+            return cell[0]
+
+        # A reference back into a subschema still being compiled (PlanItem
+        # -> subItems -> PlanItem) follows the cell once it is filled in.
+        def follow(value: Any, parent: Any, key: Any, report: Any, stack: list) -> None:
+            target = cell[0]
+            if target is not None:
+                target(value, parent, key, report, stack)
+
+        return follow
+
+    def _document(self, uri: str, ref: str) -> Any:
+        document = self.documents.get(uri)
+        if document is None and uri == CORE_SCHEMA_ID:
+            global _core_document
+            if _core_document is None:
+                _core_document = load_core_schema()
+            document = self.documents[uri] = _core_document
+        if document is None:
+            raise ValueError(f"Cannot resolve $ref {ref!r}: unknown schema {uri!r}")
+        return document
+
+    def _object_check(self, schema: Mapping[str, Any], base: str) -> Check | None:
+        required = tuple(schema.get("required", ()))
+        properties = {name: self.compile(sub, base) for name, sub in schema.get("properties", {}).items()}
+        patterns = [(re.compile(pattern), self.compile(sub, base)) for pattern, sub in schema.get("patternProperties", {}).items()]
+        additional = self.compile(schema.get("additionalProperties", True), base)
+        min_count = schema.get("minProperties")
+        max_count = schema.get("maxProperties")
+        checks = {name: check for name, check in properties.items() if check is not None}
+        lookup = checks.get
+        if not (required or checks or patterns or additional or min_count is not None or max_count is not None):
+            return None
+
+        simple = not patterns and additional is None
+
+        def check_object(value: Any, parent: Any, key: Any, report: Any, stack: list) -> None:
+            if type(value) is not dict and not isinstance(value, Mapping):
+                return
+            for name in required:
+                if name not in value:
+                    report.add_error(ISSUE_SCHEMA_VIOLATION, _render((parent, key), name), f"{name!r} is a required property")
+            if min_count is not None and len(value) < min_count:
+                report.add_error(ISSUE_SCHEMA_VIOLATION, _render(parent, key), f"Expected at least {min_count} properties")
+            if max_count is not None and len(value) > max_count:
+                report.add_error(ISSUE_SCHEMA_VIOLATION, _render(parent, key), f"Expected at most {max_count} properties")
+            here = (parent, key)
+            # Children are pushed in reverse so they are checked in key order.
+            if simple:
+                tasks = [(check, child, here, name) for name, child in value.items() if (check := lookup(name)) is not None]
+            else:
+                tasks = _property_tasks(value, here, lookup, properties, patterns, additional)
+            if tasks:
+                tasks.reverse()
+                stack.extend(tasks)
+
+        return check_object
+
+    def _array_check(self, schema: Mapping[str, Any], base: str) -> Check | None:
+        items = schema.get("items", True)
+        prefix = schema.get("prefixItems", ())
+        if isinstance(items, list):
+            # Draft 2019-09 and earlier spelling of prefixItems.
+            prefix, items = items, True
+        prefix_checks = [self.compile(sub, base) for sub in prefix]
+        rest = self.compile(items, base)
+        min_count = schema.get("minItems")
+        max_count = schema.get("maxItems")
+        unique = schema.get("uniqueItems", False)
+        if not (any(prefix_checks) or rest or min_count is not None or max_count is not None or unique):
+            return None
+
+        def check_array(value: Any, parent: Any, key: Any, report: Any, stack: list) -> None:
+            if not isinstance(value, list):
+                return
+            count = len(value)
+            if min_count is not None and count < min_count:
+                report.add_error(ISSUE_SCHEMA_VIOLATION, _render(parent, key), f"Expected at least {min_count} items")
+            if max_count is not None and count > max_count:
+                report.add_error(ISSUE_SCHEMA_VIOLATION, _render(parent, key), f"Expected at most {max_count} items")
+            if unique and _has_duplicates(value):
+                report.add_error(ISSUE_SCHEMA_VIOLATION, _render(parent, key), "Array items must be unique")
+            here = (parent, key)
+            if rest is not None:
+                start = len(prefix_checks)
+                stack.extend([(rest, value[index], here, index) for index in range(count - 1, start - 1, -1)])
+            for index in range(min(count, len(prefix_checks)) - 1, -1, -1):
+                if prefix_checks[index] is not None:
+                    stack.append((prefix_checks[index], value[index], here, index))
+
+        return check_array
+
+
+def _property_tasks(
+    value: Mapping[str, Any],
+    here: Any,
+    lookup: Callable[[str], Check | None],
+    properties: Mapping[str, Any],
+    patterns: list[tuple[re.Pattern[str], Check | None]],
+    additional: Check | None,
+) -> list[Any]:
+    tasks = []
+    for name, child in value.items():
+        check = lookup(name)
+        if check is not None:
+            tasks.append((check, child, here, name))
+        matched = name in properties
+        for pattern, sub in patterns:
+            if pattern.search(name):
+                matched = True
+                if sub is not None:
+                    tasks.append((sub, child, here, name))
+        if not matched and additional is not None:
+            tasks.append((additional, child, here, name))
+    return tasks
+
+
+def _base(schema: Any, base: str) -> str:
+    schema_id = schema.get("$id") if isinstance(schema, Mapping) else None
+    if not isinstance(schema_id, str):
+        return base
+    return (urljoin(base, schema_id) if base else schema_id).partition("#")[0]
+
+
+def _pointer(document: Any, pointer: str, ref: str) -> Any:
+    if not pointer:
+        return document
+    if not pointer.startswith("/"):
+        raise ValueError(f"Cannot resolve $ref {ref!r}: only JSON Pointer fragments are supported")
+    node = document
+    for token in pointer[1:].split("/"):
+        token = token.replace("~1", "/").replace("~0", "~")
+        try:
+            node = node[int(token)] if isinstance(node, list) else node[token]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise ValueError(f"Cannot resolve $ref {ref!r}") from None
+    return node
+
+
+_TYPES: dict[str, Callable[[Any], bool]] = {
+    "object": lambda value: type(value) is dict or isinstance(value, Mapping),
+    "array": lambda value: isinstance(value, list),
+    "string": lambda value: isinstance(value, str),
+    "integer": lambda value: (isinstance(value, int) and not isinstance(value, bool))
+    or (isinstance(value, float) and value.is_integer()),
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "boolean": lambda value: isinstance(value, bool),
+    "null": lambda value: value is None,
+}
+
+
+def _type_check(expected: str | list[str]) -> Check:
+    names = [expected] if isinstance(expected, str) else list(expected)
+    unknown = [name for name in names if name not in _TYPES]
+    if unknown:
+        raise ValueError(f"Unknown JSON Schema type(s): {unknown}")
+    tests = [_TYPES[name] for name in names]
+    label = ", ".join(repr(name) for name in names)
+
+    def check_type(value: Any, parent: Any, key: Any, report: Any, stack: list) -> None:
+        for test in tests:
+            if test(value):
+                return
+        report.add_error(ISSUE_SCHEMA_VIOLATION, _render(parent, key), f"{_show(value)} is not of type {label}")
+
+    return check_type
+
+
+def _enum_check(values: list[Any]) -> Check:
+    if all(type(value) is str for value in values):
+        allowed = frozenset(values)
+
+        def check_enum(value: Any, parent: Any, key: Any, report: Any, stack: list) -> None:
+            if not (isinstance(value, str) and value in allowed):
+                report.add_error(ISSUE_SCHEMA_VIOLATION, _render(parent, key), f"{_show(value)} is not one of {values!r}")
+
+        return check_enum
+
+    def check_enum_values(value: Any, parent: Any, key: Any, report: Any, stack: list) -> None:
+        if not any(_equal(value, option) for option in values):
+            report.add_error(ISSUE_SCHEMA_VIOLATION, _render(parent, key), f"{_show(value)} is not one of {values!r}")
+
+    return check_enum_values
+
+
+def _const_check(expected: Any) -> Check:
+    def check_const(value: Any, parent: Any, key: Any, report: Any, stack: list) -> None:
+        if not _equal(value, expected):
+            report.add_error(ISSUE_SCHEMA_VIOLATION, _render(parent, key), f"{expected!r} was expected")
+
+    return check_const
+
+
+def _string_check(schema: Mapping[str, Any]) -> Check | None:
+    min_length = schema.get("minLength")
+    max_length = schema.get("maxLength")
+    pattern = re.compile(schema["pattern"]) if "pattern" in schema else None
+    if min_length is None and max_length is None and pattern is None:
+        return None
+
+    def check_string(value: Any, parent: Any, key: Any, report: Any, stack: list) -> None:
+        if not isinstance(value, str):
+            return
+        if min_length is not None and len(value) < min_length:
+            report.add_error(ISSUE_SCHEMA_VIOLATION, _render(parent, key), f"{_show(value)} is too short")
+        if max_length is not None and len(value) > max_length:
+            report.add_error(ISSUE_SCHEMA_VIOLATION, _render(parent, key), f"{_show(value)} is too long")
+        if pattern is not None and not pattern.search(value):
+            report.add_error(
+                ISSUE_SCHEMA_VIOLATION,
+                _render(parent, key),
+                f"{_show(value)} does not match {pattern.pattern!r}",
+            )
+
+    return check_string
+
+
+def _number_check(schema: Mapping[str, Any]) -> Check | None:
+    # (bound, test that fails the value, message) per keyword present.
+    limits = [
+        (bound, failed, message)
+        for name, failed, message in (
+            ("minimum", lambda value, bound: value < bound, "less than the minimum of"),
+            ("maximum", lambda value, bound: value > bound, "greater than the maximum of"),
+            ("exclusiveMinimum", lambda value, bound: value <= bound, "less than or equal to the minimum of"),
+            ("exclusiveMaximum", lambda value, bound: value >= bound, "greater than or equal to the maximum of"),
+            ("multipleOf", lambda value, bound: not _is_multiple(value, bound), "not a multiple of"),
+        )
+        if (bound := schema.get(name)) is not None
+    ]
+    if not limits:
+        return None
+
+    def check_number(value: Any, parent: Any, key: Any, report: Any, stack: list) -> None:
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            return
+        for bound, failed, message in limits:
+            if failed(value, bound):
+                report.add_error(ISSUE_SCHEMA_VIOLATION, _render(parent, key), f"{value!r} is {message} {bound!r}")
+
+    return check_number
+
+
+def _any_of(checks: list[Check | None]) -> Check | None:
+    if any(check is None for check in checks):
+        return None
+
+    def check_any_of(value: Any, parent: Any, key: Any, report: Any, stack: list) -> None:
+        for check in checks:
+            if _matches(check, value):
+                return
+        report.add_error(ISSUE_SCHEMA_VIOLATION, _render(parent, key), f"{_show(value)} is not valid under any of the given schemas")
+
+    return check_any_of
+
+
+def _one_of(checks: list[Check | None]) -> Check:
+    def check_one_of(value: Any, parent: Any, key: Any, report: Any, stack: list) -> None:
+        matched = sum(1 for check in checks if check is None or _matches(check, value))
+        if matched != 1:
+            detail = "any" if not matched else "more than one"
+            report.add_error(ISSUE_SCHEMA_VIOLATION, _render(parent, key), f"{_show(value)} is valid under {detail} of the given schemas")
+
+    return check_one_of
+
+
+def _not(check: Check | None) -> Check:
+    def check_not(value: Any, parent: Any, key: Any, report: Any, stack: list) -> None:
+        if check is None or _matches(check, value):
+            report.add_error(ISSUE_SCHEMA_VIOLATION, _render(parent, key), f"{_show(value)} must not be valid under the 'not' schema")
+
+    return check_not
+
+
+def _reject(value: Any, parent: Any, key: Any, report: Any, stack: list) -> None:
+    report.add_error(ISSUE_SCHEMA_VIOLATION, _render(parent, key), f"False schema does not allow {_show(value)}")
+
+
+def _run(stack: list, report: Any) -> None:
+    pop = stack.pop
+    while stack:
+        check, value, parent, key = pop()
+        check(value, parent, key, report, stack)
+
+
+class _Mismatch(Exception):
+    pass
+
+
+class _Probe:
+    # Stands in for a report while anyOf/oneOf/not try a subschema.
+
+    def add_error(self, code: str, path: str, message: str) -> None:
+        raise _Mismatch
+
+    def add_warning(self, code: str, path: str, message: str) -> None:
+        pass
+
+
+_PROBE = _Probe()
+
+
+def _matches(check: Check, value: Any) -> bool:
+    try:
+        _run([(check, value, None, None)], _PROBE)
+    except _Mismatch:
+        return False
+    return True
+
+
+def _render(parent: Any, key: Any) -> str:
+    keys = []
+    while key is not None:
+        keys.append(key)
+        parent, key = parent
+    text = ""
+    for key in reversed(keys):
+        if type(key) is int:
+            text += f"[{key}]"
+        else:
+            text += f".{key}" if text else key
+    return text or "$"
+
+
+def _show(value: Any) -> str:
+    return _SHORT.repr(value)
+
+
+def _kind(value: Any) -> str:
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, Mapping):
+        return "object"
+    return type(value).__name__
+
+
+def _equal(left: Any, right: Any) -> bool:
+    # JSON equality: 1 == 1.0, but True != 1.
+    kind = _kind(left)
+    if kind != _kind(right):
+        return False
+    if kind == "list":
+        return len(left) == len(right) and all(_equal(a, b) for a, b in zip(left, right))
+    if kind == "object":
+        return left.keys() == right.keys() and all(_equal(value, right[name]) for name, value in left.items())
+    return left == right
+
+
+def _has_duplicates(values: list[Any]) -> bool:
+    try:
+        return len({(_kind(value), value) for value in values}) != len(values)
+    except TypeError:
+        seen: list[Any] = []
+        for value in values:
+            if any(_equal(value, other) for other in seen):
+                return True
+            seen.append(value)
+        return False
+
+
+def _is_multiple(value: int | float, step: int | float) -> bool:
+    if isinstance(value, int) and isinstance(step, int):
+        return value % step == 0
+    try:
+        return (value / step).is_integer()
+    except OverflowError:
+        return False
@@ -1,5 +1,64 @@
 """Serialization helpers."""
 
-from libvbrief.serialization.json_codec import dump_json_file, dumps_json, load_json_file, parse_json
+from libvbrief.serialization.atomic import atomic_writer
+from libvbrief.serialization.backends import (
+    JSONBackend,
+    available_json_backends,
+    get_json_backend,
+    register_json_backend,
+    set_json_backend,
+)
+from libvbrief.serialization.binary_codec import (
+    BinaryDecodeError,
+    dump_binary_file,
+    dumps_binary,
+    load_binary_file,
+    parse_binary,
+)
+from libvbrief.serialization.interning import clear_intern_table, intern_strings
+from libvbrief.serialization.jcs import dumps_jcs
+from libvbrief.serialization.json_codec import (
+    dump_json_file,
+    dumps_json,
+    dumps_json_bytes,
+    iter_json_chunks,
+    load_json_file,
+    parse_json,
+    parse_json_bytes,
+)
+from libvbrief.serialization.tron_codec import (
+    TronDecodeError,
+    dump_tron_file,
+    dumps_tron,
+    load_tron_file,
+    parse_tron,
+)
 
-__all__ = ["parse_json", "load_json_file", "dumps_json", "dump_json_file"]
+__all__ = [
+    "parse_json",
+    "parse_json_bytes",
+    "load_json_file",
+    "dumps_json",
+    "dumps_json_bytes",
+    "dump_json_file",
+    "iter_json_chunks",
+    "dumps_jcs",
+    "intern_strings",
+    "clear_intern_table",
+    "atomic_writer",
+    "JSONBackend",
+    "available_json_backends",
+    "get_json_backend",
+    "register_json_backend",
+    "set_json_backend",
+    "parse_tron",
+    "load_tron_file",
+    "dumps_tron",
+    "dump_tron_file",
+    "TronDecodeError",
+    "parse_binary",
+    "load_binary_file",
+    "dumps_binary",
+    "dump_binary_file",
+    "BinaryDecodeError",
+]
@@ -0,0 +1,73 @@
+"""Crash-safe file replacement for serialized documents."""
+
+from __future__ import annotations
+
+import os
+import secrets
+import stat
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+
+@contextmanager
+def atomic_writer(path: str | Path) -> Iterator[BinaryIO]:
+    """Open a temporary file next to ``path`` and atomically move it into place.
+
+    The temporary file is flushed and fsynced before ``os.replace``, so
+    readers see either the old content or the complete new content, never a
+    truncated file. If the block raises, the temporary file is removed and
+    ``path`` is left untouched. An existing file's permission bits are kept;
+    a symlink is followed and its target replaced.
+    """
+    target = Path(os.path.realpath(path))
+    fd, temp_path = _create_temp(target)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            yield handle
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, target)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(target.parent)
+
+
+def _create_temp(target: Path) -> tuple[int, Path]:
+    try:
+        mode = stat.S_IMODE(os.stat(target).st_mode)
+    except FileNotFoundError:
+        # Same permissions a plain open() would give: 0o666 less the umask.
+        mode = None
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    while True:
+        temp_path = target.with_name(f".{target.name}.{secrets.token_hex(4)}.tmp")
+        try:
+            fd = os.open(temp_path, flags, 0o666)
+        except FileExistsError:
+            continue
+        break
+    if mode is not None:
+        try:
+            os.chmod(temp_path, mode)
+        except OSError:
+            pass
+    return fd, temp_path
+
+
+def _fsync_directory(directory: Path) -> None:
+    # Persist the rename itself; not supported on every platform.
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -0,0 +1,173 @@
+"""Pluggable JSON backends used by json_codec.
+
+The registry prefers a fast third-party parser when one is importable
+(orjson, then msgspec, then ujson) and always falls back to the stdlib.
+Set ``LIBVBRIEF_JSON_BACKEND`` or call :func:`set_json_backend` to pin one.
+
+Backends only change speed, never results: json_codec retries with the
+stdlib whenever a fast backend fails or could diverge from stdlib output.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Callable
+
+ENV_VAR = "LIBVBRIEF_JSON_BACKEND"
+STDLIB = "stdlib"
+
+
+@dataclass(frozen=True)
+class JSONBackend:
+    """A JSON implementation usable by json_codec.
+
+    ``loads`` accepts ``bytes`` or ``str``. ``dumps`` is optional; when given
+    it must return two-space indented UTF-8 bytes (without trailing newline)
+    that are byte-identical to ``json.dumps(..., indent=2, ensure_ascii=False)``,
+    or raise ``TypeError``/``ValueError`` so the stdlib encoder is used instead.
+    """
+
+    name: str
+    loads: Callable[[bytes | str], Any]
+    dumps: Callable[[Any, bool], bytes] | None = None
+
+
+_FACTORIES: dict[str, Callable[[], JSONBackend | None]] = {}
+_RESOLVED: dict[str, JSONBackend | None] = {}
+_PREFERENCE: list[str] = []
+_selected: str | None = None
+
+
+def register_json_backend(
+    name: str,
+    factory: Callable[[], JSONBackend | None],
+    *,
+    preferred: bool = False,
+) -> None:
+    """Register a backend factory; the factory returns None when unavailable."""
+    _FACTORIES[name] = factory
+    _RESOLVED.pop(name, None)
+    if name in _PREFERENCE:
+        _PREFERENCE.remove(name)
+    if preferred:
+        _PREFERENCE.insert(0, name)
+    elif STDLIB in _PREFERENCE:
+        _PREFERENCE.insert(_PREFERENCE.index(STDLIB), name)
+    else:
+        _PREFERENCE.append(name)
+
+
+def available_json_backends() -> list[str]:
+    """Return importable backend names in preference order."""
+    return [name for name in _PREFERENCE if _resolve(name) is not None]
+
+
+def get_json_backend(name: str | None = None) -> JSONBackend:
+    """Return the named backend, or the active one when ``name`` is None."""
+    if name is None:
+        name = _selected or os.environ.get(ENV_VAR) or None
+    if name is None:
+        for candidate in _PREFERENCE:
+            backend = _resolve(candidate)
+            if backend is not None:
+                return backend
+        return _STDLIB_BACKEND
+
+    if name not in _FACTORIES:
+        raise ValueError(f"Unknown JSON backend {name!r}; expected one of {sorted(_FACTORIES)}")
+    backend = _resolve(name)
+    if backend is None:
+        raise ValueError(f"JSON backend {name!r} is not installed")
+    return backend
+
+
+def set_json_backend(name: str | None) -> None:
+    """Pin the process-wide backend; ``None`` restores automatic selection."""
+    global _selected
+    if name is not None:
+        get_json_backend(name)
+    _selected = name
+
+
+def _resolve(name: str) -> JSONBackend | None:
+    if name not in _RESOLVED:
+        _RESOLVED[name] = _FACTORIES[name]()
+    return _RESOLVED[name]
+
+
+_STDLIB_BACKEND = JSONBackend(name=STDLIB, loads=json.loads)
+
+
+def _orjson_backend() -> JSONBackend | None:
+    try:
+        import orjson
+    except ImportError:
+        return None
+
+    # Passthrough flags make orjson reject the types the stdlib rejects, so the
+    # stdlib fallback produces the same TypeError it always did.
+    base = (
+        orjson.OPT_INDENT_2
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_SUBCLASS
+    )
+    options = {False: base, True: base | orjson.OPT_SORT_KEYS}
+    encode = orjson.dumps
+
+    def dumps(document: Any, sort_keys: bool) -> bytes:
+        if not _floats_match(document, encode):
+            raise ValueError("float formatting differs from stdlib")
+        return encode(document, option=options[sort_keys])
+
+    return JSONBackend(name="orjson", loads=orjson.loads, dumps=dumps)
+
+
+def _msgspec_backend() -> JSONBackend | None:
+    try:
+        import msgspec
+        import msgspec.json
+    except ImportError:
+        return None
+
+    decode = msgspec.json.decode
+
+    def loads(data: bytes | str) -> Any:
+        try:
+            return decode(data)
+        except msgspec.DecodeError as exc:
+            raise ValueError(str(exc)) from exc
+
+    return JSONBackend(name="msgspec", loads=loads)
+
+
+def _ujson_backend() -> JSONBackend | None:
+    try:
+        import ujson
+    except ImportError:
+        return None
+    return JSONBackend(name="ujson", loads=ujson.loads)
+
+
+def _floats_match(document: Any, encode: Callable[[Any], bytes]) -> bool:
+    """True when every float renders exactly as ``float.__repr__`` does."""
+    stack = [[document]]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        node = pop()
+        for value in node.values() if type(node) is dict else node:
+            kind = type(value)
+            if kind is dict or kind is list or kind is tuple:
+                push(value)
+            elif kind is float and encode(value) != float.__repr__(value).encode():
+                return False
+    return True
+
+
+register_json_backend("orjson", _orjson_backend)
+register_json_backend("msgspec", _msgspec_backend)
+register_json_backend("ujson", _ujson_backend)
+register_json_backend(STDLIB, lambda: _STDLIB_BACKEND)
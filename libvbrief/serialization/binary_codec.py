@@ -0,0 +1,285 @@
+"""Compact binary encoding for vBRIEF documents.
+
+A MessagePack-style tagged format tuned for vBRIEF. Known member names,
+statuses, core edge types and priorities are one-byte codes; every other
+short string is written once and then referenced by its index in a string
+table, so repeated ids, tags and custom keys cost one or two bytes. Any
+JSON value round-trips losslessly, including unknown extras fields,
+member order (preserve mode), big integers and non-finite floats.
+
+Layout: ``b"VBB"``, a format version byte, a CRC-32 of the code table, then
+one encoded value.
+"""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Mapping
+
+from libvbrief.compat.policy import (
+    CORE_EDGE_TYPES,
+    DOCUMENT_FIELD_ORDER,
+    PLAN_FIELD_ORDER,
+    PLAN_ITEM_FIELD_ORDER,
+)
+from libvbrief.serialization.atomic import atomic_writer
+from libvbrief.types import JSONObject, JSONValue
+
+_MAGIC = b"VBB"
+_VERSION = 1
+
+# Codes are positions in this table, so entries may only ever be appended.
+# VALID_STATUSES is a set; its members are listed here in a fixed order.
+_STATUS_CODES = ("draft", "proposed", "approved", "pending", "running", "completed", "blocked", "cancelled")
+_PRIORITIES = ("low", "medium", "high", "critical")
+_EXTRA_KEYS = ("from", "to", "type", "version", "author", "description", "0.5")
+_KNOWN_STRINGS: tuple[str, ...] = tuple(
+    dict.fromkeys(
+        [
+            *DOCUMENT_FIELD_ORDER,
+            *PLAN_FIELD_ORDER,
+            *PLAN_ITEM_FIELD_ORDER,
+            *_EXTRA_KEYS,
+            *_STATUS_CODES,
+            *CORE_EDGE_TYPES,
+            *_PRIORITIES,
+        ]
+    )
+)
+_KNOWN_CODES = {value: code for code, value in enumerate(_KNOWN_STRINGS)}
+_HEADER = _MAGIC + bytes([_VERSION]) + struct.pack(">I", zlib.crc32("\0".join(_KNOWN_STRINGS).encode("utf-8")))
+
+# Tags. 0x00-0x7F index _KNOWN_STRINGS and 0x80-0xBF are the integers 0-63.
+_SMALL_INT = 0x80
+_SMALL_INT_LIMIT = 64
+_NULL, _FALSE, _TRUE, _INT, _FLOAT, _STRING, _STRING_REF, _LIST, _DICT = range(0xC0, 0xC9)
+
+# Inline strings up to this many bytes enter the string table. The decoder
+# applies the same rule, so table indexes never need to be transmitted.
+_TABLE_MAX_BYTES = 64
+
+_DOUBLE = struct.Struct(">d")
+
+assert len(_KNOWN_STRINGS) <= _SMALL_INT
+
+
+class BinaryDecodeError(ValueError):
+    """Raised when bytes are not a valid binary vBRIEF document."""
+
+
+def parse_binary(data: bytes) -> JSONObject:
+    """Decode a binary vBRIEF document into a Python mapping."""
+    data = bytes(data)
+    if not data.startswith(_MAGIC):
+        raise BinaryDecodeError("Not a binary vBRIEF document")
+    if data[: len(_HEADER)] != _HEADER:
+        raise BinaryDecodeError("Unsupported binary vBRIEF version or code table")
+    try:
+        document, end = _decode(data, len(_HEADER), [])
+    except (IndexError, struct.error):
+        raise BinaryDecodeError("Truncated binary vBRIEF document") from None
+    except UnicodeDecodeError as exc:
+        raise BinaryDecodeError(f"Invalid UTF-8 in string: {exc.reason}") from None
+    if end != len(data):
+        raise BinaryDecodeError(f"Extra data at byte {end}")
+    if not isinstance(document, dict):
+        raise ValueError("vBRIEF JSON document must be an object")
+    return document
+
+
+def load_binary_file(path: str | Path) -> JSONObject:
+    """Load and decode a binary vBRIEF document from disk."""
+    return parse_binary(Path(path).read_bytes())
+
+
+def dumps_binary(
+    document: Mapping[str, JSONValue] | dict[str, Any],
+    *,
+    canonical: bool = True,
+    preserve_format: bool = False,
+) -> bytes:
+    """Encode a document; canonical mode sorts keys like the JSON writer."""
+    sort_keys = canonical and not (preserve_format and isinstance(document, Mapping))
+    out = bytearray(_HEADER)
+    _encode(document, out, {}, sort_keys)
+    return bytes(out)
+
+
+def dump_binary_file(
+    path: str | Path,
+    document: Mapping[str, JSONValue] | dict[str, Any],
+    *,
+    canonical: bool = True,
+    preserve_format: bool = False,
+) -> None:
+    """Write a binary vBRIEF document to disk atomically."""
+    output = dumps_binary(document, canonical=canonical, preserve_format=preserve_format)
+    with atomic_writer(path) as handle:
+        handle.write(output)
+
+
+def _encode(value: Any, out: bytearray, table: dict[str, int], sort_keys: bool) -> None:
+    kind = type(value)
+    if kind is str:
+        _encode_string(value, out, table)
+    elif kind is dict:
+        out.append(_DICT)
+        _encode_uint(len(value), out)
+        for key, child in sorted(value.items()) if sort_keys else value.items():
+            if type(key) is not str:
+                raise TypeError(f"keys must be str, not {type(key).__name__}")
+            _encode_string(key, out, table)
+            _encode(child, out, table, sort_keys)
+    elif kind is list or kind is tuple:
+        out.append(_LIST)
+        _encode_uint(len(value), out)
+        for child in value:
+            _encode(child, out, table, sort_keys)
+    elif value is None:
+        out.append(_NULL)
+    elif value is True:
+        out.append(_TRUE)
+    elif value is False:
+        out.append(_FALSE)
+    elif kind is int:
+        if 0 <= value < _SMALL_INT_LIMIT:
+            out.append(_SMALL_INT + value)
+        else:
+            out.append(_INT)
+            _encode_uint(value << 1 if value >= 0 else ((-value) << 1) - 1, out)
+    elif kind is float:
+        out.append(_FLOAT)
+        out += _DOUBLE.pack(value)
+    # Subclasses are encoded as their JSON base type, like json.dumps does.
+    elif isinstance(value, str):
+        _encode(str(value), out, table, sort_keys)
+    elif isinstance(value, dict):
+        _encode(dict(value), out, table, sort_keys)
+    elif isinstance(value, (list, tuple)):
+        _encode(list(value), out, table, sort_keys)
+    elif isinstance(value, int):
+        _encode(int(value), out, table, sort_keys)
+    elif isinstance(value, float):
+        _encode(float(value), out, table, sort_keys)
+    else:
+        raise TypeError(f"Object of type {kind.__name__} is not binary-serializable")
+
+
+def _encode_string(value: str, out: bytearray, table: dict[str, int]) -> None:
+    code = _KNOWN_CODES.get(value)
+    if code is not None:
+        out.append(code)
+        return
+    index = table.get(value)
+    if index is not None:
+        out.append(_STRING_REF)
+        _encode_uint(index, out)
+        return
+    # surrogatepass keeps lone surrogates (valid in JSON text) lossless.
+    raw = value.encode("utf-8", "surrogatepass")
+    out.append(_STRING)
+    _encode_uint(len(raw), out)
+    out += raw
+    if len(raw) <= _TABLE_MAX_BYTES:
+        table[value] = len(table)
+
+
+def _encode_uint(value: int, out: bytearray) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _decode(data: bytes, pos: int, table: list[str]) -> tuple[Any, int]:
+    # Lengths, counts and indexes below 128 (the common case) are read inline.
+    tag = data[pos]
+    pos += 1
+    if tag < _SMALL_INT:
+        if tag < len(_KNOWN_STRINGS):
+            return _KNOWN_STRINGS[tag], pos
+        raise BinaryDecodeError(f"Unknown string code {tag} at byte {pos - 1}")
+    if tag < _NULL:
+        return tag - _SMALL_INT, pos
+    if tag == _STRING:
+        length = data[pos]
+        if length < 0x80:
+            pos += 1
+        else:
+            length, pos = _decode_uint(data, pos)
+        end = pos + length
+        if end > len(data):
+            raise IndexError(end)
+        value = data[pos:end].decode("utf-8", "surrogatepass")
+        if length <= _TABLE_MAX_BYTES:
+            table.append(value)
+        return value, end
+    if tag == _STRING_REF:
+        index = data[pos]
+        if index < 0x80:
+            pos += 1
+        else:
+            index, pos = _decode_uint(data, pos)
+        if index < len(table):
+            return table[index], pos
+        raise BinaryDecodeError(f"Unknown string reference {index} at byte {pos}")
+    if tag == _DICT:
+        count = data[pos]
+        if count < 0x80:
+            pos += 1
+        else:
+            count, pos = _decode_uint(data, pos)
+        result: dict[str, Any] = {}
+        for _ in range(count):
+            code = data[pos]
+            if code < len(_KNOWN_STRINGS):
+                key = _KNOWN_STRINGS[code]
+                pos += 1
+            else:
+                key, pos = _decode(data, pos, table)
+                if type(key) is not str:
+                    raise BinaryDecodeError(f"Object key is not a string at byte {pos}")
+            result[key], pos = _decode(data, pos, table)
+        return result, pos
+    if tag == _LIST:
+        count = data[pos]
+        if count < 0x80:
+            pos += 1
+        else:
+            count, pos = _decode_uint(data, pos)
+        items = []
+        append = items.append
+        for _ in range(count):
+            value, pos = _decode(data, pos, table)
+            append(value)
+        return items, pos
+    if tag == _NULL:
+        return None, pos
+    if tag == _TRUE:
+        return True, pos
+    if tag == _FALSE:
+        return False, pos
+    if tag == _INT:
+        raw, pos = _decode_uint(data, pos)
+        return (raw >> 1) if not raw & 1 else -((raw + 1) >> 1), pos
+    if tag == _FLOAT:
+        return _DOUBLE.unpack_from(data, pos)[0], pos + 8
+    raise BinaryDecodeError(f"Unknown tag 0x{tag:02x} at byte {pos - 1}")
+
+
+def _decode_uint(data: bytes, pos: int) -> tuple[int, int]:
+    byte = data[pos]
+    pos += 1
+    if byte < 0x80:
+        return byte, pos
+    value = byte & 0x7F
+    shift = 7
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
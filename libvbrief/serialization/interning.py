@@ -0,0 +1,56 @@
+"""Share equal strings between parsed documents."""
+
+from __future__ import annotations
+
+from typing import Any
+
+# Parsers build a new string object for every occurrence of a value, so a
+# corpus of plans repeats "pending", tag names and dates thousands of times.
+# Only short strings are worth sharing, and the cap keeps a stream of unique
+# values (titles, uids) from growing the table forever.
+_STRINGS: dict[str, str] = {}
+_MAX_STRINGS = 65_536
+_MAX_LENGTH = 64
+
+
+def intern_strings(document: Any) -> Any:
+    """Replace keys and short string values in ``document`` with shared copies.
+
+    Dicts and lists are updated in place (dicts keep their key order) and
+    ``document`` is returned. Strings already in the table are reused; new
+    ones up to 64 characters are added until the table holds 65,536 entries.
+    """
+    get = _STRINGS.get
+    stack = [document]
+    while stack:
+        node = stack.pop()
+        if type(node) is dict:
+            entries = list(node.items())
+            # Re-inserting is the only way to swap a key for an equal object.
+            node.clear()
+            for key, value in entries:
+                kind = type(value)
+                if kind is str:
+                    value = get(value) or _add(value)
+                elif kind is dict or kind is list:
+                    stack.append(value)
+                node[(get(key) or _add(key)) if type(key) is str else key] = value
+        elif type(node) is list:
+            for index, value in enumerate(node):
+                kind = type(value)
+                if kind is str:
+                    node[index] = get(value) or _add(value)
+                elif kind is dict or kind is list:
+                    stack.append(value)
+    return document
+
+
+def _add(text: str) -> str:
+    if len(text) <= _MAX_LENGTH and len(_STRINGS) < _MAX_STRINGS:
+        _STRINGS[text] = text
+    return text
+
+
+def clear_intern_table() -> None:
+    """Forget every shared string, e.g. after unloading a corpus."""
+    _STRINGS.clear()
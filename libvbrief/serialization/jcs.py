@@ -0,0 +1,112 @@
+"""RFC 8785 JSON Canonicalization Scheme (JCS) serializer."""
+
+from __future__ import annotations
+
+from json.encoder import encode_basestring
+from itertools import chain, repeat
+from typing import Any, Iterator, Mapping
+
+# Integers below 2**53 are exact doubles whose shortest form is their digits.
+_EXACT_INT = 2**53
+_INFINITY = float("inf")
+
+
+def dumps_jcs(value: Any) -> bytes:
+    """Serialize ``value`` to its RFC 8785 canonical UTF-8 bytes.
+
+    Object members are sorted by the UTF-16 code units of their names, no
+    whitespace is emitted, strings use the minimal JSON escapes and numbers
+    are written like ECMAScript's ``Number.prototype.toString``. Numbers are
+    IEEE doubles in JCS, so integers beyond 2**53 are rounded like any other
+    JSON consumer would. NaN, infinities and values that are not JSON raise
+    ValueError or TypeError.
+    """
+    # Each frame is an iterator of (text before the value, value) pairs and
+    # the text closing its container; nesting depth is not limited by recursion.
+    parts: list[str] = []
+    frames: list[tuple[Iterator[tuple[str, Any]], str]] = [(iter((("", value),)), "")]
+    while frames:
+        entries, closing = frames[-1]
+        for prefix, value in entries:
+            kind = type(value)
+            if kind is str:
+                parts.append(prefix + encode_basestring(value))
+            elif kind is dict or (kind is not list and isinstance(value, Mapping)):
+                keys = _sorted_keys(value)
+                parts.append(prefix + "{")
+                prefixes = [("," if index else "") + encode_basestring(key) + ":" for index, key in enumerate(keys)]
+                frames.append((zip(prefixes, [value[key] for key in keys]), "}"))
+                break
+            elif kind is list or kind is tuple:
+                parts.append(prefix + "[")
+                frames.append((zip(chain(("",), repeat(",")), value), "]"))
+                break
+            elif value is None:
+                parts.append(prefix + "null")
+            elif value is True:
+                parts.append(prefix + "true")
+            elif value is False:
+                parts.append(prefix + "false")
+            elif isinstance(value, (int, float)):
+                parts.append(prefix + _number(value))
+            else:
+                raise TypeError(f"Object of type {kind.__name__} is not JSON serializable")
+        else:
+            frames.pop()
+            parts.append(closing)
+    return "".join(parts).encode("utf-8")
+
+
+def _sorted_keys(value: Mapping[Any, Any]) -> list[str]:
+    keys = list(value)
+    for key in keys:
+        if type(key) is not str:
+            raise TypeError(f"JSON object keys must be strings, not {type(key).__name__}")
+    # Code point and UTF-16 order only differ once characters beyond the
+    # Basic Multilingual Plane meet U+E000..U+FFFF.
+    if "".join(keys).isascii():
+        return sorted(keys)
+    return sorted(keys, key=_utf16)
+
+
+def _utf16(key: str) -> bytes:
+    return key.encode("utf-16-be", "surrogatepass")
+
+
+def _number(value: int | float) -> str:
+    if isinstance(value, int) and -_EXACT_INT < value < _EXACT_INT:
+        return str(int(value))
+    try:
+        value = float(value)
+    except OverflowError:
+        raise ValueError("JCS cannot represent an integer beyond the double range") from None
+    if value != value or value in (_INFINITY, -_INFINITY):
+        raise ValueError(f"JCS cannot represent {value!r}")
+    if value == 0:
+        return "0"
+    if value.is_integer() and -_EXACT_INT < value < _EXACT_INT:
+        return str(int(value))
+
+    # repr gives the shortest round-tripping digits, as ECMAScript requires;
+    # only the layout differs. ``point`` is the decimal exponent n of
+    # ECMA-262 Number::toString: the value is 0.<digits> * 10**point.
+    sign = "-" if value < 0 else ""
+    mantissa, _, exponent = repr(abs(value)).partition("e")
+    whole, _, fraction = mantissa.partition(".")
+    combined = whole + fraction
+    digits = combined.lstrip("0")
+    point = len(whole) + int(exponent or 0) - (len(combined) - len(digits))
+    digits = digits.rstrip("0")
+    count = len(digits)
+
+    if count <= point <= 21:
+        return sign + digits + "0" * (point - count)
+    if 0 < point <= 21:
+        return sign + digits[:point] + "." + digits[point:]
+    if -6 < point <= 0:
+        return sign + "0." + "0" * -point + digits
+    power = point - 1
+    exponent_text = f"e+{power}" if power >= 0 else f"e-{-power}"
+    if count == 1:
+        return sign + digits + exponent_text
+    return sign + digits[0] + "." + digits[1:] + exponent_text
@@ -4,23 +4,47 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Mapping
+from typing import Any, Iterator, Mapping
 
+from libvbrief.serialization.atomic import atomic_writer
+from libvbrief.serialization.backends import STDLIB, JSONBackend, get_json_backend
+from libvbrief.serialization.interning import intern_strings
 from libvbrief.types import JSONObject, JSONValue
 
+# Fast backends cannot all represent integers beyond 64 bits (orjson silently
+# turns them into floats), so input with a 19+ digit run is parsed by the
+# stdlib. Mapping every byte to "0"/" " and searching is much cheaper than a regex.
+_DIGIT_MASK = bytes(0x30 if 0x30 <= b <= 0x39 else 0x20 for b in range(256))
+_LONG_DIGIT_RUN = b"0" * 19
 
-def parse_json(text: str) -> JSONObject:
-    """Parse JSON text into a Python mapping."""
-    data = json.loads(text)
-    if not isinstance(data, dict):
-        raise ValueError("vBRIEF JSON document must be an object")
-    return data
+# Files are written by streaming the root object and ``plan`` member by
+# member and the arrays inside ``plan`` a batch of entries at a time; anything
+# deeper is rendered in one piece, so peak memory is one batch of items.
+_STREAM_DEPTH = 2
+_BATCH_SIZE = 64
+
+
+def parse_json(text: str, *, intern: bool = False) -> JSONObject:
+    """Parse JSON text into a Python mapping.
+
+    With ``intern`` keys and short string values are shared with every other
+    document parsed that way (see :func:`intern_strings`).
+    """
+    try:
+        data = text.encode("utf-8")
+    except (AttributeError, UnicodeEncodeError):
+        return _as_document(json.loads(text), intern)
+    return _as_document(_loads(data), intern)
 
 
-def load_json_file(path: str | Path) -> JSONObject:
+def parse_json_bytes(data: bytes, *, intern: bool = False) -> JSONObject:
+    """Parse UTF-8 JSON bytes into a Python mapping without decoding to str first."""
+    return _as_document(_loads(data), intern)
+
+
+def load_json_file(path: str | Path, *, intern: bool = False) -> JSONObject:
     """Load and parse a JSON document from disk."""
-    content = Path(path).read_text(encoding="utf-8")
-    return parse_json(content)
+    return parse_json_bytes(Path(path).read_bytes(), intern=intern)
 
 
 def dumps_json(
@@ -30,12 +54,25 @@ def dumps_json(
     preserve_format: bool = False,
 ) -> str:
     """Serialize a JSON document using canonical or preserve mode."""
-    if preserve_format and isinstance(document, Mapping):
-        rendered = json.dumps(document, ensure_ascii=False, indent=2, sort_keys=False)
-        return f"{rendered}\n"
+    sort_keys = _sort_keys(document, canonical=canonical, preserve_format=preserve_format)
+    rendered = _backend_dumps(document, sort_keys)
+    if rendered is not None:
+        return rendered.decode("utf-8")
+    return _stdlib_dumps(document, sort_keys)
 
-    rendered = json.dumps(document, ensure_ascii=False, indent=2, sort_keys=canonical)
-    return f"{rendered}\n"
+
+def dumps_json_bytes(
+    document: Mapping[str, JSONValue] | dict[str, Any],
+    *,
+    canonical: bool = True,
+    preserve_format: bool = False,
+) -> bytes:
+    """Serialize a JSON document to UTF-8 bytes, byte-identical to ``dumps_json``."""
+    sort_keys = _sort_keys(document, canonical=canonical, preserve_format=preserve_format)
+    rendered = _backend_dumps(document, sort_keys)
+    if rendered is not None:
+        return rendered
+    return _stdlib_dumps(document, sort_keys).encode("utf-8")
 
 
 def dump_json_file(
@@ -45,6 +82,99 @@ def dump_json_file(
     canonical: bool = True,
     preserve_format: bool = False,
 ) -> None:
-    """Write JSON document to disk using configured writer mode."""
-    output = dumps_json(document, canonical=canonical, preserve_format=preserve_format)
-    Path(path).write_text(output, encoding="utf-8")
+    """Write JSON document to disk using configured writer mode.
+
+    The output is streamed to a temporary file and atomically renamed over
+    ``path``; it is byte-identical to ``dumps_json``.
+    """
+    with atomic_writer(path) as handle:
+        for chunk in iter_json_chunks(document, canonical=canonical, preserve_format=preserve_format):
+            handle.write(chunk)
+
+
+def iter_json_chunks(
+    document: Mapping[str, JSONValue] | dict[str, Any],
+    *,
+    canonical: bool = True,
+    preserve_format: bool = False,
+) -> Iterator[bytes]:
+    """Yield ``dumps_json_bytes`` output in pieces of at most a few plan items."""
+    sort_keys = _sort_keys(document, canonical=canonical, preserve_format=preserve_format)
+    yield from _iter_chunks(document, sort_keys, get_json_backend(), b"\n", 0)
+    yield b"\n"
+
+
+def _loads(data: bytes) -> Any:
+    backend = get_json_backend()
+    if backend.name != STDLIB and _LONG_DIGIT_RUN not in data.translate(_DIGIT_MASK):
+        try:
+            return backend.loads(data)
+        except (TypeError, ValueError):
+            # Re-parse with the stdlib so accepted input (NaN, lone surrogates)
+            # and error messages stay exactly as before.
+            pass
+    return json.loads(data)
+
+
+def _sort_keys(document: Any, *, canonical: bool, preserve_format: bool) -> bool:
+    if preserve_format and isinstance(document, Mapping):
+        return False
+    return canonical
+
+
+def _iter_chunks(value: Any, sort_keys: bool, backend: JSONBackend, newline: bytes, depth: int) -> Iterator[bytes]:
+    # Mirrors json.dumps(indent=2): a nested value rendered on its own only
+    # needs the current indentation added after each of its newlines.
+    kind = type(value)
+    if value and kind is dict and depth < _STREAM_DEPTH and all(type(key) is str for key in value):
+        inner = newline + b"  "
+        entries = sorted(value.items()) if sort_keys else value.items()
+        separator = b"{" + inner
+        for key, child in entries:
+            yield separator + json.dumps(key, ensure_ascii=False).encode("utf-8") + b": "
+            yield from _iter_chunks(child, sort_keys, backend, inner, depth + 1)
+            separator = b"," + inner
+        yield newline + b"}"
+    elif value and kind is list and depth <= _STREAM_DEPTH:
+        # A slice rendered as a list is "[\n  a,\n  b\n]"; its middle is
+        # exactly those entries' lines inside the full array.
+        separator = b"[" + newline
+        for start in range(0, len(value), _BATCH_SIZE):
+            rendered = _render(value[start : start + _BATCH_SIZE], sort_keys, backend)
+            yield separator + rendered[2:-2].replace(b"\n", newline)
+            separator = b"," + newline
+        yield newline + b"]"
+    else:
+        yield _render(value, sort_keys, backend).replace(b"\n", newline)
+
+
+def _render(value: Any, sort_keys: bool, backend: JSONBackend) -> bytes:
+    if backend.dumps is not None:
+        try:
+            return backend.dumps(value, sort_keys)
+        except (TypeError, ValueError):
+            pass
+    return json.dumps(value, ensure_ascii=False, indent=2, sort_keys=sort_keys).encode("utf-8")
+
+
+def _backend_dumps(document: Any, sort_keys: bool) -> bytes | None:
+    backend = get_json_backend()
+    if backend.dumps is None:
+        return None
+    try:
+        return backend.dumps(document, sort_keys) + b"\n"
+    except (TypeError, ValueError):
+        return None
+
+
+def _stdlib_dumps(document: Any, sort_keys: bool) -> str:
+    rendered = json.dumps(document, ensure_ascii=False, indent=2, sort_keys=sort_keys)
+    return f"{rendered}\n"
+
+
+def _as_document(data: Any, intern: bool) -> JSONObject:
+    if not isinstance(data, dict):
+        raise ValueError("vBRIEF JSON document must be an object")
+    if intern:
+        intern_strings(data)
+    return data
@@ -0,0 +1,401 @@
+"""TRON parse/emit helpers for vBRIEF documents.
+
+TRON is a JSON superset that adds ``class Name: field, ...`` definitions and
+positional constructors (``Name("a", "b")``). Documents may also omit the
+root braces and list ``key: value`` members directly, which is how the
+``examples/*.vbrief.tron`` files are written. See docs/tron-encoding.md.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections import Counter
+from json.decoder import scanstring
+from json.encoder import encode_basestring
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+from libvbrief.serialization.atomic import atomic_writer
+from libvbrief.types import JSONObject, JSONValue
+
+_WHITESPACE = re.compile(r"(?:[ \t\r\n]+|#[^\n]*)*")
+_NUMBER = re.compile(r"-?(?:0|[1-9][0-9]*)(\.[0-9]+)?([eE][-+]?[0-9]+)?")
+_IDENTIFIER = re.compile(r"[A-Za-z_$][A-Za-z0-9_$]*")
+_BARE_KEY = re.compile(r"^[A-Za-z_$][A-Za-z0-9_$]*$")
+# Fast path for the common escape-free string element inside ``[...]`` or ``Name(...)``.
+_SIMPLE_ELEMENT = re.compile(r'"([^"\\\x00-\x1f]*)"[ \t\r\n]*(?:,(?:[ \t\r\n]+|#[^\n]*)*|(?=[\])]))')
+
+_LITERALS: dict[str, Any] = {
+    "true": True,
+    "false": False,
+    "null": None,
+    "NaN": float("nan"),
+    "Infinity": float("inf"),
+}
+
+_SCALAR_TYPES = (str, int, float, type(None))
+
+_ITEM_CLASS = "PlanItem"
+_EDGE_CLASS = "Edge"
+
+
+class TronDecodeError(ValueError):
+    """Raised when TRON text cannot be parsed."""
+
+    def __init__(self, msg: str, doc: str, pos: int) -> None:
+        lineno = doc.count("\n", 0, pos) + 1
+        colno = pos - doc.rfind("\n", 0, pos)
+        super().__init__(f"{msg}: line {lineno} column {colno} (char {pos})")
+        self.msg = msg
+        self.doc = doc
+        self.pos = pos
+        self.lineno = lineno
+        self.colno = colno
+
+
+def parse_tron(text: str) -> JSONObject:
+    """Parse TRON text into a Python mapping."""
+    data = _TronParser(text).parse_document()
+    if not isinstance(data, dict):
+        raise ValueError("vBRIEF TRON document must be an object")
+    return data
+
+
+def load_tron_file(path: str | Path) -> JSONObject:
+    """Load and parse a TRON document from disk."""
+    content = Path(path).read_text(encoding="utf-8")
+    return parse_tron(content)
+
+
+def dumps_tron(
+    document: Mapping[str, JSONValue] | dict[str, Any],
+    *,
+    canonical: bool = True,
+    preserve_format: bool = False,
+) -> str:
+    """Serialize a document to TRON, using classes for repeated items and edges."""
+    sort_keys = canonical and not preserve_format
+    classes = _infer_classes(document, sort_keys=sort_keys)
+    writer = _TronWriter(classes, sort_keys=sort_keys)
+
+    blocks = [f"class {name}: {', '.join(fields)}" for name, fields in classes.items()]
+    if blocks:
+        blocks[-1] += "\n"
+    for key in _ordered_keys(document, sort_keys):
+        blocks.append(f"{_render_key(key)}: {writer.render(document[key], 0)}\n")
+    return "\n".join(blocks)
+
+
+def dump_tron_file(
+    path: str | Path,
+    document: Mapping[str, JSONValue] | dict[str, Any],
+    *,
+    canonical: bool = True,
+    preserve_format: bool = False,
+) -> None:
+    """Write TRON document to disk using configured writer mode (atomically)."""
+    output = dumps_tron(document, canonical=canonical, preserve_format=preserve_format)
+    with atomic_writer(path) as handle:
+        handle.write(output.encode("utf-8"))
+
+
+class _TronParser:
+    """Single-pass tokenizer and recursive-descent builder for TRON text."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.classes: dict[str, tuple[str, ...]] = {}
+
+    def parse_document(self) -> Any:
+        text = self.text
+        pos = self._skip(0)
+
+        while text.startswith("class", pos):
+            match = _IDENTIFIER.match(text, pos)
+            if match is None or match.group() != "class":
+                break
+            after = self._skip(match.end())
+            if after == match.end() or _IDENTIFIER.match(text, after) is None:
+                break
+            pos = self._parse_class(after)
+
+        if pos < len(text) and text[pos] in "{[" or self._is_value_start(pos):
+            value, pos = self._parse_value(pos)
+        else:
+            value, pos = self._parse_members(pos, terminator=None)
+
+        pos = self._skip(pos)
+        if pos != len(text):
+            raise TronDecodeError("Extra data", text, pos)
+        return value
+
+    def _is_value_start(self, pos: int) -> bool:
+        # A bare JSON scalar root (e.g. ``"x"``) is still parsed, then rejected
+        # by parse_tron with the same message as the JSON codec.
+        if pos >= len(self.text):
+            return False
+        if self.text[pos] == '"':
+            try:
+                end = self._skip(scanstring(self.text, pos + 1)[1])
+            except ValueError:
+                return True
+            return end >= len(self.text) or self.text[end] != ":"
+        return self.text[pos] == "-" or self.text[pos].isdigit()
+
+    def _skip(self, pos: int) -> int:
+        return _WHITESPACE.match(self.text, pos).end()
+
+    def _parse_class(self, pos: int) -> int:
+        text = self.text
+        match = _IDENTIFIER.match(text, pos)
+        name = match.group()
+        pos = self._skip(match.end())
+        if not text.startswith(":", pos):
+            raise TronDecodeError("Expecting ':' after class name", text, pos)
+
+        fields: list[str] = []
+        while True:
+            pos = self._skip(pos + 1)
+            match = _IDENTIFIER.match(text, pos)
+            if match is None:
+                raise TronDecodeError("Expecting class field name", text, pos)
+            fields.append(match.group())
+            pos = self._skip(match.end())
+            if not text.startswith(",", pos):
+                break
+
+        self.classes[name] = tuple(fields)
+        return pos
+
+    def _parse_key(self, pos: int) -> tuple[str, int]:
+        text = self.text
+        if text.startswith('"', pos):
+            try:
+                return scanstring(text, pos + 1)
+            except ValueError as exc:
+                raise TronDecodeError("Invalid string", text, pos) from exc
+        match = _IDENTIFIER.match(text, pos)
+        if match is None:
+            raise TronDecodeError("Expecting property name", text, pos)
+        return match.group(), match.end()
+
+    def _parse_members(self, pos: int, terminator: str | None) -> tuple[dict[str, Any], int]:
+        text = self.text
+        result: dict[str, Any] = {}
+        end = len(text)
+
+        while True:
+            pos = self._skip(pos)
+            if pos >= end:
+                if terminator is not None:
+                    raise TronDecodeError(f"Expecting '{terminator}'", text, pos)
+                return result, pos
+            if terminator is not None and text[pos] == terminator:
+                return result, pos + 1
+
+            key, pos = self._parse_key(pos)
+            pos = self._skip(pos)
+            if not text.startswith(":", pos):
+                raise TronDecodeError("Expecting ':' delimiter", text, pos)
+            value, pos = self._parse_value(self._skip(pos + 1))
+            result[key] = value
+
+            pos = self._skip(pos)
+            if text.startswith(",", pos):
+                pos += 1
+
+    def _parse_value(self, pos: int) -> tuple[Any, int]:
+        text = self.text
+        if pos >= len(text):
+            raise TronDecodeError("Expecting value", text, pos)
+        char = text[pos]
+
+        if char == '"':
+            try:
+                return scanstring(text, pos + 1)
+            except ValueError as exc:
+                raise TronDecodeError("Invalid string", text, pos) from exc
+        if char == "{":
+            return self._parse_members(pos + 1, terminator="}")
+        if char == "[":
+            return self._parse_sequence(pos + 1, terminator="]")
+
+        match = _NUMBER.match(text, pos)
+        if match is not None:
+            literal = match.group()
+            if match.group(1) or match.group(2):
+                return float(literal), match.end()
+            return int(literal), match.end()
+        if text.startswith("-Infinity", pos):
+            return float("-inf"), pos + 9
+
+        match = _IDENTIFIER.match(text, pos)
+        if match is None:
+            raise TronDecodeError("Expecting value", text, pos)
+        name = match.group()
+        after = self._skip(match.end())
+        if text.startswith("(", after):
+            return self._parse_instance(name, pos, after + 1)
+        if name in _LITERALS:
+            return _LITERALS[name], match.end()
+        raise TronDecodeError(f"Unexpected identifier {name!r}", text, pos)
+
+    def _parse_sequence(self, pos: int, terminator: str) -> tuple[list[Any], int]:
+        text = self.text
+        result: list[Any] = []
+        append = result.append
+        simple = _SIMPLE_ELEMENT.match
+        pos = self._skip(pos)
+        while True:
+            if text.startswith(terminator, pos):
+                return result, pos + 1
+            match = simple(text, pos)
+            if match is not None:
+                append(match.group(1))
+                pos = match.end()
+                continue
+            value, pos = self._parse_value(pos)
+            append(value)
+            pos = self._skip(pos)
+            if text.startswith(",", pos):
+                pos = self._skip(pos + 1)
+            elif not text.startswith(terminator, pos):
+                raise TronDecodeError(f"Expecting ',' or '{terminator}'", text, pos)
+
+    def _parse_instance(self, name: str, start: int, pos: int) -> tuple[dict[str, Any], int]:
+        fields = self.classes.get(name)
+        if fields is None:
+            raise TronDecodeError(f"Undefined class {name!r}", self.text, start)
+        args, pos = self._parse_sequence(pos, terminator=")")
+        if len(args) > len(fields):
+            raise TronDecodeError(
+                f"{name} takes {len(fields)} fields but {len(args)} were given",
+                self.text,
+                start,
+            )
+        return {k: v for k, v in zip(fields, args) if v is not None}, pos
+
+
+class _TronWriter:
+    """Pretty TRON emitter mirroring the JSON codec's two-space layout."""
+
+    def __init__(self, classes: dict[str, tuple[str, ...]], *, sort_keys: bool) -> None:
+        self.sort_keys = sort_keys
+        self.by_layout = {fields: name for name, fields in classes.items()}
+
+    def render(self, value: Any, depth: int) -> str:
+        if isinstance(value, _SCALAR_TYPES):
+            return _render_scalar(value)
+        if isinstance(value, Mapping):
+            constructor = self._constructor(value)
+            if constructor is not None:
+                return constructor
+            if not value:
+                return "{}"
+            pad = "  " * (depth + 1)
+            lines = [
+                f"{pad}{_render_key(key)}: {self.render(value[key], depth + 1)}"
+                for key in _ordered_keys(value, self.sort_keys)
+            ]
+            return "{\n" + ",\n".join(lines) + "\n" + "  " * depth + "}"
+
+        if isinstance(value, list):
+            if not value:
+                return "[]"
+            if not any(isinstance(x, (Mapping, list)) for x in value):
+                return "[" + ", ".join(_render_scalar(x) for x in value) + "]"
+            pad = "  " * (depth + 1)
+            lines = [f"{pad}{self.render(x, depth + 1)}" for x in value]
+            return "[\n" + ",\n".join(lines) + "\n" + "  " * depth + "]"
+
+        return _render_scalar(value)
+
+    def render_inline(self, value: Any) -> str:
+        if isinstance(value, _SCALAR_TYPES):
+            return _render_scalar(value)
+        if isinstance(value, Mapping):
+            constructor = self._constructor(value)
+            if constructor is not None:
+                return constructor
+            members = (
+                f"{_render_key(key)}: {self.render_inline(value[key])}"
+                for key in _ordered_keys(value, self.sort_keys)
+            )
+            return "{" + ", ".join(members) + "}"
+        if isinstance(value, list):
+            return "[" + ", ".join(self.render_inline(x) for x in value) + "]"
+        return _render_scalar(value)
+
+    def _constructor(self, value: Mapping[str, Any]) -> str | None:
+        name = self.by_layout.get(_layout(value, self.sort_keys))
+        if name is None or any(v is None for v in value.values()):
+            return None
+        args = ", ".join(self.render_inline(value[key]) for key in _ordered_keys(value, self.sort_keys))
+        return f"{name}({args})"
+
+
+def _infer_classes(document: Mapping[str, Any], *, sort_keys: bool) -> dict[str, tuple[str, ...]]:
+    plan = document.get("plan")
+    if not isinstance(plan, Mapping):
+        return {}
+
+    classes: dict[str, tuple[str, ...]] = {}
+    edges = plan.get("edges")
+    if isinstance(edges, list):
+        layout = _common_layout(edges, sort_keys)
+        if layout is not None:
+            classes[_EDGE_CLASS] = layout
+
+    items = plan.get("items")
+    if isinstance(items, list):
+        layout = _common_layout(_iter_items(items), sort_keys)
+        if layout is not None and layout not in classes.values():
+            classes[_ITEM_CLASS] = layout
+    return classes
+
+
+def _common_layout(values: Iterable[Any], sort_keys: bool) -> tuple[str, ...] | None:
+    counts: Counter[tuple[str, ...]] = Counter(
+        _layout(value, sort_keys)
+        for value in values
+        if isinstance(value, Mapping)
+        and value
+        and "subItems" not in value
+        and all(v is not None for v in value.values())
+    )
+    if not counts:
+        return None
+    layout, count = counts.most_common(1)[0]
+    return layout if count > 1 else None
+
+
+def _iter_items(items: list[Any]) -> Iterable[Any]:
+    stack = list(reversed(items))
+    while stack:
+        item = stack.pop()
+        yield item
+        if isinstance(item, Mapping):
+            sub_items = item.get("subItems")
+            if isinstance(sub_items, list):
+                stack.extend(reversed(sub_items))
+
+
+def _layout(value: Mapping[str, Any], sort_keys: bool) -> tuple[str, ...]:
+    return tuple(sorted(value)) if sort_keys else tuple(value)
+
+
+def _ordered_keys(value: Mapping[str, Any], sort_keys: bool) -> Iterable[str]:
+    return sorted(value) if sort_keys else value.keys()
+
+
+def _render_key(key: str) -> str:
+    if _BARE_KEY.match(key) and key != "class":
+        return key
+    return json.dumps(key, ensure_ascii=False)
+
+
+def _render_scalar(value: Any) -> str:
+    if type(value) is str:
+        return encode_basestring(value)
+    return json.dumps(value, ensure_ascii=False)
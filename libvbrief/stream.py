@@ -0,0 +1,367 @@
+"""Incremental, constant-memory iteration over plan items in a JSON file.
+
+``iter_items`` reads the file in chunks with a small pure-Python event
+parser and yields each top-level ``plan.items`` entry as soon as its closing
+brace is read, so memory is bounded by the largest single item rather than
+by the number of items. Paths use the same ``plan.items[0].subItems[1]``
+form as :mod:`libvbrief.validation`.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from json.decoder import scanstring
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+_NUMBER = re.compile(r"-?(?:0|[1-9][0-9]*)(\.[0-9]+)?([eE][-+]?[0-9]+)?")
+_LITERALS = {
+    "t": ("true", True),
+    "f": ("false", False),
+    "n": ("null", None),
+    "N": ("NaN", float("nan")),
+    "I": ("Infinity", float("inf")),
+    "-": ("-Infinity", float("-inf")),
+}
+_LONGEST_LITERAL = 9
+_DECODER = json.JSONDecoder()
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+_TAIL_SIZE = 1 << 16
+
+
+@dataclass(frozen=True)
+class StreamedItem:
+    """A plan item yielded by :func:`iter_items`."""
+
+    path: str
+    item: dict[str, Any]
+    depth: int
+
+
+class ItemStream:
+    """Iterator of :class:`StreamedItem` with the document's ``vBRIEFInfo``.
+
+    ``info`` is populated before the first item is returned when
+    ``vBRIEFInfo`` precedes ``plan`` or is the last root member (canonical
+    output sorts it last; a short read of the file tail finds it). In any
+    other layout it is filled in once the stream reaches it.
+    """
+
+    def __init__(self, path: str | Path, *, depth: int | None, chunk_size: int) -> None:
+        self.path = Path(path)
+        self.info: dict[str, Any] | None = None
+        self._depth = depth
+        self._chunk_size = chunk_size
+        self._file: IO[str] | None = self.path.open("r", encoding="utf-8")
+        self._info_seen = False
+        self._items = self._iter_document(_Lexer(self._file, chunk_size))
+        self._started = False
+
+    def __iter__(self) -> ItemStream:
+        return self
+
+    def __next__(self) -> StreamedItem:
+        try:
+            item = next(self._items)
+        except BaseException:
+            self.close()
+            raise
+        if not self._started:
+            self._started = True
+            if not self._info_seen:
+                self.info = _find_trailing_info(self.path)
+                self._info_seen = True
+        return item
+
+    def __enter__(self) -> ItemStream:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _iter_document(self, lexer: _Lexer) -> Iterator[StreamedItem]:
+        for key in lexer.members(root=True):
+            if key == "vBRIEFInfo":
+                info = lexer.value()
+                self.info = info if isinstance(info, dict) else None
+                self._info_seen = True
+            elif key == "plan" and lexer.peek() == "{":
+                for plan_key in lexer.members():
+                    if plan_key == "items" and lexer.peek() == "[":
+                        yield from self._iter_items(lexer)
+                    else:
+                        lexer.skip()
+            else:
+                lexer.skip()
+
+    def _iter_items(self, lexer: _Lexer) -> Iterator[StreamedItem]:
+        for index in lexer.elements():
+            item = lexer.value()
+            if isinstance(item, dict):
+                yield from _flatten(item, f"plan.items[{index}]", self._depth)
+
+
+def iter_items(
+    path: str | Path,
+    *,
+    depth: int | None = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> ItemStream:
+    """Stream plan items from a vBRIEF JSON file.
+
+    ``depth=0`` yields only top-level items; ``depth=N`` also yields subItems
+    up to N levels down, in pre-order, after their parent; ``depth=None``
+    yields every level. Yielded parents still carry their ``subItems``.
+    Entries that are not objects are skipped but keep their index in paths.
+    """
+    return ItemStream(path, depth=depth, chunk_size=chunk_size)
+
+
+def _flatten(item: dict[str, Any], path: str, max_depth: int | None) -> Iterator[StreamedItem]:
+    stack = [(path, item, 0)]
+    while stack:
+        path, item, depth = stack.pop()
+        yield StreamedItem(path=path, item=item, depth=depth)
+        if max_depth is not None and depth >= max_depth:
+            continue
+        sub_items = item.get("subItems")
+        if not isinstance(sub_items, list):
+            continue
+        for index in range(len(sub_items) - 1, -1, -1):
+            child = sub_items[index]
+            if isinstance(child, dict):
+                stack.append((f"{path}.subItems[{index}]", child, depth + 1))
+
+
+def _find_trailing_info(path: Path) -> dict[str, Any] | None:
+    """Fast path: decode ``"vBRIEFInfo": {...}`` when it is the last root member."""
+    with path.open("rb") as handle:
+        handle.seek(0, 2)
+        size = handle.tell()
+        handle.seek(max(size - _TAIL_SIZE, 0))
+        tail = handle.read().decode("utf-8", errors="replace")
+
+    start = tail.rfind('"vBRIEFInfo"')
+    if start <= 0 or tail[start - 1] == "\\":
+        return None
+    colon = _WHITESPACE.match(tail, start + len('"vBRIEFInfo"')).end()
+    if not tail.startswith(":", colon):
+        return None
+    try:
+        value, end = _DECODER.raw_decode(tail, _WHITESPACE.match(tail, colon + 1).end())
+    except ValueError:
+        return None
+    # Exactly one closing brace may follow: the root object's.
+    if tail[end:].strip() != "}" or not isinstance(value, dict):
+        return None
+    return value
+
+
+class _Lexer:
+    """Chunked JSON tokenizer with just enough structure for streaming."""
+
+    def __init__(self, handle: IO[str], chunk_size: int) -> None:
+        self.handle = handle
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.offset = 0
+        self.lines = 0
+        self.eof = False
+
+    def members(self, *, root: bool = False) -> Iterator[str]:
+        """Iterate object keys; the caller must consume each member's value."""
+        if root and self.peek() != "{":
+            self.error("vBRIEF JSON document must be an object")
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+        else:
+            while True:
+                if self.peek() != '"':
+                    self.error("Expecting property name enclosed in double quotes")
+                key = self.string()
+                self.expect(":")
+                self.peek()
+                yield key
+                char = self.peek()
+                self.pos += 1
+                if char == "}":
+                    break
+                if char != ",":
+                    self.pos -= 1
+                    self.error("Expecting ',' delimiter")
+        if root and self.peek() != "":
+            self.error("Extra data")
+
+    def elements(self) -> Iterator[int]:
+        """Iterate array indexes; the caller must consume each element."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        index = 0
+        while True:
+            self.peek()
+            yield index
+            index += 1
+            char = self.peek()
+            self.pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                self.pos -= 1
+                self.error("Expecting ',' delimiter")
+
+    def value(self) -> Any:
+        """Decode the next complete value."""
+        char = self.peek()
+        if char in "{[":
+            # Decode in C when the whole value is buffered (allowing one refill
+            # for values that straddle a chunk boundary); otherwise build it
+            # token by token, which also produces precise errors.
+            for _ in range(2):
+                try:
+                    value, self.pos = _DECODER.raw_decode(self.buf, self.pos)
+                    return value
+                except ValueError:
+                    if not self._fill():
+                        break
+            return self._parse(keep=True)
+        return self.scalar()
+
+    def skip(self) -> None:
+        """Consume the next value without building it."""
+        self._parse(keep=False)
+
+    def _parse(self, *, keep: bool) -> Any:
+        # Iterative so deeply nested values cannot exhaust the Python stack.
+        # Without ``keep`` containers are replaced by True (object) / False
+        # (array) markers so skipped values are checked but never built.
+        frames: list[tuple[Any, str | None]] = []
+        key: str | None = None
+        while True:
+            char = self.peek()
+            if char == "{" or char == "[":
+                self.pos += 1
+                is_dict = char == "{"
+                frames.append((({} if is_dict else []) if keep else is_dict, key))
+                if self.peek() != ("}" if is_dict else "]"):
+                    key = self._key() if is_dict else None
+                    continue
+                self.pos += 1
+                value, key = frames.pop()
+            elif char == '"':
+                value = self.string()
+            else:
+                value = self.scalar()
+
+            while True:
+                if not frames:
+                    return value if keep else None
+                container = frames[-1][0]
+                is_dict = type(container) is dict if keep else container
+                if keep:
+                    if is_dict:
+                        container[key] = value
+                    else:
+                        container.append(value)
+
+                char = self.peek()
+                if char == ",":
+                    self.pos += 1
+                    key = self._key() if is_dict else None
+                    break
+                if char != ("}" if is_dict else "]"):
+                    self.error("Expecting ',' delimiter")
+                self.pos += 1
+                value, key = frames.pop()
+
+    def _key(self) -> str:
+        if self.peek() != '"':
+            self.error("Expecting property name enclosed in double quotes")
+        key = self.string()
+        self.expect(":")
+        return key
+
+    def string(self) -> str:
+        while True:
+            try:
+                value, end = scanstring(self.buf, self.pos + 1)
+            except json.JSONDecodeError as exc:
+                incomplete = exc.msg.startswith("Unterminated") or exc.pos >= len(self.buf) - 6
+                if incomplete and self._fill():
+                    continue
+                raise self._decode_error(exc.msg, exc.pos) from None
+            self.pos = end
+            return value
+
+    def scalar(self) -> Any:
+        if len(self.buf) - self.pos < _LONGEST_LITERAL + 1:
+            self._fill()
+        char = self.buf[self.pos : self.pos + 1]
+        if char == '"':
+            return self.string()
+
+        match = _NUMBER.match(self.buf, self.pos)
+        while match is not None and match.end() == len(self.buf) and self._fill():
+            match = _NUMBER.match(self.buf, self.pos)
+        if match is not None:
+            self.pos = match.end()
+            if match.group(1) or match.group(2):
+                return float(match.group())
+            return int(match.group())
+
+        literal = _LITERALS.get(char)
+        if literal is not None and self.buf.startswith(literal[0], self.pos):
+            self.pos += len(literal[0])
+            return literal[1]
+        self.error("Expecting value")
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at EOF)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            self.error(f"Expecting '{char}' delimiter" if char == ":" else f"Expecting '{char}'")
+        self.pos += 1
+
+    def error(self, msg: str) -> None:
+        raise self._decode_error(msg, self.pos)
+
+    def _decode_error(self, msg: str, pos: int) -> json.JSONDecodeError:
+        # Only the current chunk is buffered, so rebase the position onto the file.
+        error = json.JSONDecodeError(msg, self.buf, pos)
+        error.pos = self.offset + pos
+        error.lineno = self.lines + self.buf.count("\n", 0, pos) + 1
+        error.args = (f"{msg}: line {error.lineno} (char {error.pos})",)
+        return error
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.handle.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.offset += self.pos
+        self.lines += self.buf.count("\n", 0, self.pos)
+        self.buf = self.buf[self.pos :] + chunk
+        self.pos = 0
+        return True
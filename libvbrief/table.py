@@ -0,0 +1,358 @@
+"""Columnar (struct-of-arrays) view of plan items for bulk analytics.
+
+:class:`PlanTable` flattens one or many documents into one row per item,
+in document order, with a column per field:
+
+- ``status`` and ``priority``: int8 codes into :data:`CATEGORIES`, -1 when
+  missing or not a known value
+- the date-time fields: int64 seconds since the Unix epoch (UTC), or
+  :data:`NO_DATE`
+- ``percentComplete``: float64, NaN when missing
+- ``parent`` (row of the parent item, -1 at the top), ``depth`` and
+  ``document`` (position in ``documents``)
+
+Columns are NumPy arrays when NumPy is importable, so filters, group-bys
+and rollups run vectorized; otherwise they are :class:`array.array` and the
+same operations run as plain loops. ``items[row]`` leads back to the
+:class:`PlanItem`. The table is a snapshot: later edits to the items are
+not reflected.
+"""
+
+from __future__ import annotations
+
+import math
+import operator
+from array import array
+from collections import Counter
+from typing import Any, Iterable, Sequence
+
+from libvbrief.compat import VALID_STATUSES
+from libvbrief.models import PlanItem, VBriefDocument
+from libvbrief.query import date_key
+from libvbrief.traversal import walk_items
+
+NUMPY = "numpy"
+ARRAY = "array"
+
+CATEGORIES: dict[str, tuple[str, ...]] = {
+    # Sorted so the codes do not depend on set iteration order.
+    "status": tuple(sorted(VALID_STATUSES)),
+    "priority": ("low", "medium", "high", "critical"),
+}
+DATE_COLUMNS = ("dueDate", "startDate", "endDate", "created", "updated", "completed")
+NO_DATE = -(2**63)
+
+# array.array typecodes; NumPy reads the same codes as dtypes.
+_TYPECODES = {
+    "status": "b",
+    "priority": "b",
+    **{name: "q" for name in DATE_COLUMNS},
+    "percentComplete": "d",
+    "parent": "q",
+    "depth": "i",
+    "document": "i",
+}
+_CODES = {name: {label: code for code, label in enumerate(labels)} for name, labels in CATEGORIES.items()}
+_AGGREGATES = ("count", "sum", "mean", "min", "max")
+
+
+def available_table_backends() -> list[str]:
+    """Return the usable column backends, preferred first."""
+    return [NUMPY, ARRAY] if _numpy() is not None else [ARRAY]
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class PlanTable:
+    """Plan items of one or more documents as columns; see the module docstring."""
+
+    def __init__(self, documents: VBriefDocument | Iterable[VBriefDocument], *, backend: str | None = None) -> None:
+        if isinstance(documents, VBriefDocument):
+            documents = [documents]
+        self.documents: list[VBriefDocument] = list(documents)
+        if backend is None:
+            backend = available_table_backends()[0]
+        elif backend not in available_table_backends():
+            raise ValueError(f"Table backend {backend!r} is not available; expected one of {available_table_backends()}")
+        self.backend = backend
+        self._np = _numpy() if backend == NUMPY else None
+        self.items: list[PlanItem] = []
+        self._rows: dict[int, int] | None = None
+        self.columns: dict[str, Any] = self._build()
+
+    def _build(self) -> dict[str, Any]:
+        columns = {name: array(code) for name, code in _TYPECODES.items()}
+        status, priority = columns["status"].append, columns["priority"].append
+        dates = [(name, columns[name].append) for name in DATE_COLUMNS]
+        percent = columns["percentComplete"].append
+        parent, depth, document = columns["parent"].append, columns["depth"].append, columns["document"].append
+        status_codes, priority_codes = _CODES["status"], _CODES["priority"]
+        items = self.items
+        rows: dict[int, tuple[int, int]] = {}
+        for number, doc in enumerate(self.documents):
+            for _, item, owner in walk_items(doc.plan._items or (), path=None, children=_model_children):
+                if not isinstance(item, PlanItem):
+                    continue
+                row = len(items)
+                items.append(item)
+                parent_row, parent_depth = rows.get(id(owner), (-1, -1))
+                rows[id(item)] = (row, parent_depth + 1)
+                parent(parent_row)
+                depth(parent_depth + 1)
+                document(number)
+                status(_code(status_codes, item.status))
+                priority(_code(priority_codes, item.priority))
+                for name, append in dates:
+                    value = getattr(item, name)
+                    key = None if value is None else date_key(value)
+                    append(NO_DATE if key is None else int(key.timestamp()))
+                value = item.percentComplete
+                percent(float(value) if type(value) in (int, float) else math.nan)
+        if self._np is not None:
+            return {name: self._np.frombuffer(column, dtype=column.typecode) for name, column in columns.items()}
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __getitem__(self, name: str) -> Any:
+        """Return the column ``name``."""
+        return self.columns[name]
+
+    def row(self, item: PlanItem) -> int:
+        """Return the row of ``item``; KeyError if it is not in the table."""
+        if self._rows is None:
+            self._rows = {id(entry): row for row, entry in enumerate(self.items)}
+        row = self._rows.get(id(item))
+        if row is None or self.items[row] is not item:
+            raise KeyError(item)
+        return row
+
+    def items_at(self, rows: Iterable[int]) -> list[PlanItem]:
+        """Return the items of ``rows`` (for example the result of :meth:`where`)."""
+        items = self.items
+        return [items[row] for row in rows.tolist()] if hasattr(rows, "tolist") else [items[row] for row in rows]
+
+    def where(self, **conditions: Any) -> Sequence[int]:
+        """Return the rows matching every condition, in table order.
+
+        ``status``, ``priority``, ``document`` and ``depth`` take a value or
+        a list of values (None matches a missing status or priority). Date
+        columns and ``percentComplete`` take ``(low, high)``, inclusive,
+        with None for an open end; dates may be ISO 8601 strings or
+        datetimes. Missing values never fall in a range.
+        """
+        tests = [self._test(name, wanted) for name, wanted in conditions.items()]
+        np = self._np
+        if np is not None:
+            mask = np.ones(len(self), dtype=bool)
+            for column, test in tests:
+                mask &= test(column)
+            return np.flatnonzero(mask)
+        rows: Iterable[int] = range(len(self))
+        for column, test in tests:
+            rows = [row for row in rows if test(column[row])]
+        return array("q", rows)
+
+    def _test(self, name: str, wanted: Any) -> tuple[Any, Any]:
+        if name not in _TYPECODES or name == "parent":
+            raise ValueError(f"Cannot filter on {name!r}")
+        column = self.columns[name]
+        np = self._np
+        if name in DATE_COLUMNS or name == "percentComplete":
+            low, high = wanted
+            if name in DATE_COLUMNS:
+                low, high = _epoch(name, low), _epoch(name, high)
+                floor = NO_DATE + 1 if low is None else low
+            else:
+                floor = -math.inf if low is None else low
+            ceiling = math.inf if high is None else high
+            if np is not None:
+                return column, lambda values: (values >= floor) & (values <= ceiling)
+            return column, lambda value: floor <= value <= ceiling
+        values = [wanted] if isinstance(wanted, (str, int)) or wanted is None else list(wanted)
+        if name in CATEGORIES:
+            values = [_category_code(name, value) for value in values]
+        if np is not None:
+            return column, lambda column_values: np.isin(column_values, values)
+        accepted = frozenset(values)
+        return column, accepted.__contains__
+
+    def count_by(self, name: str, rows: Sequence[int] | None = None) -> dict[Any, int]:
+        """Count rows per value of ``name``: status/priority labels (None for missing), or ints."""
+        keys = self._select(self.columns[name], rows)
+        np = self._np
+        if name in CATEGORIES:
+            labels = CATEGORIES[name]
+            if np is not None:
+                counts = np.bincount(keys.astype(np.int64) + 1, minlength=len(labels) + 1).tolist()
+            else:
+                counter = Counter(keys)
+                counts = [counter[code] for code in range(-1, len(labels))]
+            result = dict(zip(labels, counts[1:]))
+            if counts[0]:
+                result[None] = counts[0]
+            return result
+        if np is not None:
+            values, counts = np.unique(keys, return_counts=True)
+            return dict(zip(values.tolist(), counts.tolist()))
+        return dict(sorted(Counter(keys).items()))
+
+    def aggregate_by(self, key: str, name: str, how: str = "mean", rows: Sequence[int] | None = None) -> dict[Any, float]:
+        """Aggregate column ``name`` per value of column ``key``, skipping missing values.
+
+        ``how`` is one of count, sum, mean, min or max; dates aggregate as
+        epoch seconds. Groups without any value are left out.
+        """
+        if how not in _AGGREGATES:
+            raise ValueError(f"Unknown aggregate {how!r}; expected one of {_AGGREGATES}")
+        keys = self._select(self.columns[key], rows)
+        values = self._select(self.columns[name], rows)
+        labels = CATEGORIES.get(key)
+        np = self._np
+        if np is not None:
+            present = self._present(name, values)
+            keys, values = keys[present], values[present].astype(np.float64)
+            groups, inverse = np.unique(keys, return_inverse=True)
+            counts = np.bincount(inverse, minlength=len(groups))
+            if how in ("min", "max"):
+                result = np.full(len(groups), math.inf if how == "min" else -math.inf)
+                (np.minimum if how == "min" else np.maximum).at(result, inverse, values)
+            elif how == "count":
+                result = counts
+            else:
+                result = np.bincount(inverse, weights=values, minlength=len(groups))
+                if how == "mean":
+                    result = result / counts
+            pairs = zip(groups.tolist(), result.tolist())
+        else:
+            grouped: dict[Any, list[float]] = {}
+            for group, value in zip(keys, values):
+                if _is_present(name, value):
+                    grouped.setdefault(group, []).append(float(value))
+            pairs = ((group, _reduce(how, grouped[group])) for group in sorted(grouped))
+        return {(labels[group] if group >= 0 else None) if labels else group: value for group, value in pairs}
+
+    def rollup(self, name: str, how: str = "sum") -> Any:
+        """Aggregate column ``name`` over each item's subtree (the item and all descendants).
+
+        Returns a float64 column (int64 for ``count``); NaN where the
+        subtree holds no value.
+        """
+        if how not in _AGGREGATES:
+            raise ValueError(f"Unknown aggregate {how!r}; expected one of {_AGGREGATES}")
+        column, parent, depth = self.columns[name], self.columns["parent"], self.columns["depth"]
+        np = self._np
+        if np is not None:
+            present = self._present(name, column)
+            counts = present.astype(np.int64)
+            if how in ("min", "max"):
+                identity = math.inf if how == "min" else -math.inf
+                totals = np.where(present, column, identity).astype(np.float64)
+                combine = np.minimum.at if how == "min" else np.maximum.at
+            else:
+                totals = np.where(present, column, 0).astype(np.float64)
+                combine = np.add.at
+            # Deepest level first: children always sit one level below.
+            order = np.argsort(depth, kind="stable")
+            bounds = np.searchsorted(depth[order], np.arange(int(depth.max(initial=0)) + 2))
+            for level in range(len(bounds) - 2, 0, -1):
+                level_rows = order[bounds[level] : bounds[level + 1]]
+                parents = parent[level_rows]
+                np.add.at(counts, parents, counts[level_rows])
+                combine(totals, parents, totals[level_rows])
+            if how == "count":
+                return counts
+            if how == "mean":
+                totals = totals / np.where(counts > 0, counts, 1)
+            return np.where(counts > 0, totals, math.nan)
+        combine = min if how == "min" else max if how == "max" else operator.add
+        counts = array("q", (1 if _is_present(name, value) else 0 for value in column))
+        values = [float(value) if count else None for value, count in zip(column, counts)]
+        # Rows are in document order, so every child comes after its parent.
+        for row in range(len(column) - 1, -1, -1):
+            up = parent[row]
+            if up < 0:
+                continue
+            counts[up] += counts[row]
+            if values[row] is not None:
+                values[up] = values[row] if values[up] is None else combine(values[up], values[row])
+        if how == "count":
+            return counts
+        return array(
+            "d",
+            (
+                math.nan if value is None else value / count if how == "mean" else value
+                for value, count in zip(values, counts)
+            ),
+        )
+
+    def _select(self, column: Any, rows: Sequence[int] | None) -> Any:
+        if rows is None:
+            return column
+        if self._np is not None:
+            return column[self._np.asarray(rows, dtype=self._np.int64)]
+        return [column[row] for row in rows]
+
+    def _present(self, name: str, values: Any) -> Any:
+        np = self._np
+        if name in DATE_COLUMNS:
+            return values != NO_DATE
+        if name == "percentComplete":
+            return ~np.isnan(values)
+        if name in CATEGORIES:
+            return values >= 0
+        return np.ones(len(values), dtype=bool)
+
+
+def _model_children(item: Any) -> Any:
+    return item._subItems if isinstance(item, PlanItem) else None
+
+
+def _code(codes: dict[str, int], value: Any) -> int:
+    return codes.get(value, -1) if type(value) is str else -1
+
+
+def _category_code(name: str, value: Any) -> int:
+    if value is None:
+        return -1
+    code = _CODES[name].get(value)
+    if code is None:
+        raise ValueError(f"Unknown {name} {value!r}; expected one of {CATEGORIES[name]}")
+    return code
+
+
+def _epoch(name: str, value: Any) -> int | None:
+    if value is None:
+        return None
+    key = date_key(value)
+    if key is None:
+        raise ValueError(f"{name} bound {value!r} is not an ISO 8601 date-time")
+    return int(key.timestamp())
+
+
+def _is_present(name: str, value: Any) -> bool:
+    if name in DATE_COLUMNS:
+        return value != NO_DATE
+    if name == "percentComplete":
+        return not math.isnan(value)
+    if name in CATEGORIES:
+        return value >= 0
+    return True
+
+
+def _reduce(how: str, values: list[float]) -> float:
+    if how == "count":
+        return len(values)
+    if how == "min":
+        return min(values)
+    if how == "max":
+        return max(values)
+    total = math.fsum(values)
+    return total / len(values) if how == "mean" else total
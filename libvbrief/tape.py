@@ -0,0 +1,441 @@
+"""Random access into large vBRIEF JSON files through a structural index.
+
+:func:`load_lazy` memory-maps the file and makes one structural pass that
+records the byte span of every entry of ``plan.items`` (at any ``subItems``
+depth), ``plan.edges`` and the ``vBRIEFInfo`` value. Entries are decoded
+only when accessed, so ``len(doc.items)``, ``doc.items[i]`` and
+``doc.get(id)`` cost O(item size) once the index exists.
+
+The index is saved next to the data file (``<name>.vbidx``) and reused while
+the file's size and ``mtime_ns`` are unchanged.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import re
+import sys
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass
+from json.decoder import scanstring
+from pathlib import Path
+from typing import IO, Any, Callable, Iterator
+
+from libvbrief.serialization.atomic import atomic_writer
+
+INDEX_SUFFIX = ".vbidx"
+_INDEX_MAGIC = b"VBIDX1\n"
+
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+_ARRAY_VALUE = re.compile(r"[ \t\r\n]*:[ \t\r\n]*\[")
+_DECODER = json.JSONDecoder()
+
+
+@dataclass
+class _Index:
+    starts: array
+    ends: array
+    parents: array
+    positions: array
+    top: array
+    edge_starts: array
+    edge_ends: array
+    ids: dict[str, int]
+    info: tuple[int, int] | None
+
+
+class LazyItems(Sequence):
+    """Top-level ``plan.items`` of a :class:`LazyDocument`, decoded on access."""
+
+    def __init__(self, document: LazyDocument, ordinals: array) -> None:
+        self._document = document
+        self._ordinals = ordinals
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return [self._document._decode_item(ordinal) for ordinal in self._ordinals[index]]
+        return self._document._decode_item(self._ordinals[index])
+
+
+class LazyEdges(Sequence):
+    """``plan.edges`` of a :class:`LazyDocument`, decoded on access."""
+
+    def __init__(self, document: LazyDocument) -> None:
+        self._document = document
+
+    def __len__(self) -> int:
+        return len(self._document._index.edge_starts)
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = range(len(self))[index]
+        starts, ends = self._document._index.edge_starts, self._document._index.edge_ends
+        return self._document._decode(starts[index], ends[index])
+
+
+class LazyDocument:
+    """Read-only view of a memory-mapped vBRIEF JSON file."""
+
+    def __init__(self, path: Path, handle: IO[bytes], buffer: mmap.mmap, index: _Index) -> None:
+        self.path = path
+        self._handle = handle
+        self._buffer = buffer
+        self._index = index
+        self.items = LazyItems(self, index.top)
+        self.edges = LazyEdges(self)
+
+    @property
+    def info(self) -> dict[str, Any] | None:
+        """The decoded ``vBRIEFInfo`` object, or None when absent."""
+        if self._index.info is None:
+            return None
+        return self._decode(*self._index.info)
+
+    def __len__(self) -> int:
+        """Number of items at every depth."""
+        return len(self._index.starts)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._index.ids
+
+    def ids(self) -> Iterator[str]:
+        """Iterate item ids in document order."""
+        return iter(self._index.ids)
+
+    def get(self, item_id: str, default: Any = None) -> Any:
+        """Decode the first item (at any depth) whose ``id`` is ``item_id``."""
+        ordinal = self._index.ids.get(item_id)
+        if ordinal is None:
+            return default
+        return self._decode_item(ordinal)
+
+    def path_of(self, item_id: str) -> str | None:
+        """Return the validation-style path of an item, e.g. ``plan.items[0].subItems[1]``."""
+        ordinal = self._index.ids.get(item_id)
+        if ordinal is None:
+            return None
+        parts = []
+        while ordinal >= 0:
+            parent = self._index.parents[ordinal]
+            name = "items" if parent < 0 else "subItems"
+            parts.append(f"{name}[{self._index.positions[ordinal]}]")
+            ordinal = parent
+        return ".".join(["plan", *reversed(parts)])
+
+    def close(self) -> None:
+        """Release the memory map and file handle."""
+        self._buffer.close()
+        self._handle.close()
+
+    def __enter__(self) -> LazyDocument:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _decode_item(self, ordinal: int) -> Any:
+        return self._decode(self._index.starts[ordinal], self._index.ends[ordinal])
+
+    def _decode(self, start: int, end: int) -> Any:
+        return json.loads(self._buffer[start:end])
+
+
+def load_lazy(path: str | Path, *, persist_index: bool = True) -> LazyDocument:
+    """Open a vBRIEF JSON file for random access without decoding it.
+
+    With ``persist_index`` the structural index is read from, or written to,
+    ``<path>.vbidx``; a stale or unreadable index is rebuilt silently.
+    """
+    path = Path(path)
+    handle = path.open("rb")
+    try:
+        stat = os.fstat(handle.fileno())
+        if stat.st_size == 0:
+            raise ValueError("vBRIEF JSON document must be an object")
+        buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except BaseException:
+        handle.close()
+        raise
+
+    try:
+        index_path = path.with_name(path.name + INDEX_SUFFIX)
+        index = _read_index(index_path, stat) if persist_index else None
+        if index is None:
+            index = build_index(buffer)
+            if persist_index:
+                _write_index(index_path, stat, index)
+    except BaseException:
+        buffer.close()
+        handle.close()
+        raise
+    return LazyDocument(path, handle, buffer, index)
+
+
+def build_index(data: bytes | mmap.mmap) -> _Index:
+    """Run the structural pass over UTF-8 JSON ``data``."""
+    return _IndexBuilder(data).build()
+
+
+class _IndexBuilder:
+    """Records entry spans by walking the document's skeleton.
+
+    Every entry is decoded once with the C decoder (which also finds its end
+    and validates it); only items that have subItems are additionally walked
+    member by member to locate their children.
+    """
+
+    def __init__(self, data: bytes | mmap.mmap) -> None:
+        self.data = data
+        self.text = str(data, "utf-8")
+        self.starts, self.ends, self.parents, self.positions = array("q"), array("q"), array("q"), array("q")
+        self.top = array("q")
+        self.edge_starts, self.edge_ends = array("q"), array("q")
+        self.ids: dict[str, int] = {}
+        self.info: tuple[int, int] | None = None
+
+    def build(self) -> _Index:
+        text = self.text
+        pos = _WHITESPACE.match(text).end()
+        if not text.startswith("{", pos):
+            raise ValueError("vBRIEF JSON document must be an object")
+        end = self._members(pos, self._root_member)
+        if _WHITESPACE.match(text, end).end() != len(text):
+            raise self._error("Extra data", _WHITESPACE.match(text, end).end())
+
+        spans = [self.starts, self.ends, self.edge_starts, self.edge_ends]
+        info = self.info
+        if len(text) != len(self.data):
+            # Offsets so far index the decoded text; convert them to bytes.
+            offsets = sorted({offset for values in spans for offset in values} | set(info or ()))
+            to_bytes = {}
+            char_pos = byte_pos = 0
+            for offset in offsets:
+                byte_pos += len(text[char_pos:offset].encode("utf-8"))
+                char_pos = offset
+                to_bytes[offset] = byte_pos
+            for values in spans:
+                values[:] = array("q", [to_bytes[offset] for offset in values])
+            if info is not None:
+                info = (to_bytes[info[0]], to_bytes[info[1]])
+
+        return _Index(
+            self.starts,
+            self.ends,
+            self.parents,
+            self.positions,
+            self.top,
+            self.edge_starts,
+            self.edge_ends,
+            self.ids,
+            info,
+        )
+
+    def _root_member(self, key: str, pos: int) -> int:
+        if key == "plan" and self.text.startswith("{", pos):
+            return self._members(pos, self._plan_member)
+        end = self._skip(pos)
+        if key == "vBRIEFInfo":
+            self.info = (pos, end) if self.text.startswith("{", pos) else None
+        return end
+
+    def _plan_member(self, key: str, pos: int) -> int:
+        if key == "items" and self.text.startswith("[", pos):
+            return self._elements(pos, lambda index, start: self._item(-1, index, start))
+        if key == "edges" and self.text.startswith("[", pos):
+            return self._elements(pos, self._edge)
+        return self._skip(pos)
+
+    def _item(self, parent: int, position: int, pos: int, siblings: list[Any] | None = None) -> int:
+        value, end = self._decode(pos)
+        if siblings is not None:
+            siblings.append(value)
+        ordinal = len(self.starts)
+        self.starts.append(pos)
+        self.ends.append(end)
+        self.parents.append(parent)
+        self.positions.append(position)
+        if parent < 0:
+            self.top.append(ordinal)
+        if not isinstance(value, dict):
+            return end
+        item_id = value.get("id")
+        if isinstance(item_id, str):
+            self.ids.setdefault(item_id, ordinal)
+
+        sub_items = value.get("subItems")
+        if not sub_items:
+            return end
+        # Jump straight to the item's own subItems array instead of walking
+        # its members; a match is only trusted if its children decode to the
+        # item's subItems value, otherwise the index is rolled back.
+        children: list[Any] = []
+        mark = (len(self.starts), len(self.top), len(self.ids))
+        start = self._find_sub_items(pos, end)
+        while start >= 0:
+            self._elements(start, lambda index, child: self._item(ordinal, index, child, children))
+            if children == sub_items:
+                return end
+            self._rollback(mark)
+            children.clear()
+            start = self._find_sub_items(start, end)
+        self._members(pos, lambda key, start: self._item_member(ordinal, key, start))
+        return end
+
+    def _find_sub_items(self, pos: int, end: int) -> int:
+        """Return the start of the next ``"subItems": [`` array after ``pos``, or -1.
+
+        An unescaped ``"subItems"`` followed by ``:`` is always a member name,
+        though possibly of a nested object.
+        """
+        text = self.text
+        at = pos
+        while True:
+            at = text.find('"subItems"', at + 1, end)
+            if at < 0:
+                return -1
+            escapes = at
+            while text[escapes - 1] == "\\":
+                escapes -= 1
+            if (at - escapes) % 2:
+                continue
+            match = _ARRAY_VALUE.match(text, at + len('"subItems"'))
+            if match is not None:
+                return match.end() - 1
+
+    def _rollback(self, mark: tuple[int, int, int]) -> None:
+        items, top, ids = mark
+        for values in (self.starts, self.ends, self.parents, self.positions):
+            del values[items:]
+        del self.top[top:]
+        while len(self.ids) > ids:
+            self.ids.popitem()
+
+    def _item_member(self, ordinal: int, key: str, pos: int) -> int:
+        if key == "subItems" and self.text.startswith("[", pos):
+            return self._elements(pos, lambda index, start: self._item(ordinal, index, start))
+        return self._skip(pos)
+
+    def _edge(self, index: int, pos: int) -> int:
+        end = self._skip(pos)
+        self.edge_starts.append(pos)
+        self.edge_ends.append(end)
+        return end
+
+    def _members(self, pos: int, handle: Callable[[str, int], int]) -> int:
+        """Walk the object at ``pos``; ``handle`` consumes each value and returns its end."""
+        text = self.text
+        pos = _WHITESPACE.match(text, pos + 1).end()
+        if text.startswith("}", pos):
+            return pos + 1
+        while True:
+            if not text.startswith('"', pos):
+                raise self._error("Expecting property name enclosed in double quotes", pos)
+            key, pos = scanstring(text, pos + 1)
+            pos = _WHITESPACE.match(text, pos).end()
+            if not text.startswith(":", pos):
+                raise self._error("Expecting ':' delimiter", pos)
+            pos = handle(key, _WHITESPACE.match(text, pos + 1).end())
+            pos = _WHITESPACE.match(text, pos).end()
+            if text.startswith("}", pos):
+                return pos + 1
+            if not text.startswith(",", pos):
+                raise self._error("Expecting ',' delimiter", pos)
+            pos = _WHITESPACE.match(text, pos + 1).end()
+
+    def _elements(self, pos: int, handle: Callable[[int, int], int]) -> int:
+        """Walk the array at ``pos``; ``handle`` consumes each element and returns its end."""
+        text = self.text
+        pos = _WHITESPACE.match(text, pos + 1).end()
+        if text.startswith("]", pos):
+            return pos + 1
+        index = 0
+        while True:
+            pos = _WHITESPACE.match(text, handle(index, pos)).end()
+            index += 1
+            if text.startswith("]", pos):
+                return pos + 1
+            if not text.startswith(",", pos):
+                raise self._error("Expecting ',' delimiter", pos)
+            pos = _WHITESPACE.match(text, pos + 1).end()
+
+    def _decode(self, pos: int) -> tuple[Any, int]:
+        return _DECODER.raw_decode(self.text, pos)
+
+    def _skip(self, pos: int) -> int:
+        return _DECODER.raw_decode(self.text, pos)[1]
+
+    def _error(self, msg: str, pos: int) -> json.JSONDecodeError:
+        return json.JSONDecodeError(msg, self.text, pos)
+
+
+def _read_index(index_path: Path, stat: os.stat_result) -> _Index | None:
+    try:
+        data = index_path.read_bytes()
+    except OSError:
+        return None
+    try:
+        if not data.startswith(_INDEX_MAGIC):
+            return None
+        header_end = data.index(b"\n", len(_INDEX_MAGIC))
+        header = json.loads(data[len(_INDEX_MAGIC) : header_end])
+        if (
+            header["size"] != stat.st_size
+            or header["mtime_ns"] != stat.st_mtime_ns
+            or header["byteorder"] != sys.byteorder
+        ):
+            return None
+        offset = header_end + 1
+        arrays = []
+        for length in header["lengths"]:
+            values = array("q")
+            values.frombytes(data[offset : offset + length * values.itemsize])
+            if len(values) != length:
+                return None
+            arrays.append(values)
+            offset += length * values.itemsize
+        *arrays, id_ordinals = arrays
+        id_names = json.loads(data[offset:])
+        if len(id_names) != len(id_ordinals):
+            return None
+        info = tuple(header["info"]) if header["info"] is not None else None
+        return _Index(*arrays, ids=dict(zip(id_names, id_ordinals)), info=info)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _write_index(index_path: Path, stat: os.stat_result, index: _Index) -> None:
+    arrays = [
+        index.starts,
+        index.ends,
+        index.parents,
+        index.positions,
+        index.top,
+        index.edge_starts,
+        index.edge_ends,
+        array("q", index.ids.values()),
+    ]
+    header = {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "byteorder": sys.byteorder,
+        "lengths": [len(values) for values in arrays],
+        "info": list(index.info) if index.info is not None else None,
+    }
+    parts = [_INDEX_MAGIC, json.dumps(header).encode("ascii"), b"\n"]
+    parts.extend(values.tobytes() for values in arrays)
+    # Names go last as a JSON list; decoding a list is much cheaper than an object.
+    parts.append(json.dumps(list(index.ids)).encode("ascii"))
+
+    try:
+        with atomic_writer(index_path) as handle:
+            handle.write(b"".join(parts))
+    except OSError:
+        # The index is only a cache; read-only directories just skip it.
+        pass
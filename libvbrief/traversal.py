@@ -0,0 +1,107 @@
+"""Iterative traversal of nested plan items.
+
+Items nest through ``subItems`` without a depth limit, so every walk over
+them uses an explicit stack instead of recursion: agent-generated plans a
+few hundred levels deep would otherwise hit ``RecursionError``.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, Iterator, Mapping
+
+ChildrenGetter = Callable[[Any], "Iterable[Any] | None"]
+
+
+def mapping_children(item: Any) -> list[Any] | None:
+    """Return the ``subItems`` list of a mapping item, or None."""
+    if isinstance(item, Mapping):
+        sub_items = item.get("subItems")
+        if isinstance(sub_items, list):
+            return sub_items
+    return None
+
+
+class ItemPath:
+    """Location of an item, rendered as ``plan.items[0].subItems[1]`` on demand.
+
+    Each path points at its parent's, so a walk allocates one small object
+    per item instead of ever longer strings (quadratic in depth).
+    """
+
+    __slots__ = ("parent", "index")
+
+    def __init__(self, parent: ItemPath | str, index: int) -> None:
+        self.parent = parent
+        self.index = index
+
+    def __str__(self) -> str:
+        indexes = []
+        node: ItemPath | str = self
+        while isinstance(node, ItemPath):
+            indexes.append(node.index)
+            node = node.parent
+        top = indexes.pop()
+        return f"{node}[{top}]" + "".join(f".subItems[{index}]" for index in reversed(indexes))
+
+    def __repr__(self) -> str:
+        return f"ItemPath({str(self)!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (ItemPath, str)):
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+
+def walk_items(
+    items: Iterable[Any],
+    *,
+    path: str | ItemPath | None = "plan.items",
+    parent: Any = None,
+    children: ChildrenGetter = mapping_children,
+) -> Iterator[tuple[ItemPath | None, Any, Any]]:
+    """Yield ``(path, item, parent)`` for each item and its descendants in pre-order.
+
+    ``path`` names the location of ``items``; each yielded path is an
+    :class:`ItemPath` below it, or None when ``path`` is None. ``parent`` is
+    reported for the top-level ``items``. ``children(item)`` returns the
+    entries to descend into; it is called once per yielded item, when the
+    caller resumes the generator, and may return None to prune the subtree.
+    """
+    stack = [(enumerate(items), parent, path)]
+    while stack:
+        entries, owner, prefix = stack[-1]
+        for index, item in entries:
+            item_path = None if prefix is None else ItemPath(prefix, index)
+            yield item_path, item, owner
+            nested = children(item)
+            if nested:
+                stack.append((enumerate(nested), item, item_path))
+                break
+        else:
+            stack.pop()
+
+
+def collect_hierarchical_ids(items: Iterable[Mapping[str, Any]], prefix: str = "") -> dict[str, Any]:
+    """Map each hierarchical ID (``parent.child``) to its item, in document order.
+
+    Items without an ID are skipped together with their subItems; ``prefix``
+    is the hierarchical ID of the items' parent, if any.
+    """
+    item_map: dict[str, Any] = {}
+    full_ids: dict[int, str] = {}
+
+    def id_children(item: Mapping[str, Any]) -> list[Any] | None:
+        return item.get("subItems") if item.get("id") else None
+
+    for _, item, parent in walk_items(items, path=None, children=id_children):
+        item_id = item.get("id")
+        if not item_id:
+            continue
+        parent_id = full_ids[id(parent)] if parent is not None else prefix
+        full_id = f"{parent_id}.{item_id}" if parent_id else item_id
+        full_ids[id(item)] = full_id
+        item_map[full_id] = item
+    return item_map
@@ -1,12 +1,23 @@
-"""Core conformance validation for vBRIEF v0.5 JSON documents."""
+"""Core conformance validation for vBRIEF v0.5 JSON documents.
+
+Validation is a set of :class:`Rule` objects run by a :class:`RuleEngine`
+in a single traversal of the document: the engine walks the root, the
+plan, every item and every edge once and hands each node to the rules
+that registered a callback for that kind of node. :data:`CORE_RULES` are
+the checks :func:`validate_document` applies by default;
+:data:`CONFORMANCE_RULES` add the recommendations and DAG constraints the
+conformance tools check, and organisations can add rules of their own.
+"""
 
 from __future__ import annotations
 
-from typing import Any, Mapping
+from typing import Any, Iterable, Mapping
 
 from libvbrief.compat import (
     HIERARCHICAL_ID_PATTERN,
+    ISSUE_EDGE_CYCLE,
     ISSUE_INVALID_DOCUMENT_TYPE,
+    ISSUE_INVALID_EDGE,
     ISSUE_INVALID_ID_FORMAT,
     ISSUE_INVALID_ITEM_STATUS,
     ISSUE_INVALID_ITEM_TYPE,
@@ -19,174 +30,551 @@ from libvbrief.compat import (
     ISSUE_MISSING_ITEM_FIELD,
     ISSUE_MISSING_PLAN_FIELD,
     ISSUE_MISSING_ROOT_FIELD,
+    ISSUE_NARRATIVE_KEY_CASE,
+    ISSUE_REMOVED_CONTAINER,
+    ISSUE_UNKNOWN_EDGE_REFERENCE,
     PLAN_REF_PATTERN,
     VALID_STATUSES,
 )
 from libvbrief.issues import ValidationReport
+from libvbrief.schema import CompiledSchema, compile_schema, core_schema
+from libvbrief.traversal import ItemPath, mapping_children, walk_items
+
+_HOOKS = ("document", "plan", "item", "edge", "finish")
+
+
+class Rule:
+    """A validation rule: override the callbacks for the nodes it checks.
+
+    The engine only calls the callbacks a rule overrides. ``item`` receives
+    each plan item that is a mapping, the parent item (None at the top
+    level) and its :class:`~libvbrief.traversal.ItemPath`; render the path
+    with ``str`` or an f-string only when reporting an issue. ``edge``
+    receives each entry of ``plan.edges`` after all items were visited, and
+    ``finish`` runs last.
+
+    Rules that collect state across nodes override ``start`` to return a
+    fresh instance for every document, so one engine can be shared.
+    """
+
+    def start(self) -> Rule:
+        """Return the rule object that checks the next document."""
+        return self
+
+    def document(self, data: Mapping[str, Any], report: ValidationReport) -> None:
+        """Check the root object."""
+
+    def plan(self, plan: Mapping[str, Any], report: ValidationReport) -> None:
+        """Check the plan's own fields."""
+
+    def item(self, item: Mapping[str, Any], parent: Mapping[str, Any] | None, path: ItemPath, report: ValidationReport) -> None:
+        """Check one item's own fields."""
+
+    def edge(self, edge: Any, index: int, report: ValidationReport) -> None:
+        """Check one entry of ``plan.edges``."""
+
+    def finish(self, report: ValidationReport) -> None:
+        """Report what can only be decided once the whole document was seen."""
+
+
+class RuleEngine:
+    """Run a sequence of rules over documents in a single traversal.
+
+    Issues are reported node by node in document order, and for each node
+    in the order of ``rules``. The engine itself reports a document that is
+    not an object and plan items that are not objects, since no rule can
+    look inside them.
+    """
+
+    def __init__(self, rules: Iterable[Rule]) -> None:
+        self.rules = tuple(rules)
+
+    def validate(
+        self,
+        document: Any,
+        *,
+        max_errors: int | None = None,
+        fail_fast: bool = False,
+        include_warnings: bool = True,
+    ) -> ValidationReport:
+        """Validate a dict or model document and return structured issues.
+
+        With ``max_errors`` the traversal stops as soon as that many errors
+        were reported and the report is marked ``truncated``; ``fail_fast``
+        is ``max_errors=1``. ``include_warnings=False`` drops warnings.
+        """
+        if fail_fast:
+            max_errors = 1
+        if max_errors is None and include_warnings:
+            report = ValidationReport()
+            self._run(document, report)
+            return report
+
+        if max_errors is not None and max_errors < 1:
+            raise ValueError("max_errors must be at least 1")
+        bounded = _BoundedReport(max_errors, include_warnings)
+        try:
+            self._run(document, bounded)
+        except _ErrorBudgetSpent:
+            return ValidationReport(bounded.errors, bounded.warnings, truncated=True)
+        return ValidationReport(bounded.errors, bounded.warnings)
+
+    def _run(self, document: Any, report: ValidationReport) -> None:
+        data = _to_dict(document)
+        if not isinstance(data, Mapping):
+            report.add_error(
+                ISSUE_INVALID_DOCUMENT_TYPE,
+                "$",
+                "Document must be an object/dictionary",
+            )
+            return
 
+        hooks = _hooks([rule.start() for rule in self.rules])
+        for check in hooks["document"]:
+            check(data, report)
 
-def validate_document(document: Any) -> ValidationReport:
-    """Validate dict or model document and return structured issues."""
-    report = ValidationReport()
-    data = _to_dict(document)
+        plan = data.get("plan")
+        if isinstance(plan, Mapping):
+            for check in hooks["plan"]:
+                check(plan, report)
+            items = plan.get("items")
+            if isinstance(items, list):
+                _check_items(items, hooks["item"], report)
+            edges = plan.get("edges")
+            if isinstance(edges, list) and hooks["edge"]:
+                for index, edge in enumerate(edges):
+                    for check in hooks["edge"]:
+                        check(edge, index, report)
 
-    if not isinstance(data, Mapping):
-        report.add_error(
-            ISSUE_INVALID_DOCUMENT_TYPE,
-            "$",
-            "Document must be an object/dictionary",
-        )
-        return report
+        for check in hooks["finish"]:
+            check(report)
 
-    _validate_root(data, report)
-    return report
 
+class _ErrorBudgetSpent(Exception):
+    pass
 
-def _validate_root(data: Mapping[str, Any], report: ValidationReport) -> None:
-    if "vBRIEFInfo" not in data:
-        report.add_error(ISSUE_MISSING_ROOT_FIELD, "vBRIEFInfo", "Missing required root field: vBRIEFInfo")
-        vbrief_info: Mapping[str, Any] | None = None
-    else:
-        raw_info = data.get("vBRIEFInfo")
-        if not isinstance(raw_info, Mapping):
-            report.add_error(
-                ISSUE_INVALID_ROOT_FIELD_TYPE,
-                "vBRIEFInfo",
-                "vBRIEFInfo must be an object",
-            )
-            vbrief_info = None
-        else:
-            vbrief_info = raw_info
 
-    if vbrief_info is not None:
-        version = vbrief_info.get("version")
-        if version != "0.5":
-            report.add_error(
-                ISSUE_INVALID_VERSION,
-                "vBRIEFInfo.version",
-                f"Expected version '0.5', got {version!r}",
-            )
+class _BoundedReport(ValidationReport):
+    # Raises out of the traversal once ``max_errors`` errors were collected,
+    # so no later node is visited and no later issue or path is built.
 
-    if "plan" not in data:
-        report.add_error(ISSUE_MISSING_ROOT_FIELD, "plan", "Missing required root field: plan")
-        return
+    def __init__(self, max_errors: int | None, include_warnings: bool) -> None:
+        super().__init__()
+        self.max_errors = max_errors
+        self.include_warnings = include_warnings
 
-    plan = data.get("plan")
-    if not isinstance(plan, Mapping):
-        report.add_error(ISSUE_INVALID_ROOT_FIELD_TYPE, "plan", "plan must be an object")
-        return
+    def add_error(self, code: str, path: str, message: str) -> None:
+        super().add_error(code, path, message)
+        if self.max_errors is not None and len(self.errors) >= self.max_errors:
+            raise _ErrorBudgetSpent
 
-    _validate_plan(plan, report)
+    def add_warning(self, code: str, path: str, message: str) -> None:
+        if self.include_warnings:
+            super().add_warning(code, path, message)
 
 
-def _validate_plan(plan: Mapping[str, Any], report: ValidationReport) -> None:
-    for field_name in ("title", "status", "items"):
-        if field_name not in plan:
-            report.add_error(
-                ISSUE_MISSING_PLAN_FIELD,
-                f"plan.{field_name}",
-                f"Missing required plan field: {field_name}",
-            )
+class RootFields(Rule):
+    """``vBRIEFInfo`` with version 0.5 and a ``plan`` object are present."""
 
-    status = plan.get("status")
-    if status is not None and status not in VALID_STATUSES:
-        report.add_error(
-            ISSUE_INVALID_PLAN_STATUS,
-            "plan.status",
-            f"Invalid plan status {status!r}; expected one of {sorted(VALID_STATUSES)}",
-        )
+    def document(self, data: Mapping[str, Any], report: ValidationReport) -> None:
+        _validate_info(data, report)
 
-    plan_id = plan.get("id")
-    if plan_id is not None and (not isinstance(plan_id, str) or not HIERARCHICAL_ID_PATTERN.match(plan_id)):
-        report.add_error(
-            ISSUE_INVALID_ID_FORMAT,
-            "plan.id",
-            "plan.id must match hierarchical ID pattern",
-        )
+        if "plan" not in data:
+            report.add_error(ISSUE_MISSING_ROOT_FIELD, "plan", "Missing required root field: plan")
+        elif not isinstance(data.get("plan"), Mapping):
+            report.add_error(ISSUE_INVALID_ROOT_FIELD_TYPE, "plan", "plan must be an object")
 
-    items = plan.get("items")
-    if items is None:
-        return
 
-    if not isinstance(items, list):
-        report.add_error(
-            ISSUE_INVALID_PLAN_FIELD_TYPE,
-            "plan.items",
-            "plan.items must be an array",
-        )
-        return
-
-    _validate_items(items, report, "plan.items")
+class RequiredFields(Rule):
+    """The plan has a title, status and items; every item a title and status."""
 
+    def plan(self, plan: Mapping[str, Any], report: ValidationReport) -> None:
+        for field_name in ("title", "status", "items"):
+            if field_name not in plan:
+                report.add_error(
+                    ISSUE_MISSING_PLAN_FIELD,
+                    f"plan.{field_name}",
+                    f"Missing required plan field: {field_name}",
+                )
 
-def _validate_items(items: list[Any], report: ValidationReport, path: str) -> None:
-    for index, item in enumerate(items):
-        item_path = f"{path}[{index}]"
-
-        if not isinstance(item, Mapping):
-            report.add_error(
-                ISSUE_INVALID_ITEM_TYPE,
-                item_path,
-                "Plan item must be an object",
-            )
-            continue
-
+    def item(self, item: Mapping[str, Any], parent: Mapping[str, Any] | None, path: ItemPath, report: ValidationReport) -> None:
         if "title" not in item:
             report.add_error(
                 ISSUE_MISSING_ITEM_FIELD,
-                f"{item_path}.title",
+                f"{path}.title",
                 "Missing required item field: title",
             )
 
         if "status" not in item:
             report.add_error(
                 ISSUE_MISSING_ITEM_FIELD,
-                f"{item_path}.status",
+                f"{path}.status",
                 "Missing required item field: status",
             )
 
+
+class StatusValues(Rule):
+    """Plan and item statuses come from the status enum."""
+
+    def plan(self, plan: Mapping[str, Any], report: ValidationReport) -> None:
+        status = plan.get("status")
+        if status is not None and not isinstance(status, str):
+            report.add_error(ISSUE_INVALID_PLAN_STATUS, "plan.status", "Status must be a string")
+        elif status is not None and status not in VALID_STATUSES:
+            report.add_error(
+                ISSUE_INVALID_PLAN_STATUS,
+                "plan.status",
+                f"Invalid plan status {status!r}; expected one of {sorted(VALID_STATUSES)}",
+            )
+
+    def item(self, item: Mapping[str, Any], parent: Mapping[str, Any] | None, path: ItemPath, report: ValidationReport) -> None:
         status = item.get("status")
-        if status is not None and status not in VALID_STATUSES:
+        if status is not None and not isinstance(status, str):
+            report.add_error(ISSUE_INVALID_ITEM_STATUS, f"{path}.status", "Status must be a string")
+        elif status is not None and status not in VALID_STATUSES:
             report.add_error(
                 ISSUE_INVALID_ITEM_STATUS,
-                f"{item_path}.status",
+                f"{path}.status",
                 f"Invalid item status {status!r}; expected one of {sorted(VALID_STATUSES)}",
             )
 
+
+class IdFormat(Rule):
+    """Plan and item ids match the hierarchical ID pattern."""
+
+    def plan(self, plan: Mapping[str, Any], report: ValidationReport) -> None:
+        plan_id = plan.get("id")
+        if plan_id is not None and (not isinstance(plan_id, str) or not HIERARCHICAL_ID_PATTERN.match(plan_id)):
+            report.add_error(
+                ISSUE_INVALID_ID_FORMAT,
+                "plan.id",
+                "plan.id must match hierarchical ID pattern",
+            )
+
+    def item(self, item: Mapping[str, Any], parent: Mapping[str, Any] | None, path: ItemPath, report: ValidationReport) -> None:
         item_id = item.get("id")
         if item_id is not None and (not isinstance(item_id, str) or not HIERARCHICAL_ID_PATTERN.match(item_id)):
             report.add_error(
                 ISSUE_INVALID_ID_FORMAT,
-                f"{item_path}.id",
+                f"{path}.id",
                 "item id must match hierarchical ID pattern",
             )
 
+
+class PlanRefFormat(Rule):
+    """Item planRefs are ``#id``, ``file://`` or ``https://`` URIs."""
+
+    def item(self, item: Mapping[str, Any], parent: Mapping[str, Any] | None, path: ItemPath, report: ValidationReport) -> None:
         plan_ref = item.get("planRef")
         if plan_ref is not None and (not isinstance(plan_ref, str) or not PLAN_REF_PATTERN.match(plan_ref)):
             report.add_error(
                 ISSUE_INVALID_PLANREF,
-                f"{item_path}.planRef",
+                f"{path}.planRef",
                 "planRef must match #..., file://..., or https://...",
             )
 
+
+class ContainerTypes(Rule):
+    """``plan.items`` and ``subItems`` are arrays."""
+
+    def plan(self, plan: Mapping[str, Any], report: ValidationReport) -> None:
+        items = plan.get("items")
+        if items is not None and not isinstance(items, list):
+            report.add_error(
+                ISSUE_INVALID_PLAN_FIELD_TYPE,
+                "plan.items",
+                "plan.items must be an array",
+            )
+
+    def item(self, item: Mapping[str, Any], parent: Mapping[str, Any] | None, path: ItemPath, report: ValidationReport) -> None:
+        # The engine descends into subItems only when it is a list.
         sub_items = item.get("subItems")
-        if sub_items is None:
-            continue
-        if not isinstance(sub_items, list):
+        if sub_items is not None and not isinstance(sub_items, list):
             report.add_error(
                 ISSUE_INVALID_SUBITEMS_TYPE,
-                f"{item_path}.subItems",
+                f"{path}.subItems",
                 "subItems must be an array",
             )
+
+
+class RemovedContainers(Rule):
+    """The v0.4 ``todoList`` and ``playbook`` containers are gone in v0.5."""
+
+    def document(self, data: Mapping[str, Any], report: ValidationReport) -> None:
+        for name, message in (
+            ("todoList", "TodoList container is removed in v0.5. Use Plan instead."),
+            ("playbook", "Playbook container is removed in v0.5. Use Plan with narratives instead."),
+        ):
+            if name in data:
+                report.add_error(ISSUE_REMOVED_CONTAINER, name, message)
+
+
+class NarrativeKeyCase(Rule):
+    """Warn about plan narrative keys that are not TitleCase or contain spaces."""
+
+    def plan(self, plan: Mapping[str, Any], report: ValidationReport) -> None:
+        narratives = plan.get("narratives")
+        if not isinstance(narratives, Mapping):
+            return
+        for key in narratives:
+            if not isinstance(key, str) or not key:
+                continue
+            if not key[0].isupper():
+                report.add_warning(
+                    ISSUE_NARRATIVE_KEY_CASE,
+                    f"plan.narratives.{key}",
+                    f"Narrative key {key!r} SHOULD use TitleCase (e.g. {key.title()!r})",
+                )
+            if " " in key:
+                report.add_warning(
+                    ISSUE_NARRATIVE_KEY_CASE,
+                    f"plan.narratives.{key}",
+                    f"Narrative key {key!r} SHOULD not contain spaces",
+                )
+
+
+class EdgeGraph(Rule):
+    """Edges are objects with ``from``, ``to`` and ``type``, name existing items
+    and form a directed acyclic graph.
+
+    An endpoint may be an item id or a hierarchical id (ancestor ids joined
+    with ``.``); ids win over hierarchical ids, as in
+    :meth:`libvbrief.index.ItemIndex.resolve`. Cycles are looked for among
+    the items the endpoints resolve to once every edge was seen.
+    """
+
+    def __init__(self) -> None:
+        self._targets: dict[str, int] = {}
+        self._paths: dict[int, str] = {}
+        self._graph: dict[Any, list[Any]] = {}
+        self._names: dict[Any, str] = {}
+
+    def start(self) -> EdgeGraph:
+        return type(self)()
+
+    def item(self, item: Mapping[str, Any], parent: Mapping[str, Any] | None, path: ItemPath, report: ValidationReport) -> None:
+        item_id = item.get("id")
+        if not isinstance(item_id, str) or not item_id:
+            return
+        targets = self._targets
+        if item_id not in targets:
+            targets[item_id] = id(item)
+        if parent is None:
+            self._paths[id(item)] = item_id
+            return
+        prefix = self._paths.get(id(parent))
+        if prefix is not None:
+            full_id = self._paths[id(item)] = f"{prefix}.{item_id}"
+            if full_id not in targets:
+                targets[full_id] = id(item)
+
+    def edge(self, edge: Any, index: int, report: ValidationReport) -> None:
+        if type(edge) is not dict and not isinstance(edge, Mapping):
+            report.add_error(ISSUE_INVALID_EDGE, f"plan.edges[{index}]", "Edge must be an object")
+            return
+        keys = []
+        for field_name in ("from", "to", "type"):
+            value = edge.get(field_name)
+            if not value:
+                report.add_error(
+                    ISSUE_INVALID_EDGE,
+                    f"plan.edges[{index}].{field_name}",
+                    f"Missing required edge field: {field_name}",
+                )
+            elif field_name != "type":
+                key = self._targets.get(value) if isinstance(value, str) else None
+                if key is None:
+                    report.add_error(
+                        ISSUE_UNKNOWN_EDGE_REFERENCE,
+                        f"plan.edges[{index}].{field_name}",
+                        f"Edge {field_name!r} references non-existent item {value!r}",
+                    )
+                else:
+                    self._names.setdefault(key, value)
+                    keys.append(key)
+        if len(keys) == 2:
+            self._graph.setdefault(keys[0], []).append(keys[1])
+
+    def finish(self, report: ValidationReport) -> None:
+        cycle = _find_cycle(self._graph)
+        if cycle is not None:
+            names = " -> ".join(self._names[node] for node in cycle)
+            report.add_error(ISSUE_EDGE_CYCLE, "plan.edges", f"Cycle detected: {names}")
+
+
+class SchemaRule(Rule):
+    """The document conforms to a compiled JSON Schema (see :mod:`libvbrief.schema`).
+
+    The schema is checked once every other rule ran, with issues coded
+    ``schema_violation``.
+    """
+
+    def __init__(self, schema: CompiledSchema) -> None:
+        self.schema = schema
+        self._data: Any = None
+
+    def start(self) -> SchemaRule:
+        return type(self)(self.schema)
+
+    def document(self, data: Mapping[str, Any], report: ValidationReport) -> None:
+        self._data = data
+
+    def finish(self, report: ValidationReport) -> None:
+        self.schema.validate(self._data, report)
+
+
+CORE_RULES: tuple[Rule, ...] = (
+    RootFields(),
+    RequiredFields(),
+    StatusValues(),
+    IdFormat(),
+    PlanRefFormat(),
+    ContainerTypes(),
+)
+CONFORMANCE_RULES: tuple[Rule, ...] = CORE_RULES + (
+    RemovedContainers(),
+    NarrativeKeyCase(),
+    EdgeGraph(),
+)
+
+_CORE_ENGINE = RuleEngine(CORE_RULES)
+
+
+def validate_document(
+    document: Any,
+    *,
+    rules: Iterable[Rule] | None = None,
+    schema: bool | Mapping[str, Any] | CompiledSchema = False,
+    max_errors: int | None = None,
+    fail_fast: bool = False,
+    include_warnings: bool = True,
+) -> ValidationReport:
+    """Validate dict or model document and return structured issues.
+
+    ``rules`` replaces :data:`CORE_RULES`, e.g. with
+    ``CONFORMANCE_RULES + (MyOrgRule(),)``. ``schema=True`` also checks the
+    vBRIEF core JSON Schema; pass a schema mapping (e.g. an extension schema)
+    or a :class:`~libvbrief.schema.CompiledSchema` to check that one instead.
+    ``max_errors``, ``fail_fast`` and ``include_warnings`` bound the work as
+    in :meth:`RuleEngine.validate`.
+    """
+    if schema is False:
+        engine = _CORE_ENGINE if rules is None else RuleEngine(rules)
+    else:
+        if schema is True:
+            schema = core_schema()
+        elif not isinstance(schema, CompiledSchema):
+            schema = compile_schema(schema)
+        engine = RuleEngine((*(CORE_RULES if rules is None else rules), SchemaRule(schema)))
+    return engine.validate(
+        document,
+        max_errors=max_errors,
+        fail_fast=fail_fast,
+        include_warnings=include_warnings,
+    )
+
+
+def _hooks(rules: list[Rule]) -> dict[str, list[Any]]:
+    # Bound callbacks per node kind, for the rules that override them.
+    return {
+        name: [getattr(rule, name) for rule in rules if getattr(type(rule), name) is not getattr(Rule, name)]
+        for name in _HOOKS
+    }
+
+
+def _check_items(items: list[Any], checks: list[Any], report: ValidationReport) -> None:
+    for item_path, item, parent in walk_items(items, path="plan.items", children=_sub_items):
+        if type(item) is not dict and not isinstance(item, Mapping):
+            report.add_error(
+                ISSUE_INVALID_ITEM_TYPE,
+                str(item_path),
+                "Plan item must be an object",
+            )
             continue
+        for check in checks:
+            check(item, parent, item_path, report)
 
-        _validate_items(sub_items, report, f"{item_path}.subItems")
+
+def _sub_items(item: Any) -> list[Any] | None:
+    # mapping_children with a fast path for dicts, skipping the ABC check.
+    if type(item) is dict:
+        sub_items = item.get("subItems")
+        return sub_items if isinstance(sub_items, list) else None
+    return mapping_children(item)
+
+
+def _validate_info(data: Mapping[str, Any], report: ValidationReport) -> None:
+    if "vBRIEFInfo" not in data:
+        report.add_error(ISSUE_MISSING_ROOT_FIELD, "vBRIEFInfo", "Missing required root field: vBRIEFInfo")
+        return
+
+    vbrief_info = data.get("vBRIEFInfo")
+    if not isinstance(vbrief_info, Mapping):
+        report.add_error(
+            ISSUE_INVALID_ROOT_FIELD_TYPE,
+            "vBRIEFInfo",
+            "vBRIEFInfo must be an object",
+        )
+        return
+
+    version = vbrief_info.get("version")
+    if version != "0.5":
+        report.add_error(
+            ISSUE_INVALID_VERSION,
+            "vBRIEFInfo.version",
+            f"Expected version '0.5', got {version!r}",
+        )
+
+
+_CORE_HOOKS = _hooks(list(CORE_RULES))
+
+
+def _validate_plan_fields(plan: Mapping[str, Any], report: ValidationReport) -> None:
+    """Check the plan's own fields against the core rules, not its items."""
+    for check in _CORE_HOOKS["plan"]:
+        check(plan, report)
+
+
+def _validate_item(item: Mapping[str, Any], item_path: ItemPath, report: ValidationReport) -> None:
+    """Check one item's own fields against the core rules, not its subItems."""
+    for check in _CORE_HOOKS["item"]:
+        check(item, None, item_path, report)
+
+
+def _find_cycle(graph: Mapping[Any, list[Any]]) -> list[Any] | None:
+    """Return one cycle as ``[a, b, ..., a]``, found by an iterative DFS."""
+    visiting, done = set(), set()
+    for start in graph:
+        if start in done:
+            continue
+        visiting.add(start)
+        stack = [(start, iter(graph[start]))]
+        while stack:
+            node, targets = stack[-1]
+            for target in targets:
+                if target in visiting:
+                    cycle = [node for node, _ in stack]
+                    return cycle[cycle.index(target) :] + [target]
+                if target not in done:
+                    visiting.add(target)
+                    stack.append((target, iter(graph.get(target, ()))))
+                    break
+            else:
+                stack.pop()
+                visiting.discard(node)
+                done.add(node)
+    return None
 
 
 def _to_dict(document: Any) -> Any:
     if isinstance(document, Mapping):
         return document
 
+    # Validation only reads, so models hand out their cached dicts.
+    shared = getattr(document, "_shared_dict", None)
+    if callable(shared):
+        return shared()
+
     to_dict = getattr(document, "to_dict", None)
     if callable(to_dict):
         return to_dict(preserve_order=False)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+from libvbrief import VBriefDocument, dump_file
+from libvbrief.serialization import available_json_backends, dumps_json, set_json_backend
+from libvbrief.serialization.json_codec import iter_json_chunks
+
+EXAMPLES = sorted((Path(__file__).resolve().parent.parent / "examples").glob("*.vbrief.json"))
+
+ODD = {
+    "plan": {
+        "title": "Café",
+        "status": "running",
+        "items": [{"id": "x", "title": "X", "status": "draft", "subItems": []}, [], {}, 1e16, None],
+        "edges": [],
+        "metadata": {"nested": {"deep": [1, {"a": 2}]}},
+        "extra": {2: "non-string keys", 1: "are rendered whole"},
+    },
+    "vBRIEFInfo": {"version": "0.5"},
+}
+
+
+@pytest.fixture(autouse=True)
+def _restore_backend():
+    yield
+    set_json_backend(None)
+
+
+@pytest.mark.parametrize("backend", available_json_backends())
+@pytest.mark.parametrize("path", [*EXAMPLES, None], ids=lambda p: p.name if p else "odd")
+def test_streamed_file_output_is_byte_identical(tmp_path: Path, backend: str, path: Path | None) -> None:
+    set_json_backend(backend)
+    document = json.loads(path.read_text(encoding="utf-8")) if path else ODD
+    target = tmp_path / "out.vbrief.json"
+
+    for canonical, preserve_format in [(True, False), (False, True), (False, False)]:
+        expected = dumps_json(document, canonical=canonical, preserve_format=preserve_format)
+        dump_file(document, target, canonical=canonical, preserve_format=preserve_format)
+
+        assert target.read_text(encoding="utf-8") == expected
+
+
+def test_items_are_emitted_in_bounded_chunks() -> None:
+    document = {"plan": {"title": "T", "status": "draft", "items": [{"title": str(i), "status": "draft"} for i in range(1000)]}}
+
+    chunks = list(iter_json_chunks(document))
+
+    assert b"".join(chunks).decode("utf-8") == dumps_json(document)
+    assert max(len(chunk) for chunk in chunks) < len(b"".join(chunks)) / 10
+
+
+def test_failed_write_leaves_original_file_and_no_temp_files(tmp_path: Path) -> None:
+    target = tmp_path / "plan.vbrief.json"
+    dump_file({"plan": {"title": "Old", "status": "draft", "items": []}}, target)
+    original = target.read_bytes()
+
+    broken = {"plan": {"title": "New", "status": "draft", "items": [{"title": "ok", "status": "draft"}, {"title": object()}]}}
+    with pytest.raises(TypeError):
+        dump_file(broken, target)
+
+    assert target.read_bytes() == original
+    assert [p.name for p in tmp_path.iterdir()] == ["plan.vbrief.json"]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permission bits")
+def test_existing_permissions_and_symlinks_are_kept(tmp_path: Path) -> None:
+    target = tmp_path / "plan.vbrief.json"
+    link = tmp_path / "link.vbrief.json"
+    target.write_text("{}", encoding="utf-8")
+    target.chmod(0o640)
+    link.symlink_to(target)
+
+    VBriefDocument.from_dict({"vBRIEFInfo": {"version": "0.5"}, "plan": {"title": "T", "status": "draft", "items": []}}).to_file(link)
+
+    assert link.is_symlink()
+    assert json.loads(target.read_text(encoding="utf-8"))["plan"]["title"] == "T"
+    assert stat.S_IMODE(target.stat().st_mode) == 0o640
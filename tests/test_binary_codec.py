@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+
+import pytest
+
+from libvbrief import VBriefDocument, dump_file, dumps_bytes, load_file, loads_bytes
+from libvbrief.compat import CORE_EDGE_TYPES, VALID_STATUSES
+from libvbrief.serialization.binary_codec import (
+    _KNOWN_CODES,
+    BinaryDecodeError,
+    dumps_binary,
+    parse_binary,
+)
+
+EXAMPLES = sorted((Path(__file__).resolve().parent.parent / "examples").glob("*.vbrief.json"))
+
+
+@pytest.mark.parametrize("path", EXAMPLES, ids=lambda p: p.name)
+def test_examples_round_trip_and_shrink(path: Path) -> None:
+    source = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(source, dict):
+        pytest.skip("not a vBRIEF document")
+
+    preserved = parse_binary(dumps_binary(source, canonical=False, preserve_format=True))
+    canonical = parse_binary(dumps_binary(source))
+
+    assert json.dumps(preserved) == json.dumps(source)
+    assert json.dumps(canonical) == json.dumps(source, sort_keys=True)
+    assert len(dumps_binary(source)) < len(json.dumps(source, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def test_round_trip_keeps_extras_and_exact_values() -> None:
+    source = {
+        "vBRIEFInfo": {"version": "0.5", "x-vendor": {"nested": [1, 2]}},
+        "plan": {
+            "title": "Plan",
+            "status": "running",
+            "items": [
+                {"id": "a", "title": "A", "status": "blocked", "x-custom": "kept", "tags": ["t", "t"]},
+                {"id": "b", "title": "B", "status": "done-ish", "percentComplete": 12.5},
+            ],
+            "edges": [{"from": "a", "to": "b", "type": "blocks"}, {"from": "a", "to": "b", "type": "custom"}],
+            "numbers": [0, 63, 64, -1, 2**100, -(2**100), -0.0, 1e308, float("inf")],
+            "odd": ["\ud800", "", "é" * 100, None, True, False],
+        },
+    }
+
+    decoded = loads_bytes(dumps_bytes(source, format="binary", preserve_format=True), format="binary")
+
+    assert decoded["plan"]["items"] == source["plan"]["items"]
+    assert decoded["plan"]["odd"] == source["plan"]["odd"]
+    assert decoded["vBRIEFInfo"] == source["vBRIEFInfo"]
+    numbers = decoded["plan"]["numbers"]
+    assert numbers == source["plan"]["numbers"] and all(type(n) is type(m) for n, m in zip(numbers, source["plan"]["numbers"]))
+    assert math.copysign(1.0, numbers[6]) == -1.0
+
+    doc = VBriefDocument.from_dict(decoded)
+    assert doc.plan.items[0].extras == {"x-custom": "kept"}
+
+
+def test_known_strings_and_repeats_are_one_or_two_bytes() -> None:
+    assert VALID_STATUSES <= _KNOWN_CODES.keys()
+    assert set(CORE_EDGE_TYPES) <= _KNOWN_CODES.keys()
+
+    one = dumps_binary({"tags": ["backend-team"]})
+    many = dumps_binary({"tags": ["backend-team"] * 101})
+
+    assert len(many) - len(one) == 200
+
+
+def test_file_suffix_selects_binary(tmp_path: Path) -> None:
+    source = {"vBRIEFInfo": {"version": "0.5"}, "plan": {"title": "T", "status": "draft", "items": []}}
+    path = tmp_path / "plan.vbb"
+
+    dump_file(source, path)
+
+    assert path.read_bytes().startswith(b"VBB")
+    assert load_file(path, strict=True) == source
+
+
+@pytest.mark.parametrize(
+    "data, message",
+    [
+        (b"{}", "Not a binary"),
+        (b"VBB\x09\x00\x00\x00\x00\xc8\x00", "Unsupported"),
+        (dumps_binary({"plan": {"title": "T"}})[:-1], "Truncated"),
+        (dumps_binary({"plan": {}}) + b"\xc0", "Extra data"),
+    ],
+)
+def test_invalid_input_raises(data: bytes, message: str) -> None:
+    with pytest.raises(BinaryDecodeError, match=message):
+        parse_binary(data)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from libvbrief.cli import main
+from libvbrief.validation import RuleEngine
+
+
+def _write_plans(directory: Path) -> None:
+    valid = {"vBRIEFInfo": {"version": "0.5"}, "plan": {"title": "P", "status": "running", "items": []}}
+    invalid = {"vBRIEFInfo": {"version": "0.5"}, "plan": {"title": "P", "status": "oops", "items": [], "x": 1}}
+    (directory / "nested").mkdir()
+    for index in range(5):
+        (directory / "nested" / f"ok-{index}.vbrief.json").write_text(json.dumps(valid), encoding="utf-8")
+    (directory / "bad.vbrief.json").write_text(json.dumps(invalid), encoding="utf-8")
+    (directory / "broken.vbrief.json").write_text("{not json", encoding="utf-8")
+    (directory / "notes.json").write_text("[]", encoding="utf-8")
+
+
+def test_validate_streams_one_json_line_per_file(tmp_path, capsys) -> None:
+    _write_plans(tmp_path)
+
+    exit_code = main(["validate", "--jobs", "2", "--chunk-size", "2", str(tmp_path)])
+
+    captured = capsys.readouterr()
+    records = {Path(record["file"]).name: record for record in map(json.loads, captured.out.splitlines())}
+    assert exit_code == 1
+    assert len(records) == 7 and all(records[f"ok-{index}.vbrief.json"]["valid"] for index in range(5))
+    assert [(issue["code"], issue["path"]) for issue in records["bad.vbrief.json"]["errors"]] == [
+        ("invalid_plan_status", "plan.status")
+    ]
+    assert records["broken.vbrief.json"]["errors"][0]["code"] == "unreadable_document"
+    assert captured.err.startswith("7 files (2 invalid), ") and "files/s" in captured.err
+
+
+def test_validate_writes_sarif_and_accepts_globs(tmp_path, capsys) -> None:
+    _write_plans(tmp_path)
+
+    exit_code = main(["validate", "--jobs", "1", "--format", "sarif", "--schema", str(tmp_path / "**" / "*.json")])
+
+    log = json.loads(capsys.readouterr().out)
+    results = log["runs"][0]["results"]
+    assert exit_code == 1 and log["version"] == "2.1.0"
+    by_file = {}
+    for result in results:
+        location = result["locations"][0]
+        file = Path(location["physicalLocation"]["artifactLocation"]["uri"]).name
+        by_file.setdefault(file, []).append((result["ruleId"], result["level"], location["logicalLocations"][0]["fullyQualifiedName"]))
+    assert by_file["notes.json"] == [("invalid_document_type", "error", "$")]
+    assert by_file["bad.vbrief.json"] == [("invalid_plan_status", "error", "plan.status"), ("schema_violation", "error", "plan.status")]
+    assert by_file["broken.vbrief.json"][0][0] == "unreadable_document"
+    assert len(by_file) == 3
+
+
+def test_validate_exit_codes(tmp_path, capsys) -> None:
+    _write_plans(tmp_path)
+
+    assert main(["validate", "-j", "1", str(tmp_path / "nested")]) == 0
+    assert main(["validate", "-j", "1", str(tmp_path / "missing" / "*.json")]) == 2
+    assert main(["validate", "-j", "1", "--schema-file", str(tmp_path / "nope.json"), str(tmp_path)]) == 2
+    assert "no files matched" in capsys.readouterr().err
+
+
+def test_validate_reports_a_file_that_breaks_a_rule_and_keeps_going(tmp_path, capsys, monkeypatch) -> None:
+    _write_plans(tmp_path)
+    listed = {"vBRIEFInfo": {"version": "0.5"}, "plan": {"title": "P", "status": ["x"], "items": []}}
+    (tmp_path / "listed.vbrief.json").write_text(json.dumps(listed), encoding="utf-8")
+
+    assert main(["validate", "-j", "2", str(tmp_path)]) == 1
+    records = {Path(record["file"]).name: record for record in map(json.loads, capsys.readouterr().out.splitlines())}
+    assert len(records) == 8
+    assert [(issue["code"], issue["message"]) for issue in records["listed.vbrief.json"]["errors"]] == [
+        ("invalid_plan_status", "Status must be a string")
+    ]
+
+    validate = RuleEngine.validate
+
+    def flaky(self, document, **kwargs):
+        if document.get("plan", {}).get("status") == "oops":
+            raise RuntimeError("rule bug")
+        return validate(self, document, **kwargs)
+
+    monkeypatch.setattr(RuleEngine, "validate", flaky)
+    assert main(["validate", "-j", "1", str(tmp_path)]) == 1
+    records = {Path(record["file"]).name: record for record in map(json.loads, capsys.readouterr().out.splitlines())}
+    assert len(records) == 8
+    assert records["bad.vbrief.json"]["errors"] == [
+        {"code": "validation_failed", "path": "$", "message": "RuntimeError: rule bug"}
+    ]
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import copy
+import random
+
+import pytest
+
+from libvbrief import VBriefDocument, diff
+from libvbrief.compare import Change
+
+
+def _data() -> dict:
+    return {
+        "vBRIEFInfo": {"version": "0.5"},
+        "plan": {
+            "title": "P",
+            "status": "running",
+            "items": [
+                {"id": "a", "title": "A", "status": "pending"},
+                {
+                    "id": "b",
+                    "title": "B",
+                    "status": "running",
+                    "subItems": [
+                        {"id": "b1", "title": "B1", "status": "pending"},
+                        {"id": "b2", "title": "B2", "status": "blocked"},
+                    ],
+                },
+                {"uid": "u-c", "id": "c", "title": "C", "status": "completed"},
+            ],
+            "edges": [{"from": "a", "to": "b", "type": "blocks"}, {"from": "b", "to": "c", "type": "blocks"}],
+        },
+    }
+
+
+def _patched(old: dict, new: dict) -> dict:
+    # The models read an empty subItems list as no subItems, so compare
+    # documents the way they serialize.
+    old, new = _expected(old), _expected(new)
+    doc = VBriefDocument.from_dict(copy.deepcopy(old))
+    doc.apply_patch(diff(old, new).to_patch())
+    result = doc.to_dict()
+    result["plan"].pop("sequence")
+    return result
+
+
+def _expected(new: dict) -> dict:
+    return VBriefDocument.from_dict(copy.deepcopy(new)).to_dict()
+
+
+def test_changes_are_reported_per_kind() -> None:
+    old = _data()
+    new = _data()
+    items = new["plan"]["items"]
+    c = items.pop()
+    c["id"] = "c-renamed"
+    items[1]["subItems"].insert(0, c)
+    items[0]["status"] = "completed"
+    del items[1]["subItems"][2]
+    items.append({"id": "d", "title": "D", "status": "draft"})
+    new["plan"]["edges"][1]["to"] = "c-renamed"
+    new["plan"]["title"] = "Q"
+
+    changes = diff(old, new).changes
+
+    assert changes == [
+        Change("changed", "plan", "title", "P", "Q"),
+        Change("removed", "plan.items[1].subItems[1]", old={"id": "b2", "title": "B2", "status": "blocked"}),
+        Change("changed", "plan.items[0]", "status", "pending", "completed"),
+        Change("moved", "plan.items[1].subItems[0]", old_path="plan.items[2]"),
+        Change("changed", "plan.items[1].subItems[0]", "id", "c", "c-renamed"),
+        Change("added", "plan.items[2]", new={"id": "d", "title": "D", "status": "draft"}),
+        Change("removed", "plan.edges[1]", old={"from": "b", "to": "c", "type": "blocks"}),
+        Change("added", "plan.edges[1]", new={"from": "b", "to": "c-renamed", "type": "blocks"}),
+    ]
+    assert _patched(old, new) == _expected(new)
+    assert not diff(old, copy.deepcopy(old))
+    assert diff(old, copy.deepcopy(old)).to_patch() == []
+
+
+def test_booleans_are_not_numbers() -> None:
+    old = _data()
+    old["plan"]["items"][0].update({"x-flag": True, "metadata": {"n": [1, False]}})
+    new = copy.deepcopy(old)
+    new["plan"]["items"][0].update({"x-flag": 1, "metadata": {"n": [1, 0]}})
+    new["plan"]["items"][2]["x-flag"] = 1.0
+
+    changes = diff(old, new).changes
+
+    assert changes == [
+        Change("changed", "plan.items[0]", "x-flag", True, 1),
+        Change("changed", "plan.items[0]", "metadata", {"n": [1, False]}, {"n": [1, 0]}),
+        Change("changed", "plan.items[2]", "x-flag", None, 1.0),
+    ]
+    # Numbers still compare by value, as in JSON.
+    same = copy.deepcopy(new)
+    same["plan"]["items"][2]["x-flag"] = 1
+    assert not diff(new, same)
+
+def test_reordering_moves_only_what_left_the_sequence() -> None:
+    old = _data()
+    old["plan"]["items"] = [{"id": f"t{index}", "title": "T", "status": "pending"} for index in range(10)]
+    new = copy.deepcopy(old)
+    items = new["plan"]["items"]
+    items.insert(7, items.pop(2))
+
+    result = diff(old, new)
+
+    assert [change.kind for change in result] == ["moved"]
+    assert result.to_patch() == [{"op": "move", "from": "/plan/items/2", "path": "/plan/items/7"}]
+
+
+def test_moving_under_the_next_sibling() -> None:
+    old = _data()
+    old["plan"]["items"] = old["plan"]["items"][:2]
+    new = copy.deepcopy(old)
+    new["plan"]["items"][1]["subItems"].insert(1, new["plan"]["items"].pop(0))
+
+    # "/plan/items/0" into "/plan/items/0/subItems/1" would be a move into itself.
+    assert diff(old, new).to_patch() == [
+        {"op": "move", "from": "/plan/items/0", "path": "/plan/items/-"},
+        {"op": "move", "from": "/plan/items/1", "path": "/plan/items/0/subItems/1"},
+    ]
+    assert _patched(old, new) == _expected(new)
+
+
+def test_items_match_by_path_when_ids_are_missing() -> None:
+    old = _data()
+    for item in old["plan"]["items"][1]["subItems"]:
+        del item["id"]
+    new = copy.deepcopy(old)
+    new["plan"]["items"][1]["subItems"][1]["status"] = "completed"
+
+    assert diff(old, new).changes == [Change("changed", "plan.items[1].subItems[1]", "status", "blocked", "completed")]
+
+
+def test_change_log_records() -> None:
+    old = _data()
+    new = _data()
+    new["plan"]["items"][0]["status"] = "completed"
+    del new["plan"]["items"][2]
+    new["plan"]["items"].append({"id": "d", "title": "D", "status": "draft"})
+    agent = {"id": "bot-1", "type": "aiAgent"}
+
+    log = diff(old, new).to_change_log(agent, sequence=4, timestamp="2026-10-17T10:00:00Z")
+
+    assert [(entry["operation"], entry["path"]) for entry in log] == [
+        ("delete", "plan.items[2]"),
+        ("update", "plan.items[0].status"),
+        ("create", "plan.items[2]"),
+    ]
+    assert log[1]["oldValue"] == "pending" and log[1]["newValue"] == "completed"
+    assert all(entry["sequence"] == 4 and entry["agent"] == agent and entry["timestamp"] == "2026-10-17T10:00:00Z" for entry in log)
+    assert diff(old, new).to_change_log(agent, sequence=4)[0]["timestamp"].endswith("Z")
+
+
+def _apply(document: dict, operations: list[dict]) -> dict:
+    # A plain RFC 6902 applier: the models drop entries that are not objects.
+    document = copy.deepcopy(document)
+
+    def locate(pointer: str) -> tuple:
+        *parents, last = pointer.split("/")[1:]
+        node = document
+        for token in parents:
+            node = node[int(token)] if isinstance(node, list) else node[token]
+        return node, (len(node) if last == "-" else int(last)) if isinstance(node, list) else last
+
+    for operation in operations:
+        if operation["op"] == "move":
+            node, key = locate(operation["from"])
+            value = node.pop(key)
+        elif operation["op"] == "remove":
+            node, key = locate(operation["path"])
+            node.pop(key)
+            continue
+        else:
+            value = copy.deepcopy(operation["value"])
+        node, key = locate(operation["path"])
+        if isinstance(node, list) and operation["op"] != "replace":
+            node.insert(key, value)
+        else:
+            node[key] = value
+    return document
+
+
+def test_entries_that_are_not_items_round_trip() -> None:
+    old = {
+        "plan": {
+            "title": "P",
+            "status": "running",
+            "items": [
+                {"title": "A", "status": "draft", "subItems": [{"title": "a1", "status": "draft", "subItems": 3}, 3]},
+                {"title": "B", "status": "draft", "id": "b", "subItems": [{"title": "b1", "status": "draft"}]},
+                None,
+                [1],
+            ],
+        }
+    }
+    new = {
+        "plan": {
+            "title": "P",
+            "status": "running",
+            "items": [
+                {"title": "A", "status": "draft", "subItems": [None, {"title": "a1", "status": "draft", "id": "x"}]},
+                None,
+                {"title": "B", "status": "draft", "id": "b", "subItems": ["b1"]},
+                [1],
+            ],
+        }
+    }
+
+    assert _apply(old, diff(old, new).to_patch()) == new
+    assert _apply(new, diff(new, old).to_patch()) == old
+    assert diff(old, copy.deepcopy(old)).to_patch() == []
+    assert [(change.kind, change.path) for change in diff(old, new) if change.kind != "changed"] == [
+        ("removed", "plan.items[0].subItems[0]"),
+        ("removed", "plan.items[0].subItems[1]"),
+        ("removed", "plan.items[1].subItems[0]"),
+        ("removed", "plan.items[2]"),
+        ("added", "plan.items[0].subItems[0]"),
+        ("added", "plan.items[0].subItems[1]"),
+        ("added", "plan.items[1]"),
+        ("added", "plan.items[2].subItems[0]"),
+    ]
+
+
+def _containers(data: dict) -> list[list]:
+    lists = [data["plan"]["items"]]
+    stack = list(data["plan"]["items"])
+    while stack:
+        item = stack.pop()
+        sub_items = item.setdefault("subItems", [])
+        lists.append(sub_items)
+        stack.extend(sub_items)
+    return lists
+
+
+def _mutate(rng: random.Random, data: dict, step: int) -> None:
+    lists = _containers(data)
+    source = rng.choice([items for items in lists if items] or lists)
+    choice = rng.randrange(6) if source else 0
+    if choice == 0:
+        item = {"title": f"N{step}", "status": "draft"}
+        if rng.random() < 0.7:
+            # Shared ids fall back to matching by path.
+            item["id"] = rng.choice([f"n{step}", "shared"])
+        if rng.random() < 0.3:
+            item["subItems"] = [{"id": f"n{step}.0", "title": "S", "status": "draft"}]
+        source.insert(rng.randrange(len(source) + 1), item)
+    elif choice == 1:
+        del source[rng.randrange(len(source))]
+    elif choice == 2:
+        rng.choice(source)["status"] = rng.choice(["pending", "running", "completed"])
+    elif choice == 3:
+        item = source.pop(rng.randrange(len(source)))
+        # Never move an item into its own subtree.
+        targets = [items for items in _containers(data) if items is not item.get("subItems")]
+        stack = list(item.get("subItems", []))
+        while stack:
+            inner = stack.pop()
+            targets = [items for items in targets if items is not inner.get("subItems")]
+            stack.extend(inner.get("subItems", []))
+        target = rng.choice(targets)
+        target.insert(rng.randrange(len(target) + 1), item)
+    elif choice == 4:
+        source.reverse()
+    else:
+        edges = data["plan"]["edges"]
+        if edges and rng.random() < 0.5:
+            del edges[rng.randrange(len(edges))]
+        else:
+            edges.append({"from": f"n{step}", "to": "a", "type": rng.choice(["blocks", "informs"])})
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_random_edits_round_trip_through_the_patch(seed: int) -> None:
+    rng = random.Random(seed)
+    old = _data()
+    for step in range(40):
+        _mutate(rng, old, step)
+    new = copy.deepcopy(old)
+    for step in range(40, 40 + rng.randrange(1, 25)):
+        _mutate(rng, new, step)
+
+    result = diff(old, new)
+
+    assert _patched(old, new) == _expected(new)
+    assert _patched(new, old) == _expected(old)
+    moves = [operation for operation in result.to_patch() if operation["op"] == "move"]
+    moved = sum(change.kind == "moved" for change in result)
+    assert moved <= len(moves) <= 2 * moved
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import copy
+import random
+
+import pytest
+
+from libvbrief import PlanItem, VBriefDocument
+
+
+def _document(*, lazy: bool = False) -> VBriefDocument:
+    return VBriefDocument.from_dict(
+        {
+            "vBRIEFInfo": {"version": "0.5"},
+            "plan": {
+                "title": "P",
+                "status": "running",
+                "items": [
+                    {
+                        "id": "setup",
+                        "uid": "u-setup",
+                        "title": "Setup",
+                        "status": "pending",
+                        "subItems": [
+                            {"id": "auth", "title": "Auth", "status": "pending"},
+                            {"title": "No id", "status": "pending", "subItems": [{"id": "deep", "title": "Deep", "status": "pending"}]},
+                        ],
+                    },
+                    {"id": "ship", "title": "Ship", "status": "pending"},
+                ],
+            },
+        },
+        lazy=lazy,
+    )
+
+
+def _snapshot(doc: VBriefDocument) -> dict[str, object]:
+    return {
+        entry.item.title: (entry.parent.title, entry.position, entry.path, entry._id, entry._uid)
+        for entry in doc.index._entries.values()
+    }
+
+
+def _matches_fresh_index(doc: VBriefDocument) -> bool:
+    return _snapshot(doc) == _snapshot(copy.deepcopy(doc))
+
+
+def test_index_looks_up_by_id_uid_and_path() -> None:
+    doc = _document()
+    index = doc.index
+
+    setup = doc.plan.items[0]
+    auth = setup.subItems[0]
+    assert index.by_id("auth") is auth
+    assert index.by_uid("u-setup") is setup
+    assert index.by_path("setup.auth") is auth
+    assert index.by_path("deep") is None and index.by_id("deep").title == "Deep"
+    assert index.resolve("#setup.auth") is auth and index.resolve("ship") is doc.plan.items[1]
+    assert index.resolve("file://./other.vbrief.json#ship") is None
+    entry = index.entry(auth)
+    assert entry.parent is setup and entry.position == 0 and entry.path == "setup.auth"
+    assert index.entry(doc.plan.items[1]).parent is doc.plan
+    assert len(index) == 5 and doc.index is index
+    with pytest.raises(KeyError):
+        index.entry(PlanItem(title="elsewhere", status="pending"))
+
+
+def test_index_follows_list_mutations_and_renames() -> None:
+    doc = _document()
+    index = doc.index
+    setup, ship = doc.plan.items
+
+    doc.plan.items.insert(0, PlanItem(title="First", status="pending", id="first"))
+    assert index.entry(ship).position == 2 and index.by_path("first").title == "First"
+
+    setup.id = "boot"
+    assert index.by_id("setup") is None and index.by_path("boot.auth").title == "Auth"
+
+    auth = setup.subItems.pop(0)
+    assert auth not in index and index.by_id("auth") is None
+    ship.subItems.append(auth)
+    assert index.by_path("ship.auth") is auth and index.entry(auth).parent is ship
+
+    del doc.plan.items[1]
+    assert index.by_id("deep") is None and index.by_uid("u-setup") is None
+    assert _matches_fresh_index(doc)
+
+
+def test_index_handles_duplicates_and_moves_within_a_list() -> None:
+    doc = _document()
+    index = doc.index
+    items = doc.plan.items
+    items.append(PlanItem(title="Ship again", status="pending", id="ship"))
+
+    assert index.by_id("ship").title == "Ship"
+    items[0], items[1] = items[1], items[0]
+    assert index.entry(items[0]).position == 0 and index.entry(items[1]).position == 1
+    items.remove(items[0])
+    assert index.by_id("ship").title == "Ship again"
+    assert _matches_fresh_index(doc)
+
+
+def test_index_survives_random_edits() -> None:
+    rng = random.Random(7)
+    for lazy in (False, True):
+        doc = _document(lazy=lazy)
+        index = doc.index
+        for step in range(300):
+            items = list(index._entries.values())
+            target = rng.choice(items).item if items else None
+            action = rng.randrange(6)
+            if action == 0 or target is None:
+                owner = target.subItems if target is not None else doc.plan.items
+                owner.insert(rng.randrange(len(owner) + 1), PlanItem(title=f"n{step}", status="pending", id=rng.choice(["a", "b", f"n{step}"])))
+            elif action == 1:
+                target.id = rng.choice(["a", "b", None, f"r{step}"])
+            elif action == 2:
+                target.uid = f"u{rng.randrange(5)}"
+            elif action == 3:
+                entry = index.entry(target)
+                siblings = entry.parent.subItems if isinstance(entry.parent, PlanItem) else entry.parent.items
+                del siblings[entry.position]
+            elif action == 4 and len(items) > 1:
+                entry = index.entry(target)
+                siblings = entry.parent.subItems if isinstance(entry.parent, PlanItem) else entry.parent.items
+                moved = siblings.pop(entry.position)
+                destination = rng.choice(items).item
+                if destination is not moved and destination in index:
+                    destination.subItems.append(moved)
+            else:
+                target.subItems.reverse()
+        assert _matches_fresh_index(doc)
+
+
+def test_index_rebuilds_while_plain_lists_are_present() -> None:
+    doc = _document()
+    index = doc.index
+    ship = doc.plan.items[1]
+
+    children = [PlanItem(title="Plain", status="pending", id="plain")]
+    ship.subItems = children
+    assert index.by_path("ship.plain") is children[0]
+    children.append(PlanItem(title="Later", status="pending", id="later"))
+    assert index.by_path("ship.later") is children[1]
+
+
+def test_index_is_not_copied() -> None:
+    doc = _document()
+    index = doc.index
+
+    clone = copy.deepcopy(doc)
+
+    assert clone.index is not index
+    assert clone.index.by_id("auth") is clone.plan.items[0].subItems[0]
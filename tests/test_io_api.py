@@ -4,7 +4,8 @@ import json
 
 import pytest
 
-from libvbrief import ValidationError, dump_file, dumps, load_file, loads
+from libvbrief import ValidationError, VBriefDocument, dump_file, dumps, load_file, loads
+from libvbrief.serialization import clear_intern_table, interning, parse_json
 
 
 def test_loads_lenient_mode_allows_invalid_doc() -> None:
@@ -18,9 +19,13 @@ def test_loads_lenient_mode_allows_invalid_doc() -> None:
 def test_loads_strict_mode_raises() -> None:
     text = json.dumps({"vBRIEFInfo": {"version": "0.4"}, "plan": {"title": "x", "status": "oops", "items": []}})
 
-    with pytest.raises(ValidationError):
+    with pytest.raises(ValidationError) as raised:
         loads(text, strict=True)
 
+    # Strict loading stops at the first error.
+    assert raised.value.report.truncated
+    assert str(raised.value) == "vBRIEFInfo.version: Expected version '0.5', got '0.4'; ... (stopped after 1 error)"
+
 
 def test_file_io_round_trip(tmp_path) -> None:
     source = {
@@ -52,3 +57,37 @@ def test_dumps_preserve_mode_keeps_insertion_order() -> None:
     z_index = rendered.index('"z"')
     a_index = rendered.index('"a"')
     assert z_index < a_index
+
+
+def test_interning_shares_strings_between_documents(tmp_path) -> None:
+    source = {
+        "vBRIEFInfo": {"version": "0.5"},
+        "plan": {"title": "R", "status": "running", "items": [{"title": "a", "status": "pending", "tags": ["backend"]}]},
+    }
+    path = tmp_path / "doc.vbrief.json"
+    dump_file(source, path)
+    text = path.read_text(encoding="utf-8")
+
+    first = load_file(path, intern=True)
+    second = parse_json(text, intern=True)
+    model = VBriefDocument.from_json(text, intern=True)
+    plain = loads(text)
+
+    assert first == second == plain == source
+    assert second["plan"]["items"][0]["tags"][0] is first["plan"]["items"][0]["tags"][0]
+    assert model.plan.items[0].status is first["plan"]["items"][0]["status"]
+    assert [key for key in second["plan"]["items"][0]] == [key for key in plain["plan"]["items"][0]]
+    assert next(iter(second["plan"])) is next(iter(first["plan"]))
+    assert plain["plan"]["items"][0]["status"] is not first["plan"]["items"][0]["status"]
+
+
+def test_intern_table_is_bounded(monkeypatch) -> None:
+    clear_intern_table()
+    monkeypatch.setattr(interning, "_MAX_STRINGS", 3)
+    long_title = "x" * 100
+    text = json.dumps({"vBRIEFInfo": {"version": "0.5"}, "plan": {"title": long_title, "status": "running", "items": []}})
+
+    loads(text, intern=True)
+
+    assert len(interning._STRINGS) == 3 and long_title not in interning._STRINGS
+    clear_intern_table()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+import struct
+
+import pytest
+
+from libvbrief.serialization import dumps_jcs
+
+# RFC 8785 appendix B: IEEE 754 bit patterns and their canonical text.
+NUMBERS = {
+    "0000000000000000": "0",
+    "8000000000000000": "0",
+    "0000000000000001": "5e-324",
+    "8000000000000001": "-5e-324",
+    "7fefffffffffffff": "1.7976931348623157e+308",
+    "ffefffffffffffff": "-1.7976931348623157e+308",
+    "4340000000000000": "9007199254740992",
+    "c340000000000000": "-9007199254740992",
+    "4430000000000000": "295147905179352830000",
+    "44b52d02c7e14af5": "9.999999999999997e+22",
+    "44b52d02c7e14af6": "1e+23",
+    "44b52d02c7e14af7": "1.0000000000000001e+23",
+    "444b1ae4d6e2ef4e": "999999999999999700000",
+    "444b1ae4d6e2ef4f": "999999999999999900000",
+    "444b1ae4d6e2ef50": "1e+21",
+    "3eb0c6f7a0b5ed8c": "9.999999999999997e-7",
+    "3eb0c6f7a0b5ed8d": "0.000001",
+    "41b3de4355555553": "333333333.3333332",
+    "41b3de4355555554": "333333333.33333325",
+    "41b3de4355555555": "333333333.3333333",
+    "41b3de4355555556": "333333333.3333334",
+    "41b3de4355555557": "333333333.33333343",
+    "becbf647612f3696": "-0.0000033333333333333333",
+    "43143ff3c1cb0959": "1424953923781206.2",
+}
+
+
+@pytest.mark.parametrize("bits, expected", NUMBERS.items())
+def test_numbers_match_the_rfc_vectors(bits: str, expected: str) -> None:
+    (value,) = struct.unpack(">d", bytes.fromhex(bits))
+
+    assert dumps_jcs(value) == expected.encode("ascii")
+
+
+def test_rfc_sample_document() -> None:
+    text = (
+        '{"numbers": [333333333.33333329, 1E30, 4.50, 2e-3, 0.000000000000000000000000001],'
+        ' "string": "\\u20ac$\\u000F\\u000aA\'\\u0042\\u0022\\u005c\\\\\\"\\/",'
+        ' "literals": [null, true, false]}'
+    )
+
+    assert dumps_jcs(json.loads(text)) == (
+        '{"literals":[null,true,false],"numbers":[333333333.3333333,1e+30,4.5,0.002,1e-27],'
+        '"string":"€$\\u000f\\nA\'B\\"\\\\\\\\\\"/"}'
+    ).encode("utf-8")
+
+
+def test_members_sort_by_utf16_code_units() -> None:
+    names = ["€", "\r", "דּ", "1", "\U0001f600", "\u0080", "ö"]
+
+    rendered = json.loads(dumps_jcs({name: index for index, name in enumerate(names)}))
+
+    assert list(rendered) == ["\r", "1", "\u0080", "ö", "€", "\U0001f600", "דּ"]
+
+
+def test_structure_and_rejected_values() -> None:
+    assert dumps_jcs({"b": [1, (2, {}), []], "a": {"z": None, "y": 2**60}}) == (
+        b'{"a":{"y":1152921504606847000,"z":null},"b":[1,[2,{}],[]]}'
+    )
+    assert dumps_jcs(-0.0) == b"0" and dumps_jcs(True) == b"true" and dumps_jcs(1.0) == b"1"
+    for value in (float("nan"), float("inf"), 10**400):
+        with pytest.raises(ValueError):
+            dumps_jcs(value)
+    with pytest.raises(TypeError):
+        dumps_jcs({1: "x"})
+    with pytest.raises(TypeError):
+        dumps_jcs({"when": object()})
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from libvbrief import dumps, dumps_bytes, load_file, loads_bytes
+from libvbrief.serialization import (
+    available_json_backends,
+    dumps_json,
+    get_json_backend,
+    parse_json,
+    set_json_backend,
+)
+
+EXAMPLES = sorted((Path(__file__).resolve().parent.parent / "examples").glob("*.vbrief.json"))
+
+
+@pytest.fixture(autouse=True)
+def _restore_backend():
+    yield
+    set_json_backend(None)
+
+
+def _stdlib_render(document, *, sort_keys: bool) -> str:
+    return json.dumps(document, ensure_ascii=False, indent=2, sort_keys=sort_keys) + "\n"
+
+
+@pytest.mark.parametrize("backend", available_json_backends())
+@pytest.mark.parametrize("path", EXAMPLES, ids=lambda p: p.name)
+def test_backends_are_byte_identical_to_stdlib(backend: str, path: Path) -> None:
+    set_json_backend(backend)
+    document = load_file(path)
+
+    assert document == json.loads(path.read_text(encoding="utf-8"))
+    assert dumps_json(document) == _stdlib_render(document, sort_keys=True)
+    assert dumps_json(document, canonical=False, preserve_format=True) == _stdlib_render(document, sort_keys=False)
+    assert dumps_bytes(document) == _stdlib_render(document, sort_keys=True).encode("utf-8")
+
+
+@pytest.mark.parametrize("backend", available_json_backends())
+def test_backends_keep_stdlib_number_semantics(backend: str) -> None:
+    set_json_backend(backend)
+    document = {"plan": {"n": [1e16, 2.5e-05, 0.1, -0.0, float("nan")], "big": 2**70, "neg": -(2**63) - 1}}
+
+    assert dumps_json(document) == _stdlib_render(document, sort_keys=True)
+
+    parsed = parse_json('{"big": 123456789012345678901234567890, "neg": -9223372036854775809}')
+    assert parsed == {"big": 123456789012345678901234567890, "neg": -9223372036854775809}
+
+
+def test_bytes_entry_points_round_trip() -> None:
+    source = {"vBRIEFInfo": {"version": "0.5"}, "plan": {"title": "Café", "status": "running", "items": []}}
+
+    data = dumps_bytes(source)
+
+    assert isinstance(data, bytes)
+    assert data.decode("utf-8") == dumps(source)
+    assert loads_bytes(data, strict=True) == source
+
+
+def test_invalid_json_errors_come_from_stdlib() -> None:
+    with pytest.raises(json.JSONDecodeError):
+        loads_bytes(b'{"plan": ')
+
+
+def test_backend_selection(monkeypatch) -> None:
+    assert available_json_backends()[-1] == "stdlib"
+
+    monkeypatch.setenv("LIBVBRIEF_JSON_BACKEND", "stdlib")
+    assert get_json_backend().name == "stdlib"
+
+    with pytest.raises(ValueError, match="Unknown JSON backend"):
+        set_json_backend("simdjson-does-not-exist")
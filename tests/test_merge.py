@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import copy
+
+from libvbrief import MergeConflict, VBriefDocument, merge
+
+
+def _base() -> dict:
+    return {
+        "vBRIEFInfo": {"version": "0.5"},
+        "plan": {
+            "title": "P",
+            "status": "running",
+            "sequence": 3,
+            "items": [
+                {"id": "a", "title": "A", "status": "pending"},
+                {
+                    "id": "b",
+                    "title": "B",
+                    "status": "running",
+                    "subItems": [
+                        {"id": "b1", "title": "B1", "status": "pending"},
+                        {"id": "b2", "title": "B2", "status": "blocked"},
+                    ],
+                },
+                {"id": "c", "title": "C", "status": "completed"},
+            ],
+            "edges": [{"from": "a", "to": "b", "type": "blocks"}],
+            "changeLog": [{"sequence": 3, "timestamp": "2026-10-01T00:00:00Z", "operation": "update", "path": "plan"}],
+        },
+    }
+
+
+def _ids(document: VBriefDocument) -> list:
+    def walk(items):
+        return [(item.id, walk(item.subItems)) if item.subItems else item.id for item in items]
+
+    return walk(document.plan.items)
+
+
+def test_independent_edits_merge_cleanly() -> None:
+    base, ours, theirs = _base(), _base(), _base()
+    ours["plan"]["items"][0]["status"] = "running"
+    ours["plan"]["items"][1]["subItems"].append({"id": "b3", "title": "B3", "status": "draft"})
+    ours["plan"]["changeLog"].append({"sequence": 4, "timestamp": "2026-10-02T00:00:00Z", "operation": "update", "path": "plan.items[0]"})
+    theirs["plan"]["items"][0]["narrative"] = {"Outcome": "done"}
+    theirs["plan"]["items"].insert(0, theirs["plan"]["items"].pop(2))
+    del theirs["plan"]["items"][2]["subItems"][1]
+    theirs["plan"]["edges"].append({"from": "b", "to": "c", "type": "informs"})
+    theirs["plan"]["changeLog"].append({"sequence": 4, "timestamp": "2026-10-03T00:00:00Z", "operation": "delete", "path": "plan.items[1].subItems[1]"})
+
+    result = merge(base, ours, theirs)
+
+    assert result.clean
+    plan = result.document.plan
+    assert _ids(result.document) == ["c", "a", ("b", ["b1", "b3"])]
+    assert plan.items[1].status == "running" and plan.items[1].narrative == {"Outcome": "done"}
+    assert [edge["to"] for edge in plan.edges] == ["b", "c"]
+    assert [entry["path"] for entry in plan.changeLog] == ["plan", "plan.items[0]", "plan.items[1].subItems[1]"]
+
+
+def test_conflicts_go_to_the_higher_sequence() -> None:
+    base, ours, theirs = _base(), _base(), _base()
+    ours["plan"]["items"][0].update(status="blocked", sequence=2, lastModifiedBy="bot-a")
+    theirs["plan"]["items"][0].update(status="completed", sequence=5, lastModifiedBy="bot-b")
+    ours["plan"]["items"][2].update(title="Ours", sequence=7)
+    theirs["plan"]["items"][2].update(title="Theirs")
+    ours["plan"]["title"] = "Ours"
+    theirs["plan"].update(title="Theirs", sequence=4)
+
+    result = merge(base, ours, theirs)
+
+    items = result.document.plan.items
+    assert (items[0].status, items[0].sequence, items[0].lastModifiedBy) == ("completed", 5, "bot-b")
+    assert items[2].title == "Ours" and items[2].sequence == 7
+    assert result.document.plan.title == "Theirs" and result.document.plan.sequence == 4
+    assert result.conflicts == [
+        MergeConflict("member", "plan", "title", "Ours", "Theirs", "theirs"),
+        MergeConflict("member", "plan.items[0]", "status", "blocked", "completed", "theirs"),
+        MergeConflict("member", "plan.items[2]", "title", "Ours", "Theirs", "ours"),
+    ]
+
+
+def test_removals_against_edits_keep_the_item() -> None:
+    base, ours, theirs = _base(), _base(), _base()
+    del ours["plan"]["items"][1]
+    theirs["plan"]["items"][1]["subItems"][0]["status"] = "completed"
+    del theirs["plan"]["items"][2]
+
+    result = merge(base, ours, theirs)
+
+    assert _ids(result.document) == ["a", ("b", ["b1"])]
+    assert [(conflict.kind, conflict.path, conflict.resolution) for conflict in result.conflicts] == [
+        ("removed", "plan.items[1].subItems[0]", "theirs"),
+        ("removed", "plan.items[1]", "theirs"),
+    ]
+
+
+def test_crossed_moves_do_not_loop() -> None:
+    base, ours, theirs = _base(), _base(), _base()
+    a = ours["plan"]["items"].pop(0)
+    ours["plan"]["items"][1]["subItems"] = [a]
+    c = theirs["plan"]["items"].pop(2)
+    theirs["plan"]["items"][0]["subItems"] = [c]
+
+    result = merge(base, ours, theirs)
+
+    # Ours put a under c and theirs c under a: ours wins the loop.
+    assert _ids(result.document) == [("b", ["b1", "b2"]), ("c", ["a"])]
+    assert result.conflicts == [MergeConflict("moved", "plan.items[1]", None, "plan.items[1]", "plan.items[0].subItems[0]", "ours")]
+
+
+def test_both_sides_adding_the_same_item() -> None:
+    base, ours, theirs = _base(), _base(), _base()
+    ours["plan"]["items"].append({"uid": "u-new", "title": "New", "status": "draft"})
+    theirs["plan"]["items"].append({"uid": "u-new", "title": "New", "status": "pending", "sequence": 1})
+
+    result = merge(base, ours, theirs)
+
+    assert [item.uid for item in result.document.plan.items] == [None, None, None, "u-new"]
+    assert result.document.plan.items[3].status == "pending"
+    assert [(conflict.path, conflict.field) for conflict in result.conflicts] == [("plan.items[3]", "status")]
+
+
+def test_the_same_edit_on_both_sides_is_taken_once() -> None:
+    base = _base()
+    side = copy.deepcopy(base)
+    side["plan"]["items"].insert(1, {"title": "Write docs", "status": "draft", "subItems": [{"title": "Outline", "status": "draft"}]})
+    side["plan"]["items"][2]["subItems"].append({"title": "Review", "status": "pending"})
+    side["plan"]["items"][0]["status"] = "running"
+
+    result = merge(base, side, copy.deepcopy(side))
+
+    assert result.clean
+    assert result.document.to_dict() == VBriefDocument.from_dict(side).to_dict()
+
+
+def test_booleans_and_numbers_are_different_edits() -> None:
+    base, ours, theirs = _base(), _base(), _base()
+    base["plan"]["items"][2]["x-done"] = 1
+    ours["plan"]["items"][0]["x-flag"] = True
+    theirs["plan"]["items"][0]["x-flag"] = 1
+    del ours["plan"]["items"][2]
+    theirs["plan"]["items"][2]["x-done"] = True
+
+    result = merge(base, ours, theirs)
+
+    assert result.conflicts == [
+        MergeConflict("removed", "plan.items[2]", None, None, {"id": "c", "title": "C", "status": "completed", "x-done": True}, "theirs"),
+        MergeConflict("member", "plan.items[0]", "x-flag", True, 1, "ours"),
+    ]
+    assert result.document.plan.items[2].extras == {"x-done": True}
+
+def test_unchanged_sides_round_trip() -> None:
+    base = _base()
+    ours = copy.deepcopy(base)
+    ours["plan"]["items"][1]["subItems"].reverse()
+
+    assert merge(base, base, base).document.to_dict() == VBriefDocument.from_dict(base).to_dict()
+    assert merge(base, ours, base).document.to_dict() == VBriefDocument.from_dict(ours).to_dict()
+    assert merge(base, base, ours).document.to_dict() == VBriefDocument.from_dict(ours).to_dict()
@@ -1,6 +1,12 @@
 from __future__ import annotations
 
-from libvbrief import VBriefDocument, validate
+import copy
+import dataclasses
+
+import pytest
+
+from libvbrief import Plan, PlanItem, ValidationError, VBriefDocument, validate
+from libvbrief.models import LazyItemList
 
 
 def test_model_from_dict_and_to_dict_preserves_unknown_fields() -> None:
@@ -44,6 +50,25 @@ def test_model_validation_returns_report() -> None:
     assert validate(model).is_valid
 
 
+def test_strict_from_dict_builds_items_while_validating_the_input() -> None:
+    data = _tracked_document().to_dict(preserve_order=True)
+    data["plan"]["items"].append({"title": "c", "status": "pending", "subItems": [], "x-c": 1})
+
+    strict = VBriefDocument.from_dict(data, strict=True)
+    strict.plan.items[0].subItems[0].status = "completed"
+
+    assert VBriefDocument.from_dict(data, strict=True) == VBriefDocument.from_dict(data)
+    assert strict.to_dict()["plan"]["items"][0]["subItems"][0]["status"] == "completed"
+    assert type(VBriefDocument.from_dict(data, strict=True, lazy=True).plan.items) is LazyItemList
+
+    # The input is validated, not its normalised model, so codes and paths
+    # are those of libvbrief.validate.
+    del data["plan"]["items"][0]["subItems"][0]["title"]
+    with pytest.raises(ValidationError) as raised:
+        VBriefDocument.from_dict(data, strict=True)
+    assert raised.value.report.errors == validate(data).errors
+
+
 def test_model_preserve_order_uses_original_field_order() -> None:
     source = {
         "vBRIEFInfo": {"version": "0.5"},
@@ -60,3 +85,285 @@ def test_model_preserve_order_uses_original_field_order() -> None:
     text = model.to_json(canonical=False, preserve_format=True)
 
     assert text.index('"z"') < text.index('"a"')
+
+
+def test_plan_items_are_compact_and_keep_the_attribute_api() -> None:
+    source = {
+        "plan": {
+            "title": "P",
+            "status": "running",
+            "items": [
+                {"id": "a", "title": "A", "status": "pending"},
+                {"id": "b", "title": "B", "status": "pending", "subItems": [{"title": "c", "status": "draft"}]},
+            ],
+        }
+    }
+
+    first, second = VBriefDocument.from_dict(source).plan.items
+
+    assert not hasattr(first, "__dict__")
+    assert first._subItems is None and first._extras is None
+    assert first._field_order == ("id", "title", "status")
+    assert first._field_order is VBriefDocument.from_dict(source).plan.items[0]._field_order
+
+    first.subItems.append(PlanItem("child", "draft"))
+    first.extras["x-new"] = 1
+    assert first.to_dict()["subItems"] == [{"title": "child", "status": "draft"}]
+    assert first.to_dict()["x-new"] == 1
+    assert second.subItems[0] == PlanItem(title="c", status="draft", _field_order=["title", "status"])
+    assert repr(PlanItem("t", "draft")).startswith("PlanItem(title='t', status='draft', id=None")
+
+
+def test_models_keep_the_dataclass_helpers() -> None:
+    item = VBriefDocument.from_dict(
+        {"plan": {"title": "P", "status": "running", "items": [{"title": "A", "status": "pending", "x-a": 1, "subItems": [{"title": "c", "status": "draft"}]}]}}
+    ).plan.items[0]
+
+    assert dataclasses.is_dataclass(item) and dataclasses.is_dataclass(Plan)
+    assert [f.name for f in dataclasses.fields(PlanItem)][:3] == ["title", "status", "id"]
+    assert dataclasses.fields(Plan)[-1].name == "_field_order" and not dataclasses.fields(Plan)[-1].repr
+    as_dict = dataclasses.asdict(item)
+    assert as_dict["subItems"][0]["title"] == "c" and as_dict["extras"] == {"x-a": 1}
+    as_dict["subItems"].append({})
+    renamed = dataclasses.replace(item, title="B")
+    assert renamed.to_dict() == {**item.to_dict(), "title": "B"}
+
+
+def test_lazy_from_dict_builds_items_on_access_and_returns_untouched_mappings() -> None:
+    child = {"title": "c", "status": "draft", "x-child": 1}
+    untouched = {"id": "b", "title": "B", "status": "pending", "subItems": [child]}
+    items = [{"id": "a", "title": "A", "status": "pending"}, untouched, "not-an-item"]
+    source = {"vBRIEFInfo": {"version": "0.5"}, "plan": {"title": "P", "status": "running", "items": items}}
+
+    model = VBriefDocument.from_dict(source, lazy=True)
+
+    assert isinstance(model.plan.items, LazyItemList)
+    assert model.plan.items.built_count == 0
+    assert len(model.plan.items) == 2
+
+    first = model.plan.items[0]
+    assert first is model.plan.items[0]
+    assert model.plan.items.built_count == 1
+    first.status = "completed"
+
+    out = model.to_dict()
+    assert out["plan"]["items"][0]["status"] == "completed"
+    assert out["plan"]["items"][1] == untouched
+    assert model._shared_dict()["plan"]["items"][1] is untouched
+    assert items == [{"id": "a", "title": "A", "status": "pending"}, untouched, "not-an-item"]
+
+    eager = VBriefDocument.from_dict(source)
+    eager.plan.items[0].status = "completed"
+    assert model.plan.items == eager.plan.items
+    assert model.plan.items[1].subItems[0].extras == {"x-child": 1}
+
+
+def test_lazy_items_support_list_mutation_without_touching_source() -> None:
+    raw = [{"title": str(i), "status": "draft"} for i in range(4)]
+    model = VBriefDocument.from_dict({"plan": {"title": "P", "status": "draft", "items": raw}}, lazy=True)
+
+    items = model.plan.items
+    items.append(PlanItem("new", "pending"))
+    del items[0]
+    items[1] = PlanItem("swapped", "running")
+    items.insert(0, PlanItem("first", "draft"))
+
+    assert [item.title for item in items] == ["first", "1", "swapped", "3", "new"]
+    assert [entry["title"] for entry in model.to_dict()["plan"]["items"]] == ["first", "1", "swapped", "3", "new"]
+    assert [entry["title"] for entry in raw] == ["0", "1", "2", "3"]
+
+
+def test_lazy_from_file_matches_eager_output(tmp_path) -> None:
+    path = tmp_path / "plan.vbrief.json"
+    document = {
+        "vBRIEFInfo": {"version": "0.5"},
+        "plan": {
+            "title": "P",
+            "status": "running",
+            "items": [{"title": "A", "status": "pending", "subItems": [{"title": "B", "status": "draft"}]}],
+        },
+    }
+    VBriefDocument.from_dict(document).to_file(path)
+
+    lazy = VBriefDocument.from_file(path, lazy=True)
+
+    assert lazy.to_json() == VBriefDocument.from_file(path).to_json()
+    assert lazy.plan.items.built_count == 0
+
+
+def _tracked_document() -> VBriefDocument:
+    return VBriefDocument.from_dict(
+        {
+            "vBRIEFInfo": {"version": "0.5"},
+            "plan": {
+                "title": "P",
+                "status": "running",
+                "items": [
+                    {"id": "a", "title": "A", "status": "pending", "subItems": [{"title": "a1", "status": "draft"}]},
+                    {"id": "b", "title": "B", "status": "pending"},
+                ],
+            },
+        }
+    )
+
+
+def test_to_dict_reuses_unchanged_subtrees_after_an_edit() -> None:
+    model = _tracked_document()
+    before = model._shared_dict()
+    untouched = before["plan"]["items"][1]
+
+    model.plan.items[0].subItems[0].status = "completed"
+    after = model._shared_dict()
+
+    assert after["plan"]["items"][0]["subItems"][0]["status"] == "completed"
+    assert after["plan"]["items"][1] is untouched
+    assert after == VBriefDocument.from_dict(after).to_dict()
+
+
+def test_list_and_extras_edits_invalidate_cached_dicts() -> None:
+    model = _tracked_document()
+    model.to_dict()
+    model.plan.items.append(PlanItem("C", "draft"))
+    model.to_dict()
+    model.plan.items[2].subItems.append(PlanItem("c1", "draft"))
+    model.to_dict()
+    model.plan.items[1].extras["x-note"] = "hi"
+    model.to_dict()
+    del model.plan.items[0]
+
+    items = model.to_dict()["plan"]["items"]
+    assert [entry["title"] for entry in items] == ["B", "C"]
+    assert items[0]["x-note"] == "hi"
+    assert items[1]["subItems"] == [{"title": "c1", "status": "draft"}]
+
+    replacement = [PlanItem("only", "draft")]
+    model.plan.items = replacement
+    model.to_dict()
+    replacement[0].title = "renamed"
+    replacement.append(PlanItem("plain", "draft"))
+    assert [entry["title"] for entry in model.to_dict()["plan"]["items"]] == ["renamed", "plain"]
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_edits_below_assigned_lists_reach_the_output(lazy: bool) -> None:
+    model = VBriefDocument.from_dict(_tracked_document().to_dict(), lazy=lazy)
+    child = PlanItem("child", "pending")
+    model.plan.items[0].subItems = [child]
+    model.to_json()
+    child.status = "completed"
+    assert model.to_dict()["plan"]["items"][0]["subItems"] == [{"title": "child", "status": "completed"}]
+
+    grandchild = PlanItem("grandchild", "pending")
+    model.plan.items.append(PlanItem("C", "draft", subItems=[grandchild]))
+    model.to_json()
+    grandchild.title = "renamed"
+    assert model.to_dict()["plan"]["items"][2]["subItems"][0]["title"] == "renamed"
+
+
+def test_to_dict_results_can_be_modified() -> None:
+    model = _tracked_document()
+    item = model.plan.items[0]
+
+    out = item.to_dict()
+    out["title"] = "mutated"
+    out["subItems"][0]["status"] = "mutated"
+    out["subItems"].append({})
+    model.to_dict()["plan"]["items"].clear()
+
+    assert item.to_dict() == {"id": "a", "title": "A", "status": "pending", "subItems": [{"title": "a1", "status": "draft"}]}
+    assert len(model.to_dict()["plan"]["items"]) == 2
+
+
+def test_lazy_documents_track_edits_on_built_items() -> None:
+    source = _tracked_document().to_dict()
+    model = VBriefDocument.from_dict(source, lazy=True)
+    model.to_dict()
+
+    model.plan.items[0].subItems[0].title = "edited"
+
+    assert model.to_dict()["plan"]["items"][0]["subItems"][0]["title"] == "edited"
+    assert source["plan"]["items"][0]["subItems"][0]["title"] == "a1"
+
+
+def test_copies_detach_from_the_parent_tree() -> None:
+    model = _tracked_document()
+    item = model.plan.items[0]
+
+    clone = copy.deepcopy(item)
+    model.to_dict()
+    clone.title = "clone"
+
+    assert clone._parent is None
+    assert clone.to_dict() == {**item.to_dict(), "title": "clone"}
+    assert model.to_dict()["plan"]["items"][0]["title"] == "A"
+
+
+def test_forks_share_untouched_items_and_keep_edits_apart() -> None:
+    model = _tracked_document()
+    shared = model._shared_dict()["plan"]["items"][1]
+
+    fork = model.fork(reason="try another order")
+    fork.plan.items[0].subItems[0].status = "completed"
+    model.plan.items[0].title = "renamed"
+    second = fork.fork()
+    second.plan.items.append(PlanItem("extra", "draft"))
+
+    assert model.plan.items[0].subItems[0].status != "completed"
+    assert fork.plan.items[0].title == "A"
+    assert fork.to_dict()["plan"]["items"][0]["subItems"][0]["status"] == "completed"
+    assert fork.plan.items.built_count == 1
+    assert fork._shared_dict()["plan"]["items"][1] is shared
+    assert second._shared_dict()["plan"]["items"][1] is shared
+    assert [item.title for item in second.plan.items] == ["A", "B", "extra"]
+    assert len(fork.plan.items) == 2
+
+
+def test_fork_metadata() -> None:
+    model = _tracked_document()
+    model.plan.sequence = 4
+
+    fork = model.fork(reason="explore")
+
+    assert model.plan.uid is not None and fork.plan.uid not in (None, model.plan.uid)
+    assert fork.plan.fork["parentUid"] == model.plan.uid
+    assert fork.plan.fork["parentSequence"] == 4 and fork.plan.fork["forkReason"] == "explore"
+    assert fork.plan.fork["forkedAt"].endswith("Z") and fork.plan.fork["mergeStatus"] == "unmerged"
+    assert fork.validate().is_valid and model.fork().plan.fork["parentUid"] == model.plan.uid
+    fork.vbrief_info["x-note"] = "fork only"
+    assert "x-note" not in model.vbrief_info
+
+
+def test_content_hash_is_a_cached_merkle_hash() -> None:
+    model = _tracked_document()
+    data = model.to_dict()
+    reordered = {"plan": dict(reversed(list(data["plan"].items()))), "vBRIEFInfo": data["vBRIEFInfo"]}
+    lazy = VBriefDocument.from_dict(reordered, lazy=True)
+
+    root = model.content_hash()
+    first, second = (item.content_hash() for item in model.plan.items)
+
+    assert len(root) == 64 and lazy.content_hash() == root
+    assert lazy.plan.items[1].content_hash() == second and lazy.plan.items.built_count == 1
+    cached = model.plan.items[1]._cached[2]
+    model.plan.items[0].subItems[0].status = "completed"
+    assert model.content_hash() != root and model.plan.items[0].content_hash() != first
+    assert model.plan.items[1]._cached[2] is cached
+    model.plan.items[0].subItems[0].status = "draft"
+    assert model.content_hash() == root
+    model.vbrief_info["author"] = "me"
+    assert model.content_hash() != root
+
+
+def test_content_hash_follows_reassigned_field_values() -> None:
+    model = _tracked_document()
+    item = model.plan.items[1]
+    item.tags = ["x"]
+    root, before = model.content_hash(), item.content_hash()
+
+    item.tags.append("z")
+    item.tags = item.tags
+
+    assert item.content_hash() != before and model.content_hash() != root
+    assert item.content_hash() == PlanItem.from_dict(item.to_dict()).content_hash()
+    item.tags = ["x"]
+    assert model.content_hash() == root
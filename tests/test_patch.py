@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import copy
+import random
+
+import pytest
+
+from libvbrief import PatchError, PlanItem, ValidationError, VBriefDocument
+from libvbrief.validation import validate_document
+
+
+def _data() -> dict:
+    return {
+        "vBRIEFInfo": {"version": "0.5"},
+        "plan": {
+            "title": "P",
+            "status": "running",
+            "items": [
+                {"id": "a", "title": "A", "status": "pending", "tags": ["x"]},
+                {
+                    "id": "b",
+                    "title": "B",
+                    "status": "running",
+                    "subItems": [
+                        {"id": "b1", "title": "B1", "status": "pending"},
+                        {"id": "b2", "title": "B2", "status": "blocked", "metadata": {"owner": "kim"}},
+                    ],
+                },
+                {"id": "c", "title": "C", "status": "completed"},
+            ],
+        },
+    }
+
+
+def _pointer_tokens(pointer: str) -> list[str]:
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _reference(data: dict, operations: list[dict]) -> dict:
+    # Straightforward RFC 6902 on plain dicts, to compare against.
+    data = copy.deepcopy(data)
+
+    def walk(tokens):
+        node = data
+        for token in tokens[:-1]:
+            node = node[int(token)] if isinstance(node, list) else node[token]
+        return node, tokens[-1]
+
+    def get(pointer):
+        node, key = walk(_pointer_tokens(pointer))
+        return node[int(key)] if isinstance(node, list) else node[key]
+
+    def add(pointer, value):
+        node, key = walk(_pointer_tokens(pointer))
+        if isinstance(node, list):
+            node.insert(len(node) if key == "-" else int(key), value)
+        else:
+            node[key] = value
+
+    def remove(pointer):
+        node, key = walk(_pointer_tokens(pointer))
+        del node[int(key) if isinstance(node, list) else key]
+
+    for operation in operations:
+        op, path = operation["op"], operation["path"]
+        if op == "add":
+            add(path, copy.deepcopy(operation["value"]))
+        elif op == "remove":
+            remove(path)
+        elif op == "replace":
+            remove(path)
+            add(path, copy.deepcopy(operation["value"]))
+        elif op == "move":
+            value = get(operation["from"])
+            remove(operation["from"])
+            add(path, value)
+        elif op == "copy":
+            add(path, copy.deepcopy(get(operation["from"])))
+    return data
+
+
+def test_operations_edit_the_models() -> None:
+    doc = VBriefDocument.from_dict(_data())
+    index = doc.index
+    operations = [
+        {"op": "test", "path": "/plan/items/1/subItems/1/metadata/owner", "value": "kim"},
+        {"op": "replace", "path": "/plan/items/0/status", "value": "running"},
+        {"op": "add", "path": "/plan/items/0/tags/-", "value": "y"},
+        {"op": "add", "path": "/plan/items/1/subItems/0", "value": {"id": "b0", "title": "B0", "status": "draft"}},
+        {"op": "move", "from": "/plan/items/2", "path": "/plan/items/1/subItems/-"},
+        {"op": "copy", "from": "/plan/items/0/tags", "path": "/plan/tags"},
+        {"op": "remove", "path": "/plan/items/1/subItems/2/metadata/owner"},
+        {"op": "add", "path": "/plan/items/0/x-note", "value": {"a/b": 1}},
+        {"op": "replace", "path": "/plan/items/0/x-note/a~1b", "value": 2},
+        {"op": "add", "path": "/x-top", "value": True},
+    ]
+    moved = doc.plan.items[2]
+
+    report = doc.apply_patch(operations)
+
+    expected = _reference(_data(), operations)
+    expected["plan"]["sequence"] = 1
+    assert report.is_valid
+    assert doc.to_dict() == expected
+    assert doc.plan.items[1].subItems[-1] is moved
+    assert index.by_path("b.c") is moved and index.by_id("b0").title == "B0"
+    assert doc.plan.items[0].tags == ["x", "y"] and doc.plan.tags == ["x", "y"]
+    assert doc.plan.tags is not doc.plan.items[0].tags
+
+
+def test_failed_patches_leave_the_document_unchanged() -> None:
+    doc = VBriefDocument.from_dict(_data())
+    before = copy.deepcopy(doc.to_dict())
+    first = doc.plan.items[0]
+    failures = [
+        [{"op": "remove", "path": "/plan/items/0"}, {"op": "test", "path": "/plan/items/0/id", "value": "a"}],
+        [{"op": "replace", "path": "/plan/items/1/title", "value": "X"}, {"op": "remove", "path": "/plan/items/1/title"}],
+        [{"op": "add", "path": "/plan/items/-", "value": {"title": "N", "status": "draft"}}, {"op": "add", "path": "/plan/items/9", "value": {}}],
+        [{"op": "move", "from": "/plan/items/1", "path": "/plan/items/1/subItems/0"}],
+        [{"op": "add", "path": "/plan/items/0/tags/01", "value": "z"}],
+        [{"op": "add", "path": "/plan/items/0", "value": "not an item"}],
+        [{"op": "frobnicate", "path": "/plan"}],
+        [{"op": "remove", "path": "/plan/items/0/narrative"}],
+        [{"op": "add", "path": "/plan/items/0/x-flag", "value": True}, {"op": "test", "path": "/plan/items/0/x-flag", "value": 1}],
+    ]
+
+    for operations in failures:
+        with pytest.raises(PatchError, match=r"^Operation \d"):
+            doc.apply_patch(operations)
+        assert doc.to_dict() == before
+    assert doc.plan.items[0] is first
+    assert doc.index.by_id("a") is first
+
+
+def test_only_touched_paths_are_revalidated() -> None:
+    data = _data()
+    data["plan"]["items"][2]["status"] = "bogus"
+    doc = VBriefDocument.from_dict(data)
+
+    report = doc.apply_patch(
+        [
+            {"op": "replace", "path": "/plan/items/1/subItems/0/status", "value": "done"},
+            {"op": "add", "path": "/plan/items/0", "value": {"id": "bad id", "title": "N", "status": "draft", "subItems": [{"title": "S", "status": "?"}]}},
+            {"op": "replace", "path": "/vBRIEFInfo/version", "value": "0.4"},
+        ]
+    )
+
+    full = validate_document(doc)
+    assert [(issue.code, issue.path) for issue in report.errors] == [
+        ("invalid_version", "vBRIEFInfo.version"),
+        ("invalid_id_format", "plan.items[0].id"),
+        ("invalid_item_status", "plan.items[0].subItems[0].status"),
+        ("invalid_item_status", "plan.items[2].subItems[0].status"),
+    ]
+    assert set(report.errors) < set(full.errors)
+    assert [issue.path for issue in set(full.errors) - set(report.errors)] == ["plan.items[3].status"]
+
+
+def test_strict_patches_roll_back_on_new_errors() -> None:
+    doc = VBriefDocument.from_dict(_data())
+    before = copy.deepcopy(doc.to_dict())
+
+    with pytest.raises(ValidationError):
+        doc.apply_patch([{"op": "replace", "path": "/plan/status", "value": "unknown"}], strict=True)
+    assert doc.to_dict() == before
+    assert doc.plan.sequence is None
+
+
+def test_revalidation_is_part_of_the_patch(monkeypatch) -> None:
+    doc = VBriefDocument.from_dict(_data())
+    before = copy.deepcopy(doc.to_dict())
+    operations = [{"op": "replace", "path": "/plan/status", "value": {"a": 1}}]
+
+    with pytest.raises(ValidationError):
+        doc.apply_patch(operations, strict=True)
+    assert doc.to_dict() == before
+
+    def broken(*args, **kwargs):
+        raise TypeError("unhashable type: 'dict'")
+
+    monkeypatch.setattr("libvbrief.patch._validate_plan_fields", broken)
+    with pytest.raises(TypeError):
+        doc.apply_patch(operations)
+    assert doc.to_dict() == before
+    assert doc.plan.sequence is None
+
+def test_sequence_and_change_log() -> None:
+    data = _data()
+    data["plan"]["changeLog"] = []
+    doc = VBriefDocument.from_dict(data)
+    agent = {"id": "bot-1", "type": "aiAgent"}
+
+    doc.apply_patch([{"op": "replace", "path": "/plan/items/0/status", "value": "completed"}])
+    doc.apply_patch([{"op": "remove", "path": "/plan/items/2"}], agent=agent, reason="obsolete")
+
+    assert doc.plan.sequence == 2
+    [entry] = doc.plan.changeLog
+    assert entry["sequence"] == 2 and entry["agent"] == agent and entry["operation"] == "update" and entry["reason"] == "obsolete"
+    assert entry["timestamp"].endswith("Z")
+    assert data["plan"]["changeLog"] == []
+    assert validate_document(doc).is_valid
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_random_patches_match_a_dict_reference(lazy: bool) -> None:
+    rng = random.Random(7)
+    data = _data()
+    doc = VBriefDocument.from_dict(copy.deepcopy(data), lazy=lazy)
+
+    def item_pointers(items, prefix):
+        for position, item in enumerate(items):
+            pointer = f"{prefix}/{position}"
+            yield pointer
+            yield from item_pointers(item.get("subItems", []), f"{pointer}/subItems")
+
+    for step in range(150):
+        pointers = list(item_pointers(data["plan"]["items"], "/plan/items"))
+        target = rng.choice(pointers) if pointers else None
+        choice = rng.randrange(5) if target else 1
+        if choice == 0:
+            operation = {"op": "replace", "path": f"{target}/status", "value": rng.choice(["pending", "done", "blocked"])}
+        elif choice == 1:
+            parent = rng.choice(["/plan/items"] + [f"{pointer}/subItems" for pointer in pointers if _has(data, f"{pointer}/subItems")])
+            operation = {"op": "add", "path": f"{parent}/-", "value": {"id": f"n{step}", "title": "N", "status": "draft"}}
+        elif choice == 2:
+            operation = {"op": "remove", "path": target}
+        elif choice == 3:
+            operation = {"op": "add", "path": f"{target}/tags", "value": [f"t{step}"]}
+        else:
+            operation = {"op": "move", "from": target, "path": "/plan/items/0" if not target.startswith("/plan/items/0") else "/plan/items/-"}
+        data = _without_empty_sub_items(_reference(data, [operation]))
+        report = doc.apply_patch([operation])
+        assert doc.to_dict() == {**data, "plan": {**data["plan"], "sequence": step + 1}}
+        assert set(report.errors) <= set(validate_document(doc).errors)
+
+
+def _without_empty_sub_items(data: dict) -> dict:
+    # The models leave out an empty subItems list when serializing.
+    stack = list(data["plan"]["items"])
+    while stack:
+        item = stack.pop()
+        if item.get("subItems") == []:
+            del item["subItems"]
+        stack.extend(item.get("subItems", []))
+    return data
+
+
+def _has(data: dict, pointer: str) -> bool:
+    node = data
+    for token in _pointer_tokens(pointer):
+        try:
+            node = node[int(token)] if isinstance(node, list) else node[token]
+        except (KeyError, IndexError):
+            return False
+    return True
+
+
+def test_patching_plain_item_lists() -> None:
+    doc = VBriefDocument.from_dict(_data())
+    doc.plan.items[0].subItems = [PlanItem(title="plain", status="pending")]
+
+    report = doc.apply_patch([{"op": "replace", "path": "/plan/items/0/subItems/0/status", "value": "bad"}])
+
+    assert [issue.path for issue in report.errors] == ["plan.items[0].subItems[0].status"]
+    assert doc.index.by_path("a") is doc.plan.items[0]
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from libvbrief import PlanItem, VBriefDocument
+from libvbrief.query import F, All, PlanQuery, date_key
+from libvbrief.traversal import walk_items
+
+STATUSES = ["pending", "running", "blocked"]
+TAGS = ["backend", "frontend", "ops"]
+
+
+def _item(rng: random.Random, name: str, depth: int = 0) -> dict:
+    item = {
+        "id": name,
+        "title": name,
+        "status": rng.choice(STATUSES),
+        "priority": rng.choice(["low", "high", None]),
+        "tags": rng.sample(TAGS, rng.randrange(3)),
+        "dueDate": rng.choice([None, f"2026-10-{rng.randrange(10, 28)}T10:00:00Z", f"2026-10-{rng.randrange(10, 28)}T01:00:00+02:00"]),
+        "participants": [{"id": rng.choice(["alice", "bob"]), "role": "assignee"}],
+        "metadata": rng.choice([{}, {"team": "core"}]),
+    }
+    if depth < 2 and rng.random() < 0.3:
+        item["subItems"] = [_item(rng, f"{name}.{index}", depth + 1) for index in range(2)]
+    return {key: value for key, value in item.items() if value is not None}
+
+
+def _document(seed: int = 1, count: int = 200) -> VBriefDocument:
+    rng = random.Random(seed)
+    items = [_item(rng, f"t{index}") for index in range(count)]
+    return VBriefDocument.from_dict({"vBRIEFInfo": {"version": "0.5"}, "plan": {"title": "P", "status": "running", "items": items}})
+
+
+def _scan(doc: VBriefDocument, *conditions) -> list[PlanItem]:
+    condition = All(conditions)
+    children = lambda item: item._subItems  # noqa: E731
+    return [item for _, item, _ in walk_items(doc.plan.items, path=None, children=children) if condition.matches(item)]
+
+
+def _same(left: list[PlanItem], right: list[PlanItem]) -> bool:
+    return len(left) == len(right) and all(a is b for a, b in zip(left, right))
+
+
+QUERIES = [
+    (F.status == "blocked", F.priority == "high", F.tags.contains("backend")),
+    (F.dueDate.between("2026-10-12", "2026-10-18T23:59:59Z"), F.participants.contains("alice")),
+    ((F.status == "blocked") | F.tags.contains("ops"), F.metadata.contains("team")),
+    (F.title == "t7",),
+]
+
+
+def test_select_matches_a_full_scan() -> None:
+    doc = _document()
+    query = PlanQuery(doc)
+
+    for conditions in QUERIES:
+        assert _same(query.select(*conditions), _scan(doc, *conditions))
+
+
+def test_planner_starts_from_the_most_selective_index() -> None:
+    doc = _document()
+    query = PlanQuery(doc)
+    blocked = len(_scan(doc, F.status == "blocked"))
+    alice = len(_scan(doc, F.participants.contains("alice")))
+
+    assert query.explain(F.status == "blocked", F.participants.contains("nobody")).startswith("index F.participants.contains('nobody') (~0 ")
+    assert query.explain(F.status == "blocked", F.participants.contains("alice")).startswith(
+        "index F.status == 'blocked'" if blocked < alice else "index F.participants.contains('alice')"
+    )
+    assert query.explain(F.title == "t7").startswith("scan ")
+    assert query.explain((F.status == "blocked") | F.title.contains("x")).startswith("scan ")
+
+
+def test_dates_are_compared_as_instants() -> None:
+    doc = VBriefDocument.from_dict(
+        {
+            "vBRIEFInfo": {"version": "0.5"},
+            "plan": {
+                "title": "P",
+                "status": "running",
+                "items": [
+                    {"title": "late", "status": "pending", "dueDate": "2026-10-12T09:30:00Z"},
+                    {"title": "early", "status": "pending", "dueDate": "2026-10-12T10:00:00+02:00"},
+                    {"title": "none", "status": "pending"},
+                ],
+            },
+        }
+    )
+    query = PlanQuery(doc)
+
+    assert [item.title for item in query.select(order_by="dueDate")] == ["early", "late", "none"]
+    assert [item.title for item in query.select(order_by="dueDate", descending=True)] == ["late", "early", "none"]
+    assert [item.title for item in query.select(F.dueDate < "2026-10-12T09:00:00Z")] == ["early"]
+    assert [item.title for item in query.select(order_by="dueDate", limit=1)] == ["early"]
+    assert date_key("2026-10-12T09:30:00Z") == date_key("2026-10-12t09:30:00z") == date_key("2026-10-12T11:30:00+02:00")
+    with pytest.raises(ValueError):
+        F.dueDate >= "next week"
+
+
+def test_ordered_limit_agrees_with_full_sort() -> None:
+    doc = _document(seed=3)
+    query = PlanQuery(doc)
+
+    for conditions in [(), (F.status == "running",), (F.title == "t3",)]:
+        everything = query.select(*conditions, order_by="dueDate")
+        for limit in (1, 5, 50, 1000):
+            assert _same(query.select(*conditions, order_by="dueDate", limit=limit), everything[:limit])
+
+
+def test_ties_in_order_by_keep_document_order() -> None:
+    doc = _document(seed=7)
+    query = PlanQuery(doc)
+    # Index insertion order no longer follows the document.
+    doc.plan.items.insert(0, PlanItem(title="new", status="blocked", priority="high", tags=["backend"]))
+    doc.plan.items[9].status = "blocked"
+
+    for conditions in QUERIES:
+        scanned = _scan(doc, *conditions)
+        missing = [item for item in scanned if item.priority is None]
+        for descending in (False, True):
+            present = sorted((item for item in scanned if item.priority is not None), key=lambda item: item.priority, reverse=descending)
+            assert _same(query.select(*conditions, order_by="priority", descending=descending), present + missing)
+
+def test_indexes_follow_mutations() -> None:
+    doc = _document(seed=5)
+    query = PlanQuery(doc)
+    rng = random.Random(9)
+
+    for step in range(120):
+        target = rng.choice(doc.index.items())
+        action = rng.randrange(5)
+        if action == 0:
+            target.status = rng.choice(STATUSES)
+        elif action == 1:
+            target.tags = rng.sample(TAGS, 2)
+        elif action == 2:
+            target.dueDate = f"2026-10-{rng.randrange(10, 28)}T00:00:00Z"
+        elif action == 3:
+            target.subItems.append(PlanItem(title=f"n{step}", status="blocked", priority="high", tags=["backend"]))
+        else:
+            entry = doc.index.entry(target)
+            siblings = entry.parent.subItems if isinstance(entry.parent, PlanItem) else entry.parent.items
+            del siblings[entry.position]
+        for conditions in QUERIES:
+            assert _same(query.select(*conditions), _scan(doc, *conditions))
+
+
+def test_unknown_fields_are_rejected() -> None:
+    with pytest.raises(AttributeError):
+        F.colour
+    with pytest.raises(ValueError):
+        PlanQuery(_document(count=3)).select(order_by="colour")
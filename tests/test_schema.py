@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from libvbrief import validate
+from libvbrief.schema import CORE_SCHEMA_ID, compile_schema, core_schema, load_core_schema
+
+ROOT = Path(__file__).resolve().parent.parent
+EXAMPLES = sorted((ROOT / "examples").glob("*.json"))
+
+
+def _document(**item: object) -> dict:
+    return {
+        "vBRIEFInfo": {"version": "0.5"},
+        "plan": {"title": "P", "status": "running", "items": [{"title": "T", "status": "pending", **item}]},
+    }
+
+
+def test_bundled_core_schema_matches_the_published_one() -> None:
+    published = json.loads((ROOT / "schemas" / "vbrief-core.schema.json").read_text(encoding="utf-8"))
+
+    assert load_core_schema() == published
+
+
+@pytest.mark.parametrize("path", EXAMPLES, ids=lambda path: path.name)
+def test_core_schema_agrees_with_jsonschema_on_examples(path: Path) -> None:
+    jsonschema = pytest.importorskip("jsonschema")
+    document = json.loads(path.read_text(encoding="utf-8"))
+
+    expected = []
+    for error in jsonschema.Draft202012Validator(load_core_schema()).iter_errors(document):
+        keys = list(error.absolute_path)
+        if error.validator == "required":
+            keys.append(error.message.split("'")[1])
+        expected.append("".join(f"[{key}]" if isinstance(key, int) else f".{key}" for key in keys).lstrip(".") or "$")
+
+    assert sorted(issue.path for issue in core_schema().validate(document).errors) == sorted(expected)
+
+
+def test_core_schema_reports_structured_issues() -> None:
+    document = _document(priority="urgent", sequence=-1, location={"geo": [1]}, uris=[{"title": 3}])
+    document["plan"]["items"][0]["subItems"] = [{"title": "", "status": "pending", "tags": ["a", 1]}]
+
+    report = validate(document, schema=True)
+
+    assert {issue.code for issue in report.errors} == {"schema_violation"}
+    assert [(issue.path, issue.message) for issue in report.errors] == [
+        ("plan.items[0].priority", "'urgent' is not one of ['low', 'medium', 'high', 'critical']"),
+        ("plan.items[0].sequence", "-1 is less than the minimum of 0"),
+        ("plan.items[0].location.geo", "Expected at least 2 items"),
+        ("plan.items[0].uris[0].uri", "'uri' is a required property"),
+        ("plan.items[0].uris[0].title", "3 is not of type 'string'"),
+        ("plan.items[0].subItems[0].title", "'' is too short"),
+        ("plan.items[0].subItems[0].tags[1]", "1 is not of type 'string'"),
+    ]
+    assert validate(document).is_valid
+    assert len(validate(document, schema=True, max_errors=2).errors) == 2
+
+
+def test_schema_issues_follow_the_rule_issues() -> None:
+    document = _document(status="bogus")
+
+    report = validate(document, schema=True)
+
+    assert [issue.code for issue in report.errors] == ["invalid_item_status", "schema_violation"]
+
+
+def test_extension_schemas_reference_the_core_schema_and_are_cached() -> None:
+    extension = {
+        "$id": "https://example.com/schemas/owned.json",
+        "allOf": [{"$ref": CORE_SCHEMA_ID}],
+        "properties": {
+            "plan": {"properties": {"items": {"items": {"$ref": "#/$defs/OwnedItem"}}}},
+        },
+        "$defs": {
+            "OwnedItem": {
+                "allOf": [{"$ref": f"{CORE_SCHEMA_ID}#/$defs/PlanItem"}],
+                "required": ["x-owner"],
+                "properties": {"x-owner": {"type": "string", "minLength": 1}},
+            },
+        },
+    }
+
+    report = validate(_document(priority="urgent"), schema=extension)
+
+    assert [issue.path for issue in report.errors] == ["plan.items[0].priority", "plan.items[0].x-owner", "plan.items[0].priority"]
+    assert compile_schema(extension) is compile_schema(json.loads(json.dumps(extension)))
+    assert compile_schema(extension).is_valid(_document(**{"x-owner": "ada"}))
+
+
+def test_keywords_follow_json_semantics() -> None:
+    schema = compile_schema(
+        {
+            "type": "array",
+            "prefixItems": [{"const": 1}],
+            "items": {"enum": [None, [1, 2], {"a": True}]},
+            "uniqueItems": True,
+        }
+    )
+
+    assert schema.is_valid([1.0, None, [1, 2]])
+    assert not schema.is_valid([True])
+    assert not schema.is_valid([1, {"a": 1}])
+    assert not schema.is_valid([1, None, None])
+    assert compile_schema({"oneOf": [{"type": "integer"}, {"type": "number"}]}).validate(2.5).is_valid
+    assert not compile_schema({"oneOf": [{"type": "integer"}, {"type": "number"}]}).is_valid(2)
+    assert not compile_schema({"not": {"type": "string"}}).is_valid("x")
+    assert not compile_schema({"additionalProperties": False, "patternProperties": {"^x-": {}}}).is_valid({"y": 1})
+    with pytest.raises(ValueError):
+        compile_schema({"if": {"type": "string"}})
+    with pytest.raises(ValueError):
+        compile_schema({"$ref": "other.json#/$defs/X"})
+
+
+def test_deeply_nested_items_do_not_recurse() -> None:
+    document = _document()
+    item = document["plan"]["items"][0]
+    for _ in range(5_000):
+        item["subItems"] = [{"title": "T", "status": "pending"}]
+        item = item["subItems"][0]
+    item["status"] = "bogus"
+
+    issues = core_schema().validate(document).errors
+
+    assert len(issues) == 1 and issues[0].path.endswith(".subItems[0].status")
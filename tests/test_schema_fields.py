@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from libvbrief import Plan, PlanItem, VBriefDocument
+from libvbrief.compat import (
+    PLAN_FIELD_ORDER,
+    PLAN_ITEM_FIELD_ORDER,
+    PLAN_ITEM_REQUIRED_FIELDS,
+    PLAN_REQUIRED_FIELDS,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+SCHEMA = json.loads((ROOT / "schemas" / "vbrief-core.schema.json").read_text(encoding="utf-8"))
+EXAMPLES = sorted((ROOT / "examples").glob("*.vbrief.json"))
+
+
+@pytest.mark.parametrize(
+    ("definition", "fields", "required", "model"),
+    [
+        ("PlanItem", PLAN_ITEM_FIELD_ORDER, PLAN_ITEM_REQUIRED_FIELDS, PlanItem),
+        ("Plan", PLAN_FIELD_ORDER, PLAN_REQUIRED_FIELDS, Plan),
+    ],
+)
+def test_field_lists_match_the_core_schema(definition, fields, required, model) -> None:
+    schema = SCHEMA["$defs"][definition]
+
+    assert fields == list(schema["properties"])
+    assert list(required) == schema["required"]
+    assert set(model._FIELDS) == set(fields) | {"extras"}
+
+
+@pytest.mark.parametrize("path", EXAMPLES, ids=lambda path: path.name)
+def test_generated_paths_round_trip_examples(path: Path) -> None:
+    data = json.loads(path.read_text(encoding="utf-8"))
+
+    rendered = VBriefDocument.from_dict(data).to_dict(preserve_order=True)
+
+    assert json.dumps(rendered) == json.dumps(data)
+
+
+def test_subclasses_load_through_their_own_init() -> None:
+    class TaggedItem(PlanItem):
+        __slots__ = ("source",)
+
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            self.source = "loaded"
+
+    item = TaggedItem.from_dict({"title": "T", "status": "draft", "x-a": 1, "subItems": [{"title": "c", "status": "draft"}]})
+
+    assert type(item) is TaggedItem and type(item.subItems[0]) is TaggedItem
+    assert item.source == "loaded"
+    assert item.to_dict(preserve_order=True) == {
+        "title": "T",
+        "status": "draft",
+        "x-a": 1,
+        "subItems": [{"title": "c", "status": "draft"}],
+    }
+    assert list(item.to_dict(preserve_order=True)) == ["title", "status", "x-a", "subItems"]
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from libvbrief import dump_file
+from libvbrief.stream import iter_items
+
+DOC = {
+    "vBRIEFInfo": {"version": "0.5", "author": "stream"},
+    "plan": {
+        "title": "Stream",
+        "status": "running",
+        "narratives": {"Proposal": "skip me"},
+        "items": [
+            {
+                "id": "a",
+                "title": "A",
+                "status": "pending",
+                "subItems": [
+                    {"id": "a.1", "title": "A1", "status": "pending", "subItems": [{"title": "deep", "status": "draft"}]},
+                    "not-an-item",
+                    {"id": "a.3", "title": "A3", "status": "blocked"},
+                ],
+            },
+            {"id": "b", "title": "B é \"quoted\"", "status": "completed", "percentComplete": 12.5},
+        ],
+    },
+}
+
+
+@pytest.fixture(params=[True, False], ids=["canonical", "preserve"])
+def doc_path(request, tmp_path):
+    path = tmp_path / "doc.vbrief.json"
+    dump_file(DOC, path, canonical=request.param, preserve_format=not request.param)
+    return path
+
+
+@pytest.mark.parametrize("chunk_size", [3, 1 << 16])
+def test_iter_items_yields_top_level_items_and_info(doc_path, chunk_size: int) -> None:
+    stream = iter_items(doc_path, chunk_size=chunk_size)
+
+    first = next(stream)
+    assert stream.info == DOC["vBRIEFInfo"]
+    rest = list(stream)
+
+    assert [(s.path, s.item) for s in [first, *rest]] == [
+        ("plan.items[0]", DOC["plan"]["items"][0]),
+        ("plan.items[1]", DOC["plan"]["items"][1]),
+    ]
+
+
+def test_iter_items_flattens_subitems_with_validation_paths(doc_path) -> None:
+    one_level = [s.path for s in iter_items(doc_path, depth=1)]
+    all_levels = [(s.path, s.depth) for s in iter_items(doc_path, depth=None)]
+
+    assert one_level == [
+        "plan.items[0]",
+        "plan.items[0].subItems[0]",
+        "plan.items[0].subItems[2]",
+        "plan.items[1]",
+    ]
+    assert ("plan.items[0].subItems[0].subItems[0]", 2) in all_levels
+
+
+def test_iter_items_reports_errors_with_file_offsets(tmp_path) -> None:
+    path = tmp_path / "broken.vbrief.json"
+    path.write_text('{"plan": {"items": [{"title": "ok", "status": "pending"}, {"title": }]}}', encoding="utf-8")
+
+    stream = iter_items(path, chunk_size=4)
+    assert next(stream).item["title"] == "ok"
+    with pytest.raises(json.JSONDecodeError) as excinfo:
+        next(stream)
+    assert excinfo.value.pos == path.read_text(encoding="utf-8").index("}]}}")
+
+
+def test_iter_items_rejects_non_object_documents(tmp_path) -> None:
+    path = tmp_path / "list.json"
+    path.write_text("[1, 2]", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="must be an object"):
+        list(iter_items(path))
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import math
+import random
+
+import pytest
+
+from libvbrief import PlanItem, VBriefDocument
+from libvbrief.query import date_key
+from libvbrief.compat import VALID_STATUSES
+from libvbrief.table import CATEGORIES, NO_DATE, PlanTable, available_table_backends
+from libvbrief.traversal import walk_items
+
+BACKENDS = available_table_backends()
+
+
+def _item(rng: random.Random, name: str, depth: int = 0) -> dict:
+    item = {
+        "id": name,
+        "title": name,
+        "status": rng.choice(["pending", "running", "blocked", "completed"]),
+        "priority": rng.choice(["low", "high", None]),
+        "dueDate": rng.choice([None, f"2026-10-{rng.randrange(10, 28)}T10:00:00Z", f"2026-10-{rng.randrange(10, 28)}T01:00:00+02:00"]),
+        "percentComplete": rng.choice([None, 0, 25, 50.5, 100]),
+    }
+    if depth < 3 and rng.random() < 0.3:
+        item["subItems"] = [_item(rng, f"{name}.{index}", depth + 1) for index in range(3)]
+    return {key: value for key, value in item.items() if value is not None}
+
+
+def _document(seed: int = 1, count: int = 60) -> VBriefDocument:
+    rng = random.Random(seed)
+    items = [_item(rng, f"t{seed}-{index}") for index in range(count)]
+    return VBriefDocument.from_dict({"vBRIEFInfo": {"version": "0.5"}, "plan": {"title": "P", "status": "running", "items": items}})
+
+
+def _walk(doc: VBriefDocument) -> list[tuple[PlanItem, PlanItem | None, int]]:
+    depths: dict[int, int] = {}
+    rows = []
+    for _, item, owner in walk_items(doc.plan.items, path=None, parent=doc.plan, children=lambda item: item._subItems):
+        depth = depths.get(id(owner), -1) + 1
+        depths[id(item)] = depth
+        rows.append((item, owner if isinstance(owner, PlanItem) else None, depth))
+    return rows
+
+
+def _subtree(table: PlanTable, row: int) -> list[int]:
+    parent = list(table["parent"])
+    rows = [row]
+    for other in range(row + 1, len(table)):
+        ancestor = parent[other]
+        while ancestor > row:
+            ancestor = parent[ancestor]
+        if ancestor == row:
+            rows.append(other)
+    return rows
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_columns_round_trip_to_items(backend: str) -> None:
+    docs = [_document(seed=1), _document(seed=2)]
+    table = PlanTable(docs, backend=backend)
+    expected = [(number, *entry) for number, doc in enumerate(docs) for entry in _walk(doc)]
+
+    assert len(table) == len(expected)
+    for row, (number, item, parent, depth) in enumerate(expected):
+        assert table.items[row] is item
+        assert table.row(item) == row
+        assert table["document"][row] == number
+        assert table["depth"][row] == depth
+        assert table["parent"][row] == (-1 if parent is None else table.row(parent))
+        assert table["status"][row] == CATEGORIES["status"].index(item.status)
+        assert table["priority"][row] == (-1 if item.priority is None else ("low", "medium", "high", "critical").index(item.priority))
+        due = date_key(item.dueDate)
+        assert table["dueDate"][row] == (NO_DATE if due is None else int(due.timestamp()))
+        percent = table["percentComplete"][row]
+        assert math.isnan(percent) if item.percentComplete is None else percent == item.percentComplete
+    with pytest.raises(KeyError):
+        table.row(PlanItem(title="elsewhere", status="pending"))
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_where_matches_a_scan(backend: str) -> None:
+    docs = [_document(seed=3), _document(seed=4)]
+    table = PlanTable(docs, backend=backend)
+    low, high = date_key("2026-10-12T00:00:00Z"), date_key("2026-10-18T23:59:59Z")
+
+    def scan(test) -> list[PlanItem]:
+        return [item for number, doc in enumerate(docs) for item, _, depth in _walk(doc) if test(number, item, depth)]
+
+    cases = [
+        ({"status": "blocked"}, lambda number, item, depth: item.status == "blocked"),
+        ({"priority": [None, "low"], "depth": 0}, lambda number, item, depth: item.priority in (None, "low") and depth == 0),
+        (
+            {"dueDate": ("2026-10-12", "2026-10-18T23:59:59Z"), "document": 1},
+            lambda number, item, depth: number == 1 and item.dueDate is not None and low <= date_key(item.dueDate) <= high,
+        ),
+        (
+            {"percentComplete": (25, None), "status": ["running", "pending"]},
+            lambda number, item, depth: item.percentComplete is not None and item.percentComplete >= 25 and item.status in ("running", "pending"),
+        ),
+        ({}, lambda number, item, depth: True),
+    ]
+    for conditions, test in cases:
+        found = table.items_at(table.where(**conditions))
+        expected = scan(test)
+        assert len(found) == len(expected) and all(a is b for a, b in zip(found, expected))
+    with pytest.raises(ValueError):
+        table.where(status="done")
+    with pytest.raises(ValueError):
+        table.where(dueDate=("soon", None))
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_dates_with_the_utc_designator_are_read(backend: str) -> None:
+    items = [
+        {"title": "upper", "status": "pending", "dueDate": "2026-10-12T10:00:00Z"},
+        {"title": "lower", "status": "pending", "dueDate": "2026-10-12t10:00:00z"},
+        {"title": "offset", "status": "pending", "dueDate": "2026-10-12T12:00:00+02:00"},
+    ]
+    doc = VBriefDocument.from_dict({"vBRIEFInfo": {"version": "0.5"}, "plan": {"title": "P", "status": "running", "items": items}})
+    table = PlanTable(doc, backend=backend)
+
+    assert list(table["dueDate"]) == [1_791_799_200] * 3
+    assert len(table.where(dueDate=("2026-10-12T10:00:00Z", "2026-10-12T10:00:00Z"))) == 3
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_group_bys_and_rollups(backend: str) -> None:
+    table = PlanTable(_document(seed=5), backend=backend)
+    items = table.items
+    percent = [item.percentComplete for item in items]
+
+    counts = table.count_by("status")
+    assert counts == {status: sum(item.status == status for item in items) for status in counts}
+    assert set(counts) == VALID_STATUSES
+    priorities = table.count_by("priority", rows=table.where(depth=0))
+    assert priorities.get(None, 0) == sum(item.priority is None for item, row in zip(items, range(len(items))) if table["depth"][row] == 0)
+    assert table.count_by("depth") == {depth: list(table["depth"]).count(depth) for depth in set(table["depth"])}
+
+    means = table.aggregate_by("status", "percentComplete", "mean")
+    for status, mean in means.items():
+        values = [value for item, value in zip(items, percent) if item.status == status and value is not None]
+        assert mean == pytest.approx(sum(values) / len(values))
+    assert table.aggregate_by("priority", "percentComplete", "count") == {
+        label: sum(1 for item, value in zip(items, percent) if item.priority == label and value is not None)
+        for label in {item.priority for item, value in zip(items, percent) if value is not None}
+    }
+
+    for how in ("sum", "mean", "min", "max", "count"):
+        rolled = table.rollup("percentComplete", how)
+        for row in range(len(table)):
+            values = [float(percent[other]) for other in _subtree(table, row) if percent[other] is not None]
+            if how == "count":
+                assert rolled[row] == len(values)
+            elif not values:
+                assert math.isnan(rolled[row])
+            else:
+                expected = {"sum": sum(values), "mean": sum(values) / len(values), "min": min(values), "max": max(values)}[how]
+                assert rolled[row] == pytest.approx(expected)
+    with pytest.raises(ValueError):
+        table.rollup("percentComplete", "median")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_deep_chains_roll_up(backend: str) -> None:
+    depth = 2000
+    root = current = {"title": "0", "status": "pending", "percentComplete": 1}
+    for level in range(1, depth):
+        child = {"title": str(level), "status": "pending", "percentComplete": 1}
+        current["subItems"] = [child]
+        current = child
+    doc = VBriefDocument.from_dict({"vBRIEFInfo": {"version": "0.5"}, "plan": {"title": "P", "status": "running", "items": [root]}})
+    table = PlanTable(doc, backend=backend)
+
+    assert list(table.rollup("percentComplete", "sum")) == [float(depth - row) for row in range(depth)]
+    assert table["depth"][depth - 1] == depth - 1
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from libvbrief import dump_file, load_file
+from libvbrief.tape import INDEX_SUFFIX, load_lazy
+
+DOC = {
+    "vBRIEFInfo": {"version": "0.5"},
+    "plan": {
+        "title": "Tape",
+        "status": "running",
+        "narratives": {"Note": "brackets ] } in \"strings\" are not structure ["},
+        "items": [
+            {
+                "id": "a",
+                "title": "A",
+                "status": "pending",
+                "subItems": [
+                    {"id": "a.1", "title": "A1", "status": "pending", "subItems": [{"id": "a.1.1", "title": "x", "status": "draft"}]},
+                    7,
+                    {"id": "a.3", "title": "A3", "status": "blocked", "metadata": {"id": "not-an-item"}},
+                ],
+            },
+            "not-an-item",
+            {"id": "bé", "title": "B", "status": "completed", "tags": ["[x]", "{y}"]},
+        ],
+        "edges": [{"from": "a", "to": "bé", "type": "blocks"}],
+    },
+}
+
+
+@pytest.fixture(params=[True, False], ids=["canonical", "preserve"])
+def doc_path(request, tmp_path):
+    path = tmp_path / "doc.vbrief.json"
+    dump_file(DOC, path, canonical=request.param, preserve_format=not request.param)
+    return path
+
+
+def test_lazy_document_random_access_matches_full_load(doc_path) -> None:
+    full = load_file(doc_path)
+
+    with load_lazy(doc_path) as doc:
+        assert doc.info == full["vBRIEFInfo"]
+        assert len(doc.items) == 3
+        assert doc.items[2] == full["plan"]["items"][2]
+        assert doc.items[-2] == "not-an-item"
+        assert list(doc.items) == full["plan"]["items"]
+        assert list(doc.edges) == full["plan"]["edges"]
+
+
+def test_lazy_document_get_by_id_at_any_depth(doc_path) -> None:
+    with load_lazy(doc_path) as doc:
+        assert doc.get("a.1.1") == {"id": "a.1.1", "title": "x", "status": "draft"}
+        assert doc.path_of("a.1.1") == "plan.items[0].subItems[0].subItems[0]"
+        assert doc.path_of("a.3") == "plan.items[0].subItems[2]"
+        assert doc.path_of("bé") == "plan.items[2]"
+        assert doc.get("not-an-item") is None
+        assert list(doc.ids()) == ["a", "a.1", "a.1.1", "a.3", "bé"]
+
+
+def test_index_is_persisted_and_invalidated_by_size_and_mtime(doc_path) -> None:
+    index_path = doc_path.with_name(doc_path.name + INDEX_SUFFIX)
+    load_lazy(doc_path).close()
+    assert index_path.exists()
+
+    cached = index_path.read_bytes()
+    with load_lazy(doc_path) as doc:
+        assert doc.get("a.3")["status"] == "blocked"
+    assert index_path.read_bytes() == cached
+
+    dump_file({"plan": {"title": "T", "status": "draft", "items": [{"id": "z", "title": "Z", "status": "draft"}]}}, doc_path)
+    os.utime(doc_path, ns=(1, 1))
+    with load_lazy(doc_path) as doc:
+        assert list(doc.ids()) == ["z"]
+        assert doc.info is None
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["", "[]", '{"plan": {"items": [}]}', '{"plan": {}', '{"plan": {}} {}'],
+)
+def test_structural_pass_rejects_malformed_documents(tmp_path, text: str) -> None:
+    path = tmp_path / "bad.json"
+    path.write_text(text, encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        load_lazy(path, persist_index=False)
+
+
+def test_nested_subitems_keys_outside_the_item_level_are_not_children(tmp_path) -> None:
+    item = {
+        "id": "p",
+        "title": "P",
+        "status": "pending",
+        "metadata": {"subItems": [{"id": "decoy", "title": "D", "status": "draft"}]},
+        "subItems": [{"id": "child", "title": "C", "status": "draft"}],
+    }
+    path = tmp_path / "doc.vbrief.json"
+    dump_file({"plan": {"title": "T", "status": "draft", "items": [item]}}, path, preserve_format=True)
+
+    with load_lazy(path, persist_index=False) as doc:
+        assert list(doc.ids()) == ["p", "child"]
+        assert doc.path_of("child") == "plan.items[0].subItems[0]"
+        assert doc.get("child") == item["subItems"][0]
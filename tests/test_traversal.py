@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+
+from libvbrief import VBriefDocument, validate
+from libvbrief.traversal import walk_items
+
+DEPTH = 100_000
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _deep_items(depth: int, **leaf: object) -> list[dict]:
+    leaf_item = {"title": f"level {depth - 1}", "status": "pending", **leaf}
+    node = leaf_item
+    for level in range(depth - 2, -1, -1):
+        node = {"title": f"level {level}", "status": "pending", "subItems": [node]}
+    return [node]
+
+
+def _load_dag_validator():
+    spec = importlib.util.spec_from_file_location("dag_validator", ROOT / "validation" / "dag_validator.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_walk_items_yields_preorder_paths_and_parents() -> None:
+    items = [
+        {"title": "a", "subItems": [{"title": "a1"}, "bad", {"title": "a2", "subItems": [{"title": "a2x"}]}]},
+        {"title": "b"},
+    ]
+
+    walked = [(str(path), item["title"] if isinstance(item, dict) else item, parent) for path, item, parent in walk_items(items)]
+
+    assert [(path, title) for path, title, _ in walked] == [
+        ("plan.items[0]", "a"),
+        ("plan.items[0].subItems[0]", "a1"),
+        ("plan.items[0].subItems[1]", "bad"),
+        ("plan.items[0].subItems[2]", "a2"),
+        ("plan.items[0].subItems[2].subItems[0]", "a2x"),
+        ("plan.items[1]", "b"),
+    ]
+    assert walked[1][2] is items[0] and walked[0][2] is None
+    pruned = [item["title"] for _, item, _ in walk_items(items, path=None, children=lambda item: None)]
+    assert pruned == ["a", "b"]
+
+
+def test_walk_items_handles_100k_levels() -> None:
+    items = _deep_items(DEPTH)
+
+    count = 0
+    for path, item, parent in walk_items(items, path=None):
+        count += 1
+
+    assert count == DEPTH
+    assert path is None and item["title"] == f"level {DEPTH - 1}"
+    assert parent["subItems"][0] is item
+
+
+def test_validate_reports_errors_100k_levels_deep() -> None:
+    document = {"vBRIEFInfo": {"version": "0.5"}, "plan": {"title": "P", "status": "running", "items": _deep_items(DEPTH, status="bogus")}}
+
+    report = validate(document)
+
+    [error] = report.errors
+    assert error.code == "invalid_item_status"
+    assert error.path == "plan.items[0]" + ".subItems[0]" * (DEPTH - 1) + ".status"
+
+
+def test_models_load_and_serialize_100k_levels() -> None:
+    document = {"vBRIEFInfo": {"version": "0.5"}, "plan": {"title": "P", "status": "running", "items": _deep_items(DEPTH)}}
+
+    model = VBriefDocument.from_dict(document)
+    leaf = model.plan.items[0]
+    while leaf.subItems:
+        leaf = leaf.subItems[0]
+    model.to_dict()
+    leaf.status = "completed"
+    rendered = model.to_dict()
+
+    walked = [item for _, item, _ in walk_items(rendered["plan"]["items"], path=None)]
+    assert len(walked) == DEPTH
+    assert walked[-1] == {"title": f"level {DEPTH - 1}", "status": "completed"}
+    assert walked[0]["title"] == "level 0"
+
+
+def test_dag_tools_do_not_recurse() -> None:
+    dag_validator = _load_dag_validator()
+    nested = _deep_items(5_000)
+    for _, item, _ in walk_items(nested, path=None):
+        item["id"] = "n"
+    chain = [{"id": f"t{i}", "title": "t", "status": "pending"} for i in range(DEPTH)]
+    edges = [{"from": f"t{i}", "to": f"t{i + 1}", "type": "blocks"} for i in range(DEPTH - 1)]
+
+    ids = dag_validator.collect_hierarchical_ids(nested)
+    assert len(ids) == 5_000 and ".".join(["n"] * 5_000) in ids
+
+    validator = dag_validator.DAGValidator(chain, edges)
+    assert validator.detect_cycles() is None
+    validator = dag_validator.DAGValidator(chain, edges + [{"from": f"t{DEPTH - 1}", "to": "t0", "type": "blocks"}])
+    cycle = validator.detect_cycles()
+    assert cycle[0] == cycle[-1] and len(cycle) == DEPTH + 1
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from libvbrief import dump_file, dumps, load_file, loads
+from libvbrief.serialization.tron_codec import TronDecodeError, dumps_tron, parse_tron
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "examples"
+
+
+@pytest.mark.parametrize("name", ["dag-plan", "construction-project-gantt"])
+def test_parse_tron_matches_json_example(name: str) -> None:
+    tron = parse_tron((EXAMPLES / f"{name}.vbrief.tron").read_text(encoding="utf-8"))
+    expected = json.loads((EXAMPLES / f"{name}.vbrief.json").read_text(encoding="utf-8"))
+
+    assert tron == expected
+
+
+def test_dumps_tron_preserve_mode_reproduces_example_file() -> None:
+    source = json.loads((EXAMPLES / "dag-plan.vbrief.json").read_text(encoding="utf-8"))
+
+    rendered = dumps_tron(source, canonical=False, preserve_format=True)
+
+    assert rendered == (EXAMPLES / "dag-plan.vbrief.tron").read_text(encoding="utf-8")
+
+
+def test_tron_round_trip_keeps_unknown_fields_and_nesting() -> None:
+    doc = {
+        "vBRIEFInfo": {"version": "0.5"},
+        "plan": {
+            "title": "T",
+            "status": "running",
+            "items": [
+                {"id": "a", "title": "A", "status": "pending"},
+                {"id": "b", "title": "B", "status": "pending"},
+                {
+                    "id": "c",
+                    "title": "Say \"hi\"",
+                    "status": "running",
+                    "x-extra": {"n": 1.5, "ok": True, "none": None},
+                    "subItems": [{"id": "c.1", "title": "C1", "status": "draft"}],
+                },
+            ],
+            "narratives": {"Acceptance Criteria": "line1\nline2"},
+        },
+    }
+
+    for canonical in (True, False):
+        text = dumps(doc, format="tron", canonical=canonical, preserve_format=not canonical)
+        assert loads(text, format="tron") == doc
+
+
+def test_constructor_skips_null_and_missing_fields() -> None:
+    text = """
+class PlanItem: id, title, status, priority, dueDate
+
+# Items may leave trailing optional fields out
+items: [
+  PlanItem("a", "Task A", "pending", "high"),
+  PlanItem("b", "Task B", "running", null, null),
+]
+"""
+
+    assert parse_tron(text) == {
+        "items": [
+            {"id": "a", "title": "Task A", "status": "pending", "priority": "high"},
+            {"id": "b", "title": "Task B", "status": "running"},
+        ]
+    }
+
+
+def test_parse_tron_reports_position_of_errors() -> None:
+    with pytest.raises(TronDecodeError) as excinfo:
+        parse_tron('class Edge: from, to, type\nedges: [Edge("a", "b", "blocks", "x")]')
+
+    assert excinfo.value.lineno == 2
+    assert "Edge takes 3 fields" in str(excinfo.value)
+
+    with pytest.raises(TronDecodeError):
+        parse_tron("plan: {title: Missing(1)}")
+
+
+def test_file_format_is_inferred_from_suffix(tmp_path) -> None:
+    source = {
+        "vBRIEFInfo": {"version": "0.5"},
+        "plan": {"title": "R", "status": "running", "items": [{"title": "a", "status": "pending"}]},
+    }
+
+    path = tmp_path / "doc.vbrief.tron"
+    dump_file(source, path)
+
+    assert not path.read_text(encoding="utf-8").lstrip().startswith("{")
+    assert load_file(path, strict=True) == source
+
+    with pytest.raises(ValueError, match="Unsupported format"):
+        loads("{}", format="yaml")
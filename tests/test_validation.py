@@ -1,6 +1,14 @@
 from __future__ import annotations
 
-from libvbrief import validate
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+from libvbrief import VBriefDocument, validate
+from libvbrief.validation import CONFORMANCE_RULES, CORE_RULES, Rule, RuleEngine, validate_document
+
+ROOT = Path(__file__).resolve().parent.parent
 
 
 def test_validate_minimal_document_has_no_errors() -> None:
@@ -55,3 +63,109 @@ def test_validate_reports_plan_and_item_errors() -> None:
     assert "invalid_item_status" in codes
     assert "invalid_planref" in codes
     assert "missing_item_field" in codes
+
+
+def _edge_document() -> dict:
+    return {
+        "vBRIEFInfo": {"version": "0.5"},
+        "todoList": {},
+        "plan": {
+            "title": "Edges",
+            "status": "running",
+            "narratives": {"Overview": "o", "risk notes": "r"},
+            "items": [
+                {"id": "a", "title": "A", "status": "pending", "subItems": [{"id": "a1", "title": "A1", "status": "bogus"}]},
+                {"id": "b", "title": "B", "status": "pending"},
+                "not an item",
+            ],
+            "edges": [
+                {"from": "a", "to": "a.a1", "type": "blocks"},
+                {"from": "a1", "to": "b", "type": "blocks"},
+                {"from": "b", "to": "a", "type": "informs"},
+                {"from": "b", "to": "ghost", "type": "blocks"},
+                {"from": "b", "to": "a"},
+            ],
+        },
+    }
+
+
+def test_conformance_rules_check_edges_and_recommendations_in_one_pass() -> None:
+    report = validate_document(_edge_document(), rules=CONFORMANCE_RULES)
+
+    assert [(issue.code, issue.path) for issue in report.errors] == [
+        ("removed_container", "todoList"),
+        ("invalid_item_status", "plan.items[0].subItems[0].status"),
+        ("invalid_item_type", "plan.items[2]"),
+        ("unknown_edge_reference", "plan.edges[3].to"),
+        ("invalid_edge", "plan.edges[4].type"),
+        ("edge_cycle", "plan.edges"),
+    ]
+    assert [issue.path for issue in report.warnings] == ["plan.narratives.risk notes", "plan.narratives.risk notes"]
+    assert report.errors[-1].message == "Cycle detected: a -> a.a1 -> b -> a"
+    assert {issue.code for issue in validate(_edge_document()).errors} == {"invalid_item_status", "invalid_item_type"}
+
+
+def test_custom_rules_share_the_traversal() -> None:
+    seen = []
+
+    class NeedsOwner(Rule):
+        def item(self, item, parent, path, report) -> None:
+            seen.append((type(path).__name__, parent["id"] if parent else None))
+            if "x-owner" not in item:
+                report.add_warning("missing_owner", f"{path}.x-owner", "Items should name an owner")
+
+    engine = RuleEngine(CORE_RULES + (NeedsOwner(),))
+    report = engine.validate(VBriefDocument.from_dict(_edge_document()))
+
+    assert seen == [("ItemPath", None), ("ItemPath", "a"), ("ItemPath", None)]
+    assert [issue.path for issue in report.warnings] == [
+        "plan.items[0].x-owner",
+        "plan.items[0].subItems[0].x-owner",
+        "plan.items[1].x-owner",
+    ]
+    assert [issue.code for issue in report.errors] == ["invalid_item_status"]
+
+
+def test_conformance_script_uses_the_engine() -> None:
+    spec = importlib.util.spec_from_file_location("vbrief_validator", ROOT / "validation" / "vbrief_validator.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    validator = module.ConformanceValidator(_edge_document())
+    is_valid, errors, warnings = validator.validate()
+
+    assert not is_valid
+    assert errors[0] == "todoList: TodoList container is removed in v0.5. Use Plan instead."
+    assert errors[1].startswith("plan.items[0].subItems[0].status: Invalid item status 'bogus'")
+    assert len(validator.dag_errors) == 3 and len(warnings) == 2
+
+
+def test_error_budget_stops_the_traversal() -> None:
+    doc = {
+        "vBRIEFInfo": {"version": "0.5"},
+        "plan": {
+            "title": "Broken",
+            "status": "running",
+            "narratives": {"notes": "n"},
+            "items": [{"id": f"t{i}", "title": "T", "status": "bogus"} for i in range(50)],
+        },
+    }
+    full = validate(doc)
+    seen = []
+
+    class Seen(Rule):
+        def item(self, item, parent, path, report) -> None:
+            seen.append(item["id"])
+
+    bounded = validate(doc, max_errors=5)
+    first = RuleEngine((Seen(),) + CORE_RULES).validate(doc, fail_fast=True)
+
+    assert len(full.errors) == 50 and not full.truncated
+    assert bounded.errors == full.errors[:5] and bounded.truncated
+    assert first.errors == full.errors[:1] and first.truncated
+    assert seen == ["t0"]
+    assert len(validate_document(doc, rules=CONFORMANCE_RULES).warnings) == 1
+    assert validate_document(doc, rules=CONFORMANCE_RULES, include_warnings=False).warnings == []
+    assert not validate(doc, max_errors=51).truncated
+    with pytest.raises(ValueError):
+        validate(doc, max_errors=0)
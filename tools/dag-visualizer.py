@@ -11,6 +11,13 @@ import sys
 from pathlib import Path
 from typing import Dict, List, Set
 
+# Without an installed package, use the checkout this script lives in.
+try:
+    import libvbrief
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from libvbrief.traversal import collect_hierarchical_ids
+
 
 class DAGVisualizer:
     """Generates Mermaid diagrams from vBRIEF Plans."""
@@ -47,19 +54,7 @@ class DAGVisualizer:
     
     def _build_item_map(self, items: List[Dict], prefix: str = "") -> Dict[str, Dict]:
         """Build map of item ID to item for lookup."""
-        item_map = {}
-        for item in items:
-            item_id = item.get("id")
-            if item_id:
-                full_id = f"{prefix}.{item_id}" if prefix else item_id
-                item_map[full_id] = item
-                
-                # Recursively process subItems
-                sub_items = item.get("subItems", [])
-                if sub_items:
-                    item_map.update(self._build_item_map(sub_items, full_id))
-        
-        return item_map
+        return collect_hierarchical_ids(items, prefix)
     
     def _sanitize_id(self, item_id: str) -> str:
         """Sanitize ID for use in Mermaid."""
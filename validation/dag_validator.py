@@ -7,9 +7,18 @@ Validates directed acyclic graph (DAG) constraints for Plan edges:
 - Supports hierarchical IDs with dot notation
 """
 
+import sys
+from pathlib import Path
 from typing import Dict, List, Set, Tuple, Optional
 from enum import Enum
 
+# Without an installed package, use the checkout this script lives in.
+try:
+    import libvbrief
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from libvbrief.traversal import collect_hierarchical_ids
+
 
 class ValidationError(Exception):
     """Raised when DAG validation fails."""
@@ -42,7 +51,7 @@ class DAGValidator:
     
     def _collect_item_ids(self, items: List[Dict], prefix: str = "") -> Set[str]:
         """
-        Recursively collect all item IDs including nested subItems.
+        Collect all item IDs including nested subItems, without recursion.
         
         Args:
             items: List of PlanItem dictionaries
@@ -51,20 +60,7 @@ class DAGValidator:
         Returns:
             Set of all item IDs in the plan
         """
-        ids = set()
-        for item in items:
-            item_id = item.get("id")
-            if item_id:
-                # Support hierarchical IDs
-                full_id = f"{prefix}.{item_id}" if prefix else item_id
-                ids.add(full_id)
-                
-                # Recursively process subItems
-                sub_items = item.get("subItems", [])
-                if sub_items:
-                    ids.update(self._collect_item_ids(sub_items, full_id))
-        
-        return ids
+        return set(collect_hierarchical_ids(items, prefix))
     
     def _build_adjacency_list(self) -> Dict[str, List[str]]:
         """
@@ -127,51 +123,41 @@ class DAGValidator:
         color = {node: WHITE for node in self.graph}
         parent = {node: None for node in self.graph}
         
-        def dfs(node: str) -> Optional[List[str]]:
-            """
-            DFS visit function.
-            
-            Args:
-                node: Current node being visited
-                
-            Returns:
-                Cycle path if found, None otherwise
-            """
-            color[node] = GRAY
-            
-            for neighbor in self.graph.get(node, []):
-                # Skip neighbors not in the graph (validation handles this)
-                if neighbor not in color:
-                    continue
-                
-                if color[neighbor] == GRAY:
-                    # Back edge found - cycle detected
-                    # Reconstruct cycle path
-                    cycle = [neighbor]
-                    current = node
-                    while current != neighbor:
-                        cycle.append(current)
-                        current = parent.get(current)
-                        if current is None:
-                            break
-                    cycle.append(neighbor)
-                    return list(reversed(cycle))
-                
-                if color[neighbor] == WHITE:
-                    parent[neighbor] = node
-                    cycle = dfs(neighbor)
-                    if cycle:
-                        return cycle
-            
-            color[node] = BLACK
-            return None
-        
-        # Start DFS from all unvisited nodes
-        for node in self.graph:
-            if color[node] == WHITE:
-                cycle = dfs(node)
-                if cycle:
-                    return cycle
+        # Start DFS from all unvisited nodes. The DFS keeps an explicit stack
+        # of (node, remaining neighbors) so long chains cannot overflow.
+        for start in self.graph:
+            if color[start] != WHITE:
+                continue
+            color[start] = GRAY
+            stack = [(start, iter(self.graph.get(start, [])))]
+            while stack:
+                node, neighbors = stack[-1]
+                for neighbor in neighbors:
+                    # Skip neighbors not in the graph (validation handles this)
+                    if neighbor not in color:
+                        continue
+                    
+                    if color[neighbor] == GRAY:
+                        # Back edge found - cycle detected
+                        # Reconstruct cycle path
+                        cycle = [neighbor]
+                        current = node
+                        while current != neighbor:
+                            cycle.append(current)
+                            current = parent.get(current)
+                            if current is None:
+                                break
+                        cycle.append(neighbor)
+                        return list(reversed(cycle))
+                    
+                    if color[neighbor] == WHITE:
+                        parent[neighbor] = node
+                        color[neighbor] = GRAY
+                        stack.append((neighbor, iter(self.graph.get(neighbor, []))))
+                        break
+                else:
+                    color[node] = BLACK
+                    stack.pop()
         
         return None
     
@@ -12,175 +12,49 @@ import json
 import sys
 from pathlib import Path
 from typing import Dict, List, Tuple
-import re
 
+# Schema, conformance and DAG checks run on libvbrief's validation engine.
+# Without an installed package, use the checkout this script lives in.
 try:
-    import jsonschema
-    JSONSCHEMA_AVAILABLE = True
+    import libvbrief
 except ImportError:
-    JSONSCHEMA_AVAILABLE = False
-    print("Warning: jsonschema not installed. Schema validation disabled.")
-    print("Install with: pip install jsonschema")
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from libvbrief.compat import ISSUE_EDGE_CYCLE, ISSUE_INVALID_EDGE, ISSUE_UNKNOWN_EDGE_REFERENCE
+from libvbrief.schema import compile_schema
+from libvbrief.validation import CONFORMANCE_RULES, RuleEngine
 
-# Import DAG validator
-sys.path.insert(0, str(Path(__file__).parent))
-from dag_validator import validate_plan_dag
+DAG_ISSUE_CODES = {ISSUE_INVALID_EDGE, ISSUE_UNKNOWN_EDGE_REFERENCE, ISSUE_EDGE_CYCLE}
 
 
 class ConformanceValidator:
     """Validates vBRIEF v0.5 conformance criteria."""
     
-    VALID_STATUSES = {
-        "draft", "proposed", "approved", "pending", 
-        "running", "completed", "blocked", "cancelled"
-    }
-    
-    HIERARCHICAL_ID_PATTERN = re.compile(r'^[a-zA-Z0-9_-]+(\.[a-zA-Z0-9_-]+)*$')
-    
-    URI_PATTERN = re.compile(r'^(#[a-zA-Z0-9_.-]+|file://.*|https://.*)$')
+    ENGINE = RuleEngine(CONFORMANCE_RULES)
     
     def __init__(self, doc: Dict):
         self.doc = doc
         self.errors = []
         self.warnings = []
+        self.dag_errors = []
     
     def validate(self) -> Tuple[bool, List[str], List[str]]:
         """
         Validate conformance criteria.
         
+        Version, required fields, status values, hierarchical IDs, planRef
+        URIs, narrative keys and the edge DAG are all checked in a single
+        pass over the document; DAG problems are collected in ``dag_errors``.
+        
         Returns:
             Tuple of (is_valid, errors, warnings)
         """
-        self._check_version()
-        self._check_plan_required_fields()
-        self._check_status_values()
-        self._check_hierarchical_ids()
-        self._check_uri_syntax()
-        self._check_narrative_keys()
+        report = self.ENGINE.validate(self.doc)
+        for issue in report.errors:
+            target = self.dag_errors if issue.code in DAG_ISSUE_CODES else self.errors
+            target.append(f"{issue.path}: {issue.message}")
+        self.warnings.extend(f"{issue.path}: {issue.message}" for issue in report.warnings)
         
         return (len(self.errors) == 0, self.errors, self.warnings)
-    
-    def _check_version(self):
-        """Conformance #1: Contains vBRIEFInfo with version: '0.5'"""
-        vbrief_info = self.doc.get("vBRIEFInfo")
-        if not vbrief_info:
-            self.errors.append("Missing required field: vBRIEFInfo")
-            return
-        
-        version = vbrief_info.get("version")
-        if version != "0.5":
-            self.errors.append(f"Invalid version: expected '0.5', got '{version}'")
-    
-    def _check_plan_required_fields(self):
-        """Conformance #2-3: Contains exactly one plan with required fields"""
-        if "plan" not in self.doc:
-            self.errors.append("Missing required field: plan")
-            return
-        
-        plan = self.doc["plan"]
-        
-        # Check for removed container types
-        if "todoList" in self.doc:
-            self.errors.append("TodoList container is removed in v0.5. Use Plan instead.")
-        if "playbook" in self.doc:
-            self.errors.append("Playbook container is removed in v0.5. Use Plan with narratives instead.")
-        
-        # Required fields
-        if "title" not in plan:
-            self.errors.append("Plan missing required field: title")
-        if "status" not in plan:
-            self.errors.append("Plan missing required field: status")
-        if "items" not in plan:
-            self.errors.append("Plan missing required field: items")
-        elif not isinstance(plan["items"], list):
-            self.errors.append("Plan.items must be an array")
-    
-    def _check_status_values(self):
-        """Conformance #4: All status values use defined enum"""
-        plan = self.doc.get("plan", {})
-        
-        # Check plan status
-        plan_status = plan.get("status")
-        if plan_status and plan_status not in self.VALID_STATUSES:
-            self.errors.append(f"Invalid plan status: '{plan_status}'. Must be one of {self.VALID_STATUSES}")
-        
-        # Check item statuses
-        self._check_item_statuses(plan.get("items", []), [])
-    
-    def _check_item_statuses(self, items: List[Dict], path: List[str]):
-        """Recursively check item status values."""
-        for i, item in enumerate(items):
-            item_path = path + [f"items[{i}]"]
-            status = item.get("status")
-            
-            if status and status not in self.VALID_STATUSES:
-                path_str = ".".join(item_path)
-                self.errors.append(f"Invalid status at {path_str}: '{status}'. Must be one of {self.VALID_STATUSES}")
-            
-            # Check nested items
-            sub_items = item.get("subItems", [])
-            if sub_items:
-                self._check_item_statuses(sub_items, item_path + ["subItems"])
-    
-    def _check_hierarchical_ids(self):
-        """Conformance #6: Hierarchical IDs follow dot notation"""
-        plan = self.doc.get("plan", {})
-        
-        # Check plan ID
-        plan_id = plan.get("id")
-        if plan_id and not self.HIERARCHICAL_ID_PATTERN.match(plan_id):
-            self.errors.append(f"Invalid plan ID format: '{plan_id}'. Must match pattern: [a-zA-Z0-9_-]+(\\.[a-zA-Z0-9_-]+)*")
-        
-        # Check item IDs
-        self._check_item_ids(plan.get("items", []), [])
-    
-    def _check_item_ids(self, items: List[Dict], path: List[str]):
-        """Recursively check item ID format."""
-        for i, item in enumerate(items):
-            item_path = path + [f"items[{i}]"]
-            item_id = item.get("id")
-            
-            if item_id and not self.HIERARCHICAL_ID_PATTERN.match(item_id):
-                path_str = ".".join(item_path)
-                self.errors.append(f"Invalid ID format at {path_str}: '{item_id}'. Must match pattern: [a-zA-Z0-9_-]+(\\.[a-zA-Z0-9_-]+)*")
-            
-            # Check nested items
-            sub_items = item.get("subItems", [])
-            if sub_items:
-                self._check_item_ids(sub_items, item_path + ["subItems"])
-    
-    def _check_uri_syntax(self):
-        """Conformance #9: planRef URIs follow syntax"""
-        plan = self.doc.get("plan", {})
-        self._check_item_uris(plan.get("items", []), [])
-    
-    def _check_item_uris(self, items: List[Dict], path: List[str]):
-        """Recursively check planRef URI syntax."""
-        for i, item in enumerate(items):
-            item_path = path + [f"items[{i}]"]
-            plan_ref = item.get("planRef")
-            
-            if plan_ref and not self.URI_PATTERN.match(plan_ref):
-                path_str = ".".join(item_path)
-                self.errors.append(f"Invalid planRef URI at {path_str}: '{plan_ref}'. Must match: #item-id, file://..., or https://...")
-            
-            # Check nested items
-            sub_items = item.get("subItems", [])
-            if sub_items:
-                self._check_item_uris(sub_items, item_path + ["subItems"])
-    
-    def _check_narrative_keys(self):
-        """Conformance #10: Narrative keys SHOULD use TitleCase"""
-        plan = self.doc.get("plan", {})
-        narratives = plan.get("narratives", {})
-        
-        for key in narratives.keys():
-            # Check if key is TitleCase (starts with uppercase, no spaces)
-            if not key[0].isupper():
-                self.warnings.append(f"Narrative key '{key}' SHOULD use TitleCase (e.g., '{key.title()}')")
-            
-            if " " in key:
-                self.warnings.append(f"Narrative key '{key}' SHOULD not contain spaces")
 
 
 def validate_document(file_path: str, schema_path: str = None) -> int:
@@ -210,23 +84,22 @@ def validate_document(file_path: str, schema_path: str = None) -> int:
     
     all_valid = True
     
-    # 1. JSON Schema validation
-    if JSONSCHEMA_AVAILABLE and schema_path:
+    # 1. JSON Schema validation (compiled once per schema, no jsonschema needed)
+    if schema_path:
         try:
             with open(schema_path, 'r') as f:
-                schema = json.load(f)
-            
-            jsonschema.validate(doc, schema)
-            print("✓ JSON Schema validation passed")
-        except jsonschema.ValidationError as e:
-            print(f"✗ JSON Schema validation failed:")
-            print(f"  {e.message}")
-            if e.path:
-                path = ".".join(str(p) for p in e.path)
-                print(f"  at: {path}")
-            all_valid = False
+                schema = compile_schema(json.load(f))
         except FileNotFoundError:
             print(f"⚠ Schema file not found: {schema_path}")
+        else:
+            schema_errors = schema.validate(doc).errors
+            if not schema_errors:
+                print("✓ JSON Schema validation passed")
+            else:
+                print("✗ JSON Schema validation failed:")
+                for issue in schema_errors:
+                    print(f"  - {issue.path}: {issue.message}")
+                all_valid = False
     
     # 2. Conformance validation
     conformance = ConformanceValidator(doc)
@@ -245,17 +118,16 @@ def validate_document(file_path: str, schema_path: str = None) -> int:
         for warning in warnings:
             print(f"  - {warning}")
     
-    # 3. DAG validation
+    # 3. DAG validation (checked in the same pass as conformance)
     plan = doc.get("plan", {})
-    edges = plan.get("edges", [])
+    edges = plan.get("edges", []) if isinstance(plan, dict) else []
     
     if edges:
-        is_valid, dag_errors = validate_plan_dag(plan)
-        if is_valid:
+        if not conformance.dag_errors:
             print("✓ DAG validation passed")
         else:
             print("✗ DAG validation failed:")
-            for error in dag_errors:
+            for error in conformance.dag_errors:
                 print(f"  - {error}")
             all_valid = False
     else: